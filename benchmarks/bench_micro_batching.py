@@ -0,0 +1,103 @@
+"""Бенчмарк пропускной способности micro-batching локальной генерации (CPU).
+
+Запускает ``--requests`` одинаковых по параметрам запросов из ``--clients``
+потоков через MicroBatchScheduler для каждого размера пакета и печатает
+пропускную способность и задержки. По умолчанию используется крошечная
+модель, чтобы прогон занимал секунды; реальную модель задайте ``--model``.
+
+Пример:
+    python -m benchmarks.bench_micro_batching --batch-sizes 1,2,4,8,16
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from typing import List
+
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")  # только CPU
+
+from src.backend.infrastructure.client.batching import (  # noqa: E402
+    MicroBatchScheduler,
+    batched_generate,
+)
+
+PROMPTS = [
+    "Расскажи коротко о Москве.",
+    "Что посмотреть в Казани за один день?",
+    "Опиши побережье Крыма в двух предложениях.",
+    "Чем интересен Байкал зимой?",
+]
+
+
+def run(scheduler: MicroBatchScheduler, requests: int, clients: int, params: dict):
+    """Выполнить нагрузку и вернуть (секунды, задержки)."""
+    latencies: List[float] = []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            scheduler.generate(PROMPTS[i % len(PROMPTS)], **params)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started, latencies
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="sshleifer/tiny-gpt2")
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--threads", type=int, default=0, help="torch threads")
+    args = parser.parse_args()
+
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    model = AutoModelForCausalLM.from_pretrained(args.model).to("cpu").eval()
+    params = {"max_new_tokens": args.max_new_tokens, "do_sample": False}
+
+    # Прогрев, чтобы первая конфигурация не платила за инициализацию
+    batched_generate(model, tokenizer, "cpu", PROMPTS[:2], **params)
+
+    print(f"model={args.model} requests={args.requests} clients={args.clients}")
+    print(f"{'batch':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'avg batch':>9}")
+    for size in [int(s) for s in args.batch_sizes.split(",")]:
+        scheduler = MicroBatchScheduler(
+            lambda prompts, p: batched_generate(model, tokenizer, "cpu", prompts, **p),
+            max_batch_size=size,
+            max_wait_ms=args.max_wait_ms,
+        )
+        elapsed, latencies = run(scheduler, args.requests, args.clients, params)
+        stats = scheduler.stats()
+        scheduler.close()
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(
+            f"{size:>5} {args.requests / elapsed:>8.2f} "
+            f"{statistics.median(latencies) * 1000:>8.1f} {p95 * 1000:>8.1f} "
+            f"{stats['avg_batch_size']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Бенчмарк офлайн реверс-геокодера (k-d дерево по справочнику GeoNames).
+
+Строит индекс по выгрузке GeoNames (``--gazetteer``) или по синтетическому
+справочнику из ``--places`` точек, равномерно распределённых по сфере,
+сохраняет и загружает бинарный индекс, затем замеряет пакетные запросы
+(``--queries``, по умолчанию миллион) и одиночные (``--single``) и сверяет
+часть ответов с полным перебором.
+
+Пример:
+    python -m benchmarks.bench_offline_geocoder --places 200000 --queries 5000000
+    python -m benchmarks.bench_offline_geocoder --gazetteer cities500.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from src.backend.infrastructure.services.offline_geocoder import (
+    GazetteerEntry,
+    OfflineReverseGeocoder,
+    read_geonames,
+    to_unit_vectors,
+)
+
+
+def random_points(count: int, rng: np.random.Generator):
+    """Точки, равномерно распределённые по сфере: (широты, долготы)."""
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, count)))
+    longitudes = rng.uniform(-180.0, 180.0, count)
+    return latitudes, longitudes
+
+
+def synthetic_gazetteer(count: int, rng: np.random.Generator) -> List[GazetteerEntry]:
+    """Синтетический справочник из ``count`` пунктов."""
+    latitudes, longitudes = random_points(count, rng)
+    return [
+        GazetteerEntry(i, f"Пункт {i}", float(lat), float(lon), "RU", 1000)
+        for i, (lat, lon) in enumerate(zip(latitudes, longitudes))
+    ]
+
+
+def verify(geocoder: OfflineReverseGeocoder, latitudes, longitudes, ids) -> int:
+    """Сколько ответов расходится с полным перебором."""
+    points = to_unit_vectors(geocoder.latitudes, geocoder.longitudes)
+    mismatches = 0
+    for lat, lon, found in zip(latitudes, longitudes, ids):
+        d2 = np.square(points - to_unit_vectors(lat, lon)).sum(axis=1)
+        if d2[found] > d2.min() + 1e-9:
+            mismatches += 1
+    return mismatches
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gazetteer", help="выгрузка GeoNames (cities500.txt)")
+    parser.add_argument("--places", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=1_000_000)
+    parser.add_argument("--single", type=int, default=100_000)
+    parser.add_argument("--verify", type=int, default=1000)
+    parser.add_argument("--leaf-size", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    started = time.perf_counter()
+    if args.gazetteer:
+        entries = list(read_geonames(args.gazetteer))
+    else:
+        entries = synthetic_gazetteer(args.places, rng)
+    parsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    geocoder = OfflineReverseGeocoder.build(entries, leaf_size=args.leaf_size)
+    built = time.perf_counter() - started
+    path = os.path.join(tempfile.mkdtemp(prefix="aitravel-geo-"), "index.npz")
+    geocoder.save(path)
+    started = time.perf_counter()
+    geocoder = OfflineReverseGeocoder.load(path)
+    loaded = time.perf_counter() - started
+    print(
+        f"пунктов {len(geocoder)}, глубина {geocoder.depth}; разбор {parsed:.2f} с,"
+        f" построение {built:.2f} с, загрузка индекса {loaded * 1000:.1f} мс"
+        f" ({os.path.getsize(path) / 2**20:.1f} МБ)"
+    )
+
+    latitudes, longitudes = random_points(args.queries, rng)
+    started = time.perf_counter()
+    ids, distances = geocoder.nearest_many(latitudes, longitudes)
+    elapsed = time.perf_counter() - started
+    print(
+        f"пакетно: {args.queries} запросов за {elapsed:.2f} с —"
+        f" {elapsed / args.queries * 1e6:.2f} мкс/запрос,"
+        f" {args.queries / elapsed:,.0f} запросов/с;"
+        f" медиана расстояния {np.median(distances):.1f} км"
+    )
+
+    single = min(args.single, args.queries)
+    latencies = []
+    for lat, lon in zip(latitudes[:single].tolist(), longitudes[:single].tolist()):
+        started = time.perf_counter()
+        geocoder.nearest(lat, lon)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+    print(
+        f"по одному: {single} запросов — p50 {statistics.median(latencies):.1f} мкс,"
+        f" p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f} мкс"
+    )
+
+    count = min(args.verify, args.queries)
+    mismatches = verify(geocoder, latitudes[:count], longitudes[:count], ids[:count])
+    print(f"сверка с полным перебором: {count - mismatches}/{count} совпадений")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Бенчмарк стоимости поиска в семантическом кэше чата от размера индекса.
+
+Заполняет SemanticCache синтетическими вопросами (город × шаблон) и
+замеряет время ``get`` для попаданий и промахов на каждом размере.
+
+Пример:
+    python -m benchmarks.bench_semantic_cache --sizes 100,1000,5000,20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import List
+
+from src.backend.infrastructure.cache import SemanticCache
+
+CITIES = [
+    "Москве",
+    "Париже",
+    "Риме",
+    "Казани",
+    "Сочи",
+    "Берлине",
+    "Праге",
+    "Вене",
+    "Стамбуле",
+    "Токио",
+    "Лиссабоне",
+    "Мадриде",
+    "Тбилиси",
+    "Ереване",
+    "Минске",
+]
+TEMPLATES = [
+    "Что посмотреть в {city} за {n} дня",
+    "Куда сходить вечером в {city} #{n}",
+    "Лучшие музеи в {city} вариант {n}",
+    "Где вкусно поесть в {city} до {n} тысяч",
+    "Чем заняться с детьми в {city} {n} раз",
+]
+
+
+def questions(count: int) -> List[str]:
+    """Сгенерировать ``count`` различных вопросов."""
+    result = []
+    n = 1
+    while len(result) < count:
+        for template in TEMPLATES:
+            for city in CITIES:
+                result.append(template.format(city=city, n=n))
+        n += 1
+    return result[:count]
+
+
+def measure(cache: SemanticCache, queries: List[str]) -> List[float]:
+    """Задержки ``get`` в микросекундах."""
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        cache.get(query)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    return latencies
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,5000,20000")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--features", type=int, default=2048)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(
+        f"{'size':>7} {'fill s':>7} {'hit p50 us':>10} {'hit p95 us':>10} "
+        f"{'miss p50 us':>11} {'MB':>6}"
+    )
+    for size in [int(s) for s in args.sizes.split(",")]:
+        items = questions(size)
+        cache = SemanticCache(max_entries=size, n_features=args.features)
+        started = time.perf_counter()
+        for i, question in enumerate(items):
+            cache.set(question, f"ответ {i}")
+        fill = time.perf_counter() - started
+        hits = measure(
+            cache, [q.lower() + "?" for q in rng.sample(items, min(size, args.queries))]
+        )
+        misses = measure(
+            cache, [f"Погода на Марсе в сезон {i}" for i in range(args.queries)]
+        )
+        hits.sort()
+        p95 = hits[min(len(hits) - 1, int(len(hits) * 0.95))]
+        megabytes = size * args.features * 4 / 2**20
+        print(
+            f"{size:>7} {fill:>7.2f} {statistics.median(hits):>10.0f} {p95:>10.0f} "
+            f"{statistics.median(misses):>11.0f} {megabytes:>6.1f}"
+        )
+    print(f"hit rate at last size: {cache.stats()['hit_rate']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Локальные заменители провайдера LLM и Nominatim для нагрузочных тестов.
+
+Два HTTP-сервера без внешних зависимостей:
+
+* OpenAI-совместимый ``POST /v1/chat/completions`` (в том числе потоковый,
+  ``stream: true`` — Server-Sent Events по одному слову);
+* Nominatim ``GET /reverse`` и ``GET /search`` (формат ``jsonv2``).
+
+У каждого задаются распределение задержки и доля ошибок. Формат
+распределения: ``fixed:MS``, ``uniform:MIN_MS:MAX_MS`` или
+``lognormal:MEDIAN_MS:SIGMA``. Ответы детерминированы по содержимому
+запроса, поэтому прогоны воспроизводимы.
+
+Пример:
+    python -m benchmarks.fake_servers --llm-port 8081 --nominatim-port 8082 \\
+        --llm-latency lognormal:800:0.5 --llm-error-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+WORDS = (
+    "Старинный город на берегу реки с каменным кремлём, торговыми рядами "
+    "и набережной. Рядом музеи, парки и смотровые площадки; вечером "
+    "стоит пройтись по центральной улице и попробовать местную кухню."
+).split()
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Разобрать распределение задержки.
+
+    Args:
+        spec: ``fixed:MS``, ``uniform:MIN_MS:MAX_MS`` или
+            ``lognormal:MEDIAN_MS:SIGMA``
+
+    Returns:
+        Функция, возвращающая задержку в секундах
+
+    Raises:
+        ValueError: При неизвестном формате
+    """
+    kind, _, rest = spec.partition(":")
+    args = [float(a) for a in rest.split(":") if a]
+    if kind == "fixed" and len(args) == 1:
+        return lambda rng: args[0] / 1000
+    if kind == "uniform" and len(args) == 2:
+        return lambda rng: rng.uniform(args[0], args[1]) / 1000
+    if kind == "lognormal" and len(args) == 2:
+        mu = math.log(max(args[0], 1e-3))
+        return lambda rng: rng.lognormvariate(mu, args[1]) / 1000
+    raise ValueError(f"Неизвестное распределение задержки: {spec!r}")
+
+
+@dataclass
+class FakeBehavior:
+    """Задержка и сбои заменителя; счётчики обращений."""
+
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    error_status: int = 503
+    token_latency: str = "fixed:0"
+    seed: int = 0
+    requests: int = 0
+    errors: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._latency = parse_latency(self.latency)
+        self._token_latency = parse_latency(self.token_latency)
+
+    def draw(self) -> Tuple[float, bool]:
+        """Задержка ответа и признак сбоя для очередного запроса."""
+        with self._lock:
+            self.requests += 1
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return self._latency(self._rng), failed
+
+    def token_delay(self) -> float:
+        """Пауза между фрагментами потокового ответа, секунды."""
+        with self._lock:
+            return self._token_latency(self._rng)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Общая часть обработчиков: JSON-ответы и имитация задержки/сбоя."""
+
+    behavior: FakeBehavior
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело пишутся отдельно: без TCP_NODELAY keep-alive
+    # соединение ждёт отложенного ACK (~40 мс) на каждый ответ
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Не писать журнал доступа в stderr."""
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _simulate(self) -> bool:
+        """Выждать задержку; при сбое ответить ошибкой и вернуть False."""
+        delay, failed = self.behavior.draw()
+        time.sleep(delay)
+        if failed:
+            self._send_json(self.behavior.error_status, {"error": "fake failure"})
+            return False
+        return True
+
+
+class FakeLLMHandler(_Handler):
+    """OpenAI-совместимый ``/v1/chat/completions``."""
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if urlparse(self.path).path.rstrip("/") not in (
+            "/v1/chat/completions",
+            "/chat/completions",
+        ):
+            self._send_json(404, {"error": "not found"})
+            return
+        if not self._simulate():
+            return
+        model = request.get("model") or "fake-model"
+        messages = request.get("messages") or []
+        prompt = " ".join(str(m.get("content", "")) for m in messages)
+        answer = self._answer(prompt)
+        if request.get("stream"):
+            self._stream(model, answer)
+            return
+        self._send_json(
+            200,
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": answer},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": len(prompt.split()),
+                    "completion_tokens": len(answer.split()),
+                    "total_tokens": len(prompt.split()) + len(answer.split()),
+                },
+            },
+        )
+
+    @staticmethod
+    def _answer(prompt: str) -> str:
+        """Детерминированный ответ: 12–40 слов в зависимости от промпта."""
+        seed = zlib.crc32(prompt.encode("utf-8"))
+        count = 12 + seed % 29
+        return " ".join(WORDS[(seed + i) % len(WORDS)] for i in range(count))
+
+    def _stream(self, model: str, answer: str) -> None:
+        """Отдать ответ событиями SSE по одному слову."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for i, word in enumerate(answer.split()):
+            time.sleep(self.behavior.token_delay())
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": word if i == 0 else " " + word},
+                        "finish_reason": None,
+                    }
+                ],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class FakeNominatimHandler(_Handler):
+    """Nominatim ``/reverse`` и ``/search`` в формате ``jsonv2``."""
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        route = url.path.rstrip("/")
+        if route not in ("/reverse", "/search"):
+            self._send_json(404, {"error": "not found"})
+            return
+        if not self._simulate():
+            return
+        if route == "/reverse":
+            lat = float(query.get("lat", 0))
+            lon = float(query.get("lon", 0))
+            self._send_json(200, self._place(lat, lon))
+            return
+        text = query.get("q", "")
+        seed = zlib.crc32(text.encode("utf-8"))
+        lat = (seed % 140_000) / 1000 - 70
+        lon = (seed // 140_000 % 360_000) / 1000 - 180
+        limit = int(query.get("limit", 1))
+        self._send_json(200, [self._place(lat, lon, text)][:limit])
+
+    @staticmethod
+    def _place(lat: float, lon: float, name: Optional[str] = None) -> Dict[str, Any]:
+        """Место с адресом, производным от координат."""
+        cell = f"{round(lat, 2)}:{round(lon, 2)}"
+        city = name or f"Город {zlib.crc32(cell.encode()) % 1000}"
+        address = {
+            "road": f"улица {abs(int(lat * 100)) % 90 + 1}",
+            "city": city,
+            "country": "Россия",
+            "country_code": "ru",
+        }
+        return {
+            "place_id": zlib.crc32(cell.encode()),
+            "lat": str(lat),
+            "lon": str(lon),
+            "display_name": f"{address['road']}, {city}, {address['country']}",
+            "address": address,
+        }
+
+
+def start_server(
+    handler: type, behavior: FakeBehavior, host: str = "127.0.0.1", port: int = 0
+) -> ThreadingHTTPServer:
+    """Запустить сервер в фоновом потоке.
+
+    Args:
+        handler: ``FakeLLMHandler`` или ``FakeNominatimHandler``
+        behavior: Задержки и сбои
+        host: Адрес
+        port: Порт (0 — свободный)
+
+    Returns:
+        Запущенный сервер; адрес — ``server.server_address``
+    """
+    handler_cls = type(handler.__name__, (handler,), {"behavior": behavior})
+    server = ThreadingHTTPServer((host, port), handler_cls)
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, name=f"{handler.__name__}", daemon=True
+    )
+    thread.start()
+    return server
+
+
+def server_url(server: ThreadingHTTPServer) -> str:
+    """Базовый URL запущенного сервера."""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def add_behavior_arguments(parser: argparse.ArgumentParser) -> None:
+    """Добавить в CLI параметры задержек и сбоев обоих серверов."""
+    parser.add_argument("--llm-latency", default="lognormal:800:0.5")
+    parser.add_argument("--llm-token-latency", default="fixed:20")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--nominatim-latency", default="lognormal:150:0.4")
+    parser.add_argument("--nominatim-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def behaviors_from_args(args: argparse.Namespace) -> Tuple[FakeBehavior, FakeBehavior]:
+    """Поведение заменителей LLM и Nominatim из аргументов CLI."""
+    llm = FakeBehavior(
+        latency=args.llm_latency,
+        error_rate=args.llm_error_rate,
+        token_latency=args.llm_token_latency,
+        seed=args.seed,
+    )
+    nominatim = FakeBehavior(
+        latency=args.nominatim_latency,
+        error_rate=args.nominatim_error_rate,
+        seed=args.seed + 1,
+    )
+    return llm, nominatim
+
+
+def main() -> None:
+    """Точка входа: запустить оба сервера до Ctrl+C."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--llm-port", type=int, default=8081)
+    parser.add_argument("--nominatim-port", type=int, default=8082)
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    llm, nominatim = behaviors_from_args(args)
+    llm_server = start_server(FakeLLMHandler, llm, args.host, args.llm_port)
+    geo_server = start_server(
+        FakeNominatimHandler, nominatim, args.host, args.nominatim_port
+    )
+    print(f"HF_BASE_URL={server_url(llm_server)}/v1")
+    print(f"NOMINATIM_BASE_URL={server_url(geo_server)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        llm_server.shutdown()
+        geo_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
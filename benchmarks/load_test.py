@@ -0,0 +1,311 @@
+"""Нагрузочный тест API на локальных заменителях LLM и Nominatim.
+
+По умолчанию поднимает в процессе заменители из ``benchmarks.fake_servers``
+и приложение Flask (многопоточный werkzeug), настроенное на них, затем
+``--concurrency`` клиентов в течение ``--duration`` секунд шлют запросы
+к ``/reverse_geocode``, ``/get_location_info`` и ``/api/chat`` в пропорции
+``--mix``. Печатает пропускную способность и задержки p50/p95/p99 по
+каждому эндпоинту. Сеть не нужна.
+
+С ``--target`` нагружается уже запущенное приложение (например, под
+gunicorn); заменители тогда запускаются отдельно
+(``python -m benchmarks.fake_servers``), а приложение настраивается на них
+через HF_BASE_URL и NOMINATIM_BASE_URL.
+
+Пример:
+    python -m benchmarks.load_test --duration 30 --concurrency 32 \\
+        --mix reverse_geocode=2,get_location_info=1,chat=1 --points 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.fake_servers import (
+    FakeLLMHandler,
+    FakeNominatimHandler,
+    add_behavior_arguments,
+    behaviors_from_args,
+    server_url,
+    start_server,
+)
+
+QUESTIONS = [
+    "Что посмотреть в Казани за два дня?",
+    "Куда поехать летом на море недорого?",
+    "Какие музеи есть в Санкт-Петербурге?",
+    "Посоветуй маршрут по Золотому кольцу.",
+    "Когда лучше ехать на Байкал?",
+]
+
+Scenario = Callable[[requests.Session, str, random.Random], requests.Response]
+
+
+def make_points(count: int, rng: random.Random) -> List[Tuple[float, float]]:
+    """Набор точек запросов: чем меньше набор, тем больше попаданий в кэши."""
+    return [
+        (round(rng.uniform(41.0, 70.0), 5), round(rng.uniform(20.0, 140.0), 5))
+        for _ in range(count)
+    ]
+
+
+def make_scenarios(points: List[Tuple[float, float]]) -> Dict[str, Scenario]:
+    """Сценарии запросов по имени эндпоинта."""
+
+    def point(rng: random.Random) -> Dict[str, float]:
+        lat, lon = rng.choice(points)
+        return {"latitude": lat, "longitude": lon}
+
+    def reverse_geocode(session, base, rng):
+        return session.post(f"{base}/reverse_geocode", json=point(rng))
+
+    def get_location_info(session, base, rng):
+        return session.post(f"{base}/get_location_info", json=point(rng))
+
+    def chat(session, base, rng):
+        payload = {
+            "session_id": f"load-{rng.getrandbits(48):x}",
+            "messages": [{"role": "user", "content": rng.choice(QUESTIONS)}],
+        }
+        return session.post(f"{base}/api/chat", json=payload)
+
+    return {
+        "reverse_geocode": reverse_geocode,
+        "get_location_info": get_location_info,
+        "chat": chat,
+    }
+
+
+def parse_mix(spec: str, known: List[str]) -> List[Tuple[str, float]]:
+    """Разобрать пропорции ``name=weight,...``.
+
+    Raises:
+        ValueError: При неизвестном эндпоинте
+    """
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in known:
+            raise ValueError(f"Неизвестный эндпоинт {name!r}; доступны: {known}")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль по ближайшему рангу (значения отсортированы)."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(q * len(values))) - 1))
+    return values[index]
+
+
+def run_load(
+    base_url: str,
+    scenarios: Dict[str, Scenario],
+    mix: List[Tuple[str, float]],
+    concurrency: int,
+    duration: float,
+    seed: int,
+    timeout: float,
+) -> Tuple[float, Dict[str, Dict[str, Any]]]:
+    """Выполнить нагрузку и вернуть (секунды, замеры по эндпоинтам)."""
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    results: Dict[str, Dict[str, Any]] = {
+        name: {"latencies": [], "errors": 0, "statuses": {}} for name in names
+    }
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        while time.perf_counter() < stop_at:
+            name = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                resp = scenarios[name](session, base_url, rng)
+                status = resp.status_code
+            except requests.RequestException:
+                status = 0
+            latency = time.perf_counter() - started
+            with lock:
+                item = results[name]
+                item["latencies"].append(latency)
+                item["statuses"][status] = item["statuses"].get(status, 0) + 1
+                if status != 200:
+                    item["errors"] += 1
+
+    threads = [
+        threading.Thread(target=worker, args=(i,), daemon=True)
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(duration + timeout)
+    return time.perf_counter() - started, results
+
+
+def summarize(elapsed: float, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Итоги по эндпоинтам: запросы, ошибки, req/s, перцентили (мс)."""
+    summary = {}
+    for name, item in results.items():
+        latencies = sorted(item["latencies"])
+        summary[name] = {
+            "requests": len(latencies),
+            "errors": item["errors"],
+            "statuses": {str(k): v for k, v in sorted(item["statuses"].items())},
+            "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        }
+    return summary
+
+
+def print_summary(elapsed: float, summary: Dict[str, Any]) -> None:
+    """Напечатать таблицу итогов."""
+    print(
+        f"{'endpoint':<18} {'requests':>8} {'errors':>6} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for name, row in summary.items():
+        print(
+            f"{name:<18} {row['requests']:>8} {row['errors']:>6} {row['rps']:>8} "
+            f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}"
+        )
+    total = sum(row["requests"] for row in summary.values())
+    print(f"всего {total} запросов за {elapsed:.1f} с ({total / elapsed:.1f} req/s)")
+
+
+def start_app(args: argparse.Namespace, llm_url: str, nominatim_url: str):
+    """Поднять приложение на заменителях; вернуть (сервер werkzeug, app)."""
+    cache_dir = tempfile.mkdtemp(prefix="aitravel-load-")
+    overrides = {
+        "HF_TOKEN": "fake-token",
+        "HF_BASE_URL": f"{llm_url}/v1",
+        "HF_PROVIDERS": "",
+        "NOMINATIM_BASE_URL": nominatim_url,
+        "AI_BACKEND": "remote",
+        "AI_CLIENT_MODE": args.ai_client_mode,
+        "AI_CACHE_ENABLED": "true" if args.with_cache else "false",
+        "AI_CACHE_PATH": os.path.join(cache_dir, "ai_cache.sqlite3"),
+        "GEOCODE_CACHE_ENABLED": "true" if args.with_cache else "false",
+        "GEOCODE_CACHE_PATH": os.path.join(cache_dir, "geocode_cache.sqlite3"),
+        "NOMINATIM_RATE_LIMIT": str(args.nominatim_rate_limit),
+        "NOMINATIM_RATE_LIMIT_PATH": os.path.join(cache_dir, "nominatim-rate.sqlite3"),
+        "AI_METRICS_LOG_CALLS": "false",
+        "LOG_TO_FILE": "false",
+        "LOG_TO_CONSOLE": "false",
+        "LOG_TO_ES": "false",
+    }
+    # Config читает окружение при импорте — задаём его до импорта приложения
+    os.environ.update(overrides)
+    from werkzeug.serving import make_server
+
+    from src.backend.create_app import create_app
+
+    app = create_app()
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа нагрузочного теста."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", help="URL запущенного приложения")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default="reverse_geocode=2,get_location_info=1,chat=1")
+    parser.add_argument("--points", type=int, default=500, help="число различных точек")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--ai-client-mode", choices=["sync", "async"], default="sync")
+    parser.add_argument(
+        "--with-cache",
+        action="store_true",
+        help="включить кэши описаний мест и геокодинга",
+    )
+    parser.add_argument(
+        "--nominatim-rate-limit",
+        type=float,
+        default=0.0,
+        help="лимит запросов приложения к заменителю Nominatim в секунду (0 — без)",
+    )
+    parser.add_argument("--json", dest="json_path", help="сохранить итоги в JSON")
+    add_behavior_arguments(parser)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    scenarios = make_scenarios(make_points(args.points, rng))
+    mix = parse_mix(args.mix, list(scenarios))
+
+    servers = []
+    app = None
+    if args.target:
+        base_url = args.target.rstrip("/")
+    else:
+        llm, nominatim = behaviors_from_args(args)
+        llm_server = start_server(FakeLLMHandler, llm)
+        geo_server = start_server(FakeNominatimHandler, nominatim)
+        app_server, app = start_app(
+            args, server_url(llm_server), server_url(geo_server)
+        )
+        servers = [app_server, llm_server, geo_server]
+        base_url = f"http://127.0.0.1:{app_server.server_port}"
+
+    print(
+        f"target={base_url} duration={args.duration}s "
+        f"concurrency={args.concurrency} mix={args.mix} points={args.points}"
+    )
+    elapsed, results = run_load(
+        base_url,
+        scenarios,
+        mix,
+        args.concurrency,
+        args.duration,
+        args.seed,
+        args.timeout,
+    )
+    summary = summarize(elapsed, results)
+    print_summary(elapsed, summary)
+
+    report: Dict[str, Any] = {
+        "elapsed_seconds": round(elapsed, 2),
+        "endpoints": summary,
+    }
+    if app is not None:
+        llm, nominatim = servers[1], servers[2]
+        report["upstream"] = {
+            "llm": {
+                "requests": llm.RequestHandlerClass.behavior.requests,
+                "errors": llm.RequestHandlerClass.behavior.errors,
+            },
+            "nominatim": {
+                "requests": nominatim.RequestHandlerClass.behavior.requests,
+                "errors": nominatim.RequestHandlerClass.behavior.errors,
+            },
+        }
+        print(f"вызовы заменителей: {json.dumps(report['upstream'])}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
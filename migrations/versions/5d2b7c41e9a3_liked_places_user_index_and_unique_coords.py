@@ -0,0 +1,46 @@
+"""Liked places: user_id index and unique coordinates per user
+
+Revision ID: 5d2b7c41e9a3
+Revises: 11f82ea9b8b7
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2b7c41e9a3"
+down_revision: Union[str, Sequence[str], None] = "11f82ea9b8b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Совпадает с COORDINATE_PRECISION в infrastructure/models/liked_place_model.py
+PRECISION = 6
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Привести координаты к точности хранения и убрать появившиеся дубликаты
+    op.execute(
+        "UPDATE liked_places SET"
+        f" latitude = ROUND(CAST(latitude AS NUMERIC), {PRECISION}),"
+        f" longitude = ROUND(CAST(longitude AS NUMERIC), {PRECISION})"
+    )
+    op.execute(
+        "DELETE FROM liked_places WHERE id NOT IN ("
+        " SELECT MIN(id) FROM liked_places"
+        " GROUP BY user_id, latitude, longitude)"
+    )
+    op.create_index("ix_liked_places_user_id", "liked_places", ["user_id"])
+    with op.batch_alter_table("liked_places") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_liked_places_user_coords", ["user_id", "latitude", "longitude"]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("liked_places") as batch_op:
+        batch_op.drop_constraint("uq_liked_places_user_coords", type_="unique")
+    op.drop_index("ix_liked_places_user_id", table_name="liked_places")
@@ -1,6 +1,7 @@
 """Конфигурация приложения и загрузка переменных окружения."""
 
 import os
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -22,6 +23,15 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = (
         os.getenv("SQLALCHEMY_TRACK_MODIFICATIONS", "true").lower() == "true"
     )
+    # Кэш пользователей flask-login на процесс; данные подписанной сессии
+    # (id, имя) принимаются без кэша и БД не дольше
+    # USER_SESSION_CLAIMS_TTL_SECONDS после последней проверки (0 — выключено)
+    USER_CACHE_ENABLED: bool = os.getenv("USER_CACHE_ENABLED", "true").lower() == "true"
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+    USER_SESSION_CLAIMS_TTL_SECONDS: int = int(
+        os.getenv("USER_SESSION_CLAIMS_TTL_SECONDS", "0")
+    )
 
     # Logging configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "ERROR")
@@ -55,6 +65,69 @@ class Config:
     )
     NOMINATIM_USER_AGENT: str = os.getenv("NOMINATIM_USER_AGENT", "aitravel-app/1.0")
     NOMINATIM_EMAIL: str | None = os.getenv("NOMINATIM_EMAIL")
+    # Таймаут запроса к Nominatim (сокращается до остатка бюджета запроса)
+    NOMINATIM_TIMEOUT_SECONDS: float = float(
+        os.getenv("NOMINATIM_TIMEOUT_SECONDS", "10")
+    )
+    # Пул keep-alive соединений к Nominatim и повторы на 429/5xx
+    # (Retry-After учитывается, но не дольше NOMINATIM_RETRY_AFTER_MAX_SECONDS)
+    NOMINATIM_POOL_MAXSIZE: int = int(os.getenv("NOMINATIM_POOL_MAXSIZE", "10"))
+    NOMINATIM_RETRIES: int = int(os.getenv("NOMINATIM_RETRIES", "2"))
+    NOMINATIM_BACKOFF_FACTOR: float = float(
+        os.getenv("NOMINATIM_BACKOFF_FACTOR", "0.5")
+    )
+    NOMINATIM_RETRY_AFTER_MAX_SECONDS: float = float(
+        os.getenv("NOMINATIM_RETRY_AFTER_MAX_SECONDS", "10")
+    )
+    # Политика Nominatim — не больше 1 запроса в секунду на приложение.
+    # Ограничитель общий для всех воркеров хоста (файл SQLite); 0 — выключен.
+    # Интерактивные запросы ждут слота не дольше NOMINATIM_QUEUE_MAX_WAIT_SECONDS,
+    # прогрев кэша пропускает их вперёд
+    NOMINATIM_RATE_LIMIT: float = float(os.getenv("NOMINATIM_RATE_LIMIT", "1"))
+    NOMINATIM_RATE_BURST: float = float(os.getenv("NOMINATIM_RATE_BURST", "1"))
+    NOMINATIM_RATE_LIMIT_PATH: str = os.getenv(
+        "NOMINATIM_RATE_LIMIT_PATH",
+        os.path.join(tempfile.gettempdir(), "aitravel-nominatim-rate.sqlite3"),
+    )
+    NOMINATIM_QUEUE_MAX_WAIT_SECONDS: float = float(
+        os.getenv("NOMINATIM_QUEUE_MAX_WAIT_SECONDS", "5")
+    )
+    # Кэш ответов Nominatim: координаты привязываются к GEOCODE_CACHE_PRECISION
+    # знакам после запятой; ошибки и пустые ответы живут NEGATIVE_TTL секунд
+    GEOCODE_CACHE_ENABLED: bool = (
+        os.getenv("GEOCODE_CACHE_ENABLED", "true").lower() == "true"
+    )
+    GEOCODE_CACHE_PRECISION: int = int(os.getenv("GEOCODE_CACHE_PRECISION", "4"))
+    GEOCODE_CACHE_MAX_SIZE: int = int(os.getenv("GEOCODE_CACHE_MAX_SIZE", "10000"))
+    GEOCODE_CACHE_TTL_SECONDS: int = int(
+        os.getenv("GEOCODE_CACHE_TTL_SECONDS", "2592000")
+    )
+    GEOCODE_CACHE_NEGATIVE_TTL_SECONDS: int = int(
+        os.getenv("GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", "300")
+    )
+    GEOCODE_CACHE_PATH: str | None = os.getenv("GEOCODE_CACHE_PATH")
+    # Поиск мест (/geocode_query): кэш ответов по запросу (на диске — в файле
+    # GEOCODE_CACHE_PATH) и префиксный индекс названий найденных мест для подсказок
+    GEOCODE_QUERY_CACHE_MAX_SIZE: int = int(
+        os.getenv("GEOCODE_QUERY_CACHE_MAX_SIZE", "5000")
+    )
+    GEOCODE_QUERY_CACHE_TTL_SECONDS: int = int(
+        os.getenv("GEOCODE_QUERY_CACHE_TTL_SECONDS", "86400")
+    )
+    GEOCODE_QUERY_SUGGESTIONS_MAX: int = int(
+        os.getenv("GEOCODE_QUERY_SUGGESTIONS_MAX", "5000")
+    )
+    # Офлайн реверс-геокодинг по индексу GeoNames (flask build-geocoder-index):
+    # first — ближайший пункт из индекса, Nominatim только вдали от пунктов;
+    # fallback — индекс, если Nominatim не ответил за FALLBACK_AFTER секунд
+    OFFLINE_GEOCODER_INDEX: str | None = os.getenv("OFFLINE_GEOCODER_INDEX")
+    OFFLINE_GEOCODER_MODE: str = os.getenv("OFFLINE_GEOCODER_MODE", "fallback")
+    OFFLINE_GEOCODER_MAX_DISTANCE_KM: float = float(
+        os.getenv("OFFLINE_GEOCODER_MAX_DISTANCE_KM", "50")
+    )
+    OFFLINE_GEOCODER_FALLBACK_AFTER_SECONDS: float = float(
+        os.getenv("OFFLINE_GEOCODER_FALLBACK_AFTER_SECONDS", "3")
+    )
 
     # Feature flags / visibility
     SHOW_LOGS_LINK: bool = os.getenv("SHOW_LOGS_LINK", "false").lower() == "true"
@@ -63,6 +136,112 @@ class Config:
     HF_TOKEN: str | None = os.getenv("HF_TOKEN")
     HF_PROVIDER: str = os.getenv("HF_PROVIDER", "fireworks-ai")
     HF_MODEL: str = os.getenv("HF_MODEL", "openai/gpt-oss-120b")
+    # OpenAI-совместимый сервер вместо провайдера (например, стенд нагрузочного
+    # теста benchmarks.fake_servers); пусто — HF_PROVIDER
+    HF_BASE_URL: str | None = os.getenv("HF_BASE_URL") or None
+    # Таймаут HTTP-запроса к провайдеру ИИ, секунды
+    HF_TIMEOUT_SECONDS: float = float(os.getenv("HF_TIMEOUT_SECONDS", "60"))
+    # Бэкенд ИИ: remote — HF Inference, local — модель Transformers в процессе
+    # (torch/transformers и веса загружаются при первом вызове)
+    AI_BACKEND: str = os.getenv("AI_BACKEND", "remote").lower()
+    # Писать каждый вызов LLM в лог со структурированным полем "llm"
+    AI_METRICS_LOG_CALLS: bool = (
+        os.getenv("AI_METRICS_LOG_CALLS", "true").lower() == "true"
+    )
+    # Упорядоченный список "provider[:model],..." для переключения при сбоях;
+    # пусто — единственный провайдер HF_PROVIDER
+    HF_PROVIDERS: str | None = os.getenv("HF_PROVIDERS")
+    AI_BREAKER_WINDOW: int = int(os.getenv("AI_BREAKER_WINDOW", "20"))
+    AI_BREAKER_MIN_CALLS: int = int(os.getenv("AI_BREAKER_MIN_CALLS", "5"))
+    AI_BREAKER_ERROR_RATE: float = float(os.getenv("AI_BREAKER_ERROR_RATE", "0.5"))
+    AI_BREAKER_SLOW_CALL_SECONDS: float = float(
+        os.getenv("AI_BREAKER_SLOW_CALL_SECONDS", "20")
+    )
+    AI_BREAKER_SLOW_CALL_RATE: float = float(
+        os.getenv("AI_BREAKER_SLOW_CALL_RATE", "0.5")
+    )
+    AI_BREAKER_OPEN_SECONDS: float = float(os.getenv("AI_BREAKER_OPEN_SECONDS", "30"))
+    AI_HEDGE_ENABLED: bool = os.getenv("AI_HEDGE_ENABLED", "false").lower() == "true"
+    AI_HEDGE_MIN_DELAY_SECONDS: float = float(
+        os.getenv("AI_HEDGE_MIN_DELAY_SECONDS", "2.0")
+    )
+    # sync — InferenceClient в потоке воркера; async — AsyncInferenceClient
+    # в общем цикле событий с пулом соединений HF_POOL_SIZE
+    AI_CLIENT_MODE: str = os.getenv("AI_CLIENT_MODE", "sync").lower()
+    HF_POOL_SIZE: int = int(os.getenv("HF_POOL_SIZE", "100"))
+    # Потоки, в которых sync-клиент ждёт ИИ под дедлайном запроса
+    AI_DEADLINE_WORKERS: int = int(os.getenv("AI_DEADLINE_WORKERS", "32"))
+
+    # Кэш описаний мест по квантованным координатам
+    AI_CACHE_ENABLED: bool = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+    AI_CACHE_GEOHASH_PRECISION: int = int(os.getenv("AI_CACHE_GEOHASH_PRECISION", "7"))
+    AI_CACHE_GRID_SIZE_DEG: float | None = (
+        float(os.getenv("AI_CACHE_GRID_SIZE_DEG") or "0") or None
+    )
+    AI_CACHE_MAX_SIZE: int = int(os.getenv("AI_CACHE_MAX_SIZE", "4096"))
+    AI_CACHE_TTL_SECONDS: int = int(os.getenv("AI_CACHE_TTL_SECONDS", "604800"))
+    AI_CACHE_PATH: str | None = os.getenv("AI_CACHE_PATH")
+
+    # История чата: жёсткий предел сообщений на сессию, бюджет токенов
+    # недавних сообщений и порог перегенерации краткого содержания
+    CHAT_MAX_MESSAGES: int = int(os.getenv("CHAT_MAX_MESSAGES", "200"))
+    CHAT_HISTORY_TOKEN_BUDGET: int = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+    CHAT_SUMMARY_REFRESH_TOKENS: int = int(
+        os.getenv("CHAT_SUMMARY_REFRESH_TOKENS", "400")
+    )
+    CHAT_CHARS_PER_TOKEN: float = float(os.getenv("CHAT_CHARS_PER_TOKEN", "3.0"))
+    # Рекомендации профиля: хранятся по пользователю, пока не изменился
+    # набор понравившихся мест; лайк сбрасывает запись (и, если включено,
+    # запускает фоновую перегенерацию)
+    RECOMMENDATION_CACHE_MAX_SIZE: int = int(
+        os.getenv("RECOMMENDATION_CACHE_MAX_SIZE", "10000")
+    )
+    RECOMMENDATION_CACHE_TTL_SECONDS: int = int(
+        os.getenv("RECOMMENDATION_CACHE_TTL_SECONDS", "604800")
+    )
+    RECOMMENDATION_REFRESH_ON_LIKE: bool = (
+        os.getenv("RECOMMENDATION_REFRESH_ON_LIKE", "false").lower() == "true"
+    )
+    # Потоки фоновой генерации рекомендаций для страницы профиля
+    PROFILE_RECOMMENDATION_WORKERS: int = int(
+        os.getenv("PROFILE_RECOMMENDATION_WORKERS", "4")
+    )
+    # Кэш нормализованных поисковых запросов по локации (ответы модели)
+    NORMALIZE_QUERY_CACHE_SIZE: int = int(
+        os.getenv("NORMALIZE_QUERY_CACHE_SIZE", "2048")
+    )
+    # Семантический кэш ответов на первые вопросы диалога (opt-in)
+    CHAT_SEMANTIC_CACHE_ENABLED: bool = (
+        os.getenv("CHAT_SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    )
+    CHAT_SEMANTIC_CACHE_THRESHOLD: float = float(
+        os.getenv("CHAT_SEMANTIC_CACHE_THRESHOLD", "0.85")
+    )
+    CHAT_SEMANTIC_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("CHAT_SEMANTIC_CACHE_MAX_ENTRIES", "2000")
+    )
+    CHAT_SEMANTIC_CACHE_TTL_SECONDS: int = int(
+        os.getenv("CHAT_SEMANTIC_CACHE_TTL_SECONDS", "86400")
+    )
+
+    # Пакетные описания точек (/get_location_info/batch)
+    BATCH_DESCRIBE_MAX_POINTS: int = int(os.getenv("BATCH_DESCRIBE_MAX_POINTS", "500"))
+    BATCH_DESCRIBE_MAX_CONCURRENCY: int = int(
+        os.getenv("BATCH_DESCRIBE_MAX_CONCURRENCY", "8")
+    )
+
+    # Бюджеты времени запросов: Nominatim, ИИ и БД получают остаток бюджета,
+    # по его исчерпании маршрут отдаёт частичный ответ (0 — без бюджета)
+    GEOCODE_QUERY_BUDGET_SECONDS: float = float(
+        os.getenv("GEOCODE_QUERY_BUDGET_SECONDS", "10")
+    )
+    REVERSE_GEOCODE_BUDGET_SECONDS: float = float(
+        os.getenv("REVERSE_GEOCODE_BUDGET_SECONDS", "15")
+    )
+    LOCATION_INFO_BUDGET_SECONDS: float = float(
+        os.getenv("LOCATION_INFO_BUDGET_SECONDS", "20")
+    )
+    CHAT_BUDGET_SECONDS: float = float(os.getenv("CHAT_BUDGET_SECONDS", "45"))
 
 
 _config = Config()
@@ -2,10 +2,12 @@ import os
 import time
 
 from dotenv import load_dotenv
-from flask import Flask, Response, g, request
+from flask import Flask, Response, g, request, session
 from flask_login import LoginManager
 
 from src.backend.config import _config
+from src.backend.delivery.cli.cache_cli import warm_cache_command
+from src.backend.delivery.cli.geocoder_cli import build_geocoder_index_command
 from src.backend.delivery.routes import (
     auth_router,
     chat_router,
@@ -13,14 +15,48 @@ from src.backend.delivery.routes import (
     map_router,
     profile_router,
 )
-from src.backend.infrastructure.db.uow import SqlAlchemyUnitOfWork
+from src.backend.infrastructure.cache import (
+    CoordinateQuantizer,
+    LRUCache,
+    PrefixIndex,
+    SemanticCache,
+    SqliteCacheStore,
+)
+from src.backend.infrastructure.client.http_session import PooledHTTPSession
+from src.backend.infrastructure.client.rate_limiter import SharedRateLimiter
+from src.backend.infrastructure.db.uow import (
+    SqlAlchemyUnitOfWork,
+    begin_request_scope,
+    end_request_scope,
+)
 from src.backend.infrastructure.logging.es_query_service import (
     ElasticsearchLogService,
 )
-from src.backend.infrastructure.services.ai_service import AIService
+from src.backend.infrastructure.services.ai_backends import AIBackendRegistry
+from src.backend.infrastructure.services.ai_metrics import LLMMetrics
+from src.backend.infrastructure.services.ai_service import (
+    AI_FAILURE_MESSAGES,
+    AIService,
+)
+from src.backend.infrastructure.services.async_ai_service import AsyncAIService
+from src.backend.infrastructure.services.cached_ai_service import CachedAIService
+from src.backend.infrastructure.services.cached_geocoding_service import (
+    CachedGeocodingService,
+)
 from src.backend.infrastructure.services.geocoding_service import GeocodingService
+from src.backend.infrastructure.services.offline_geocoder import (
+    OfflineReverseGeocoder,
+)
+from src.backend.infrastructure.services.tiered_geocoding_service import (
+    TieredGeocodingService,
+)
 from src.backend.repository.chat.memory_chat_repository import ChatMemoryRepository
+from src.backend.services.ai.ai_services import AIService as LocalAIService
+from src.backend.services.chat.history_policy import TokenBudgetHistoryPolicy
+from src.backend.services.geocoding.geocode_query_service import GeocodeQueryService
 from src.backend.services.place.place_service import PlaceService
+from src.backend.services.profile.recommendation_jobs import RecommendationJobs
+from src.backend.services.user.user_loader import CachedUserLoader
 from src.backend.use_case.place.place_use_case import PlaceUseCase
 from src.backend.use_case.user.profile_use_case import ProfileUseCase
 from src.backend.utils.logging_setup import setup_logging
@@ -86,6 +122,10 @@ def create_app(config_class: object | None = None) -> Flask:
             app.logger.exception("Security logging failed")
         return response
 
+    # Одна сессия БД на запрос: её делят все Unit of Work, закрывается в конце
+    app.before_request(begin_request_scope)
+    app.teardown_request(end_request_scope)
+
     # Неболтливые стартовые сообщения (без секретов)
     print("Templates folder:", base_dir)
     print("Contains index.html:", os.path.exists(os.path.join(base_dir, "index.html")))
@@ -107,21 +147,30 @@ def create_app(config_class: object | None = None) -> Flask:
     login_manager.login_view = "auth.login"
     login_manager.init_app(app)
 
+    def _find_user(user_id: int) -> object | None:
+        """Прочитать пользователя из БД (сессия запроса через UoW)."""
+        with SqlAlchemyUnitOfWork() as uow:
+            return uow.user_repo.find_by_id(user_id)
+
+    # Пользователь запроса: подписанная сессия -> кэш процесса -> БД
+    user_loader = CachedUserLoader(
+        load=_find_user,
+        cache=(
+            LRUCache(
+                max_size=int(app.config.get("USER_CACHE_MAX_SIZE", 10000)),
+                ttl_seconds=int(app.config.get("USER_CACHE_TTL_SECONDS", 300)),
+                name="users",
+            )
+            if app.config.get("USER_CACHE_ENABLED", True)
+            else None
+        ),
+        claims_ttl_seconds=float(app.config.get("USER_SESSION_CLAIMS_TTL_SECONDS", 0)),
+    )
+
     @login_manager.user_loader
     def load_user(user_id: str) -> object | None:
         """Загрузить пользователя по идентификатору для flask-login."""
-        # Создаём отдельную сессию для загрузки пользователя (вне UoW)
-        from src.backend.infrastructure.db.session import SessionLocal
-        from src.backend.repository.user.sqlalchemy_user_repository import (
-            SqlAlchemyUserRepository,
-        )
-
-        session = SessionLocal()
-        try:
-            user_repo = SqlAlchemyUserRepository(session)
-            return user_repo.find_by_id(int(user_id))
-        finally:
-            session.close()
+        return user_loader(user_id, session)
 
     # Регистрация блюпринтов
     with app.app_context():
@@ -132,30 +181,195 @@ def create_app(config_class: object | None = None) -> Flask:
         app.register_blueprint(chat_router.bp)
 
     # Композиция зависимостей приложения (DI)
+    cfg = app.config
     # Общий AI сервис (тяжёлый объект) создаём один раз и переиспользуем
-    ai_service = AIService(config=app.config, logger=app.logger)
+    # Бэкенды ИИ создаются лениво: тяжёлые модули и веса грузятся при первом
+    # вызове выбранного бэкенда
+    ai_backends = AIBackendRegistry(logger=app.logger)
+    # Метрики вызовов LLM: задержки, токены, ошибки по методу/провайдеру/модели
+    llm_metrics = LLMMetrics(
+        chars_per_token=float(cfg.get("CHAT_CHARS_PER_TOKEN", 3.0)),
+        log_calls=bool(cfg.get("AI_METRICS_LOG_CALLS", True)),
+    )
+    ai_backends.register(
+        "remote",
+        lambda: (
+            AsyncAIService(config=cfg, logger=app.logger, metrics=llm_metrics)
+            if cfg.get("AI_CLIENT_MODE", "sync") == "async"
+            else AIService(config=cfg, logger=app.logger, metrics=llm_metrics)
+        ),
+    )
+    ai_backends.register(
+        "local",
+        lambda: LocalAIService(logger=app.logger),
+        import_modules=("torch", "transformers"),
+    )
+    ai_service = ai_backends.get(cfg.get("AI_BACKEND", "remote"))
+    # Кэш описаний мест по ячейкам координат (опционально с диском)
+    if cfg.get("AI_CACHE_ENABLED", True):
+        cache_path = cfg.get("AI_CACHE_PATH")
+        ai_service = CachedAIService(
+            inner=ai_service,
+            cache=LRUCache(
+                max_size=int(cfg.get("AI_CACHE_MAX_SIZE", 4096)),
+                ttl_seconds=int(cfg.get("AI_CACHE_TTL_SECONDS", 604800)),
+                store=(
+                    SqliteCacheStore(cache_path, namespace="ai_place_info")
+                    if cache_path
+                    else None
+                ),
+                name="ai_place_info",
+            ),
+            quantizer=CoordinateQuantizer(
+                geohash_precision=int(cfg.get("AI_CACHE_GEOHASH_PRECISION", 7)),
+                grid_size_deg=cfg.get("AI_CACHE_GRID_SIZE_DEG"),
+            ),
+            logger=app.logger,
+        )
     app.extensions.setdefault("services", {})
+    app.extensions["services"]["user_loader"] = user_loader
     app.extensions["services"]["ai_service"] = ai_service
+    app.extensions["services"]["ai_backends"] = ai_backends
+    app.extensions["services"]["llm_metrics"] = llm_metrics
     # Geocoding (OSM Nominatim) — создаём из app.config, без current_app
-    cfg = app.config
-    app.extensions["services"]["geocoding_service"] = GeocodingService(
+    geocoding_service = GeocodingService(
         base_url=cfg.get("NOMINATIM_BASE_URL", "https://nominatim.openstreetmap.org"),
         user_agent=cfg.get("NOMINATIM_USER_AGENT", "aitravel-app/1.0"),
         email=cfg.get("NOMINATIM_EMAIL"),
         logger=app.logger,
+        timeout=float(cfg.get("NOMINATIM_TIMEOUT_SECONDS", 10)),
+        # Пул keep-alive соединений с повторами на 429/5xx
+        session=PooledHTTPSession(
+            pool_maxsize=int(cfg.get("NOMINATIM_POOL_MAXSIZE", 10)),
+            retries=int(cfg.get("NOMINATIM_RETRIES", 2)),
+            backoff_factor=float(cfg.get("NOMINATIM_BACKOFF_FACTOR", 0.5)),
+            max_retry_wait=float(cfg.get("NOMINATIM_RETRY_AFTER_MAX_SECONDS", 10)),
+        ),
+        # Общая для воркеров хоста очередь: не чаще NOMINATIM_RATE_LIMIT в секунду
+        limiter=(
+            SharedRateLimiter(
+                cfg["NOMINATIM_RATE_LIMIT_PATH"],
+                rate=float(cfg["NOMINATIM_RATE_LIMIT"]),
+                burst=float(cfg.get("NOMINATIM_RATE_BURST", 1)),
+                name="nominatim",
+                logger=app.logger,
+            )
+            if float(cfg.get("NOMINATIM_RATE_LIMIT", 0)) > 0
+            and cfg.get("NOMINATIM_RATE_LIMIT_PATH")
+            else None
+        ),
+        queue_max_wait=float(cfg.get("NOMINATIM_QUEUE_MAX_WAIT_SECONDS", 5)),
+    )
+    # Кэш ответов Nominatim по привязанным координатам (опционально с диском)
+    if cfg.get("GEOCODE_CACHE_ENABLED", True):
+        geocode_cache_path = cfg.get("GEOCODE_CACHE_PATH")
+        geocoding_service = CachedGeocodingService(
+            inner=geocoding_service,
+            cache=LRUCache(
+                max_size=int(cfg.get("GEOCODE_CACHE_MAX_SIZE", 10000)),
+                ttl_seconds=int(cfg.get("GEOCODE_CACHE_TTL_SECONDS", 2592000)),
+                store=(
+                    SqliteCacheStore(geocode_cache_path, namespace="geocode")
+                    if geocode_cache_path
+                    else None
+                ),
+                name="geocode",
+            ),
+            precision=int(cfg.get("GEOCODE_CACHE_PRECISION", 4)),
+            negative_ttl_seconds=float(
+                cfg.get("GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", 300)
+            ),
+            logger=app.logger,
+        )
+    # Офлайн-индекс GeoNames: первый уровень или подстраховка Nominatim
+    offline_index = cfg.get("OFFLINE_GEOCODER_INDEX")
+    if offline_index:
+        try:
+            offline_geocoder = OfflineReverseGeocoder.load(offline_index)
+        except (OSError, ValueError) as e:
+            app.logger.warning(f"Офлайн-геокодер не загружен ({offline_index}): {e}")
+        else:
+            geocoding_service = TieredGeocodingService(
+                inner=geocoding_service,
+                offline=offline_geocoder,
+                mode=cfg.get("OFFLINE_GEOCODER_MODE", "fallback"),
+                max_distance_km=float(cfg.get("OFFLINE_GEOCODER_MAX_DISTANCE_KM", 50)),
+                fallback_after=float(
+                    cfg.get("OFFLINE_GEOCODER_FALLBACK_AFTER_SECONDS", 3)
+                ),
+                logger=app.logger,
+            )
+    app.extensions["services"]["geocoding_service"] = geocoding_service
+    # Поиск мест для строки поиска карты: кэш по запросу и префиксные подсказки
+    app.extensions["services"]["geocode_query_service"] = GeocodeQueryService(
+        geocoder=geocoding_service,
+        ai_service=ai_service,
+        results=LRUCache(
+            max_size=int(cfg.get("GEOCODE_QUERY_CACHE_MAX_SIZE", 5000)),
+            ttl_seconds=int(cfg.get("GEOCODE_QUERY_CACHE_TTL_SECONDS", 86400)),
+            store=(
+                SqliteCacheStore(cfg["GEOCODE_CACHE_PATH"], namespace="geocode_query")
+                if cfg.get("GEOCODE_CACHE_PATH")
+                else None
+            ),
+            name="geocode_query",
+        ),
+        suggestions=PrefixIndex(
+            max_entries=int(cfg.get("GEOCODE_QUERY_SUGGESTIONS_MAX", 5000))
+        ),
+        negative_ttl_seconds=float(cfg.get("GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", 300)),
+        logger=app.logger,
     )
-    app.extensions["services"]["chat_repo"] = ChatMemoryRepository(max_messages=30)
+    app.extensions["services"]["chat_repo"] = ChatMemoryRepository(
+        max_messages=int(cfg.get("CHAT_MAX_MESSAGES", 200))
+    )
+    # Отбор истории чата по бюджету токенов со скользящим кратким содержанием
+    app.extensions["services"]["chat_history_policy"] = TokenBudgetHistoryPolicy(
+        ai_service=ai_service,
+        budget_tokens=int(cfg.get("CHAT_HISTORY_TOKEN_BUDGET", 1500)),
+        refresh_tokens=int(cfg.get("CHAT_SUMMARY_REFRESH_TOKENS", 400)),
+        chars_per_token=float(cfg.get("CHAT_CHARS_PER_TOKEN", 3.0)),
+        logger=app.logger,
+    )
+    # Семантический кэш ответов на первые вопросы без контекста
+    if cfg.get("CHAT_SEMANTIC_CACHE_ENABLED", False):
+        app.extensions["services"]["chat_semantic_cache"] = SemanticCache(
+            max_entries=int(cfg.get("CHAT_SEMANTIC_CACHE_MAX_ENTRIES", 2000)),
+            threshold=float(cfg.get("CHAT_SEMANTIC_CACHE_THRESHOLD", 0.85)),
+            ttl_seconds=int(cfg.get("CHAT_SEMANTIC_CACHE_TTL_SECONDS", 86400)),
+        )
     # PlaceService на базе UoW и AI
     app.extensions["services"]["place_service"] = PlaceService(
         place_use_case=PlaceUseCase(
             uow=SqlAlchemyUnitOfWork(),
             ai_service=ai_service,
+            fallback_messages=AI_FAILURE_MESSAGES,
         )
     )
     # ProfileUseCase для профиля пользователя
+    # Рекомендации хранятся по пользователю с хешем набора понравившихся мест
+    cache_path = cfg.get("AI_CACHE_PATH")
     app.extensions["services"]["profile_use_case"] = ProfileUseCase(
         uow=SqlAlchemyUnitOfWork(),
         ai_service=ai_service,
+        recommendation_cache=LRUCache(
+            max_size=int(cfg.get("RECOMMENDATION_CACHE_MAX_SIZE", 10000)),
+            ttl_seconds=int(cfg.get("RECOMMENDATION_CACHE_TTL_SECONDS", 604800)),
+            store=(
+                SqliteCacheStore(cache_path, namespace="recommendations")
+                if cache_path
+                else None
+            ),
+            name="recommendations",
+        ),
+        fallback_messages=AI_FAILURE_MESSAGES,
+    )
+    # Фоновая генерация рекомендаций для отложенного фрагмента профиля
+    # (и перегенерация после лайка при RECOMMENDATION_REFRESH_ON_LIKE)
+    app.extensions["services"]["recommendation_jobs"] = RecommendationJobs(
+        app.extensions["services"]["profile_use_case"],
+        max_workers=int(cfg.get("PROFILE_RECOMMENDATION_WORKERS", 4)),
+        logger=app.logger,
     )
 
     # Сервис для чтения логов из Elasticsearch (для веб-дашборда)
@@ -169,6 +383,10 @@ def create_app(config_class: object | None = None) -> Flask:
         request_timeout=int(app.config.get("ES_REQUEST_TIMEOUT", 5)),
     )
 
+    # Команды обслуживания (flask warm-cache, flask build-geocoder-index)
+    app.cli.add_command(warm_cache_command)
+    app.cli.add_command(build_geocoder_index_command)
+
     # Логируем зарегистрированные маршруты
     with app.app_context():
         print("Registered routes:")
@@ -0,0 +1,85 @@
+"""Команды Flask CLI для обслуживания кэша описаний мест."""
+
+from typing import List, Tuple
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from src.backend.services.cache.cache_warmer import (
+    CacheWarmer,
+    WarmPoint,
+    read_seed_file,
+)
+
+
+@click.command("warm-cache")
+@click.option(
+    "--seed",
+    "seeds",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Файл с точками 'lat,lon[,name]' (можно указать несколько раз).",
+)
+@click.option(
+    "--top",
+    default=200,
+    show_default=True,
+    help="Сколько самых популярных мест из liked_places прогреть (0 — ни одного).",
+)
+@click.option("--workers", default=4, show_default=True, help="Размер пула.")
+@click.option(
+    "--ai-rps", default=2.0, show_default=True, help="Запросов к модели в секунду."
+)
+@click.option(
+    "--geocode-rps",
+    default=1.0,
+    show_default=True,
+    help="Запросов к Nominatim в секунду (политика OSM — не более 1).",
+)
+@click.option("--no-geocode", is_flag=True, help="Не выполнять реверс-геокодинг.")
+@click.option("--force", is_flag=True, help="Перегенерировать закэшированные точки.")
+@with_appcontext
+def warm_cache_command(
+    seeds: Tuple[str, ...],
+    top: int,
+    workers: int,
+    ai_rps: float,
+    geocode_rps: float,
+    no_geocode: bool,
+    force: bool,
+) -> None:
+    """Заранее сгенерировать описания популярных мест и записать их в кэш."""
+    services = current_app.extensions["services"]
+    if not current_app.config.get("AI_CACHE_PATH"):
+        click.echo(
+            "AI_CACHE_PATH не задан: кэш живёт только в памяти этого процесса, "
+            "прогрев не дойдёт до веб-сервера.",
+            err=True,
+        )
+        raise SystemExit(2)
+
+    points: List[WarmPoint] = []
+    if top > 0:
+        place_service = services["place_service"]
+        for place in place_service.get_popular_places(top):
+            points.append(WarmPoint(place.latitude, place.longitude, place.city_name))
+    for path in seeds:
+        points.extend(read_seed_file(path))
+    if not points:
+        click.echo("Нет точек для прогрева.")
+        return
+
+    warmer = CacheWarmer(
+        ai_service=services["ai_service"],
+        geocoder=None if no_geocode else services.get("geocoding_service"),
+        max_workers=workers,
+        ai_rate=ai_rps,
+        geocode_rate=geocode_rps,
+        logger=current_app.logger,
+    )
+    stats = warmer.warm(points, force=force)
+    click.echo(
+        "Прогрев завершён: всего {total}, сгенерировано {warmed}, "
+        "уже в кэше {skipped}, ошибок {failed}".format(**stats.as_dict())
+    )
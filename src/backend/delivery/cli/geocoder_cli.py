@@ -0,0 +1,54 @@
+"""Команды Flask CLI для офлайн-геокодера."""
+
+import time
+from typing import Optional
+
+import click
+
+from src.backend.infrastructure.services.offline_geocoder import (
+    OfflineReverseGeocoder,
+    read_country_names,
+    read_geonames,
+)
+
+
+@click.command("build-geocoder-index")
+@click.argument("gazetteer", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output",
+    "-o",
+    required=True,
+    type=click.Path(dir_okay=False, writable=True),
+    help="Файл индекса (.npz); его путь задаётся в OFFLINE_GEOCODER_INDEX.",
+)
+@click.option(
+    "--countries",
+    type=click.Path(exists=True, dir_okay=False),
+    help="countryInfo.txt GeoNames — названия стран вместо кодов ISO.",
+)
+@click.option(
+    "--min-population",
+    default=0,
+    show_default=True,
+    help="Пропустить пункты с меньшим населением.",
+)
+@click.option("--leaf-size", default=16, show_default=True, help="Точек в листе.")
+def build_geocoder_index_command(
+    gazetteer: str,
+    output: str,
+    countries: Optional[str],
+    min_population: int,
+    leaf_size: int,
+) -> None:
+    """Построить индекс офлайн-геокодера по выгрузке GeoNames (cities500.txt)."""
+    started = time.perf_counter()
+    geocoder = OfflineReverseGeocoder.build(
+        read_geonames(gazetteer, min_population=min_population),
+        country_names=read_country_names(countries) if countries else None,
+        leaf_size=leaf_size,
+    )
+    geocoder.save(output)
+    click.echo(
+        f"Индекс {output}: {len(geocoder)} пунктов, глубина дерева {geocoder.depth},"
+        f" {time.perf_counter() - started:.1f} с"
+    )
@@ -1,4 +1,13 @@
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    current_app,
+    flash,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
 from flask.typing import ResponseReturnValue
 from flask_login import current_user, login_required, login_user, logout_user
 from pydantic import ValidationError
@@ -105,6 +114,9 @@ def logout() -> ResponseReturnValue:
     Returns:
         ResponseReturnValue: HTTP-редирект на страницу входа.
     """
+    user_loader = current_app.extensions.get("services", {}).get("user_loader")
+    if user_loader is not None:
+        user_loader.invalidate(current_user.id, session)
     logout_user()
     flash("Вы вышли из системы.", "info")
     return redirect(url_for("auth_router.login"))
@@ -1,9 +1,22 @@
-from flask import Blueprint, current_app, jsonify, render_template, request
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    render_template,
+    request,
+    stream_with_context,
+)
 from flask.typing import ResponseReturnValue
 from flask_login import current_user
 from pydantic import ValidationError
 
 from src.backend.delivery.shemas.chat_shemas import ChatRequest, ClearChatRequest
+from src.backend.infrastructure.services.ai_service import AI_CHAT_ERROR_MESSAGE
+from src.backend.utils.deadline import DeadlineExceeded, deadline_scope
 
 bp = Blueprint("chat", __name__)
 
@@ -22,6 +35,96 @@ def chat_page() -> ResponseReturnValue:
     return render_template("chat.html")
 
 
+def _build_payload_history(req: ChatRequest) -> List[Dict[str, str]]:
+    """Собрать историю диалога для запроса к ИИ.
+
+    Сохраняет новые сообщения в историю сессии, отбирает историю для
+    промпта политикой бюджета токенов (если она настроена) и, для
+    аутентифицированного пользователя, добавляет системный контекст
+    с его понравившимися местами.
+
+    Args:
+        req: Провалидированный запрос чата
+
+    Returns:
+        Список сообщений в формате {"role": ..., "content": ...}
+    """
+    services = current_app.extensions["services"]
+    repo = services["chat_repo"]
+    for m in req.messages:
+        repo.append(req.session_id, m.role, m.content)
+    history = repo.get(req.session_id)
+
+    history_policy = services.get("chat_history_policy")
+    if history_policy is not None:
+        payload_history = history_policy.build(
+            req.session_id, history, total=repo.total(req.session_id)
+        )
+    else:
+        payload_history = list(history)
+
+    try:
+        if hasattr(current_user, "is_authenticated") and current_user.is_authenticated:
+            profile_use_case = current_app.extensions["services"]["profile_use_case"]
+            liked_places = profile_use_case.get_liked_places(current_user.id)
+            if liked_places:
+                liked_str = ", ".join([p.city_name for p in liked_places])
+                system_context = (
+                    "Контекст пользователя: ему нравятся следующие места: "
+                    + liked_str
+                    + ". Если пользователь просит рекомендации, опирайся на эти предпочтения. "
+                    "Если он уточняет новое направление, подстрой рекомендации под это пожелание, "
+                    "сохраняя логику его предыдущих предпочтений. Отвечай по-русски, кратко и по делу."
+                )
+                payload_history = [
+                    {"role": "system", "content": system_context}
+                ] + payload_history
+    except Exception:
+        pass
+
+    return payload_history
+
+
+def _cached_answer(
+    payload_history: List[Dict[str, str]],
+) -> Tuple[Optional[str], Optional[str]]:
+    """Найти ответ в семантическом кэше чата.
+
+    Кэшируются только вопросы без контекста: первый ход диалога без
+    системных сообщений (предпочтений пользователя, краткого содержания).
+
+    Args:
+        payload_history: История, подготовленная для запроса к ИИ
+
+    Returns:
+        Пара (вопрос для кэширования или None, ответ из кэша или None)
+    """
+    cache = current_app.extensions["services"].get("chat_semantic_cache")
+    if cache is None or len(payload_history) != 1:
+        return None, None
+    message = payload_history[0]
+    if message.get("role") != "user":
+        return None, None
+    question = message.get("content", "")
+    hit = cache.get(question)
+    return question, hit.answer if hit is not None else None
+
+
+def _remember_answer(question: Optional[str], answer: str) -> None:
+    """Сохранить ответ на вопрос без контекста в семантический кэш."""
+    cache = current_app.extensions["services"].get("chat_semantic_cache")
+    if cache is None or not question or not answer:
+        return
+    if answer == AI_CHAT_ERROR_MESSAGE:
+        return
+    cache.set(question, answer)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Сформировать одно событие Server-Sent Events."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @bp.route("/api/chat", methods=["POST"])
 def chat_api() -> ResponseReturnValue:
     """
@@ -49,48 +152,138 @@ def chat_api() -> ResponseReturnValue:
         repo = current_app.extensions["services"]["chat_repo"]
         ai = current_app.extensions["services"]["ai_service"]
 
-        history = repo.get(req.session_id)
-        for m in req.messages:
-            history.append({"role": m.role, "content": m.content})
+        # Один бюджет на весь ход: и краткое содержание истории, и ответ
+        budget = float(current_app.config.get("CHAT_BUDGET_SECONDS", 45))
+        with deadline_scope(budget):
+            payload_history = _build_payload_history(req)
+            question, answer = _cached_answer(payload_history)
+            if answer is None:
+                answer = ai.chat(payload_history)
+                _remember_answer(question, answer)
+        repo.append(req.session_id, "assistant", answer)
 
-        payload_history = list(history)
+        return jsonify({"answer": answer})
+    except ValidationError as e:
+        return jsonify({"error": "Ошибка валидации", "details": e.errors()}), 400
+    except DeadlineExceeded as e:
+        current_app.logger.warning(f"Бюджет чата исчерпан: {e}")
+        return jsonify({"error": "Превышено время ожидания ответа ИИ"}), 504
+    except Exception as e:
+        current_app.logger.error(f"Ошибка API чата: {e}", exc_info=True)
+        return jsonify({"error": "Внутренняя ошибка сервера"}), 500
 
-        try:
-            if (
-                hasattr(current_user, "is_authenticated")
-                and current_user.is_authenticated
-            ):
-                profile_use_case = current_app.extensions["services"][
-                    "profile_use_case"
-                ]
-                liked_places = profile_use_case.get_liked_places(current_user.id)
-                if liked_places:
-                    liked_str = ", ".join([p.city_name for p in liked_places])
-                    system_context = (
-                        "Контекст пользователя: ему нравятся следующие места: "
-                        + liked_str
-                        + ". Если пользователь просит рекомендации, опирайся на эти предпочтения. "
-                        "Если он уточняет новое направление, подстрой рекомендации под это пожелание, "
-                        "сохраняя логику его предыдущих предпочтений. Отвечай по-русски, кратко и по делу."
-                    )
-                    payload_history = [
-                        {"role": "system", "content": system_context}
-                    ] + payload_history
-        except Exception:
-            pass
-
-        answer = ai.chat(payload_history)
+
+@bp.route("/api/chat/async", methods=["POST"])
+async def chat_async_api() -> ResponseReturnValue:
+    """
+    Асинхронный вариант ``/api/chat``.
+
+    Ожидание ответа модели не блокирует поток воркера, если сервис ИИ
+    реализует неблокирующий ``chat_async`` (режим ``AI_CLIENT_MODE=async``).
+
+    Returns:
+        ResponseReturnValue: JSON-ответ с сообщением ассистента
+        или описанием ошибки.
+
+    Raises:
+        ValidationError: При некорректных данных запроса.
+        Exception: При внутренних ошибках обработки чата.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Некорректный JSON"}), 400
+
+        req = ChatRequest(**data)
+        repo = current_app.extensions["services"]["chat_repo"]
+        ai = current_app.extensions["services"]["ai_service"]
+
+        # Один бюджет на весь ход: и краткое содержание истории, и ответ
+        budget = float(current_app.config.get("CHAT_BUDGET_SECONDS", 45))
+        with deadline_scope(budget):
+            payload_history = _build_payload_history(req)
+            question, answer = _cached_answer(payload_history)
+            if answer is None:
+                answer = await ai.chat_async(payload_history)
+                _remember_answer(question, answer)
         repo.append(req.session_id, "assistant", answer)
 
         return jsonify({"answer": answer})
     except ValidationError as e:
-        return jsonify(
-            {"error": "Ошибка валидации", "details": e.errors()}), 400
+        return jsonify({"error": "Ошибка валидации", "details": e.errors()}), 400
+    except DeadlineExceeded as e:
+        current_app.logger.warning(f"Бюджет чата исчерпан: {e}")
+        return jsonify({"error": "Превышено время ожидания ответа ИИ"}), 504
     except Exception as e:
         current_app.logger.error(f"Ошибка API чата: {e}", exc_info=True)
         return jsonify({"error": "Внутренняя ошибка сервера"}), 500
 
 
+@bp.route("/api/chat/stream", methods=["POST"])
+def chat_stream_api() -> ResponseReturnValue:
+    """
+    Обрабатывает API-запрос диалога с потоковой выдачей ответа (SSE).
+
+    Принимает тот же JSON, что и ``/api/chat``, но возвращает поток
+    ``text/event-stream``: события ``token`` с фрагментами ответа по мере
+    генерации, затем ``done`` с полным текстом (или ``error`` при сбое).
+    Итоговое сообщение ассистента сохраняется в историю после окончания
+    потока.
+
+    Returns:
+        ResponseReturnValue: Поток событий SSE либо JSON с ошибкой валидации.
+
+    Raises:
+        ValidationError: При некорректных данных запроса.
+        Exception: При внутренних ошибках подготовки диалога.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Некорректный JSON"}), 400
+
+        req = ChatRequest(**data)
+        repo = current_app.extensions["services"]["chat_repo"]
+        ai = current_app.extensions["services"]["ai_service"]
+        # Краткое содержание истории не дольше бюджета обычного чата
+        budget = float(current_app.config.get("CHAT_BUDGET_SECONDS", 45))
+        with deadline_scope(budget):
+            payload_history = _build_payload_history(req)
+        question, cached = _cached_answer(payload_history)
+    except ValidationError as e:
+        return jsonify({"error": "Ошибка валидации", "details": e.errors()}), 400
+    except Exception as e:
+        current_app.logger.error(f"Ошибка API чата: {e}", exc_info=True)
+        return jsonify({"error": "Внутренняя ошибка сервера"}), 500
+
+    def generate() -> Iterator[str]:
+        """Отдавать фрагменты ответа ИИ как события SSE."""
+        if cached is not None:
+            repo.append(req.session_id, "assistant", cached)
+            yield _sse("token", {"text": cached})
+            yield _sse("done", {"answer": cached})
+            return
+        parts: List[str] = []
+        try:
+            for token in ai.chat_stream(payload_history):
+                parts.append(token)
+                yield _sse("token", {"text": token})
+        except Exception as e:
+            current_app.logger.error(f"Ошибка потокового чата: {e}", exc_info=True)
+            yield _sse("error", {"error": "Ответ прерван. Попробуйте ещё раз."})
+            return
+        answer = "".join(parts)
+        repo.append(req.session_id, "assistant", answer)
+        _remember_answer(question, answer)
+        yield _sse("done", {"answer": answer})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @bp.route("/api/chat/clear", methods=["POST"])
 def chat_clear() -> ResponseReturnValue:
     """
@@ -114,11 +307,13 @@ def chat_clear() -> ResponseReturnValue:
         req = ClearChatRequest(**data)
         repo = current_app.extensions["services"]["chat_repo"]
         repo.clear(req.session_id)
+        history_policy = current_app.extensions["services"].get("chat_history_policy")
+        if history_policy is not None:
+            history_policy.forget(req.session_id)
 
         return jsonify({"status": "ok"})
     except ValidationError as e:
-        return jsonify(
-            {"error": "Ошибка валидации", "details": e.errors()}), 400
+        return jsonify({"error": "Ошибка валидации", "details": e.errors()}), 400
     except Exception as e:
         current_app.logger.error(f"Ошибка очистки чата: {e}", exc_info=True)
         return jsonify({"error": "Внутренняя ошибка сервера"}), 500
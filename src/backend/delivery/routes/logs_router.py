@@ -86,3 +86,47 @@ def logs_search_api() -> ResponseReturnValue:
         page=page,
     )
     return jsonify(data)
+
+
+@bp.route("/api/metrics", methods=["GET"])
+@login_required
+def llm_metrics_api() -> ResponseReturnValue:
+    """
+    Возвращает метрики вызовов LLM текущего процесса.
+
+    По каждой серии (метод сервиса ИИ, провайдер, модель): число вызовов,
+    ошибок и пустых ответов, токены промпта и ответа, гистограмма
+    и перцентили задержек. Также отдаёт счётчики объединения одинаковых
+    запросов к ИИ, состояние бэкендов ИИ, семантического кэша чата, кэша
+    и HTTP-пула геокодинга, кэша поиска мест и загрузчика пользователей.
+
+    Returns:
+        ResponseReturnValue: JSON-ответ с сериями метрик.
+    """
+    services = current_app.extensions.get("services", {})
+    metrics = services.get("llm_metrics")
+    backends = services.get("ai_backends")
+    ai_service = services.get("ai_service")
+    semantic_cache = services.get("chat_semantic_cache")
+    geocoder = services.get("geocoding_service")
+    geocode_query = services.get("geocode_query_service")
+    user_loader = services.get("user_loader")
+    return jsonify(
+        {
+            "llm": metrics.snapshot() if metrics is not None else [],
+            "ai_single_flight": (
+                ai_service.single_flight_stats()
+                if hasattr(ai_service, "single_flight_stats")
+                else None
+            ),
+            "backends": backends.stats() if backends is not None else {},
+            "chat_semantic_cache": (
+                semantic_cache.stats() if semantic_cache is not None else None
+            ),
+            "geocoding": (geocoder.stats() if hasattr(geocoder, "stats") else None),
+            "geocode_query": (
+                geocode_query.stats() if geocode_query is not None else None
+            ),
+            "users": user_loader.stats() if user_loader is not None else None,
+        }
+    )
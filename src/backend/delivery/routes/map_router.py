@@ -1,9 +1,26 @@
-from flask import Blueprint, current_app, flash, jsonify, render_template, request
+import json
+from typing import Iterator
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    flash,
+    jsonify,
+    render_template,
+    request,
+    stream_with_context,
+)
 from flask.typing import ResponseReturnValue
 from flask_login import current_user
 from pydantic import ValidationError
 
-from src.backend.delivery.shemas.place_shemas import PointInfoRequestSchema
+from src.backend.delivery.shemas.place_shemas import (
+    BatchPointInfoRequestSchema,
+    GeocodeQueryRequestSchema,
+    PointInfoRequestSchema,
+)
+from src.backend.utils.deadline import DeadlineExceeded, deadline_scope
 
 bp = Blueprint("map", __name__)
 
@@ -49,10 +66,12 @@ def get_location_info_route() -> ResponseReturnValue:
 
         point_data = PointInfoRequestSchema(**data)
         place_service = current_app.extensions["services"]["place_service"]
-        info = place_service.get_info_for_point(
-            point_data.latitude,
-            point_data.longitude,
-        )
+        budget = float(current_app.config.get("LOCATION_INFO_BUDGET_SECONDS", 20))
+        with deadline_scope(budget):
+            info = place_service.get_info_for_point(
+                point_data.latitude,
+                point_data.longitude,
+            )
 
         error_signals = [
             "AI service is not configured",
@@ -69,6 +88,9 @@ def get_location_info_route() -> ResponseReturnValue:
             f"Ошибка валидации в get_location_info: {e.errors()}"
         )
         return jsonify({"error": "Ошибка валидации", "details": e.errors()}), 400
+    except DeadlineExceeded as e:
+        current_app.logger.warning(f"Бюджет get_location_info исчерпан: {e}")
+        return jsonify({"error": "Превышено время ожидания ответа ИИ"}), 504
     except Exception as e:
         current_app.logger.error(
             f"Неожиданная ошибка в get_location_info: {e}", exc_info=True
@@ -76,6 +98,112 @@ def get_location_info_route() -> ResponseReturnValue:
         return jsonify({"error": "Внутренняя ошибка сервера"}), 500
 
 
+@bp.route("/get_location_info/async", methods=["POST"])
+async def get_location_info_async_route() -> ResponseReturnValue:
+    """
+    Асинхронный вариант ``/get_location_info``.
+
+    Ожидание ответа ИИ не блокирует поток воркера, если сервис ИИ
+    реализует неблокирующий ``get_place_info_async``.
+
+    Returns:
+        ResponseReturnValue: JSON с описанием точки либо сообщением об ошибке.
+
+    Raises:
+        ValidationError: При некорректных координатах запроса.
+        Exception: При внутренних ошибках сервиса.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Некорректный JSON"}), 400
+
+        point_data = PointInfoRequestSchema(**data)
+        place_service = current_app.extensions["services"]["place_service"]
+        budget = float(current_app.config.get("LOCATION_INFO_BUDGET_SECONDS", 20))
+        with deadline_scope(budget):
+            info = await place_service.get_info_for_point_async(
+                point_data.latitude,
+                point_data.longitude,
+            )
+
+        error_signals = [
+            "AI service is not configured",
+            "Could not retrieve information",
+            "Content generation was blocked",
+        ]
+        if any(err in info for err in error_signals):
+            return jsonify({"error": info}), 503
+
+        return jsonify({"info": info})
+
+    except ValidationError as e:
+        current_app.logger.warning(
+            f"Ошибка валидации в get_location_info/async: {e.errors()}"
+        )
+        return jsonify({"error": "Ошибка валидации", "details": e.errors()}), 400
+    except DeadlineExceeded as e:
+        current_app.logger.warning(f"Бюджет get_location_info/async исчерпан: {e}")
+        return jsonify({"error": "Превышено время ожидания ответа ИИ"}), 504
+    except Exception as e:
+        current_app.logger.error(
+            f"Неожиданная ошибка в get_location_info/async: {e}", exc_info=True
+        )
+        return jsonify({"error": "Внутренняя ошибка сервера"}), 500
+
+
+@bp.route("/get_location_info/batch", methods=["POST"])
+def get_location_info_batch_route() -> ResponseReturnValue:
+    """
+    Возвращает ИИ-описания набора точек потоком NDJSON.
+
+    Принимает ``{"points": [{"latitude": ..., "longitude": ...}, ...]}``.
+    Сначала все точки проверяются по кэшу, промахи генерируются
+    параллельно (не более ``BATCH_DESCRIBE_MAX_CONCURRENCY`` запросов к ИИ).
+    Каждая строка ответа — JSON-объект с ``index``, координатами, флагом
+    ``cached`` и полем ``info`` либо ``error``; строки идут в порядке
+    входного списка по мере готовности.
+
+    Returns:
+        ResponseReturnValue: Поток ``application/x-ndjson`` либо JSON с ошибкой.
+
+    Raises:
+        ValidationError: При некорректных координатах запроса.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Некорректный JSON"}), 400
+        batch = BatchPointInfoRequestSchema(**data)
+    except ValidationError as e:
+        return jsonify({"error": "Ошибка валидации", "details": e.errors()}), 400
+
+    cfg = current_app.config
+    max_points = int(cfg.get("BATCH_DESCRIBE_MAX_POINTS", 500))
+    if len(batch.points) > max_points:
+        return (
+            jsonify({"error": f"Слишком много точек: не более {max_points}"}),
+            413,
+        )
+
+    place_service = current_app.extensions["services"]["place_service"]
+    results = place_service.describe_points(
+        [(p.latitude, p.longitude) for p in batch.points],
+        max_concurrency=int(cfg.get("BATCH_DESCRIBE_MAX_CONCURRENCY", 8)),
+    )
+
+    def generate() -> Iterator[str]:
+        """Отдавать результаты по точкам построчно."""
+        for item in results:
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @bp.route("/reverse_geocode", methods=["POST"])
 def reverse_geocode_route() -> ResponseReturnValue:
     """
@@ -105,45 +233,53 @@ def reverse_geocode_route() -> ResponseReturnValue:
         if geocoder is None:
             return jsonify({"error": "Сервис геокодинга не сконфигурирован"}), 503
 
-        geo = geocoder.reverse_geocode(
-            point.latitude,
-            point.longitude,
-            lang="ru",
-        )
-        address = geo.get("display_name")
-        addr_components = geo.get("address")
-
-        ai_service = services.get("ai_service")
-        ai_text = None
-        liked_str = None
-
-        if ai_service is not None:
-            try:
-                if (
-                    hasattr(current_user, "is_authenticated")
-                    and current_user.is_authenticated
-                ):
-                    profile_use_case = services.get("profile_use_case")
-                    if profile_use_case:
-                        liked = profile_use_case.get_liked_places(current_user.id)
-                        if liked:
-                            liked_str = ", ".join([p.city_name for p in liked])
-            except Exception:
-                pass
-
-            if hasattr(ai_service, "get_place_info_with_address_and_prefs"):
-                ai_text = ai_service.get_place_info_with_address_and_prefs(
-                    address,
-                    point.latitude,
-                    point.longitude,
-                    liked_places_str=liked_str,
-                )
-            else:
-                ai_text = ai_service.get_place_info_with_address(
-                    address,
-                    point.latitude,
-                    point.longitude,
-                )
+        budget = float(current_app.config.get("REVERSE_GEOCODE_BUDGET_SECONDS", 15))
+        with deadline_scope(budget):
+            geo = geocoder.reverse_geocode(
+                point.latitude,
+                point.longitude,
+                lang="ru",
+            )
+            address = geo.get("display_name")
+            addr_components = geo.get("address")
+            degraded = bool((geo.get("raw") or {}).get("deadline_exceeded"))
+
+            ai_service = services.get("ai_service")
+            ai_text = None
+            liked_str = None
+
+            if ai_service is not None and not degraded:
+                try:
+                    if (
+                        hasattr(current_user, "is_authenticated")
+                        and current_user.is_authenticated
+                    ):
+                        profile_use_case = services.get("profile_use_case")
+                        if profile_use_case:
+                            liked = profile_use_case.get_liked_places(current_user.id)
+                            if liked:
+                                liked_str = ", ".join([p.city_name for p in liked])
+                except Exception:
+                    pass
+
+                try:
+                    if hasattr(ai_service, "get_place_info_with_address_and_prefs"):
+                        ai_text = ai_service.get_place_info_with_address_and_prefs(
+                            address,
+                            point.latitude,
+                            point.longitude,
+                            liked_places_str=liked_str,
+                        )
+                    else:
+                        ai_text = ai_service.get_place_info_with_address(
+                            address,
+                            point.latitude,
+                            point.longitude,
+                        )
+                except DeadlineExceeded as e:
+                    # Бюджет исчерпан: отдаём адрес без описания
+                    current_app.logger.warning(f"reverse_geocode без описания: {e}")
+                    degraded = True
 
         return jsonify(
             {
@@ -151,6 +287,7 @@ def reverse_geocode_route() -> ResponseReturnValue:
                 "address_components": addr_components,
                 "ai_description": ai_text,
                 "raw": geo.get("raw"),
+                "degraded": degraded,
             }
         )
     except ValidationError as e:
@@ -163,4 +300,63 @@ def reverse_geocode_route() -> ResponseReturnValue:
 
 
 @bp.route("/geocode_query", methods=["POST"])
-def ge
+def geocode_query_route() -> ResponseReturnValue:
+    """
+    Ищет места по тексту из строки поиска карты.
+
+    Нормализует запрос, геокодирует его и при ``describe`` добавляет
+    ИИ-описание первого совпадения. Повторный запрос отдаётся из кэша
+    без обращения к модели и Nominatim (кроме ещё не полученного описания).
+
+    Returns:
+        ResponseReturnValue: JSON с совпадениями, описанием и подсказками.
+
+    Raises:
+        ValidationError: При пустом или слишком длинном запросе.
+        Exception: При внутренних ошибках обработки.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "Некорректный JSON"}), 400
+
+        query = GeocodeQueryRequestSchema(**data)
+        search = current_app.extensions["services"].get("geocode_query_service")
+        if search is None:
+            return jsonify({"error": "Сервис геокодинга не сконфигурирован"}), 503
+
+        budget = float(current_app.config.get("GEOCODE_QUERY_BUDGET_SECONDS", 10))
+        with deadline_scope(budget):
+            result = search.search(
+                query.query, limit=query.limit, describe=query.describe
+            )
+        return jsonify(result)
+    except ValidationError as e:
+        return jsonify({"error": "Ошибка валидации", "details": e.errors()}), 400
+    except DeadlineExceeded as e:
+        current_app.logger.warning(f"Бюджет geocode_query исчерпан: {e}")
+        return jsonify({"error": "Превышено время ожидания поиска"}), 504
+    except Exception as e:
+        current_app.logger.error(
+            f"Неожиданная ошибка в geocode_query: {e}", exc_info=True
+        )
+        return jsonify({"error": "Внутренняя ошибка сервера"}), 500
+
+
+@bp.route("/geocode_query/suggest", methods=["GET"])
+def geocode_query_suggest_route() -> ResponseReturnValue:
+    """
+    Мгновенные подсказки строки поиска по ранее найденным запросам.
+
+    Внешние сервисы не вызываются: подсказки берутся из префиксного
+    индекса удачных запросов этого процесса.
+
+    Returns:
+        ResponseReturnValue: JSON со списком подсказок (query, display_name,
+        lat, lon).
+    """
+    search = current_app.extensions["services"].get("geocode_query_service")
+    prefix = (request.args.get("q") or "")[:200]
+    limit = min(max(request.args.get("limit", 5, type=int), 1), 10)
+    suggestions = search.suggest(prefix, limit) if search is not None else []
+    return jsonify({"suggestions": suggestions})
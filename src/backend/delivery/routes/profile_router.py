@@ -16,27 +16,51 @@ from pydantic import ValidationError
 from src.backend.delivery.shemas.place_shemas import LikedPlaceCreateSchema
 from src.backend.domain.exceptions.place_exceptions import PlaceServiceError
 from src.backend.domain.exceptions.user_exceptions import UserNotFoundError
+from src.backend.infrastructure.services.ai_service import AI_FAILURE_MESSAGES
 
 bp = Blueprint("profile_router", __name__, url_prefix="/profile")
 
+RECOMMENDATION_ERROR_SIGNALS = (
+    "AI service is not configured",
+    "Could not generate recommendations",
+    "Content generation was blocked",
+    "Not enough liked places",
+)
+
+
+def _recommendation_unavailable(recommendation: str | None) -> bool:
+    """Признак того, что вместо рекомендации пришло сообщение о сбое ИИ."""
+    if not recommendation:
+        return False
+    return recommendation in AI_FAILURE_MESSAGES or any(
+        err in recommendation for err in RECOMMENDATION_ERROR_SIGNALS
+    )
+
 
 @bp.route("/")
 @login_required
 def user_profile() -> ResponseReturnValue:
-    """Страница профиля пользователя."""
+    """Страница профиля пользователя.
+
+    Понравившиеся места отображаются сразу. Рекомендация берётся из
+    хранилища, а если её нужно сгенерировать — генерация запускается
+    в фоне, и страница подгружает фрагмент ``/profile/recommendation``.
+    """
     liked_places = []
     recommendation = "Не удалось получить рекомендации."
     try:
-        profile_use_case = current_app.extensions["services"]["profile_use_case"]
+        services = current_app.extensions["services"]
+        profile_use_case = services["profile_use_case"]
         liked_places = profile_use_case.get_liked_places(current_user.id)
-        recommendation = profile_use_case.get_recommendations(current_user.id)
-
-        error_signals = [
-            "AI service is not configured",
-            "Could not generate recommendations",
-            "Content generation was blocked",
-        ]
-        if any(err in recommendation for err in error_signals):
+        jobs = services.get("recommendation_jobs")
+        if jobs is not None:
+            recommendation = jobs.get_or_start(current_user.id, liked_places)
+        else:
+            recommendation = profile_use_case.get_recommendations(
+                current_user.id, liked_places=liked_places
+            )
+
+        if _recommendation_unavailable(recommendation):
             flash(
                 "Рекомендации ИИ могут быть недоступны. Проверьте наличие HF_TOKEN и работу сервиса ИИ.",
                 "warning",
@@ -50,7 +74,41 @@ def user_profile() -> ResponseReturnValue:
         flash("Не удалось загрузить все данные профиля из-за ошибки.", "danger")
 
     return render_template(
-        "profile.html", liked_places=liked_places, recommendation=recommendation
+        "profile.html",
+        liked_places=liked_places,
+        recommendation=recommendation,
+        unavailable=_recommendation_unavailable(recommendation),
+    )
+
+
+@bp.route("/recommendation")
+@login_required
+def recommendation_fragment() -> ResponseReturnValue:
+    """Отложенный фрагмент с рекомендацией для страницы профиля.
+
+    Returns:
+        ResponseReturnValue: 202 без тела, пока генерация идёт, иначе
+        HTML-фрагмент с рекомендацией.
+    """
+    try:
+        jobs = current_app.extensions["services"]["recommendation_jobs"]
+        recommendation = jobs.get_or_start(current_user.id)
+    except Exception as e:
+        current_app.logger.error(
+            f"Ошибка получения рекомендаций пользователя {current_user.id}: {e}",
+            exc_info=True,
+        )
+        recommendation = "Не удалось получить рекомендации."
+    if recommendation is None:
+        return "", 202, {"Cache-Control": "no-store", "Retry-After": "2"}
+    return (
+        render_template(
+            "_recommendation.html",
+            recommendation=recommendation,
+            unavailable=_recommendation_unavailable(recommendation),
+        ),
+        200,
+        {"Cache-Control": "no-store"},
     )
 
 
@@ -77,6 +135,11 @@ def like_place_route() -> ResponseReturnValue:
             place_data.latitude,
             place_data.longitude,
         )
+        if current_app.config.get("RECOMMENDATION_REFRESH_ON_LIKE"):
+            # Перегенерация идёт через пул фрагмента: одна на пользователя
+            jobs = current_app.extensions["services"].get("recommendation_jobs")
+            if jobs is not None:
+                jobs.refresh(current_user.id)
         flash(f"'{place_data.city_name}' добавлен в ваши любимые места!", "success")
 
     except ValidationError as e:
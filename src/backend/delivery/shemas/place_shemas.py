@@ -1,6 +1,8 @@
 """Схемы Pydantic для данных о местах."""
 
-from pydantic import BaseModel, constr
+from typing import List
+
+from pydantic import BaseModel, Field, constr
 
 
 class PointInfoRequestSchema(BaseModel):
@@ -10,6 +12,20 @@ class PointInfoRequestSchema(BaseModel):
     longitude: float
 
 
+class BatchPointInfoRequestSchema(BaseModel):
+    """Запрос описаний набора точек."""
+
+    points: List[PointInfoRequestSchema] = Field(min_length=1)
+
+
+class GeocodeQueryRequestSchema(BaseModel):
+    """Поиск мест по тексту из строки поиска карты."""
+
+    query: constr(strip_whitespace=True, min_length=1, max_length=200)
+    limit: int = Field(default=5, ge=1, le=10)
+    describe: bool = False
+
+
 class LikedPlaceCreateSchema(BaseModel):
     """Создание избранного места."""
 
@@ -0,0 +1,14 @@
+"""Доменная модель популярного места (PopularPlace)."""
+
+
+class PopularPlace:
+    """Место, которое отметили несколько пользователей."""
+
+    def __init__(
+        self, city_name: str, latitude: float, longitude: float, likes: int
+    ) -> None:
+        """Инициализировать сущность PopularPlace."""
+        self.city_name = city_name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.likes = likes
@@ -3,6 +3,7 @@
 from abc import ABC, abstractmethod
 
 from src.backend.domain.model.place.liked_place_model import LikedPlace
+from src.backend.domain.model.place.popular_place_model import PopularPlace
 
 
 class PlaceRepository(ABC):
@@ -12,6 +13,19 @@ class PlaceRepository(ABC):
     def add_liked_place(self, place: LikedPlace) -> LikedPlace:
         """Добавить понравившееся место и вернуть его."""
 
+    @abstractmethod
+    def add_liked_place_if_absent(self, place: LikedPlace) -> tuple[LikedPlace, bool]:
+        """Добавить место, если у пользователя нет места с теми же координатами.
+
+        Returns:
+            Сохранённое (новое или уже существовавшее) место и признак,
+            что оно добавлено сейчас
+        """
+
     @abstractmethod
     def get_liked_places_by_user(self, user_id: int) -> list[LikedPlace]:
         """Вернуть список понравившихся мест пользователя."""
+
+    @abstractmethod
+    def get_popular_places(self, limit: int) -> list[PopularPlace]:
+        """Вернуть самые часто отмечаемые места (по убыванию числа отметок)."""
@@ -1,13 +1,17 @@
 """Порт интерфейса сервиса ИИ для доменного слоя."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 
 class IAIService(ABC):
     """Порт сервиса ИИ для туристического ассистента.
 
     Предоставляет методы получения краткой информации о месте,
-    рекомендаций для путешествий и диалогового чата.
+    рекомендаций для путешествий и диалогового чата. Асинхронные
+    варианты по умолчанию выполняют синхронные методы в пуле потоков;
+    неблокирующие адаптеры переопределяют их.
     """
 
     @abstractmethod
@@ -28,3 +32,50 @@ class IAIService(ABC):
         {"role": "user|assistant|system", "content": "..."}. Возвращает ответ ассистента.
         """
         raise NotImplementedError
+
+    def chat_stream(self, messages: list[dict[str, str]]) -> Iterator[str]:
+        """Ведёт диалог с потоковой выдачей ответа по фрагментам.
+
+        Реализация по умолчанию отдаёт весь ответ ``chat`` одним фрагментом;
+        адаптеры с поддержкой стриминга переопределяют метод.
+        """
+        answer = self.chat(messages)
+        if answer:
+            yield answer
+
+    def summarize_dialog(
+        self, messages: list[dict[str, str]], previous_summary: str | None = None
+    ) -> str:
+        """Сжимает часть диалога в краткое содержание.
+
+        Реализация по умолчанию просит модель через ``chat`` дополнить
+        предыдущее краткое содержание новыми репликами.
+        """
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        request = (
+            "Сожми диалог в краткое содержание (до 120 слов): факты о "
+            "пользователе, его пожелания и уже данные рекомендации. "
+            "Верни только текст содержания.\n\n"
+        )
+        if previous_summary:
+            request += f"Предыдущее содержание: {previous_summary}\n\n"
+        return self.chat([{"role": "user", "content": request + transcript}])
+
+    def get_cached_place_info(self, latitude: float, longitude: float) -> str | None:
+        """Возвращает описание места из кэша без обращения к модели.
+
+        Реализация по умолчанию кэша не имеет и возвращает ``None``.
+        """
+        return None
+
+    async def get_place_info_async(self, latitude: float, longitude: float) -> str:
+        """Асинхронный вариант ``get_place_info``."""
+        return await asyncio.to_thread(self.get_place_info, latitude, longitude)
+
+    async def get_travel_recommendation_async(self, liked_places_str: str) -> str:
+        """Асинхронный вариант ``get_travel_recommendation``."""
+        return await asyncio.to_thread(self.get_travel_recommendation, liked_places_str)
+
+    async def chat_async(self, messages: list[dict[str, str]]) -> str:
+        """Асинхронный вариант ``chat``."""
+        return await asyncio.to_thread(self.chat, messages)
@@ -0,0 +1,25 @@
+"""Порт кэша ключ/значение для доменного слоя."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class ICache(ABC):
+    """Порт кэша. Реализации находятся во внешних слоях (infrastructure/cache)."""
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Вернуть значение по ключу или None при промахе."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        """Сохранить значение; ``ttl_seconds`` переопределяет TTL по умолчанию."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Удалить запись."""
+        raise NotImplementedError
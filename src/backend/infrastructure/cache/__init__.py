@@ -0,0 +1,10 @@
+"""Инфраструктурные кэши: LRU с TTL, дисковый уровень, квантование координат,
+single-flight для одновременных одинаковых вызовов, семантический кэш
+и префиксный индекс запросов."""
+
+from .geo_quantizer import CoordinateQuantizer, geohash_encode
+from .lru_cache import LRUCache
+from .prefix_index import PrefixIndex
+from .semantic_cache import SemanticCache, SemanticHit, normalize_question
+from .single_flight import SingleFlight
+from .sqlite_store import SqliteCacheStore
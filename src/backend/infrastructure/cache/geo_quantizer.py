@@ -0,0 +1,67 @@
+"""Квантование координат в ячейки для построения ключей кэша."""
+
+from __future__ import annotations
+
+import math
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 7) -> str:
+    """Закодировать точку в geohash заданной длины.
+
+    Точность 5 ≈ 4.9 км, 6 ≈ 1.2 км, 7 ≈ 150 м, 8 ≈ 38 м.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars: list[str] = []
+    bit = 0
+    ch = 0
+    even = True
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            ch |= 1 << (4 - bit)
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        if bit < 4:
+            bit += 1
+        else:
+            chars.append(_GEOHASH_ALPHABET[ch])
+            bit = 0
+            ch = 0
+    return "".join(chars)
+
+
+class CoordinateQuantizer:
+    """Сводит близкие координаты к одному ключу ячейки.
+
+    Используется либо geohash заданной точности, либо равномерная сетка
+    с размером ячейки ``grid_size_deg`` градусов (имеет приоритет).
+    """
+
+    def __init__(
+        self, geohash_precision: int = 7, grid_size_deg: float | None = None
+    ) -> None:
+        """Создать квантователь.
+
+        Args:
+            geohash_precision: Длина geohash (1–12)
+            grid_size_deg: Размер ячейки сетки в градусах; если задан, geohash
+                не используется
+        """
+        if grid_size_deg is not None and grid_size_deg <= 0:
+            raise ValueError("grid_size_deg должен быть положительным")
+        self.geohash_precision = min(max(int(geohash_precision), 1), 12)
+        self.grid_size_deg = grid_size_deg
+
+    def cell(self, latitude: float, longitude: float) -> str:
+        """Вернуть идентификатор ячейки для точки."""
+        if self.grid_size_deg:
+            row = math.floor(latitude / self.grid_size_deg)
+            col = math.floor(longitude / self.grid_size_deg)
+            return f"grid{self.grid_size_deg:g}:{row}:{col}"
+        return "gh:" + geohash_encode(latitude, longitude, self.geohash_precision)
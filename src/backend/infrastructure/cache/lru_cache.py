@@ -0,0 +1,124 @@
+"""Потокобезопасный LRU-кэш с TTL, счётчиками и опциональным дисковым уровнем."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from src.backend.domain.services.cache.cache_port import ICache
+from src.backend.infrastructure.cache.sqlite_store import SqliteCacheStore
+
+
+class LRUCache(ICache):
+    """In-memory LRU-кэш с ограничением размера и временем жизни записей.
+
+    Если передан ``store``, он используется как второй уровень: промах
+    в памяти проверяется на диске, а каждая запись дублируется в хранилище.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float | None = None,
+        store: SqliteCacheStore | None = None,
+        name: str = "cache",
+    ) -> None:
+        """Создать кэш.
+
+        Args:
+            max_size: Максимальное количество записей в памяти
+            ttl_seconds: Время жизни записи по умолчанию (None — бессрочно)
+            store: Персистентное хранилище второго уровня
+            name: Имя кэша для метрик
+        """
+        self.name = name
+        self.max_size = max(1, int(max_size))
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self._store = store
+        self._data: OrderedDict[str, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any | None:
+        """Вернуть значение по ключу или None при промахе/истечении."""
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+        if self._store is not None:
+            stored = self._store.get(key)
+            if stored is not None:
+                value, expires_at = stored
+                with self._lock:
+                    self._put(key, value, expires_at)
+                    self.hits += 1
+                    self.store_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        """Сохранить значение; ``ttl_seconds`` переопределяет TTL по умолчанию."""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._put(key, value, expires_at)
+        if self._store is not None:
+            self._store.set(key, value, expires_at)
+
+    def delete(self, key: str) -> None:
+        """Удалить запись из памяти и хранилища."""
+        with self._lock:
+            self._data.pop(key, None)
+        if self._store is not None:
+            self._store.delete(key)
+
+    def clear(self) -> None:
+        """Очистить кэш полностью (включая дисковый уровень)."""
+        with self._lock:
+            self._data.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Вернуть снимок счётчиков кэша."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "store_hits": self.store_hits,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "persistent": self._store is not None,
+            }
+
+    def __len__(self) -> int:
+        """Количество записей в памяти."""
+        with self._lock:
+            return len(self._data)
+
+    def _put(self, key: str, value: Any, expires_at: float | None) -> None:
+        """Положить запись в память и вытеснить самые старые (под блокировкой)."""
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,82 @@
+"""Префиксный индекс ранее встречавшихся ключей для мгновенных подсказок."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any, Dict, List, Tuple
+
+
+class PrefixIndex:
+    """Отсортированный список ключей с частотой обращений.
+
+    Подсказки по префиксу — двоичный поиск начала диапазона и просмотр
+    не более ``scan_limit`` ключей с этим префиксом; выдача упорядочена
+    по частоте. При переполнении вытесняется самый редкий ключ.
+    """
+
+    def __init__(self, max_entries: int = 5000, scan_limit: int = 256) -> None:
+        """Инициализировать индекс.
+
+        Args:
+            max_entries: Максимум ключей
+            scan_limit: Сколько ключей с префиксом просматривать за запрос
+        """
+        self.max_entries = max(1, max_entries)
+        self.scan_limit = scan_limit
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._entries: Dict[str, Tuple[int, Any]] = {}
+        self.lookups = 0
+        self.hits = 0
+
+    def add(self, key: str, value: Any) -> None:
+        """Учесть обращение к ключу и запомнить связанное с ним значение."""
+        if not key:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0] + 1, value)
+                return
+            if len(self._entries) >= self.max_entries:
+                self._evict()
+            bisect.insort(self._keys, key)
+            self._entries[key] = (1, value)
+
+    def suggest(self, prefix: str, limit: int = 5) -> List[Any]:
+        """Значения самых частых ключей, начинающихся с ``prefix``."""
+        if not prefix or limit <= 0:
+            return []
+        with self._lock:
+            self.lookups += 1
+            start = bisect.bisect_left(self._keys, prefix)
+            found = []
+            for key in self._keys[start : start + self.scan_limit]:
+                if not key.startswith(prefix):
+                    break
+                count, value = self._entries[key]
+                found.append((-count, key, value))
+            if found:
+                self.hits += 1
+        found.sort(key=lambda item: item[:2])
+        return [value for _, _, value in found[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Размер индекса и доля запросов подсказок с результатом."""
+        with self._lock:
+            lookups, hits, size = self.lookups, self.hits, len(self._keys)
+        return {
+            "entries": size,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _evict(self) -> None:
+        """Удалить самый редкий ключ (вызывается под блокировкой)."""
+        victim = min(self._entries, key=lambda k: self._entries[k][0])
+        del self._entries[victim]
+        del self._keys[bisect.bisect_left(self._keys, victim)]
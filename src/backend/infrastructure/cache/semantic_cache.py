@@ -0,0 +1,259 @@
+"""Семантический кэш ответов на близкие по смыслу вопросы.
+
+Вопрос нормализуется и превращается в вектор TF-IDF по хешированным
+признакам: слова и символьные n-граммы слов (устойчивы к падежным
+окончаниям). Векторы хранятся в матрице NumPy фиксированного размера;
+поиск — одно умножение матрицы на вектор запроса (косинусная близость).
+Ответ переиспользуется, если близость не ниже порога и числа в вопросах
+совпадают («3 дня» и «5 дней» — разные вопросы). Всё считается на CPU
+в памяти процесса.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def normalize_question(text: str) -> str:
+    """Нормализовать вопрос: регистр, «ё», пунктуация и пробелы."""
+    text = (text or "").lower().replace("ё", "е")
+    return " ".join(_WORD_RE.findall(text))
+
+
+class HashingVectorizer:
+    """Хешированные признаки текста: слова и символьные n-граммы слов."""
+
+    def __init__(self, n_features: int = 2048, char_ngram: int = 4) -> None:
+        """Создать векторизатор.
+
+        Args:
+            n_features: Размерность пространства признаков
+            char_ngram: Длина символьных n-грамм
+        """
+        self.n_features = n_features
+        self.char_ngram = char_ngram
+
+    def features(self, normalized: str) -> Dict[int, int]:
+        """Частоты хешированных признаков нормализованного текста."""
+        counts: Dict[int, int] = {}
+        n = self.char_ngram
+        for word in normalized.split():
+            grams = [f"w:{word}"]
+            padded = f" {word} "
+            if len(padded) <= n:
+                grams.append(f"c:{padded}")
+            else:
+                grams.extend(f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+            for gram in grams:
+                index = zlib.crc32(gram.encode("utf-8")) % self.n_features
+                counts[index] = counts.get(index, 0) + 1
+        return counts
+
+
+@dataclass
+class SemanticHit:
+    """Найденный в кэше ответ."""
+
+    answer: str
+    score: float
+    question: str
+
+
+@dataclass
+class _Entry:
+    """Запись индекса: исходный вопрос, ответ и разреженные признаки."""
+
+    question: str
+    answer: str
+    indices: np.ndarray
+    tf: np.ndarray
+    numbers: Tuple[str, ...]
+    expires_at: Optional[float]
+
+
+class SemanticCache:
+    """Ограниченный индекс вопросов с поиском по косинусной близости.
+
+    При заполнении вытесняется запись, к которой дольше всего не
+    обращались. Веса IDF пересчитываются по мере изменения индекса.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2000,
+        threshold: float = 0.85,
+        ttl_seconds: Optional[float] = 86400,
+        n_features: int = 2048,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Создать пустой кэш.
+
+        Args:
+            max_entries: Максимальное число вопросов в индексе
+            threshold: Минимальная косинусная близость для попадания
+            ttl_seconds: Время жизни записи (None — бессрочно)
+            n_features: Размерность векторов
+            clock: Источник времени
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self._vectorizer = HashingVectorizer(n_features)
+        self._clock = clock
+        self._matrix = np.zeros((self.max_entries, n_features), dtype=np.float32)
+        self._last_used = np.full(self.max_entries, np.inf)
+        self._df = np.zeros(n_features, dtype=np.float64)
+        self._entries: List[Optional[_Entry]] = [None] * self.max_entries
+        self._slots: Dict[str, int] = {}
+        self._free = list(range(self.max_entries - 1, -1, -1))
+        self._since_reweight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Число вопросов в индексе."""
+        return len(self._slots)
+
+    def get(self, question: str) -> Optional[SemanticHit]:
+        """Найти ответ на достаточно близкий вопрос.
+
+        Returns:
+            Найденный ответ с близостью или None при промахе
+        """
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+        features = self._vectorizer.features(normalized)
+        numbers = tuple(_NUMBER_RE.findall(normalized))
+        with self._lock:
+            hit = self._search(features, numbers)
+            if hit is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return hit
+
+    def set(self, question: str, answer: str) -> None:
+        """Сохранить ответ на вопрос (повторный вопрос перезаписывается)."""
+        normalized = normalize_question(question)
+        if not normalized or not answer:
+            return
+        features = self._vectorizer.features(normalized)
+        entry = _Entry(
+            question=normalized,
+            answer=answer,
+            indices=np.fromiter(features.keys(), dtype=np.int64),
+            tf=np.fromiter(features.values(), dtype=np.float64),
+            numbers=tuple(_NUMBER_RE.findall(normalized)),
+            expires_at=(self._clock() + self.ttl_seconds if self.ttl_seconds else None),
+        )
+        with self._lock:
+            slot = self._slots.get(normalized)
+            if slot is not None:
+                self._remove(slot)
+            if not self._free:
+                self._remove(int(np.argmin(self._last_used)))
+                self.evictions += 1
+            slot = self._free.pop()
+            self._entries[slot] = entry
+            self._slots[normalized] = slot
+            self._df[entry.indices] += 1
+            self._last_used[slot] = self._clock()
+            self._since_reweight += 1
+            if self._since_reweight >= max(16, len(self._slots) // 4):
+                self._reweight()
+            else:
+                self._matrix[slot] = self._vector(entry.indices, entry.tf)
+
+    def clear(self) -> None:
+        """Очистить индекс."""
+        with self._lock:
+            for slot in list(self._slots.values()):
+                self._remove(slot)
+
+    def stats(self) -> Dict[str, float]:
+        """Счётчики попаданий, промахов, вытеснений и размер индекса."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._slots),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+    def _search(
+        self, features: Dict[int, int], numbers: Tuple[str, ...]
+    ) -> Optional[SemanticHit]:
+        """Лучший подходящий ответ по близости (вызывается под блокировкой)."""
+        if not self._slots:
+            return None
+        query = self._vector(
+            np.fromiter(features.keys(), dtype=np.int64),
+            np.fromiter(features.values(), dtype=np.float64),
+        )
+        scores = self._matrix @ query
+        now = self._clock()
+        top = min(5, len(scores))
+        candidates = np.argpartition(scores, -top)[-top:]
+        for slot in candidates[np.argsort(scores[candidates])[::-1]]:
+            score = float(scores[slot])
+            if score < self.threshold:
+                break
+            entry = self._entries[slot]
+            if entry is None:
+                continue
+            if entry.expires_at is not None and entry.expires_at <= now:
+                self._remove(int(slot))
+                continue
+            if entry.numbers != numbers:
+                continue
+            self._last_used[slot] = now
+            return SemanticHit(entry.answer, round(score, 4), entry.question)
+        return None
+
+    def _idf(self, indices: np.ndarray) -> np.ndarray:
+        """Сглаженный IDF признаков по текущему индексу."""
+        n = len(self._slots)
+        return np.log((1.0 + n) / (1.0 + self._df[indices])) + 1.0
+
+    def _vector(self, indices: np.ndarray, tf: np.ndarray) -> np.ndarray:
+        """Нормированный вектор TF-IDF (сублинейный TF)."""
+        vector = np.zeros(self._matrix.shape[1], dtype=np.float32)
+        vector[indices] = (1.0 + np.log(tf)) * self._idf(indices)
+        norm = math.sqrt(float(vector @ vector))
+        return vector / norm if norm else vector
+
+    def _reweight(self) -> None:
+        """Пересчитать строки матрицы под текущие веса IDF."""
+        for slot in self._slots.values():
+            entry = self._entries[slot]
+            self._matrix[slot] = self._vector(entry.indices, entry.tf)
+        self._since_reweight = 0
+
+    def _remove(self, slot: int) -> None:
+        """Освободить слот индекса."""
+        entry = self._entries[slot]
+        if entry is None:
+            return
+        self._df[entry.indices] -= 1
+        self._matrix[slot] = 0.0
+        self._last_used[slot] = np.inf
+        self._entries[slot] = None
+        del self._slots[entry.question]
+        self._free.append(slot)
@@ -0,0 +1,89 @@
+"""Single-flight: объединение одновременных одинаковых вызовов в один."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """Состояние одного выполняющегося вызова и число ждущих его результата."""
+
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Группа вызовов, в которой по ключу выполняется не более одного вызова.
+
+    Первый вызывающий с данным ключом выполняет функцию, остальные,
+    пришедшие до её завершения, ждут и получают тот же результат
+    (или то же исключение). Результат после завершения не хранится.
+    """
+
+    def __init__(self) -> None:
+        """Создать пустую группу."""
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Выполнить ``fn`` или дождаться уже идущего вызова с тем же ключом.
+
+        Args:
+            key: Ключ вызова (например, хэш нормализованного промпта)
+            fn: Функция без аргументов, выполняющая реальную работу
+
+        Returns:
+            Результат ``fn`` (общий для всех ожидавших)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result
+
+    def stats(self) -> dict[str, int]:
+        """Вернуть счётчики: выполнено, объединено, выполняется сейчас.
+
+        ``waiting`` — сколько вызывающих сейчас ждут результата уже идущих
+        вызовов (объединённые ожидающие).
+        """
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+                "waiting": sum(call.waiters for call in self._calls.values()),
+            }
@@ -0,0 +1,108 @@
+"""Персистентное хранилище кэша на базе SQLite.
+
+Используется как второй (дисковый) уровень для ``LRUCache``: значения
+переживают перезапуск процесса и разделяются между воркерами одного хоста.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+
+class SqliteCacheStore:
+    """Хранилище пар ключ/значение с TTL в файле SQLite.
+
+    Несколько кэшей могут делить один файл — записи разделяются
+    по ``namespace``. Значения сериализуются в JSON.
+    """
+
+    def __init__(self, path: str, namespace: str = "default") -> None:
+        """Открыть (или создать) файл кэша.
+
+        Args:
+            path: Путь к файлу SQLite
+            namespace: Пространство имён записей внутри файла
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> tuple[Any, float | None] | None:
+        """Вернуть ``(значение, expires_at)`` или None, если записи нет/истекла."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries"
+                " WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        return json.loads(value), expires_at
+
+    def set(self, key: str, value: Any, expires_at: float | None = None) -> None:
+        """Сохранить значение; ``expires_at`` — unix-время истечения или None."""
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, payload, expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Удалить запись по ключу."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Удалить все записи текущего пространства имён."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Удалить истёкшие записи и вернуть их количество."""
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM cache_entries"
+                " WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+                (self.namespace, time.time()),
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+    def close(self) -> None:
+        """Закрыть соединение с файлом."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,202 @@
+"""Динамический micro-batching для локальной генерации текста.
+
+Запросы складываются в очередь; фоновый поток собирает их в пакеты до
+``max_batch_size`` штук или до истечения ``max_wait_ms`` с момента
+первого запроса пакета, выполняет один пакетный ``generate`` и раздаёт
+результаты вызывающим. Модель используется только из этого потока,
+поэтому одновременные запросы не конкурируют за неё.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+GenerateBatchFn = Callable[[List[str], Dict[str, Any]], List[str]]
+
+_STOP = object()
+
+
+def batched_generate(
+    model: Any,
+    tokenizer: Any,
+    device: str,
+    prompts: List[str],
+    **generate_kwargs: Any,
+) -> List[str]:
+    """Сгенерировать продолжения для пакета промптов одним вызовом ``generate``.
+
+    Промпты дополняются слева до общей длины, из выхода берутся только
+    новые токены каждого элемента пакета.
+
+    Args:
+        model: Модель Transformers (causal LM)
+        tokenizer: Токенизатор модели
+        device: Устройство ("cpu" или "cuda")
+        prompts: Промпты пакета
+        generate_kwargs: Параметры ``model.generate``
+
+    Returns:
+        Тексты продолжений в порядке промптов
+    """
+    import torch
+
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"
+    inputs = tokenizer(prompts, return_tensors="pt", padding=True).to(device)
+    with torch.no_grad():
+        outputs = model.generate(
+            **inputs, pad_token_id=tokenizer.pad_token_id, **generate_kwargs
+        )
+    prompt_len = inputs["input_ids"].shape[1]
+    return [
+        tokenizer.decode(row[prompt_len:], skip_special_tokens=True).strip()
+        for row in outputs
+    ]
+
+
+class _Request:
+    """Запрос в очереди планировщика."""
+
+    __slots__ = ("prompt", "params", "future")
+
+    def __init__(self, prompt: str, params: Dict[str, Any]) -> None:
+        self.prompt = prompt
+        self.params = params
+        self.future: Future = Future()
+
+
+class MicroBatchScheduler:
+    """Планировщик, объединяющий одиночные запросы генерации в пакеты.
+
+    В один пакет попадают только запросы с одинаковыми параметрами
+    генерации. ``max_batch_size=1`` даёт строго последовательное
+    выполнение без пакетирования.
+    """
+
+    def __init__(
+        self,
+        generate_batch: GenerateBatchFn,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Инициализировать планировщик и запустить фоновый поток.
+
+        Args:
+            generate_batch: Функция (промпты, параметры) -> тексты
+            max_batch_size: Максимальный размер пакета
+            max_wait_ms: Сколько ждать добора пакета после первого запроса
+            logger: Логгер
+        """
+        self._generate_batch = generate_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._logger = logger or logging.getLogger(__name__)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._loop, name="micro-batch", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, prompt: str, **params: Any) -> Future:
+        """Поставить промпт в очередь и вернуть Future с результатом."""
+        if self._closed:
+            raise RuntimeError("Планировщик остановлен")
+        request = _Request(prompt, params)
+        self._queue.put(request)
+        return request.future
+
+    def generate(self, prompt: str, **params: Any) -> str:
+        """Сгенерировать текст через очередь (блокирует до результата)."""
+        return self.submit(prompt, **params).result()
+
+    def stats(self) -> Dict[str, float]:
+        """Число пакетов, запросов и средний размер пакета."""
+        with self._stats_lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "avg_batch_size": (
+                    round(self.requests / self.batches, 2) if self.batches else 0.0
+                ),
+                "queued": self._queue.qsize(),
+            }
+
+    def close(self) -> None:
+        """Остановить фоновый поток после обработки уже поставленных запросов."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _loop(self) -> None:
+        """Цикл фонового потока: собрать пакет, выполнить, раздать результаты."""
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, stop = self._collect(first)
+            for group in self._group(batch):
+                self._run(group)
+            if stop:
+                return
+
+    def _collect(self, first: _Request) -> Tuple[List[_Request], bool]:
+        """Добрать пакет до максимального размера или истечения ожидания."""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = (
+                    self._queue.get(timeout=timeout)
+                    if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    @staticmethod
+    def _group(batch: List[_Request]) -> List[List[_Request]]:
+        """Разбить пакет по параметрам генерации (порядок сохраняется)."""
+        groups: Dict[Tuple, List[_Request]] = {}
+        for request in batch:
+            key = tuple(sorted(request.params.items()))
+            groups.setdefault(key, []).append(request)
+        return list(groups.values())
+
+    def _run(self, group: List[_Request]) -> None:
+        """Выполнить один пакетный вызов и раздать результаты."""
+        try:
+            texts = self._generate_batch(
+                [r.prompt for r in group], dict(group[0].params)
+            )
+            if len(texts) != len(group):
+                raise RuntimeError(
+                    f"generate_batch вернул {len(texts)} ответов на {len(group)}"
+                )
+        except Exception as e:
+            self._logger.error(f"Ошибка пакетной генерации: {e}", exc_info=True)
+            for request in group:
+                request.future.set_exception(e)
+            return
+        with self._stats_lock:
+            self.batches += 1
+            self.requests += len(group)
+        for request, text in zip(group, texts):
+            request.future.set_result(text)
@@ -0,0 +1,144 @@
+"""Circuit breaker для вызовов внешнего провайдера."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Размыкатель цепи по доле ошибок и медленных вызовов.
+
+    Хранит исходы последних ``window`` вызовов. Когда вызовов не меньше
+    ``min_calls`` и доля ошибок или медленных (дольше
+    ``slow_call_seconds``) вызовов достигает порога, цепь размыкается
+    на ``open_seconds``: вызовы не пропускаются. Затем цепь переходит
+    в полуоткрытое состояние и пропускает один пробный вызов; его успех
+    замыкает цепь, неудача снова размыкает.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 20.0,
+        slow_call_rate: float = 0.5,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Инициализировать размыкатель.
+
+        Args:
+            window: Число последних вызовов для оценки долей
+            min_calls: Минимум вызовов в окне для размыкания
+            error_rate: Порог доли ошибок
+            slow_call_seconds: Длительность, после которой вызов считается медленным
+            slow_call_rate: Порог доли медленных вызовов
+            open_seconds: Время в разомкнутом состоянии до пробного вызова
+            clock: Источник монотонного времени
+        """
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened_count = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние с учётом истечения времени размыкания."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow(self) -> bool:
+        """Можно ли выполнить вызов сейчас (в полуоткрытом — один пробный)."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, success: bool, latency: float) -> None:
+        """Учесть исход вызова.
+
+        Args:
+            success: Завершился ли вызов без ошибки
+            latency: Длительность вызова в секундах
+        """
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if success and not slow:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+            if self._state == OPEN:
+                return
+            self._outcomes.append((success, slow))
+            total = len(self._outcomes)
+            if total < self.min_calls:
+                return
+            errors = sum(1 for ok, _ in self._outcomes if not ok)
+            slows = sum(1 for _, is_slow in self._outcomes if is_slow)
+            if (
+                errors / total >= self.error_rate
+                or slows / total >= self.slow_call_rate
+            ):
+                self._open()
+
+    def release(self) -> None:
+        """Вернуть пробный вызов без исхода (например, клиент закрыл поток).
+
+        Следующий вызов в полуоткрытом состоянии снова станет пробным.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Состояние и счётчики размыкателя."""
+        with self._lock:
+            self._maybe_half_open()
+            total = len(self._outcomes)
+            errors = sum(1 for ok, _ in self._outcomes if not ok)
+            return {
+                "state": self._state,
+                "window_calls": total,
+                "window_error_rate": round(errors / total, 3) if total else 0.0,
+                "opened": self.opened_count,
+                "rejected": self.rejected,
+            }
+
+    def _open(self) -> None:
+        """Разомкнуть цепь (вызывается под блокировкой)."""
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self.opened_count += 1
+
+    def _maybe_half_open(self) -> None:
+        """Перевести в полуоткрытое состояние по истечении времени размыкания."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
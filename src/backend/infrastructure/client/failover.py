@@ -0,0 +1,380 @@
+"""Клиент инференса с переключением между провайдерами.
+
+Оборачивает упорядоченный список пар провайдер/модель Hugging Face
+Inference и повторяет интерфейс ``InferenceClient.chat.completions.create``,
+поэтому подставляется в ``AIService`` вместо одиночного клиента.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from huggingface_hub import InferenceClient
+
+from src.backend.infrastructure.client.circuit_breaker import CircuitBreaker
+
+# Минимум замеров задержки, после которого задержка хеджирования берётся по p95
+MIN_SAMPLES_FOR_P95 = 20
+
+
+class ProvidersUnavailableError(RuntimeError):
+    """Все провайдеры недоступны (цепи разомкнуты или вызовы завершились ошибкой)."""
+
+
+def parse_providers(spec: str | None, default_model: str) -> List[Tuple[str, str]]:
+    """Разобрать список провайдеров вида ``provider[:model],provider[:model]``.
+
+    Args:
+        spec: Строка конфигурации (порядок задаёт приоритет)
+        default_model: Модель для элементов без явной модели
+
+    Returns:
+        Список пар (провайдер, модель)
+    """
+    providers = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        provider, _, model = item.partition(":")
+        providers.append((provider.strip(), model.strip() or default_model))
+    return providers
+
+
+class ProviderEndpoint:
+    """Провайдер с моделью, клиентом, размыкателем и статистикой задержек."""
+
+    def __init__(
+        self, provider: str, model: str, client: Any, breaker: CircuitBreaker
+    ) -> None:
+        """Инициализировать конечную точку."""
+        self.provider = provider
+        self.model = model
+        self.client = client
+        self.breaker = breaker
+        self.calls = 0
+        self.failures = 0
+        self._latencies: Deque[float] = deque(maxlen=200)
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        """Имя конечной точки для логов и метрик."""
+        return f"{self.provider}:{self.model}"
+
+    def record(self, success: bool, latency: float) -> None:
+        """Учесть исход вызова в статистике и размыкателе."""
+        with self._lock:
+            self.calls += 1
+            if success:
+                self._latencies.append(latency)
+            else:
+                self.failures += 1
+        self.breaker.record(success, latency)
+
+    def release(self) -> None:
+        """Завершить вызов без исхода: пробный вызов размыкателя освобождается."""
+        self.breaker.release()
+
+    def p95(self) -> float | None:
+        """95-й перцентиль задержки успешных вызовов (None, если замеров мало)."""
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES_FOR_P95:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def stats(self) -> Dict[str, Any]:
+        """Счётчики конечной точки."""
+        p95 = self.p95()
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "calls": self.calls,
+            "failures": self.failures,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "breaker": self.breaker.stats(),
+        }
+
+
+class _Completions:
+    """Прокси ``chat.completions`` с интерфейсом InferenceClient."""
+
+    def __init__(self, owner: "FailoverInferenceClient") -> None:
+        self._owner = owner
+
+    def create(self, model: str | None = None, messages: Any = None, **kwargs: Any):
+        """Выполнить запрос через первый доступный провайдер.
+
+        Аргумент ``model`` игнорируется: у каждого провайдера своя модель.
+        """
+        if kwargs.pop("stream", False):
+            return self._owner.stream(messages, **kwargs)
+        return self._owner.complete(messages, **kwargs)
+
+
+class _Chat:
+    """Прокси ``chat`` с атрибутом ``completions``."""
+
+    def __init__(self, owner: "FailoverInferenceClient") -> None:
+        self.completions = _Completions(owner)
+
+
+class FailoverInferenceClient:
+    """Клиент, переключающийся на следующий провайдер при сбоях.
+
+    Провайдеры перебираются по порядку; провайдеры с разомкнутой цепью
+    пропускаются без ожидания. При включённом хеджировании, если первый
+    провайдер не ответил за ``max(hedge_min_delay, p95)``, параллельно
+    отправляется запрос следующему провайдеру и берётся первый успешный
+    ответ. Потоковые запросы переключаются только до первого фрагмента.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[ProviderEndpoint],
+        hedge_enabled: bool = False,
+        hedge_min_delay: float = 2.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Инициализировать клиент.
+
+        Args:
+            endpoints: Конечные точки в порядке приоритета
+            hedge_enabled: Включить хеджированные запросы
+            hedge_min_delay: Минимальная задержка перед хеджирующим запросом, с
+            logger: Логгер
+        """
+        if not endpoints:
+            raise ValueError("Не задано ни одного провайдера ИИ")
+        self.endpoints = endpoints
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay = hedge_min_delay
+        self._logger = logger or logging.getLogger(__name__)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.chat = _Chat(self)
+
+    def complete(self, messages: Any, **kwargs: Any) -> Any:
+        """Выполнить непотоковый запрос с переключением провайдеров.
+
+        Raises:
+            ProvidersUnavailableError: Если ни один провайдер не ответил
+        """
+        if self.hedge_enabled and len(self.endpoints) > 1:
+            return self._complete_hedged(messages, **kwargs)
+        errors: List[str] = []
+        for endpoint in self._available():
+            try:
+                return self._call(endpoint, messages, **kwargs)
+            except Exception as e:
+                errors.append(f"{endpoint.name}: {e}")
+        raise ProvidersUnavailableError(self._describe(errors))
+
+    def stream(self, messages: Any, **kwargs: Any) -> Iterator[Any]:
+        """Выполнить потоковый запрос; переключение возможно до первого фрагмента.
+
+        Raises:
+            ProvidersUnavailableError: Если ни один провайдер не начал ответ
+        """
+        errors: List[str] = []
+        for endpoint in self._available():
+            started = time.perf_counter()
+            try:
+                chunks = iter(
+                    endpoint.client.chat.completions.create(
+                        model=endpoint.model, messages=messages, stream=True, **kwargs
+                    )
+                )
+                first = next(chunks, None)
+            except Exception as e:
+                endpoint.record(False, time.perf_counter() - started)
+                self._logger.warning(f"Провайдер {endpoint.name} недоступен: {e}")
+                errors.append(f"{endpoint.name}: {e}")
+                continue
+            relay = self._relay(endpoint, started, first, chunks)
+            # Запустить генератор до входа в try: закрытие или сборка мусора
+            # непрочитанного потока тоже освободят пробный вызов
+            next(relay)
+            return relay
+        raise ProvidersUnavailableError(self._describe(errors))
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика провайдеров и хеджирования."""
+        return {
+            "providers": [endpoint.stats() for endpoint in self.endpoints],
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+    def _available(self) -> Iterator[ProviderEndpoint]:
+        """Перебрать провайдеры, чьи цепи пропускают вызов."""
+        for endpoint in self.endpoints:
+            if endpoint.breaker.allow():
+                yield endpoint
+
+    def _call(self, endpoint: ProviderEndpoint, messages: Any, **kwargs: Any) -> Any:
+        """Один вызов провайдера с учётом исхода."""
+        started = time.perf_counter()
+        try:
+            completion = endpoint.client.chat.completions.create(
+                model=endpoint.model, messages=messages, **kwargs
+            )
+        except Exception as e:
+            endpoint.record(False, time.perf_counter() - started)
+            self._logger.warning(f"Провайдер {endpoint.name} недоступен: {e}")
+            raise
+        endpoint.record(True, time.perf_counter() - started)
+        try:
+            # Метрики вызовов учитывают фактически ответившего провайдера
+            completion.served_by = (endpoint.provider, endpoint.model)
+        except AttributeError:
+            pass
+        return completion
+
+    def _relay(
+        self,
+        endpoint: ProviderEndpoint,
+        started: float,
+        first: Any,
+        chunks: Iterator[Any],
+    ) -> Iterator[Any]:
+        """Отдать фрагменты потока и учесть исход по его завершении.
+
+        Первым отдаётся ``None`` — его забирает ``stream`` при запуске.
+        Поток, брошенный клиентом (``GeneratorExit``), не считается ни
+        успехом, ни ошибкой, но пробный вызов размыкателя освобождается.
+        """
+        success: Optional[bool] = None
+        try:
+            yield None
+            if first is not None:
+                yield first
+            for chunk in chunks:
+                yield chunk
+            success = True
+        except Exception:
+            success = False
+            raise
+        finally:
+            if success is None:
+                close = getattr(chunks, "close", None)
+                if callable(close):
+                    close()
+                endpoint.release()
+            else:
+                endpoint.record(success, time.perf_counter() - started)
+
+    def _complete_hedged(self, messages: Any, **kwargs: Any) -> Any:
+        """Запрос с хеджированием: второй провайдер стартует после задержки."""
+        executor = self._ensure_executor()
+        candidates = self._available()
+        running: Dict[Future, ProviderEndpoint] = {}
+        errors: List[str] = []
+        hedged = False
+
+        def start_next() -> ProviderEndpoint | None:
+            endpoint = next(candidates, None)
+            if endpoint is not None:
+                future = executor.submit(self._call, endpoint, messages, **kwargs)
+                running[future] = endpoint
+            return endpoint
+
+        primary = start_next()
+        while running:
+            timeout = None if hedged else self._hedge_delay(primary)
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Первый провайдер отвечает дольше обычного — хеджируем
+                hedged = True
+                if start_next() is not None:
+                    self.hedges += 1
+                continue
+            for future in done:
+                endpoint = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(f"{endpoint.name}: {e}")
+                    continue
+                if endpoint is not primary:
+                    self.hedge_wins += 1
+                return result
+            if not running:
+                # Все запущенные вызовы упали — переключаемся на следующий
+                primary = start_next()
+        raise ProvidersUnavailableError(self._describe(errors))
+
+    def _hedge_delay(self, endpoint: ProviderEndpoint) -> float:
+        """Задержка перед хеджирующим запросом: p95 провайдера, не меньше минимума."""
+        p95 = endpoint.p95()
+        return max(self.hedge_min_delay, p95 or 0.0)
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        """Лениво создать пул потоков для хеджированных вызовов."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=32, thread_name_prefix="ai-hedge"
+                )
+            return self._executor
+
+    @staticmethod
+    def _describe(errors: List[str]) -> str:
+        """Текст ошибки недоступности провайдеров."""
+        if not errors:
+            return "Все провайдеры ИИ временно отключены (цепи разомкнуты)"
+        return "Все провайдеры ИИ вернули ошибку: " + "; ".join(errors)
+
+
+def create_failover_client(
+    config: dict, logger: Optional[logging.Logger] = None
+) -> FailoverInferenceClient:
+    """Создаёт клиент с переключением по списку ``HF_PROVIDERS``.
+
+    Ожидаемые ключи: HF_TOKEN, HF_PROVIDERS (или HF_PROVIDER), HF_MODEL,
+    HF_TIMEOUT_SECONDS,
+    параметры размыкателя AI_BREAKER_* и хеджирования AI_HEDGE_*.
+    """
+    token: Optional[str] = config.get("HF_TOKEN")
+    if not token:
+        raise RuntimeError("HF_TOKEN отсутствует в конфигурации приложения")
+    default_model = config.get("HF_MODEL", "openai/gpt-oss-120b")
+    providers = parse_providers(config.get("HF_PROVIDERS"), default_model) or [
+        (config.get("HF_PROVIDER", "fireworks-ai"), default_model)
+    ]
+    endpoints = [
+        ProviderEndpoint(
+            provider=provider,
+            model=model,
+            client=InferenceClient(
+                provider=provider,
+                api_key=token,
+                timeout=config.get("HF_TIMEOUT_SECONDS"),
+            ),
+            breaker=CircuitBreaker(
+                window=int(config.get("AI_BREAKER_WINDOW", 20)),
+                min_calls=int(config.get("AI_BREAKER_MIN_CALLS", 5)),
+                error_rate=float(config.get("AI_BREAKER_ERROR_RATE", 0.5)),
+                slow_call_seconds=float(
+                    config.get("AI_BREAKER_SLOW_CALL_SECONDS", 20.0)
+                ),
+                slow_call_rate=float(config.get("AI_BREAKER_SLOW_CALL_RATE", 0.5)),
+                open_seconds=float(config.get("AI_BREAKER_OPEN_SECONDS", 30.0)),
+            ),
+        )
+        for provider, model in providers
+    ]
+    return FailoverInferenceClient(
+        endpoints,
+        hedge_enabled=bool(config.get("AI_HEDGE_ENABLED", False)),
+        hedge_min_delay=float(config.get("AI_HEDGE_MIN_DELAY_SECONDS", 2.0)),
+        logger=logger,
+    )
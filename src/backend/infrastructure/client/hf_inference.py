@@ -4,9 +4,42 @@
 Инкапсулирует инициализацию клиента на основе переданной конфигурации.
 """
 
-from typing import Optional
+import functools
+import hashlib
+import inspect
+import logging
+from typing import Any, Dict, Optional
 
-from huggingface_hub import InferenceClient
+import aiohttp
+from aiohttp import ClientSession
+from huggingface_hub import AsyncInferenceClient, InferenceClient
+
+# Публичного способа передать AsyncInferenceClient свой коннектор или
+# aiohttp-сессию нет, поэтому PooledAsyncInferenceClient переопределяет
+# внутренний _get_client_session. Переопределение сверено с этой версией
+# huggingface_hub (она же закреплена в requirements.dev.txt) и с отпечатком
+# исходника метода; тест test_async_ai_service падает при их расхождении
+UPSTREAM_HUGGINGFACE_HUB_VERSION = "0.34.3"
+UPSTREAM_SESSION_FINGERPRINT = "b0705b94ec378772"
+
+logger = logging.getLogger(__name__)
+
+
+def client_options(config: dict) -> Dict[str, Any]:
+    """Аргументы конструктора клиента Inference по конфигурации.
+
+    HF_BASE_URL (OpenAI-совместимый сервер, например локальный стенд
+    нагрузочного теста) заменяет провайдера HF_PROVIDER.
+    """
+    options: Dict[str, Any] = {
+        "api_key": config.get("HF_TOKEN"),
+        "timeout": config.get("HF_TIMEOUT_SECONDS"),
+    }
+    if config.get("HF_BASE_URL"):
+        options["base_url"] = config["HF_BASE_URL"]
+    else:
+        options["provider"] = config.get("HF_PROVIDER", "fireworks-ai")
+    return options
 
 
 def create_hf_client(config: dict) -> InferenceClient:
@@ -15,9 +48,106 @@ def create_hf_client(config: dict) -> InferenceClient:
     Ожидаемые ключи:
     - HF_TOKEN (str, обязательно)
     - HF_PROVIDER (str, по умолчанию "fireworks-ai")
+    - HF_BASE_URL (str, необязательно; заменяет HF_PROVIDER)
+    - HF_TIMEOUT_SECONDS (float, необязательно)
+    """
+    if not config.get("HF_TOKEN"):
+        raise RuntimeError("HF_TOKEN отсутствует в конфигурации приложения")
+    return InferenceClient(**client_options(config))
+
+
+@functools.lru_cache(maxsize=1)
+def upstream_session_fingerprint() -> Optional[str]:
+    """Отпечаток установленной реализации ``_get_client_session`` (или None)."""
+    try:
+        source = inspect.getsource(AsyncInferenceClient._get_client_session)
+    except (OSError, TypeError):
+        return None
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def shared_pool_supported() -> bool:
+    """Совпадает ли установленный huggingface_hub с проверенной реализацией."""
+    return upstream_session_fingerprint() == UPSTREAM_SESSION_FINGERPRINT
+
+
+class PooledAsyncInferenceClient(AsyncInferenceClient):
+    """AsyncInferenceClient с общим пулом HTTP-соединений.
+
+    Базовый клиент создаёт новую aiohttp-сессию (и новый пул соединений)
+    на каждый запрос. Здесь все сессии используют один ``TCPConnector``,
+    поэтому keep-alive соединения с провайдером переиспользуются между
+    запросами. Коннектор привязан к циклу событий, в котором создан клиент.
+
+    Переопределяемый метод повторяет внутренности huggingface_hub; если
+    установленная версия отличается от проверенной
+    (``shared_pool_supported``), клиент работает как базовый.
+    """
+
+    def __init__(self, *args: Any, pool_size: int = 100, **kwargs: Any) -> None:
+        """Создать клиент с пулом не более ``pool_size`` соединений."""
+        super().__init__(*args, **kwargs)
+        self._pool_size = pool_size
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self.shared_pool = shared_pool_supported()
+        if not self.shared_pool:
+            logger.warning(
+                "Реализация сессий huggingface_hub изменилась: общий пул"
+                " соединений отключён, каждый запрос открывает своё соединение"
+            )
+
+    def _get_client_session(self, headers: Optional[Dict] = None) -> ClientSession:
+        """Создать сессию поверх общего коннектора (он не закрывается с ней)."""
+        if not self.shared_pool:
+            return super()._get_client_session(headers)
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(limit=self._pool_size)
+        client_headers = self.headers.copy()
+        if headers is not None:
+            client_headers.update(headers)
+        session = ClientSession(
+            headers=client_headers,
+            cookies=self.cookies,
+            timeout=aiohttp.ClientTimeout(self.timeout),
+            trust_env=self.trust_env,
+            connector=self._connector,
+            connector_owner=False,
+        )
+        self._sessions[session] = set()
+        session._wrapped_request = session._request
+
+        async def _request(method: str, url: str, **kwargs: Any) -> Any:
+            response = await session._wrapped_request(method, url, **kwargs)
+            self._sessions[session].add(response)
+            return response
+
+        session._request = _request
+        session._close = session.close
+
+        async def close_session() -> None:
+            for response in self._sessions[session]:
+                response.close()
+            await session._close()
+            self._sessions.pop(session, None)
+
+        session.close = close_session
+        return session
+
+    async def close(self) -> None:
+        """Закрыть открытые сессии и общий пул соединений."""
+        await super().close()
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+
+def create_async_hf_client(
+    config: dict, pool_size: int = 100
+) -> PooledAsyncInferenceClient:
+    """Создаёт асинхронный клиент с общим пулом соединений.
+
+    Ожидает те же ключи, что и ``create_hf_client``.
     """
-    token: Optional[str] = config.get("HF_TOKEN")
-    provider: str = config.get("HF_PROVIDER", "fireworks-ai")
-    if not token:
+    if not config.get("HF_TOKEN"):
         raise RuntimeError("HF_TOKEN отсутствует в конфигурации приложения")
-    return InferenceClient(provider=provider, api_key=token)
+    return PooledAsyncInferenceClient(**client_options(config), pool_size=pool_size)
@@ -0,0 +1,246 @@
+"""Долгоживущая HTTP-сессия с пулом соединений и политикой повторов.
+
+Модульный ``requests.get`` открывает новое TCP+TLS-соединение на каждый
+запрос. Здесь соединения к каждому хосту держатся в пуле (HTTP keep-alive
+плюс TCP keepalive на сокете), число соединений к хосту ограничено, а
+ответы 429/5xx и обрывы соединения повторяются с экспоненциальной паузой
+или по заголовку ``Retry-After``. Пауза не превышает ``max_retry_wait`` и
+остатка бюджета текущего запроса (см. ``utils.deadline``). Если задан
+``throttle``, каждый повтор после паузы заново берёт слот ограничителя
+частоты — повторы не обходят общий лимит запросов к хосту.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+from src.backend.utils.deadline import DeadlineExceeded, current_deadline
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class _RetryCounters:
+    """Счётчики повторов, общие для всех копий политики."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.retry_wait_seconds = 0.0
+
+    def add(self, waited: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.retry_wait_seconds += waited
+
+
+class BoundedRetry(Retry):
+    """Политика повторов urllib3 с ограниченной паузой.
+
+    ``Retry-After`` учитывается, но не дольше ``max_retry_wait`` секунд;
+    если пауза не укладывается в бюджет запроса, повтор не выполняется.
+    После паузы вызывается ``throttle`` (если задан): повтор — такой же
+    запрос к хосту и занимает свой слот ограничителя частоты.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        max_retry_wait: float = 10.0,
+        counters: Optional[_RetryCounters] = None,
+        throttle: Optional[Callable[[], None]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_retry_wait = max_retry_wait
+        self.counters = counters or _RetryCounters()
+        self.throttle = throttle
+
+    def new(self, **kw: Any) -> "BoundedRetry":
+        """Копия политики (urllib3 создаёт её на каждую попытку)."""
+        retry = super().new(**kw)
+        retry.max_retry_wait = self.max_retry_wait
+        retry.counters = self.counters
+        retry.throttle = self.throttle
+        return retry
+
+    def sleep(self, response: Any = None) -> None:
+        """Выждать перед повтором: ``Retry-After`` или экспоненциальная пауза.
+
+        Raises:
+            DeadlineExceeded: Если пауза не укладывается в бюджет запроса
+                или слот ограничителя не освободится вовремя
+        """
+        wait = None
+        if self.respect_retry_after_header and response is not None:
+            wait = self.get_retry_after(response)
+        if wait is None:
+            wait = self.get_backoff_time()
+        wait = min(max(wait, 0.0), self.max_retry_wait)
+        deadline = current_deadline()
+        if deadline is not None and wait >= deadline.remaining():
+            raise DeadlineExceeded(
+                f"Повтор через {wait:.2f} с не укладывается в бюджет запроса"
+            )
+        self.counters.add(wait)
+        if wait > 0:
+            time.sleep(wait)
+        if self.throttle is not None:
+            self.throttle()
+
+
+class _HostCounters:
+    """Запросы и открытые соединения к одному хосту."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self.connections_opened = 0
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter с TCP keepalive на сокетах пула и учётом соединений.
+
+    Соединение, по которому пришёл ответ, запоминается по хосту: новое
+    соединение увеличивает ``connections_opened``, уже встреченное
+    означает переиспользование.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostCounters] = {}
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault(
+            "socket_options",
+            HTTPConnection.default_socket_options
+            + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)],
+        )
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> Any:
+        """Отправить запрос и учесть соединение, по которому пришёл ответ."""
+        response = super().send(request, **kwargs)
+        parts = urlsplit(request.url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        host = f"{parts.scheme}://{parts.hostname}:{port}"
+        conn = getattr(response.raw, "connection", None)
+        with self._lock:
+            counters = self._hosts.setdefault(host, _HostCounters())
+            counters.requests += 1
+            if conn is not None and conn not in counters.connections:
+                counters.connections.add(conn)
+                counters.connections_opened += 1
+        return response
+
+    def host_stats(self) -> Dict[str, Dict[str, int]]:
+        """Число запросов и открытых соединений по хостам."""
+        with self._lock:
+            return {
+                host: {
+                    "requests": c.requests,
+                    "connections_opened": c.connections_opened,
+                }
+                for host, c in self._hosts.items()
+            }
+
+
+class PooledHTTPSession(requests.Session):
+    """``requests.Session`` с пулом соединений, повторами и статистикой.
+
+    Attributes:
+        adapter: Адаптер с пулами соединений по хостам
+        retry: Политика повторов
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = True,
+        retries: int = 2,
+        backoff_factor: float = 0.5,
+        max_retry_wait: float = 10.0,
+        status_forcelist: frozenset[int] = RETRY_STATUSES,
+        throttle: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Создать сессию.
+
+        Args:
+            pool_connections: Сколько хостов держать в пуле
+            pool_maxsize: Максимум соединений к одному хосту
+            pool_block: Ждать свободное соединение, а не открывать сверх
+                ``pool_maxsize``
+            retries: Число повторов (0 — без повторов)
+            backoff_factor: База экспоненциальной паузы, секунды
+            max_retry_wait: Предел паузы между попытками, секунды
+            status_forcelist: Статусы ответа, которые повторяются
+            throttle: Ожидание слота ограничителя перед каждым повтором
+        """
+        super().__init__()
+        self.retry = BoundedRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            max_retry_wait=max_retry_wait,
+            throttle=throttle,
+        )
+        self.adapter = KeepAliveAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=self.retry,
+        )
+        self.mount("https://", self.adapter)
+        self.mount("http://", self.adapter)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> Any:
+        """Отправить запрос; ``DeadlineExceeded`` из паузы повтора не оборачивается.
+
+        Raises:
+            DeadlineExceeded: Если повтор не укладывается в бюджет запроса
+        """
+        try:
+            return super().send(request, **kwargs)
+        except requests.ConnectionError as e:
+            # requests оборачивает любые OSError (TimeoutError — тоже) из urllib3
+            if e.args and isinstance(e.args[0], DeadlineExceeded):
+                raise e.args[0] from None
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Переиспользование соединений по хостам и счётчики повторов.
+
+        ``requests`` — запросы через пул хоста, ``connections_opened`` —
+        сколько соединений пришлось открыть; остальные запросы прошли
+        по уже открытым соединениям.
+        """
+        hosts: Dict[str, Dict[str, Any]] = {}
+        for host, counts in self.adapter.host_stats().items():
+            opened = counts["connections_opened"]
+            total = counts["requests"]
+            hosts[host] = {
+                "requests": total,
+                "connections_opened": opened,
+                "reused": max(0, total - opened),
+                "reuse_ratio": round(1 - opened / total, 4) if total else 0.0,
+            }
+        counters = self.retry.counters
+        return {
+            "hosts": hosts,
+            "retries": counters.retries,
+            "retry_wait_seconds": round(counters.retry_wait_seconds, 3),
+        }
@@ -14,4 +14,7 @@ MODEL_CONFIG = {
     "do_sample": True,
     "use_chat_template": True,
     "early_stopping": True,
+    # Micro-batching локальной генерации: размер пакета и ожидание добора
+    "max_batch_size": 8,
+    "max_batch_wait_ms": 10,
 }
@@ -1,18 +1,30 @@
-"""Клиент для генерации текста локальной моделью GPT-OSS."""
+"""Клиент для генерации текста локальной моделью GPT-OSS.
 
-import logging
+torch и transformers импортируются при создании клиента, а не при импорте
+модуля: процессы, работающие только с удалённым провайдером, их не грузят.
+"""
 
-import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+import logging
 
+from src.backend.infrastructure.client.batching import (
+    MicroBatchScheduler,
+    batched_generate,
+)
 from src.backend.infrastructure.client.init_model.ai_config import MODEL_CONFIG
 
 
 class GPTOSSClient:
-    """Лёгкий клиент для работы с локальной моделью GPT-OSS."""
+    """Лёгкий клиент для работы с локальной моделью GPT-OSS.
+
+    Одновременные вызовы ``generate`` объединяются планировщиком
+    micro-batching в пакетные вызовы модели.
+    """
 
     def __init__(self, logger: logging.Logger | None = None) -> None:
         """Инициализация модели и токенизатора на доступном устройстве."""
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+
         self._logger = logger or logging.getLogger(__name__)
         model_path = MODEL_CONFIG.get("model_path")
         if not model_path:
@@ -25,6 +37,14 @@ class GPTOSSClient:
         self.model = AutoModelForCausalLM.from_pretrained(model_path).to(device)
         self.device = device
         self._logger.info("GPT-OSS model loaded successfully.")
+        self._scheduler = MicroBatchScheduler(
+            lambda prompts, params: batched_generate(
+                self.model, self.tokenizer, self.device, prompts, **params
+            ),
+            max_batch_size=int(MODEL_CONFIG.get("max_batch_size", 8)),
+            max_wait_ms=float(MODEL_CONFIG.get("max_batch_wait_ms", 10)),
+            logger=self._logger,
+        )
 
     def generate(
         self,
@@ -37,15 +57,15 @@ class GPTOSSClient:
         early_stopping: bool = True,
     ) -> str:
         """Сгенерировать продолжение текста для заданного prompt."""
-        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
-        outputs = self.model.generate(
-            **inputs,
+        return self._scheduler.generate(
+            prompt,
             max_new_tokens=max_new_tokens,
             temperature=temperature,
             top_p=top_p,
             do_sample=do_sample,
             early_stopping=early_stopping,
         )
-        text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-        # Если prompt включён в начале ответа, уберём его
-        return text[len(prompt) :].strip() if text.startswith(prompt) else text.strip()
+
+    def batching_stats(self) -> dict:
+        """Статистика планировщика micro-batching."""
+        return self._scheduler.stats()
@@ -0,0 +1,322 @@
+"""Ограничители частоты вызовов внешних сервисов.
+
+``RateLimiter`` действует в пределах процесса. ``SharedRateLimiter`` —
+маркерная корзина в файле SQLite, общая для всех воркеров одного хоста:
+суммарная частота вызовов не превышает лимит, сколько бы процессов
+gunicorn ни было запущено. Ожидающие вызовы выстраиваются в очередь по
+приоритету (интерактивные запросы раньше прогрева и пакетных задач),
+ожидание ограничено ``max_wait`` и дедлайном запроса.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.backend.utils.deadline import DeadlineExceeded, current_deadline
+
+# Приоритеты очереди: меньше — раньше
+INTERACTIVE = 0
+BATCH = 10
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "rate_limit_priority", default=INTERACTIVE
+)
+
+
+def current_priority() -> int:
+    """Приоритет вызовов текущего контекста (по умолчанию ``INTERACTIVE``)."""
+    return _priority.get()
+
+
+@contextmanager
+def priority_scope(priority: int) -> Iterator[None]:
+    """Задать приоритет ограничителей на время блока.
+
+    Args:
+        priority: ``INTERACTIVE``, ``BATCH`` или другое число (меньше — раньше)
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class QueueTimeout(DeadlineExceeded):
+    """Слот ограничителя не освободится в пределах допустимого ожидания."""
+
+
+class RateLimiter:
+    """Пропускает не более ``rate`` вызовов в секунду, равномерно.
+
+    Потоки, пришедшие раньше своего слота, ждут. ``rate <= 0`` отключает
+    ограничение.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Инициализировать ограничитель.
+
+        Args:
+            rate: Допустимое число вызовов в секунду
+            clock: Источник монотонного времени
+            sleep: Функция ожидания
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> float:
+        """Дождаться своего слота.
+
+        Returns:
+            Сколько секунд пришлось ждать
+        """
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class SharedRateLimiter:
+    """Маркерная корзина, общая для процессов хоста, с очередью по приоритету.
+
+    Состояние корзины и очередь ожидающих хранятся в SQLite; каждое
+    изменение выполняется в транзакции ``BEGIN IMMEDIATE``, поэтому
+    процессы не расходуют один маркер дважды. Маркер получает только
+    голова очереди: ожидающий с меньшим приоритетом, затем пришедший
+    раньше. Записи ожидающих, которые давно не обновлялись (процесс
+    упал), удаляются через ``stale_after`` секунд.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        burst: float = 1.0,
+        name: str = "default",
+        poll_interval: float = 1.0,
+        stale_after: float = 10.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Открыть (или создать) файл корзины.
+
+        Args:
+            path: Путь к файлу SQLite, общему для процессов
+            rate: Пополнение корзины, маркеров в секунду (<= 0 — без ограничения)
+            burst: Вместимость корзины (допустимый всплеск)
+            name: Имя корзины внутри файла
+            poll_interval: Предел паузы между проверками очереди, секунды
+            stale_after: Через сколько секунд без обновления запись ожидающего
+                считается брошенной
+            clock: Источник времени, общий для процессов
+            sleep: Функция ожидания
+            logger: Логгер
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.name = name
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._clock = clock
+        self._sleep = sleep
+        self._logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._fallback = RateLimiter(rate)
+        self._counters = {"acquired": 0, "timeouts": 0, "fallbacks": 0}
+        self._waited_seconds = 0.0
+        self._conn = sqlite3.connect(
+            path, timeout=10, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                " name TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_waiters ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " name TEXT NOT NULL,"
+                " priority INTEGER NOT NULL,"
+                " seen_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS rate_waiters_queue"
+                " ON rate_waiters (name, priority, id)"
+            )
+
+    def acquire(
+        self, priority: Optional[int] = None, max_wait: Optional[float] = None
+    ) -> float:
+        """Дождаться маркера в порядке очереди.
+
+        Если по оценке очереди маркер не достанется в пределах ``max_wait``
+        (и остатка бюджета запроса), ожидание не начинается.
+
+        Args:
+            priority: Приоритет (None — из ``priority_scope``)
+            max_wait: Предел ожидания, секунды (None — без предела)
+
+        Returns:
+            Сколько секунд пришлось ждать
+
+        Raises:
+            QueueTimeout: Если маркер не достанется вовремя
+        """
+        if self.rate <= 0:
+            return 0.0
+        priority = current_priority() if priority is None else priority
+        started = self._clock()
+        limit = max_wait
+        deadline = current_deadline()
+        if deadline is not None:
+            remaining = deadline.remaining()
+            limit = remaining if limit is None else min(limit, remaining)
+        try:
+            waiter = self._enqueue(priority, started)
+        except sqlite3.Error as e:
+            return self._acquire_locally(e)
+        acquired = False
+        try:
+            while True:
+                wait = self._try_take(waiter, priority)
+                waited = self._clock() - started
+                if wait is None:
+                    acquired = True
+                    self._record("acquired", waited)
+                    return waited
+                if limit is not None and waited + wait > limit:
+                    self._record("timeouts")
+                    raise QueueTimeout(
+                        f"Очередь {self.name!r}: слот через {wait:.2f} с,"
+                        f" допустимо ждать {max(0.0, limit - waited):.2f} с"
+                    )
+                self._sleep(min(wait, self.poll_interval))
+        except sqlite3.Error as e:
+            return self._acquire_locally(e)
+        finally:
+            if not acquired:
+                self._dequeue(waiter)
+
+    def stats(self) -> Dict[str, Any]:
+        """Счётчики этого процесса и текущее состояние общей корзины."""
+        with self._lock:
+            counters = dict(self._counters)
+            waited = self._waited_seconds
+            try:
+                queued = self._conn.execute(
+                    "SELECT COUNT(*) FROM rate_waiters WHERE name = ?", (self.name,)
+                ).fetchone()[0]
+            except sqlite3.Error:
+                queued = None
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            **counters,
+            "waited_seconds": round(waited, 3),
+            "queued": queued,
+        }
+
+    def _enqueue(self, priority: int, now: float) -> int:
+        """Встать в общую очередь; вернуть идентификатор записи."""
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO rate_waiters (name, priority, seen_at) VALUES (?, ?, ?)",
+                (self.name, priority, now),
+            )
+            return cur.lastrowid
+
+    def _dequeue(self, waiter: int) -> None:
+        """Покинуть очередь без маркера."""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM rate_waiters WHERE id = ?", (waiter,))
+        except sqlite3.Error as e:
+            self._logger.warning(f"Не удалось покинуть очередь {self.name!r}: {e}")
+
+    def _try_take(self, waiter: int, priority: int) -> Optional[float]:
+        """Взять маркер, если очередь дошла (None); иначе вернуть оценку ожидания."""
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = self._clock()
+                conn.execute(
+                    "DELETE FROM rate_waiters WHERE name = ? AND seen_at < ?",
+                    (self.name, now - self.stale_after),
+                )
+                # Запись могла быть удалена как брошенная, пока процесс спал
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_waiters (id, name, priority, seen_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (waiter, self.name, priority, now),
+                )
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM rate_buckets WHERE name = ?",
+                    (self.name,),
+                ).fetchone()
+                tokens = self.burst
+                if row is not None:
+                    elapsed = max(0.0, now - row[1])
+                    tokens = min(self.burst, row[0] + elapsed * self.rate)
+                ahead = conn.execute(
+                    "SELECT COUNT(*) FROM rate_waiters WHERE name = ?"
+                    " AND (priority < ? OR (priority = ? AND id < ?))",
+                    (self.name, priority, priority, waiter),
+                ).fetchone()[0]
+                if ahead == 0 and tokens >= 1.0:
+                    tokens -= 1.0
+                    wait = None
+                    conn.execute("DELETE FROM rate_waiters WHERE id = ?", (waiter,))
+                else:
+                    # Маркеры есть, но первыми их заберут стоящие впереди
+                    wait = max((ahead + 1.0 - tokens) / self.rate, 0.01)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (name, tokens, updated_at)"
+                    " VALUES (?, ?, ?)",
+                    (self.name, tokens, now),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def _acquire_locally(self, error: Exception) -> float:
+        """Файл корзины недоступен — ограничить частоту хотя бы в процессе."""
+        self._logger.warning(f"Общий ограничитель {self.name!r} недоступен: {error}")
+        self._record("fallbacks")
+        return self._fallback.acquire()
+
+    def _record(self, counter: str, waited: float = 0.0) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+            self._waited_seconds += waited
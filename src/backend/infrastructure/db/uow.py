@@ -1,7 +1,24 @@
-"""Реализация Unit of Work на базе SQLAlchemy для инфраструктурного слоя."""
+"""Реализация Unit of Work на базе SQLAlchemy для инфраструктурного слоя.
+
+Экземпляр ``SqlAlchemyUnitOfWork`` не хранит сессию на себе: состояние
+транзакции живёт в ``ContextVar``, то есть отдельно для каждого потока
+(и задачи asyncio). Поэтому один экземпляр, созданный в ``create_app``,
+безопасно делить между потоками сервера.
+
+Внутри области запроса (``begin_request_scope``/``end_request_scope``,
+их вызывают хуки Flask) все блоки ``with uow`` — в том числе разных
+сценариев и разных экземпляров UoW — используют одну сессию, которая
+закрывается в конце запроса. Вне запроса (CLI, фоновые пулы) каждый
+внешний блок ``with`` открывает и закрывает свою сессию.
+"""
 
 from __future__ import annotations
 
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from src.backend.domain.uow.uow_port import IUnitOfWork
@@ -10,50 +27,176 @@ from src.backend.infrastructure.repository import (
     SqlAlchemyPlaceRepository,
     SqlAlchemyUserRepository,
 )
+from src.backend.utils.deadline import current_deadline
+
+
+class _SessionScope:
+    """Сессия текущего потока/запроса и глубина вложенности ``with``."""
+
+    def __init__(self, request_scoped: bool) -> None:
+        self.request_scoped = request_scoped
+        self.session: Optional[Session] = None
+        self.place_repo: Optional[SqlAlchemyPlaceRepository] = None
+        self.user_repo: Optional[SqlAlchemyUserRepository] = None
+        self.depth = 0
+        self.token = None
+
+    def open(self, session_factory: Callable[[], Session]) -> Session:
+        """Создать сессию и репозитории при первом обращении."""
+        if self.session is None:
+            self.session = session_factory()
+            # Репозитории, привязанные к одной сессии
+            self.place_repo = SqlAlchemyPlaceRepository(self.session)
+            self.user_repo = SqlAlchemyUserRepository(self.session)
+        return self.session
+
+    def close(self) -> None:
+        """Закрыть сессию (незафиксированные изменения откатываются)."""
+        if self.session is not None:
+            self.session.close()
+        self.session = self.place_repo = self.user_repo = None
+
+
+_current_scope: ContextVar[Optional[_SessionScope]] = ContextVar(
+    "uow_session_scope", default=None
+)
+
+
+def begin_request_scope() -> None:
+    """Начать область запроса: дальнейшие UoW в этом контексте делят сессию."""
+    _current_scope.set(_SessionScope(request_scoped=True))
+
+
+def end_request_scope(exc: Optional[BaseException] = None) -> None:
+    """Завершить область запроса и закрыть её сессию, если она открывалась.
+
+    Args:
+        exc: Исключение запроса (сигнатура хука ``teardown_request``)
+    """
+    scope = _current_scope.get()
+    _current_scope.set(None)
+    if scope is not None:
+        scope.close()
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """Область запроса вне Flask (фоновые задачи, скрипты, тесты)."""
+    begin_request_scope()
+    try:
+        yield
+    finally:
+        end_request_scope()
 
 
 class SqlAlchemyUnitOfWork(IUnitOfWork):
     """Unit of Work на базе SQLAlchemy.
 
-    Создаёт сессию, предоставляет репозитории и управляет транзакцией.
+    Предоставляет репозитории текущей сессии и управляет транзакцией.
+    Транзакцию фиксирует или откатывает самый внешний блок ``with``;
+    вложенные блоки (сценарий, вызванный из другого сценария) входят в
+    неё. Если у запроса есть дедлайн, на PostgreSQL время выполнения
+    запросов транзакции ограничивается остатком бюджета
+    (``statement_timeout``).
     """
 
-    def __init__(self) -> None:
-        """Инициализировать Unit of Work."""
-        self.session: Session | None = None
-        self.place_repo = None
-        self.user_repo = None
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        """Инициализировать Unit of Work.
+
+        Args:
+            session_factory: Фабрика сессий SQLAlchemy
+        """
+        self._session_factory = session_factory
+
+    @property
+    def session(self) -> Session | None:
+        """Сессия текущего контекста (None вне блока ``with``)."""
+        scope = _current_scope.get()
+        return scope.session if scope is not None else None
+
+    @property
+    def place_repo(self) -> SqlAlchemyPlaceRepository | None:
+        """Репозиторий мест текущей сессии."""
+        scope = _current_scope.get()
+        return scope.place_repo if scope is not None else None
+
+    @property
+    def user_repo(self) -> SqlAlchemyUserRepository | None:
+        """Репозиторий пользователей текущей сессии."""
+        scope = _current_scope.get()
+        return scope.user_repo if scope is not None else None
 
     def __enter__(self) -> SqlAlchemyUnitOfWork:
-        """Войти в контекст и создать сессию."""
-        self.session = SessionLocal()
-        # Репозитории, привязанные к одной сессии
-        self.place_repo = SqlAlchemyPlaceRepository(self.session)
-        self.user_repo = SqlAlchemyUserRepository(self.session)
+        """Войти в контекст: взять сессию запроса или создать свою.
+
+        Raises:
+            DeadlineExceeded: Если бюджет времени запроса уже исчерпан
+        """
+        scope = _current_scope.get()
+        if scope is None:
+            scope = _SessionScope(request_scoped=False)
+            scope.token = _current_scope.set(scope)
+        if scope.depth == 0:
+            try:
+                self._begin(scope)
+            except BaseException:
+                self._release(scope)
+                raise
+        scope.depth += 1
         return self
 
     def __exit__(
         self, exc_type: type | None, exc: Exception | None, tb: object
     ) -> None:
-        """Выйти из контекста с commit/rollback и закрытием сессии."""
+        """Выйти из контекста; внешний блок делает commit/rollback."""
+        scope = _current_scope.get()
+        if scope is None:
+            return
+        scope.depth -= 1
+        if scope.depth > 0:
+            return
         try:
             if exc_type:
                 self.rollback()
             else:
-                self.commit()
+                try:
+                    self.commit()
+                except BaseException:
+                    self.rollback()
+                    raise
         finally:
-            if self.session is not None:
-                self.session.close()
-                self.session = None
+            self._release(scope)
 
     def commit(self) -> None:
         """Зафиксировать изменения в базе данных."""
-        if self.session is None:
+        session = self.session
+        if session is None:
             return
-        self.session.commit()
+        session.commit()
 
     def rollback(self) -> None:
         """Отменить все изменения в текущей транзакции."""
-        if self.session is None:
+        session = self.session
+        if session is None:
+            return
+        session.rollback()
+
+    def _begin(self, scope: _SessionScope) -> None:
+        """Открыть сессию области и ограничить транзакцию дедлайном."""
+        deadline = current_deadline()
+        timeout = deadline.timeout() if deadline is not None else None
+        session = scope.open(self._session_factory)
+        if timeout is not None and session.get_bind().dialect.name == "postgresql":
+            # SET LOCAL действует до конца текущей транзакции
+            session.execute(
+                text(f"SET LOCAL statement_timeout = {max(1, int(timeout * 1000))}")
+            )
+
+    @staticmethod
+    def _release(scope: _SessionScope) -> None:
+        """Закрыть собственную сессию блока; сессия запроса живёт до его конца."""
+        if scope.request_scoped:
             return
-        self.session.rollback()
+        scope.close()
+        if scope.token is not None:
+            _current_scope.reset(scope.token)
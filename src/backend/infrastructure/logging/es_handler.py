@@ -106,4 +106,5 @@ class ElasticsearchHandler(logging.Handler):
             "path": getattr(record, "path", None),
             "method": getattr(record, "method", None),
             "status_code": getattr(record, "status_code", None),
+            "llm": getattr(record, "llm", None),
         }
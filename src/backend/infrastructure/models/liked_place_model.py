@@ -1,17 +1,30 @@
 """SQLAlchemy-модель для понравившихся мест пользователя."""
 
-from sqlalchemy import Column, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, Float, ForeignKey, Integer, String, UniqueConstraint
 
 from src.backend.infrastructure.db.Base import Base
 
+# Знаков после запятой у хранимых координат (~0.1 м)
+COORDINATE_PRECISION = 6
+
 
 class LikedPlace(Base):
-    """Таблица ``liked_places`` с привязкой к пользователю."""
+    """Таблица ``liked_places`` с привязкой к пользователю.
+
+    Координаты хранятся округлёнными до ``COORDINATE_PRECISION`` знаков,
+    поэтому одно место пользователя — одна строка (уникальный ключ
+    ``user_id, latitude, longitude``).
+    """
 
     __tablename__ = "liked_places"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "latitude", "longitude", name="uq_liked_places_user_coords"
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     city_name = Column(String(100), nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
@@ -0,0 +1,214 @@
+"""Реестр бэкендов сервиса ИИ с ленивой загрузкой.
+
+Бэкенд (``remote`` — Hugging Face Inference, ``local`` — модель Transformers
+в процессе) выбирается конфигурацией. Тяжёлые модули бэкенда импортируются
+и веса загружаются только при первом вызове сервиса; реестр запоминает,
+сколько времени ушло на импорт и на загрузку.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from src.backend.domain.services.ai.ai_port import IAIService
+
+
+class _Backend:
+    """Описание бэкенда и замеры его загрузки."""
+
+    def __init__(
+        self, name: str, build: Callable[[], IAIService], modules: Sequence[str]
+    ) -> None:
+        self.name = name
+        self.build = build
+        self.modules = tuple(modules)
+        self.instance: IAIService | None = None
+        self.import_seconds: float | None = None
+        self.load_seconds: float | None = None
+        self.error: str | None = None
+
+
+class AIBackendRegistry:
+    """Реестр именованных бэкендов IAIService."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
+        """Создать пустой реестр."""
+        self._backends: Dict[str, _Backend] = {}
+        self._lock = threading.Lock()
+        self._logger = logger or logging.getLogger(__name__)
+
+    def register(
+        self,
+        name: str,
+        build: Callable[[], IAIService],
+        import_modules: Sequence[str] = (),
+    ) -> None:
+        """Зарегистрировать бэкенд.
+
+        Args:
+            name: Имя бэкенда (значение AI_BACKEND)
+            build: Фабрика сервиса; вызывается один раз при первом обращении
+            import_modules: Тяжёлые модули, импорт которых замеряется отдельно
+        """
+        self._backends[name] = _Backend(name, build, import_modules)
+
+    def names(self) -> list[str]:
+        """Имена зарегистрированных бэкендов."""
+        return list(self._backends)
+
+    def get(self, name: str) -> "LazyAIService":
+        """Вернуть ленивый сервис бэкенда (без загрузки).
+
+        Raises:
+            ValueError: Если бэкенд не зарегистрирован
+        """
+        if name not in self._backends:
+            raise ValueError(
+                f"Неизвестный бэкенд ИИ '{name}'; доступны: {', '.join(self.names())}"
+            )
+        return LazyAIService(
+            lambda: self.load(name), peek=lambda: self._backends[name].instance
+        )
+
+    def load(self, name: str) -> IAIService:
+        """Загрузить бэкенд при первом вызове и вернуть его экземпляр."""
+        backend = self._backends[name]
+        if backend.instance is not None:
+            return backend.instance
+        with self._lock:
+            if backend.instance is not None:
+                return backend.instance
+            started = time.perf_counter()
+            try:
+                for module in backend.modules:
+                    importlib.import_module(module)
+                imported = time.perf_counter()
+                instance = backend.build()
+            except Exception as e:
+                backend.error = str(e)
+                self._logger.error(f"Не удалось загрузить бэкенд ИИ '{name}': {e}")
+                raise
+            loaded = time.perf_counter()
+            backend.import_seconds = round(imported - started, 3)
+            backend.load_seconds = round(loaded - imported, 3)
+            backend.instance = instance
+            self._logger.info(
+                f"Бэкенд ИИ '{name}' загружен: импорт {backend.import_seconds} с, "
+                f"загрузка {backend.load_seconds} с"
+            )
+            return instance
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Состояние бэкендов: загружен ли, время импорта и загрузки."""
+        return {
+            name: {
+                "loaded": backend.instance is not None,
+                "import_seconds": backend.import_seconds,
+                "load_seconds": backend.load_seconds,
+                "error": backend.error,
+            }
+            for name, backend in self._backends.items()
+        }
+
+
+class LazyAIService(IAIService):
+    """Сервис ИИ, создающий реальный бэкенд при первом вызове.
+
+    Методы порта и дополнительные методы бэкенда (через ``__getattr__``)
+    делегируются загруженному экземпляру.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], IAIService],
+        peek: Optional[Callable[[], IAIService | None]] = None,
+    ) -> None:
+        """Запомнить загрузчик бэкенда.
+
+        Args:
+            loader: Загрузка бэкенда (при первом вызове)
+            peek: Уже загруженный бэкенд или None — без загрузки
+        """
+        self._loader = loader
+        self._peek = peek
+
+    @property
+    def backend(self) -> IAIService:
+        """Загруженный бэкенд (загружается при первом обращении)."""
+        return self._loader()
+
+    def __getattr__(self, name: str) -> Any:
+        """Делегировать методы, отсутствующие в порте (например, stats)."""
+        if name.startswith("__") or name in ("_loader", "_peek"):
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    def single_flight_stats(self) -> Optional[Dict[str, int]]:
+        """Счётчики объединения запросов бэкенда; None, если он не загружен."""
+        backend = self._peek() if self._peek is not None else None
+        stats = getattr(backend, "single_flight_stats", None)
+        return stats() if callable(stats) else None
+
+    def get_place_info(self, latitude: float, longitude: float) -> str:
+        """Краткое описание места по координатам."""
+        return self.backend.get_place_info(latitude, longitude)
+
+    def get_travel_recommendation(self, liked_places_str: str) -> str:
+        """Рекомендация на основе понравившихся мест."""
+        return self.backend.get_travel_recommendation(liked_places_str)
+
+    def chat(self, messages: list[dict[str, str]]) -> str:
+        """Ответ ассистента на диалог."""
+        return self.backend.chat(messages)
+
+    def chat_stream(self, messages: list[dict[str, str]]) -> Iterator[str]:
+        """Потоковый ответ ассистента."""
+        return self.backend.chat_stream(messages)
+
+    def summarize_dialog(
+        self, messages: list[dict[str, str]], previous_summary: str | None = None
+    ) -> str:
+        """Краткое содержание части диалога."""
+        return self.backend.summarize_dialog(messages, previous_summary)
+
+    def get_place_info_with_address(
+        self, address: str | None, latitude: float, longitude: float
+    ) -> str:
+        """Описание места по адресу и координатам."""
+        return self.backend.get_place_info_with_address(address, latitude, longitude)
+
+    def get_place_info_with_address_and_prefs(
+        self,
+        address: str | None,
+        latitude: float,
+        longitude: float,
+        liked_places_str: str | None = None,
+    ) -> str:
+        """Описание места с учётом предпочтений пользователя."""
+        return self.backend.get_place_info_with_address_and_prefs(
+            address, latitude, longitude, liked_places_str=liked_places_str
+        )
+
+    def normalize_location_query(self, user_text: str) -> str:
+        """Нормализация поискового запроса для геокодинга."""
+        return self.backend.normalize_location_query(user_text)
+
+    def get_cached_place_info(self, latitude: float, longitude: float) -> str | None:
+        """Описание места из кэша бэкенда."""
+        return self.backend.get_cached_place_info(latitude, longitude)
+
+    async def get_place_info_async(self, latitude: float, longitude: float) -> str:
+        """Асинхронный вариант ``get_place_info``."""
+        return await self.backend.get_place_info_async(latitude, longitude)
+
+    async def get_travel_recommendation_async(self, liked_places_str: str) -> str:
+        """Асинхронный вариант ``get_travel_recommendation``."""
+        return await self.backend.get_travel_recommendation_async(liked_places_str)
+
+    async def chat_async(self, messages: list[dict[str, str]]) -> str:
+        """Асинхронный вариант ``chat``."""
+        return await self.backend.chat_async(messages)
@@ -0,0 +1,278 @@
+"""Метрики вызовов LLM: задержки, токены, ошибки и пустые ответы.
+
+Каждый запрос к провайдеру учитывается в серии (метод сервиса, провайдер,
+модель): гистограмма задержек с фиксированными корзинами, число вызовов,
+ошибок и пустых ответов, токены промпта и ответа. Токены берутся из поля
+``usage`` ответа, а если провайдер его не вернул — оцениваются по длине
+текста. Те же поля пишутся в лог как структурированное поле ``llm``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Верхние границы корзин гистограммы задержек, секунды
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+    20.0,
+    30.0,
+    60.0,
+)
+
+OUTCOME_OK = "ok"
+OUTCOME_EMPTY = "empty"
+OUTCOME_ERROR = "error"
+
+SeriesKey = Tuple[str, str, str]
+
+
+class _Series:
+    """Накопленные значения одной серии (метод, провайдер, модель)."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.bucket_counts = [0] * (len(buckets) + 1)  # последняя — +Inf
+        self.calls = 0
+        self.errors = 0
+        self.empty = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.estimated_calls = 0
+
+
+class LLMMetrics:
+    """Потокобезопасный реестр метрик вызовов LLM в памяти процесса."""
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        chars_per_token: float = 3.0,
+        log_calls: bool = True,
+    ) -> None:
+        """Создать пустой реестр.
+
+        Args:
+            buckets: Верхние границы корзин гистограммы задержек (секунды)
+            chars_per_token: Символов на токен для оценки без ``usage``
+            log_calls: Писать ли каждый вызов в лог с полем ``llm``
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.chars_per_token = chars_per_token
+        self.log_calls = log_calls
+        self._series: Dict[SeriesKey, _Series] = {}
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        method: str,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        logger: Optional[logging.Logger] = None,
+    ) -> "LLMCall":
+        """Начать замер одного вызова модели."""
+        return LLMCall(
+            self, method, provider, model, messages, logger if self.log_calls else None
+        )
+
+    def estimate_tokens(self, text: str) -> int:
+        """Оценить число токенов текста по его длине."""
+        return math.ceil(len(text or "") / self.chars_per_token)
+
+    def record(
+        self,
+        method: str,
+        provider: str,
+        model: str,
+        latency: float,
+        outcome: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        estimated: bool = False,
+    ) -> None:
+        """Учесть завершённый вызов.
+
+        Args:
+            method: Метод сервиса ИИ (chat, get_place_info, ...)
+            provider: Провайдер инференса
+            model: Модель
+            latency: Длительность вызова, секунды
+            outcome: OUTCOME_OK, OUTCOME_EMPTY или OUTCOME_ERROR
+            prompt_tokens: Токены промпта
+            completion_tokens: Токены ответа
+            estimated: Токены оценены по длине текста, а не взяты из ``usage``
+        """
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if latency <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self._series.get((method, provider, model))
+            if series is None:
+                series = _Series(self.buckets)
+                self._series[(method, provider, model)] = series
+            series.calls += 1
+            series.bucket_counts[index] += 1
+            series.latency_sum += latency
+            series.latency_max = max(series.latency_max, latency)
+            series.prompt_tokens += prompt_tokens
+            series.completion_tokens += completion_tokens
+            if estimated:
+                series.estimated_calls += 1
+            if outcome == OUTCOME_ERROR:
+                series.errors += 1
+            elif outcome == OUTCOME_EMPTY:
+                series.empty += 1
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Срез всех серий: счётчики, токены, корзины и перцентили задержек."""
+        with self._lock:
+            items = [
+                (key, list(s.bucket_counts), dict(vars(s)))
+                for key, s in sorted(self._series.items())
+            ]
+        result = []
+        for (method, provider, model), counts, values in items:
+            calls = values["calls"]
+            bounds = [str(b) for b in self.buckets] + ["+Inf"]
+            result.append(
+                {
+                    "method": method,
+                    "provider": provider,
+                    "model": model,
+                    "calls": calls,
+                    "errors": values["errors"],
+                    "empty": values["empty"],
+                    "prompt_tokens": values["prompt_tokens"],
+                    "completion_tokens": values["completion_tokens"],
+                    "estimated_token_calls": values["estimated_calls"],
+                    "latency_ms": {
+                        "avg": round(values["latency_sum"] / calls * 1000, 1),
+                        "max": round(values["latency_max"] * 1000, 1),
+                        "p50": self._quantile_ms(counts, 0.50, values["latency_max"]),
+                        "p95": self._quantile_ms(counts, 0.95, values["latency_max"]),
+                        "p99": self._quantile_ms(counts, 0.99, values["latency_max"]),
+                    },
+                    "latency_buckets": dict(zip(bounds, counts)),
+                }
+            )
+        return result
+
+    def reset(self) -> None:
+        """Сбросить все серии."""
+        with self._lock:
+            self._series.clear()
+
+    def _quantile_ms(self, counts: List[int], q: float, latency_max: float) -> float:
+        """Оценка перцентиля: верхняя граница корзины, куда он попадает.
+
+        Для последней корзины (+Inf) берётся максимальная задержка.
+        """
+        rank = q * sum(counts)
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if count and seen >= rank:
+                if i < len(self.buckets):
+                    bound = min(self.buckets[i], latency_max)
+                    return round(bound * 1000, 1)
+                break
+        return round(latency_max * 1000, 1)
+
+
+class LLMCall:
+    """Замер одного вызова модели; завершается ``succeed`` или ``fail``."""
+
+    def __init__(
+        self,
+        metrics: LLMMetrics,
+        method: str,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        logger: Optional[logging.Logger],
+    ) -> None:
+        self.metrics = metrics
+        self.method = method
+        self.provider = provider
+        self.model = model
+        self.messages = messages
+        self.logger = logger
+        self.started = time.perf_counter()
+
+    def succeed(
+        self,
+        text: str,
+        usage: Any = None,
+        served_by: Optional[Tuple[str, str]] = None,
+    ) -> None:
+        """Учесть успешный вызов.
+
+        Args:
+            text: Текст ответа (пустой — учитывается как пустой ответ)
+            usage: Поле ``usage`` ответа провайдера, если есть
+            served_by: Фактические (провайдер, модель) при переключении
+        """
+        if served_by:
+            self.provider, self.model = served_by
+        self._finish(OUTCOME_OK if text else OUTCOME_EMPTY, text, usage)
+
+    def fail(self, error: BaseException) -> None:
+        """Учесть вызов, завершившийся исключением."""
+        self._finish(OUTCOME_ERROR, "", None, error=type(error).__name__)
+
+    def _finish(
+        self, outcome: str, text: str, usage: Any, error: Optional[str] = None
+    ) -> None:
+        """Записать серию и структурированное поле лога."""
+        latency = time.perf_counter() - self.started
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        estimated = prompt_tokens is None or completion_tokens is None
+        if prompt_tokens is None:
+            prompt_tokens = sum(
+                self.metrics.estimate_tokens(m.get("content", ""))
+                for m in self.messages
+            )
+        if completion_tokens is None:
+            completion_tokens = self.metrics.estimate_tokens(text)
+        self.metrics.record(
+            self.method,
+            self.provider,
+            self.model,
+            latency,
+            outcome,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            estimated=estimated,
+        )
+        if self.logger is None:
+            return
+        fields = {
+            "method": self.method,
+            "provider": self.provider,
+            "model": self.model,
+            "outcome": outcome,
+            "latency_ms": round(latency * 1000, 1),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_estimated": estimated,
+        }
+        if error:
+            fields["error"] = error
+        self.logger.info(
+            f"LLM {self.method}: {outcome} за {fields['latency_ms']} мс",
+            extra={"llm": fields},
+        )
@@ -0,0 +1,133 @@
+"""Промпты сервиса ИИ, общие для синхронной и асинхронной реализаций."""
+
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional
+
+Messages = List[Dict[str, str]]
+
+CHAT_SYSTEM_PREAMBLE = {
+    "role": "system",
+    "content": (
+        "Ты — вежливый, лаконичный и полезный помощник. "
+        "Отвечай по-русски, будь точен и старайся давать "
+        "практичные ответы."
+    ),
+}
+
+
+def prompt_key(model: Optional[str], messages: Messages) -> str:
+    """Ключ нормализованного промпта (модель + схлопнутые пробелы)."""
+    normalized = [
+        [m.get("role", ""), re.sub(r"\s+", " ", m.get("content", "")).strip()]
+        for m in messages
+    ]
+    raw = json.dumps([model, normalized], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def chat_messages(messages: Messages) -> Messages:
+    """Диалог пользователя с системной преамбулой ассистента."""
+    return [CHAT_SYSTEM_PREAMBLE] + messages
+
+
+def normalize_query_messages(text: str) -> Messages:
+    """Промпт выделения краткого поискового запроса по локации."""
+    return [
+        {
+            "role": "system",
+            "content": (
+                "Ты помощник, который выделяет краткий поисковый запрос по "
+                "локации. Верни только название места/города/региона/адреса "
+                "на русском или латиницей, без дополнительных слов, до 50 "
+                "символов."
+            ),
+        },
+        {"role": "user", "content": text},
+    ]
+
+
+def place_info_messages(latitude: float, longitude: float) -> Messages:
+    """Промпт краткого описания места по координатам."""
+    prompt = (
+        f"Координаты: широта {latitude}, долгота {longitude}. "
+        f"Дай краткое, интересное и полезное описание для туриста (до 100 слов)."
+    )
+    return [
+        {
+            "role": "system",
+            "content": (
+                "Ты туристический ассистент. Пиши кратко и по делу на русском."
+            ),
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def place_info_with_prefs_messages(
+    address: str,
+    latitude: float,
+    longitude: float,
+    liked_places_str: str | None = None,
+) -> Messages:
+    """Промпт описания места по адресу OSM с учётом предпочтений."""
+    sys = "Ты туристический ассистент. Пиши по-русски, лаконично, без воды."
+    if liked_places_str:
+        sys += (
+            " Учитывай предпочтения пользователя (ему нравятся: "
+            + liked_places_str
+            + ") при выборе акцентов: климат, активности, стиль места."
+        )
+    user_prompt = (
+        "Вот данные о месте. Сначала используй адрес, затем координаты. "
+        "Сформируй краткое, содержательное описание для туриста (до 100 слов), "
+        "упомяни ориентиры, район/город и чем интересно это место.\n\n"
+        f"Адрес (OSM): {address}\n"
+        f"Координаты: широта {latitude}, долгота {longitude}"
+    )
+    return [
+        {"role": "system", "content": sys},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def place_info_with_address_messages(
+    address: str, latitude: float, longitude: float
+) -> Messages:
+    """Промпт описания места по адресу OSM и координатам."""
+    user_prompt = (
+        "Вот данные о месте. Сначала используй адрес, затем координаты. "
+        "Сформируй краткое, содержательное описание для туриста (до 100 слов), "
+        "упомяни ключевые ориентиры, район/город и чем интересно это место.\n\n"
+        f"Адрес (OSM): {address}\n"
+        f"Координаты: широта {latitude}, долгота {longitude}"
+    )
+    return [
+        {
+            "role": "system",
+            "content": (
+                "Ты туристический ассистент. Пиши по-русски, лаконично, "
+                "без воды. Если адрес точный — опирайся на него."
+            ),
+        },
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def travel_recommendation_messages(liked_places_str: str) -> Messages:
+    """Промпт рекомендации нового направления по понравившимся местам."""
+    prompt = (
+        "Мне нравятся следующие места: "
+        + liked_places_str
+        + ". Предложи новое направление и кратко объясни выбор (100–150 слов)."
+    )
+    return [
+        {
+            "role": "system",
+            "content": (
+                "Ты эксперт по путешествиям. Учитывай предпочтения пользователя."
+            ),
+        },
+        {"role": "user", "content": prompt},
+    ]
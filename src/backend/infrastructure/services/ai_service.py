@@ -4,12 +4,41 @@ This module provides AI-powered functionality for the travel application,
 including chat responses, location descriptions, and travel recommendations.
 """
 
+import contextvars
 import logging
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
 
 from huggingface_hub import InferenceClient
 
 from src.backend.domain.services.ai.ai_port import IAIService
+from src.backend.infrastructure.cache import LRUCache
+from src.backend.infrastructure.cache.single_flight import SingleFlight
+from src.backend.infrastructure.client.failover import (
+    FailoverInferenceClient,
+    create_failover_client,
+)
+from src.backend.infrastructure.client.hf_inference import client_options
+from src.backend.infrastructure.services import ai_prompts
+from src.backend.infrastructure.services.ai_metrics import LLMMetrics
+from src.backend.infrastructure.services.location_query import (
+    MAX_QUERY_LENGTH,
+    fold_query,
+    quick_location_query,
+)
+from src.backend.utils.deadline import DeadlineExceeded, current_deadline
+
+T = TypeVar("T")
+
+AI_ERROR_MESSAGE = "Произошла ошибка сервиса ИИ."
+AI_EMPTY_PLACE_MESSAGE = "Не удалось получить информацию о месте."
+AI_EMPTY_RECOMMENDATION_MESSAGE = "Не удалось получить рекомендации."
+# Ответы-заглушки при сбоях/пустых ответах: их нельзя кэшировать
+AI_FAILURE_MESSAGES = frozenset(
+    {AI_ERROR_MESSAGE, AI_EMPTY_PLACE_MESSAGE, AI_EMPTY_RECOMMENDATION_MESSAGE}
+)
+AI_CHAT_ERROR_MESSAGE = "Не удалось получить ответ. Попробуйте позже."
 
 
 class AIService(IAIService):
@@ -24,21 +53,41 @@ class AIService(IAIService):
         _client: Hugging Face InferenceClient instance
         _model: Model name to use for inference
         _logger: Logger instance for error tracking
+        _single_flight: Group coalescing identical in-flight prompts
+        _metrics: Per-call latency, token and error metrics
+        _query_cache: LRU of normalized location queries by folded input
+        _deadline_executor: Threads running calls bounded by a request deadline
     """
 
     def __init__(
-        self, config: Optional[Dict] = None, logger: Optional[logging.Logger] = None
+        self,
+        config: Optional[Dict] = None,
+        logger: Optional[logging.Logger] = None,
+        metrics: Optional[LLMMetrics] = None,
     ) -> None:
         """Initialize AIService with configuration and logger.
 
         Args:
             config: Configuration dictionary with HF_TOKEN, HF_PROVIDER, HF_MODEL
+                and optionally HF_PROVIDERS (ordered failover list) or
+                HF_BASE_URL (OpenAI-compatible server instead of a provider)
             logger: Logger instance for error tracking
+            metrics: Registry of per-call LLM metrics (a private one if omitted)
         """
         self._cfg = config or {}
         self._client: Optional[InferenceClient] = None
         self._model: Optional[str] = None
         self._logger = logger or logging.getLogger(__name__)
+        self._single_flight = SingleFlight()
+        self._metrics = metrics or LLMMetrics()
+        self._query_cache = LRUCache(
+            max_size=int(self._cfg.get("NORMALIZE_QUERY_CACHE_SIZE", 2048)),
+            name="normalize_query",
+        )
+        self._deadline_executor = ThreadPoolExecutor(
+            max_workers=int(self._cfg.get("AI_DEADLINE_WORKERS", 32)),
+            thread_name_prefix="ai-deadline",
+        )
 
     def _ensure_client(self) -> InferenceClient:
         """Lazily create and return InferenceClient instance.
@@ -53,14 +102,108 @@ class AIService(IAIService):
             return self._client
         cfg = self._cfg
         token = cfg.get("HF_TOKEN")
-        provider = cfg.get("HF_PROVIDER", "fireworks-ai")
         model = cfg.get("HF_MODEL", "openai/gpt-oss-120b")
         if not token:
             raise RuntimeError("HF_TOKEN не задан в конфигурации")
-        self._client = InferenceClient(provider=provider, api_key=token)
+        if cfg.get("HF_PROVIDERS"):
+            # Несколько провайдеров: переключение с размыкателями цепи
+            self._client = create_failover_client(cfg, logger=self._logger)
+        else:
+            self._client = InferenceClient(**client_options(cfg))
         self._model = model
         return self._client
 
+    def provider_stats(self) -> Dict:
+        """Статистика провайдеров (размыкатели, задержки, хеджирование)."""
+        client = self._client
+        if isinstance(client, FailoverInferenceClient):
+            return client.stats()
+        return {}
+
+    def metrics(self) -> LLMMetrics:
+        """Return the registry of per-call LLM metrics."""
+        return self._metrics
+
+    def _provider_name(self) -> str:
+        """Provider label for metrics ("failover" for a provider list)."""
+        if self._cfg.get("HF_PROVIDERS"):
+            return "failover"
+        return self._cfg.get("HF_PROVIDER", "fireworks-ai")
+
+    def _complete(self, messages: List[Dict[str, str]], method: str) -> str:
+        """Run one chat completion and return the answer text.
+
+        The call is recorded in the metrics under ``method``.
+
+        Args:
+            messages: Prompt messages with role and content
+            method: Name of the service method issuing the call
+
+        Returns:
+            Answer text or empty string if the model returned no choices
+        """
+        client = self._ensure_client()
+        model = self._model or "openai/gpt-oss-120b"
+        call = self._metrics.start(
+            method, self._provider_name(), model, messages, self._logger
+        )
+        try:
+            completion = client.chat.completions.create(model=model, messages=messages)
+        except Exception as e:
+            call.fail(e)
+            raise
+        text = completion.choices[0].message["content"] if completion.choices else ""
+        call.succeed(
+            text or "",
+            usage=getattr(completion, "usage", None),
+            served_by=getattr(completion, "served_by", None),
+        )
+        return text
+
+    def _complete_shared(self, messages: List[Dict[str, str]], method: str) -> str:
+        """Run a completion, sharing it with concurrent identical prompts.
+
+        Concurrent callers with the same normalized prompt wait for a single
+        upstream call and receive its result (or its exception).
+        """
+        return self._within_deadline(
+            lambda: self._single_flight.do(
+                self._prompt_key(messages), lambda: self._complete(messages, method)
+            )
+        )
+
+    def _within_deadline(self, fn: Callable[[], T]) -> T:
+        """Run ``fn`` but stop waiting once the request deadline passes.
+
+        Without an active deadline ``fn`` runs in the caller's thread. With
+        one, it runs on a worker thread and the caller waits at most for the
+        remaining budget; the abandoned call finishes in the background (its
+        result still reaches single-flight waiters and the metrics).
+
+        Raises:
+            DeadlineExceeded: If the budget is spent before ``fn`` returns
+        """
+        deadline = current_deadline()
+        if deadline is None:
+            return fn()
+        timeout = deadline.timeout()
+        future = self._deadline_executor.submit(contextvars.copy_context().run, fn)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(
+                f"Бюджет запроса {deadline.budget} с исчерпан в ожидании ИИ"
+            ) from None
+
+    def _prompt_key(self, messages: List[Dict[str, str]]) -> str:
+        """Build a key of the normalized prompt (model + collapsed whitespace)."""
+        return ai_prompts.prompt_key(self._model, messages)
+
+    def single_flight_stats(self) -> Dict[str, int]:
+        """Return counters of executed and coalesced upstream calls."""
+        return self._single_flight.stats()
+
     def chat(self, messages: List[Dict[str, str]]) -> str:
         """Generate AI assistant response to chat messages.
 
@@ -72,91 +215,114 @@ class AIService(IAIService):
         """
         if not messages:
             return "Пожалуйста, задайте вопрос."
+        self._ensure_client()
+        try:
+            return self._within_deadline(
+                lambda: self._complete(ai_prompts.chat_messages(messages), "chat")
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            self._logger.error(f"Ошибка чата ИИ: {e}", exc_info=True)
+            return AI_CHAT_ERROR_MESSAGE
+
+    def chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream AI assistant response to chat messages token by token.
+
+        Args:
+            messages: List of chat messages with role and content
+
+        Yields:
+            Text fragments of the response as the provider produces them
+
+        Raises:
+            Exception: If the stream breaks after part of the answer was sent
+        """
+        if not messages:
+            yield "Пожалуйста, задайте вопрос."
+            return
         client = self._ensure_client()
-        system_preamble = {
-            "role": "system",
-            "content": (
-                "Ты — вежливый, лаконичный и полезный помощник. "
-                "Отвечай по-русски, будь точен и старайся давать "
-                "практичные ответы."
-            ),
-        }
-        payload = [system_preamble] + messages
+        payload = ai_prompts.chat_messages(messages)
+        model = self._model or "openai/gpt-oss-120b"
+        call = self._metrics.start(
+            "chat_stream", self._provider_name(), model, payload, self._logger
+        )
+        parts: List[str] = []
+        usage = None
+        produced = False
         try:
-            completion = client.chat.completions.create(
-                model=self._model or "openai/gpt-oss-120b",
+            stream = client.chat.completions.create(
+                model=model,
                 messages=payload,
+                stream=True,
             )
-            if completion.choices:
-                return completion.choices[0].message["content"]
-            return ""
+            for chunk in stream:
+                usage = getattr(chunk, "usage", None) or usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                text = delta.content if delta is not None else None
+                if text:
+                    produced = True
+                    parts.append(text)
+                    yield text
+            call.succeed("".join(parts), usage=usage)
         except Exception as e:
-            self._logger.error(f"Ошибка чата ИИ: {e}", exc_info=True)
-            return "Не удалось получить ответ. Попробуйте позже."
+            call.fail(e)
+            self._logger.error(f"Ошибка потокового чата ИИ: {e}", exc_info=True)
+            if produced:
+                # Обрыв посреди ответа: сообщаем вызывающему, чтобы не сохранять
+                # усечённый текст как полноценный ответ ассистента
+                raise
+            yield AI_CHAT_ERROR_MESSAGE
 
     def normalize_location_query(self, user_text: str) -> str:
-        """Кратко нормализует запрос о локации для геокодинга (до 50 символов)."""
+        """Кратко нормализует запрос о локации для геокодинга (до 50 символов).
+
+        Координаты и короткие названия мест возвращаются без обращения
+        к модели; ответы модели кэшируются по свёрнутому тексту запроса.
+        """
         text = (user_text or "").strip()
         if not text:
             return ""
-        client = self._ensure_client()
+        quick = quick_location_query(text)
+        if quick is not None:
+            return quick
+        key = fold_query(text)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+        self._ensure_client()
         try:
-            completion = client.chat.completions.create(
-                model=self._model or "openai/gpt-oss-120b",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "Ты помощник, который выделяет краткий поисковый запрос по "
-                            "локации. Верни только название места/города/региона/адреса "
-                            "на русском или латиницей, без дополнительных слов, до 50 "
-                            "символов."
-                        ),
-                    },
-                    {"role": "user", "content": text},
-                ],
+            answer = self._complete_shared(
+                ai_prompts.normalize_query_messages(text), "normalize_location_query"
             )
-            query = (
-                completion.choices[0].message["content"].strip()
-                if completion.choices
-                else ""
-            )
-            return query[:50]
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self._logger.error(f"Ошибка normalize_location_query: {e}", exc_info=True)
             return ""
+        result = answer.strip()[:MAX_QUERY_LENGTH]
+        if result:
+            self._query_cache.set(key, result)
+        return result
 
     def get_place_info(self, latitude: float, longitude: float) -> str:
         """Краткое описание места по координатам (на русском)."""
-        prompt = (
-            f"Координаты: широта {latitude}, долгота {longitude}. "
-            f"Дай краткое, интересное и полезное описание для туриста (до 100 слов)."
-        )
-        client = self._ensure_client()
+        self._ensure_client()
         try:
-            completion = client.chat.completions.create(
-                model=self._model or "openai/gpt-oss-120b",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "Ты туристический ассистент. Пиши кратко и по делу на "
-                            "русском."
-                        ),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-            )
-            text = (
-                completion.choices[0].message["content"] if completion.choices else ""
+            text = self._complete_shared(
+                ai_prompts.place_info_messages(latitude, longitude), "get_place_info"
             )
             if not text:
                 self._logger.warning("Пустой ответ от модели на get_place_info")
-                return "Не удалось получить информацию о месте."
+                return AI_EMPTY_PLACE_MESSAGE
             return text
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self._logger.error(f"Ошибка генерации get_place_info: {e}", exc_info=True)
-            return "Произошла ошибка сервиса ИИ."
+            return AI_ERROR_MESSAGE
 
     def get_place_info_with_address_and_prefs(
         self,
@@ -174,44 +340,28 @@ class AIService(IAIService):
                 )
             return base_text
 
-        client = self._ensure_client()
-        sys = "Ты туристический ассистент. Пиши по-русски, лаконично, без воды."
-        if liked_places_str:
-            sys += (
-                " Учитывай предпочтения пользователя (ему нравятся: "
-                + liked_places_str
-                + ") при выборе акцентов: климат, активности, стиль места."
-            )
-        user_prompt = (
-            "Вот данные о месте. Сначала используй адрес, затем координаты. "
-            "Сформируй краткое, содержательное описание для туриста (до 100 слов), "
-            "упомяни ориентиры, район/город и чем интересно это место.\n\n"
-            f"Адрес (OSM): {address}\n"
-            f"Координаты: широта {latitude}, долгота {longitude}"
-        )
+        self._ensure_client()
         try:
-            completion = client.chat.completions.create(
-                model=self._model or "openai/gpt-oss-120b",
-                messages=[
-                    {"role": "system", "content": sys},
-                    {"role": "user", "content": user_prompt},
-                ],
-            )
-            text = (
-                completion.choices[0].message["content"] if completion.choices else ""
+            text = self._complete_shared(
+                ai_prompts.place_info_with_prefs_messages(
+                    address, latitude, longitude, liked_places_str
+                ),
+                "get_place_info_with_address_and_prefs",
             )
             if not text:
                 self._logger.warning(
                     "Пустой ответ от модели на get_place_info_with_address_and_prefs"
                 )
-                return "Не удалось получить информацию о месте."
+                return AI_EMPTY_PLACE_MESSAGE
             return text
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self._logger.error(
                 f"Ошибка генерации get_place_info_with_address_and_prefs: {e}",
                 exc_info=True,
             )
-            return "Произошла ошибка сервиса ИИ."
+            return AI_ERROR_MESSAGE
 
     def get_place_info_with_address(
         self, address: str | None, latitude: float, longitude: float
@@ -220,76 +370,46 @@ class AIService(IAIService):
         if not address:
             return self.get_place_info(latitude, longitude)
 
-        client = self._ensure_client()
-        user_prompt = (
-            "Вот данные о месте. Сначала используй адрес, затем координаты. "
-            "Сформируй краткое, содержательное описание для туриста (до 100 слов), "
-            "упомяни ключевые ориентиры, район/город и чем интересно это место.\n\n"
-            f"Адрес (OSM): {address}\n"
-            f"Координаты: широта {latitude}, долгота {longitude}"
-        )
+        self._ensure_client()
         try:
-            completion = client.chat.completions.create(
-                model=self._model or "openai/gpt-oss-120b",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "Ты туристический ассистент. Пиши по-русски, лаконично, "
-                            "без воды. Если адрес точный — опирайся на него."
-                        ),
-                    },
-                    {"role": "user", "content": user_prompt},
-                ],
-            )
-            text = (
-                completion.choices[0].message["content"] if completion.choices else ""
+            text = self._complete_shared(
+                ai_prompts.place_info_with_address_messages(
+                    address, latitude, longitude
+                ),
+                "get_place_info_with_address",
             )
             if not text:
                 self._logger.warning(
                     "Пустой ответ от модели на get_place_info_with_address"
                 )
-                return "Не удалось получить информацию о месте."
+                return AI_EMPTY_PLACE_MESSAGE
             return text
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self._logger.error(
                 f"Ошибка генерации get_place_info_with_address: {e}", exc_info=True
             )
-            return "Произошла ошибка сервиса ИИ."
+            return AI_ERROR_MESSAGE
 
     def get_travel_recommendation(self, liked_places_str: str) -> str:
         """Рекомендация направления на основе понравившихся мест."""
-        client = self._ensure_client()
-        prompt = (
-            "Мне нравятся следующие места: "
-            + liked_places_str
-            + ". Предложи новое направление и кратко объясни выбор (100–150 слов)."
-        )
+        self._ensure_client()
         try:
-            completion = client.chat.completions.create(
-                model=self._model or "openai/gpt-oss-120b",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "Ты эксперт по путешествиям. Учитывай предпочтения "
-                            "пользователя."
-                        ),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-            )
-            text = (
-                completion.choices[0].message["content"] if completion.choices else ""
+            text = self._complete_shared(
+                ai_prompts.travel_recommendation_messages(liked_places_str),
+                "get_travel_recommendation",
             )
             if not text:
                 self._logger.warning(
                     "Пустой ответ от модели на get_travel_recommendation"
                 )
-                return "Не удалось получить рекомендации."
+                return AI_EMPTY_RECOMMENDATION_MESSAGE
             return text
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             self._logger.error(
                 f"Ошибка генерации get_travel_recommendation: {e}", exc_info=True
             )
-            return "Произошла ошибка сервиса ИИ."
+            return AI_ERROR_MESSAGE
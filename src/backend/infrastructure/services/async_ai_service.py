@@ -0,0 +1,517 @@
+"""Асинхронная реализация сервиса ИИ на AsyncInferenceClient.
+
+Все запросы к провайдеру выполняются в одном фоновом цикле событий
+с общим пулом HTTP-соединений: ожидание ответа модели не занимает
+поток воркера. Синхронный API порта сохранён для существующих
+вызывающих — он отправляет корутину в фоновый цикл и ждёт результат.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Coroutine, Dict, Iterator, List, Optional, TypeVar
+
+from src.backend.domain.services.ai.ai_port import IAIService
+from src.backend.infrastructure.cache import LRUCache
+from src.backend.infrastructure.client.failover import parse_providers
+from src.backend.infrastructure.client.hf_inference import (
+    PooledAsyncInferenceClient,
+    create_async_hf_client,
+)
+from src.backend.infrastructure.services import ai_prompts
+from src.backend.infrastructure.services.ai_metrics import LLMMetrics
+from src.backend.infrastructure.services.ai_service import (
+    AI_CHAT_ERROR_MESSAGE,
+    AI_EMPTY_PLACE_MESSAGE,
+    AI_EMPTY_RECOMMENDATION_MESSAGE,
+    AI_ERROR_MESSAGE,
+)
+from src.backend.infrastructure.services.location_query import (
+    MAX_QUERY_LENGTH,
+    fold_query,
+    quick_location_query,
+)
+from src.backend.utils.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    remaining_timeout,
+)
+
+T = TypeVar("T")
+
+_STREAM_END = object()
+
+
+class AsyncAIService(IAIService):
+    """Сервис ИИ на асинхронном клиенте Hugging Face с общим пулом соединений.
+
+    Один экземпляр держит сотни одновременных ожиданий LLM: корутины
+    выполняются в фоновом цикле событий, а одинаковые одновременные
+    промпты объединяются в один запрос к провайдеру.
+
+    Attributes:
+        _cfg: Конфигурация (HF_TOKEN, HF_PROVIDER, HF_MODEL, HF_POOL_SIZE)
+        _client: Асинхронный клиент (создаётся лениво в фоновом цикле)
+        _loop: Фоновый цикл событий
+        _in_flight: Выполняющиеся запросы по ключу промпта
+        _metrics: Метрики вызовов LLM
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict] = None,
+        logger: Optional[logging.Logger] = None,
+        metrics: Optional[LLMMetrics] = None,
+    ) -> None:
+        """Инициализировать сервис (цикл событий стартует при первом вызове).
+
+        Args:
+            config: Конфигурация с HF_TOKEN, HF_PROVIDER, HF_MODEL, HF_POOL_SIZE
+            logger: Логгер
+            metrics: Реестр метрик вызовов LLM (по умолчанию собственный)
+        """
+        self._cfg = config or {}
+        self._logger = logger or logging.getLogger(__name__)
+        self._metrics = metrics or LLMMetrics()
+        self._query_cache = LRUCache(
+            max_size=int(self._cfg.get("NORMALIZE_QUERY_CACHE_SIZE", 2048)),
+            name="normalize_query",
+        )
+        self._client: Optional[PooledAsyncInferenceClient] = None
+        self._model: Optional[str] = None
+        self._provider = self._cfg.get("HF_PROVIDER", "fireworks-ai")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    # --- фоновый цикл событий ---
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Запустить фоновый цикл событий, если он ещё не запущен."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="async-ai-loop", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _submit(self, coro: Coroutine[Any, Any, T]) -> Future:
+        """Отправить корутину в фоновый цикл."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Выполнить корутину в фоновом цикле и дождаться результата.
+
+        При активном дедлайне запроса ожидание ограничено остатком бюджета,
+        а корутина отменяется (общий запрос single-flight продолжается).
+
+        Raises:
+            DeadlineExceeded: Если бюджет исчерпан раньше ответа
+        """
+        deadline = current_deadline()
+        if deadline is None:
+            return self._submit(coro).result()
+        try:
+            timeout = deadline.timeout()
+        except DeadlineExceeded:
+            coro.close()
+            raise
+        future = self._submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(
+                f"Бюджет запроса {deadline.budget} с исчерпан в ожидании ИИ"
+            ) from None
+
+    def _await(self, coro: Coroutine[Any, Any, T]) -> Awaitable[T]:
+        """Ожидаемый результат корутины для вызывающего из любого цикла.
+
+        При активном дедлайне ожидание ограничено остатком бюджета
+        (``DeadlineExceeded`` по его исчерпании).
+        """
+        loop = self._ensure_loop()
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is loop:
+            awaitable: Awaitable[T] = coro
+        else:
+            awaitable = asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(coro, loop)
+            )
+        deadline = current_deadline()
+        if deadline is None:
+            return awaitable
+        return self._bounded(awaitable, deadline)
+
+    @staticmethod
+    async def _bounded(awaitable: Awaitable[T], deadline: Deadline) -> T:
+        """Дождаться результата не дольше остатка бюджета ``deadline``."""
+        try:
+            return await asyncio.wait_for(awaitable, timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(
+                f"Бюджет запроса {deadline.budget} с исчерпан в ожидании ИИ"
+            ) from None
+
+    def close(self) -> None:
+        """Закрыть клиент и остановить фоновый цикл событий."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.close(), loop).result()
+            self._client = None
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
+
+    # --- клиент и single-flight ---
+
+    def _ensure_client(self) -> PooledAsyncInferenceClient:
+        """Лениво создать асинхронный клиент (вызывается в фоновом цикле).
+
+        Raises:
+            RuntimeError: Если HF_TOKEN не задан
+        """
+        if self._client is not None:
+            return self._client
+        cfg = self._cfg
+        model = cfg.get("HF_MODEL", "openai/gpt-oss-120b")
+        providers = parse_providers(cfg.get("HF_PROVIDERS"), model)
+        if providers:
+            # Асинхронный клиент не переключает провайдеров: только первый
+            provider, model = providers[0]
+            self._logger.warning(
+                "AI_CLIENT_MODE=async не поддерживает переключение HF_PROVIDERS:"
+                f" запросы идут только к {provider}:{model}"
+            )
+            cfg = {**cfg, "HF_PROVIDER": provider}
+        self._client = create_async_hf_client(
+            cfg, pool_size=int(cfg.get("HF_POOL_SIZE", 100))
+        )
+        self._provider = cfg.get("HF_PROVIDER", "fireworks-ai")
+        self._model = model
+        return self._client
+
+    def metrics(self) -> LLMMetrics:
+        """Реестр метрик вызовов LLM."""
+        return self._metrics
+
+    async def _complete(self, messages: List[Dict[str, str]], method: str) -> str:
+        """Выполнить один запрос к модели и вернуть текст ответа.
+
+        Вызов учитывается в метриках под именем ``method``.
+        """
+        client = self._ensure_client()
+        model = self._model or "openai/gpt-oss-120b"
+        call = self._metrics.start(
+            method,
+            self._provider,
+            model,
+            messages,
+            self._logger,
+        )
+        try:
+            completion = await client.chat.completions.create(
+                model=model, messages=messages
+            )
+        except Exception as e:
+            call.fail(e)
+            raise
+        text = completion.choices[0].message["content"] if completion.choices else ""
+        call.succeed(text or "", usage=getattr(completion, "usage", None))
+        return text
+
+    async def _complete_shared(
+        self, messages: List[Dict[str, str]], method: str
+    ) -> str:
+        """Выполнить запрос, разделив его с одновременными одинаковыми промптами."""
+        key = ai_prompts.prompt_key(self._model, messages)
+        task = self._in_flight.get(key)
+        if task is None:
+            self._executed += 1
+            task = asyncio.ensure_future(self._complete(messages, method))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self._coalesced += 1
+        # shield: отмена одного ожидающего не отменяет общий запрос
+        return await asyncio.shield(task)
+
+    def single_flight_stats(self) -> Dict[str, int]:
+        """Вернуть счётчики выполненных и объединённых запросов к провайдеру."""
+        return {
+            "executed": self._executed,
+            "coalesced": self._coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+    # --- корутины сценариев (выполняются в фоновом цикле) ---
+
+    async def _chat(self, messages: List[Dict[str, str]]) -> str:
+        """Ответ ассистента на диалог."""
+        if not messages:
+            return "Пожалуйста, задайте вопрос."
+        self._ensure_client()
+        try:
+            return await self._complete(ai_prompts.chat_messages(messages), "chat")
+        except Exception as e:
+            self._logger.error(f"Ошибка чата ИИ: {e}", exc_info=True)
+            return AI_CHAT_ERROR_MESSAGE
+
+    async def _normalize_location_query(self, user_text: str) -> str:
+        """Краткий поисковый запрос по локации (до 50 символов)."""
+        text = (user_text or "").strip()
+        if not text:
+            return ""
+        key = fold_query(text)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+        self._ensure_client()
+        try:
+            answer = await self._complete_shared(
+                ai_prompts.normalize_query_messages(text), "normalize_location_query"
+            )
+        except Exception as e:
+            self._logger.error(f"Ошибка normalize_location_query: {e}", exc_info=True)
+            return ""
+        result = answer.strip()[:MAX_QUERY_LENGTH]
+        if result:
+            self._query_cache.set(key, result)
+        return result
+
+    async def _describe(
+        self, name: str, messages: List[Dict[str, str]], empty_message: str
+    ) -> str:
+        """Общий сценарий генерации описания с заглушками при сбоях."""
+        try:
+            text = await self._complete_shared(messages, name)
+            if not text:
+                self._logger.warning(f"Пустой ответ от модели на {name}")
+                return empty_message
+            return text
+        except Exception as e:
+            self._logger.error(f"Ошибка генерации {name}: {e}", exc_info=True)
+            return AI_ERROR_MESSAGE
+
+    async def _get_place_info(self, latitude: float, longitude: float) -> str:
+        """Краткое описание места по координатам."""
+        self._ensure_client()
+        return await self._describe(
+            "get_place_info",
+            ai_prompts.place_info_messages(latitude, longitude),
+            AI_EMPTY_PLACE_MESSAGE,
+        )
+
+    async def _get_place_info_with_address_and_prefs(
+        self,
+        address: str | None,
+        latitude: float,
+        longitude: float,
+        liked_places_str: str | None = None,
+    ) -> str:
+        """Описание места по адресу и координатам с учётом предпочтений."""
+        if not address:
+            base_text = await self._get_place_info(latitude, longitude)
+            if liked_places_str:
+                return f"Учитывая, что вам нравятся: {liked_places_str}. {base_text}"
+            return base_text
+        self._ensure_client()
+        return await self._describe(
+            "get_place_info_with_address_and_prefs",
+            ai_prompts.place_info_with_prefs_messages(
+                address, latitude, longitude, liked_places_str
+            ),
+            AI_EMPTY_PLACE_MESSAGE,
+        )
+
+    async def _get_place_info_with_address(
+        self, address: str | None, latitude: float, longitude: float
+    ) -> str:
+        """Описание места по адресу и координатам."""
+        if not address:
+            return await self._get_place_info(latitude, longitude)
+        self._ensure_client()
+        return await self._describe(
+            "get_place_info_with_address",
+            ai_prompts.place_info_with_address_messages(address, latitude, longitude),
+            AI_EMPTY_PLACE_MESSAGE,
+        )
+
+    async def _get_travel_recommendation(self, liked_places_str: str) -> str:
+        """Рекомендация направления по понравившимся местам."""
+        self._ensure_client()
+        return await self._describe(
+            "get_travel_recommendation",
+            ai_prompts.travel_recommendation_messages(liked_places_str),
+            AI_EMPTY_RECOMMENDATION_MESSAGE,
+        )
+
+    async def _stream_to_queue(
+        self, messages: List[Dict[str, str]], out: queue.Queue
+    ) -> None:
+        """Читать потоковый ответ и складывать фрагменты в очередь."""
+        produced = False
+        call = None
+        try:
+            client = self._ensure_client()
+            model = self._model or "openai/gpt-oss-120b"
+            payload = ai_prompts.chat_messages(messages)
+            call = self._metrics.start(
+                "chat_stream",
+                self._provider,
+                model,
+                payload,
+                self._logger,
+            )
+            stream = await client.chat.completions.create(
+                model=model, messages=payload, stream=True
+            )
+            parts: List[str] = []
+            usage = None
+            async for chunk in stream:
+                usage = getattr(chunk, "usage", None) or usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                text = delta.content if delta is not None else None
+                if text:
+                    produced = True
+                    parts.append(text)
+                    out.put(text)
+            call.succeed("".join(parts), usage=usage)
+        except Exception as e:
+            if call is not None:
+                call.fail(e)
+            self._logger.error(f"Ошибка потокового чата ИИ: {e}", exc_info=True)
+            out.put(e if produced else AI_CHAT_ERROR_MESSAGE)
+        finally:
+            out.put(_STREAM_END)
+
+    # --- синхронный API порта ---
+
+    def chat(self, messages: List[Dict[str, str]]) -> str:
+        """Сгенерировать ответ ассистента на сообщения чата."""
+        return self._run(self._chat(messages))
+
+    def chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Потоковый ответ ассистента по фрагментам.
+
+        Ожидание каждого фрагмента ограничено остатком бюджета запроса.
+
+        Raises:
+            DeadlineExceeded: Если бюджет исчерпан раньше конца ответа
+            Exception: Если поток оборвался после отправки части ответа
+        """
+        if not messages:
+            yield "Пожалуйста, задайте вопрос."
+            return
+        out: queue.Queue = queue.Queue()
+        future = self._submit(self._stream_to_queue(messages, out))
+        try:
+            while True:
+                try:
+                    item = out.get(timeout=remaining_timeout())
+                except queue.Empty:
+                    raise DeadlineExceeded(
+                        "Бюджет запроса исчерпан в ожидании фрагмента ответа ИИ"
+                    ) from None
+                if item is _STREAM_END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Клиент отключился или бюджет исчерпан: задача в фоновом цикле
+            # отменяется (Future.cancel планирует task.cancel через
+            # call_soon_threadsafe) и больше не пишет в очередь
+            future.cancel()
+
+    def normalize_location_query(self, user_text: str) -> str:
+        """Кратко нормализует запрос о локации для геокодинга (до 50 символов).
+
+        Координаты и короткие названия мест возвращаются без обращения
+        к модели (и без перехода в фоновый цикл).
+        """
+        quick = quick_location_query(user_text)
+        if quick is not None:
+            return quick
+        return self._run(self._normalize_location_query(user_text))
+
+    def get_place_info(self, latitude: float, longitude: float) -> str:
+        """Краткое описание места по координатам (на русском)."""
+        return self._run(self._get_place_info(latitude, longitude))
+
+    def get_place_info_with_address_and_prefs(
+        self,
+        address: str | None,
+        latitude: float,
+        longitude: float,
+        liked_places_str: str | None = None,
+    ) -> str:
+        """Описание места по адресу OSM и координатам с учётом предпочтений."""
+        return self._run(
+            self._get_place_info_with_address_and_prefs(
+                address, latitude, longitude, liked_places_str
+            )
+        )
+
+    def get_place_info_with_address(
+        self, address: str | None, latitude: float, longitude: float
+    ) -> str:
+        """Краткое описание места по адресу OSM и координатам."""
+        return self._run(
+            self._get_place_info_with_address(address, latitude, longitude)
+        )
+
+    def get_travel_recommendation(self, liked_places_str: str) -> str:
+        """Рекомендация направления на основе понравившихся мест."""
+        return self._run(self._get_travel_recommendation(liked_places_str))
+
+    # --- асинхронный API порта ---
+
+    async def chat_async(self, messages: List[Dict[str, str]]) -> str:
+        """Асинхронный вариант ``chat``."""
+        return await self._await(self._chat(messages))
+
+    async def get_place_info_async(self, latitude: float, longitude: float) -> str:
+        """Асинхронный вариант ``get_place_info``."""
+        return await self._await(self._get_place_info(latitude, longitude))
+
+    async def get_place_info_with_address_and_prefs_async(
+        self,
+        address: str | None,
+        latitude: float,
+        longitude: float,
+        liked_places_str: str | None = None,
+    ) -> str:
+        """Асинхронный вариант ``get_place_info_with_address_and_prefs``."""
+        return await self._await(
+            self._get_place_info_with_address_and_prefs(
+                address, latitude, longitude, liked_places_str
+            )
+        )
+
+    async def get_travel_recommendation_async(self, liked_places_str: str) -> str:
+        """Асинхронный вариант ``get_travel_recommendation``."""
+        return await self._await(self._get_travel_recommendation(liked_places_str))
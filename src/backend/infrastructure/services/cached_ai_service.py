@@ -0,0 +1,172 @@
+"""Кэширующий декоратор над портом сервиса ИИ.
+
+Ответы о местах кэшируются по ячейке квантованных координат: клики
+в пределах одной ячейки обслуживаются из кэша без обращения к модели.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.backend.domain.services.ai.ai_port import IAIService
+from src.backend.infrastructure.cache import CoordinateQuantizer, LRUCache
+from src.backend.infrastructure.services.ai_service import AI_FAILURE_MESSAGES
+
+
+class CachedAIService(IAIService):
+    """Сервис ИИ с кэшем описаний мест перед исходной реализацией.
+
+    Кэшируются только описания мест; чат, рекомендации и нормализация
+    запросов передаются во внутренний сервис без изменений.
+
+    Attributes:
+        inner: Исходная реализация порта IAIService
+        cache: Кэш описаний (LRU + TTL, опционально с дисковым уровнем)
+        quantizer: Правило квантования координат в ячейки
+    """
+
+    def __init__(
+        self,
+        inner: IAIService,
+        cache: LRUCache,
+        quantizer: CoordinateQuantizer | None = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Инициализировать декоратор.
+
+        Args:
+            inner: Оборачиваемый сервис ИИ
+            cache: Кэш для хранения описаний
+            quantizer: Квантователь координат (по умолчанию geohash-7)
+            logger: Логгер
+        """
+        self.inner = inner
+        self.cache = cache
+        self.quantizer = quantizer or CoordinateQuantizer()
+        self._logger = logger or logging.getLogger(__name__)
+
+    def get_place_info(self, latitude: float, longitude: float) -> str:
+        """Краткое описание места по координатам (с кэшем по ячейке)."""
+        key = self._key("place", latitude, longitude)
+        return self._cached(key, self.inner.get_place_info, latitude, longitude)
+
+    def get_place_info_with_address(
+        self, address: str | None, latitude: float, longitude: float
+    ) -> str:
+        """Описание места по адресу и координатам (с кэшем по ячейке)."""
+        if not address:
+            return self.get_place_info(latitude, longitude)
+        key = self._key("place_addr", latitude, longitude)
+        return self._cached(
+            key,
+            self.inner.get_place_info_with_address,
+            address,
+            latitude,
+            longitude,
+        )
+
+    def get_place_info_with_address_and_prefs(
+        self,
+        address: str | None,
+        latitude: float,
+        longitude: float,
+        liked_places_str: str | None = None,
+    ) -> str:
+        """Описание места с учётом предпочтений (ключ включает предпочтения)."""
+        key = self._key("place_prefs", latitude, longitude, liked_places_str)
+        return self._cached(
+            key,
+            self.inner.get_place_info_with_address_and_prefs,
+            address,
+            latitude,
+            longitude,
+            liked_places_str=liked_places_str,
+        )
+
+    def get_travel_recommendation(self, liked_places_str: str) -> str:
+        """Рекомендация путешествия (без кэширования)."""
+        return self.inner.get_travel_recommendation(liked_places_str)
+
+    def chat(self, messages: List[Dict[str, str]]) -> str:
+        """Диалог с ассистентом (без кэширования)."""
+        return self.inner.chat(messages)
+
+    def chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Потоковый диалог с ассистентом (без кэширования)."""
+        return self.inner.chat_stream(messages)
+
+    def get_cached_place_info(self, latitude: float, longitude: float) -> str | None:
+        """Описание места из кэша по ячейке либо None (без вызова модели)."""
+        return self._lookup(self._key("place", latitude, longitude))
+
+    async def get_place_info_async(self, latitude: float, longitude: float) -> str:
+        """Асинхронное описание места по координатам (с кэшем по ячейке)."""
+        key = self._key("place", latitude, longitude)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        text = await self.inner.get_place_info_async(latitude, longitude)
+        self._store(key, text)
+        return text
+
+    async def get_travel_recommendation_async(self, liked_places_str: str) -> str:
+        """Асинхронная рекомендация путешествия (без кэширования)."""
+        return await self.inner.get_travel_recommendation_async(liked_places_str)
+
+    async def chat_async(self, messages: List[Dict[str, str]]) -> str:
+        """Асинхронный диалог с ассистентом (без кэширования)."""
+        return await self.inner.chat_async(messages)
+
+    def normalize_location_query(self, user_text: str) -> str:
+        """Нормализация поискового запроса (без кэширования)."""
+        return self.inner.normalize_location_query(user_text)
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики кэша описаний и объединения запросов внутреннего сервиса."""
+        return {**self.cache.stats(), "single_flight": self.single_flight_stats()}
+
+    def single_flight_stats(self) -> Optional[Dict[str, int]]:
+        """Счётчики объединения одинаковых запросов внутреннего сервиса."""
+        stats = getattr(self.inner, "single_flight_stats", None)
+        return stats() if callable(stats) else None
+
+    def _key(
+        self,
+        kind: str,
+        latitude: float,
+        longitude: float,
+        extra: str | None = None,
+    ) -> str:
+        """Построить ключ кэша: тип ответа + ячейка (+ хэш доп. контекста)."""
+        key = f"{kind}:{self.quantizer.cell(latitude, longitude)}"
+        if extra:
+            digest = hashlib.sha256(extra.encode("utf-8")).hexdigest()[:16]
+            key += f":{digest}"
+        return key
+
+    def _cached(self, key: str, func: Any, *args: Any, **kwargs: Any) -> str:
+        """Вернуть ответ из кэша либо вычислить и сохранить успешный ответ."""
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        text = func(*args, **kwargs)
+        self._store(key, text)
+        return text
+
+    def _lookup(self, key: str) -> str | None:
+        """Прочитать ответ из кэша; сбой кэша считается промахом."""
+        try:
+            return self.cache.get(key)
+        except Exception as e:
+            self._logger.warning(f"Не удалось прочитать кэш ИИ: {e}")
+            return None
+
+    def _store(self, key: str, text: str) -> None:
+        """Сохранить успешный ответ в кэш (заглушки сбоев не кэшируются)."""
+        if text and text not in AI_FAILURE_MESSAGES:
+            try:
+                self.cache.set(key, text)
+            except Exception as e:
+                self._logger.warning(f"Не удалось записать в кэш ИИ: {e}")
@@ -0,0 +1,113 @@
+"""Кэширующий декоратор над сервисом геокодинга Nominatim.
+
+Публичный Nominatim допускает около одного запроса в секунду, поэтому
+пропускная способность карты упирается в него. Координаты реверс-геокодинга
+привязываются к сетке заданной точности (число знаков после запятой), и
+Nominatim запрашивается уже по привязанной точке: все клики в пределах
+ячейки получают один и тот же ответ из кэша. Ключи различаются по языку.
+Неудачные ответы (ошибка или пустой результат) кэшируются на короткий
+срок, чтобы повторные клики не долбили сервис.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from src.backend.infrastructure.cache import LRUCache, SingleFlight
+from src.backend.infrastructure.services.geocoding_service import GeocodingService
+from src.backend.infrastructure.services.location_query import fold_query
+
+
+class CachedGeocodingService:
+    """Сервис геокодинга с кэшем перед исходной реализацией.
+
+    Attributes:
+        inner: Исходный сервис геокодинга
+        cache: Кэш ответов (LRU + TTL, опционально с дисковым уровнем)
+        precision: Знаков после запятой при привязке координат
+        negative_ttl_seconds: Время жизни неудачного ответа
+    """
+
+    def __init__(
+        self,
+        inner: GeocodingService,
+        cache: LRUCache,
+        precision: int = 4,
+        negative_ttl_seconds: float = 300,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Инициализировать декоратор.
+
+        Args:
+            inner: Оборачиваемый сервис геокодинга
+            cache: Кэш ответов
+            precision: Знаков после запятой (4 ≈ 11 м, 3 ≈ 110 м)
+            negative_ttl_seconds: TTL ошибок и пустых ответов (0 — не кэшировать)
+            logger: Логгер
+        """
+        self.inner = inner
+        self.cache = cache
+        self.precision = min(max(int(precision), 0), 7)
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._single_flight = SingleFlight()
+        self._logger = logger or logging.getLogger(__name__)
+
+    def snap(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Привязать координаты к сетке кэша."""
+        return round(latitude, self.precision), round(longitude, self.precision)
+
+    def reverse_geocode(
+        self, latitude: float, longitude: float, lang: str = "ru"
+    ) -> Dict[str, Any]:
+        """Реверс-геокодинг привязанной точки через кэш.
+
+        Возвращает словарь того же вида, что ``GeocodingService.reverse_geocode``.
+        """
+        lat, lon = self.snap(latitude, longitude)
+        key = f"reverse:{lang}:{lat:.{self.precision}f}:{lon:.{self.precision}f}"
+        return self._cached(
+            key, lambda: self.inner.reverse_geocode(lat, lon, lang=lang)
+        )
+
+    def search(self, query: str, lang: str = "ru", limit: int = 1) -> Dict[str, Any]:
+        """Прямой геокодинг через кэш (ключ — запрос без регистра и лишних пробелов).
+
+        Возвращает словарь того же вида, что ``GeocodingService.search``.
+        """
+        key = f"search:{lang}:{limit}:{fold_query(query)}"
+        return self._cached(
+            key, lambda: self.inner.search(query, lang=lang, limit=limit)
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики кэша, объединённых промахов и HTTP-сессии Nominatim."""
+        inner_stats = getattr(self.inner, "stats", None)
+        return {
+            **self.cache.stats(),
+            "single_flight": self._single_flight.stats(),
+            **(inner_stats() if callable(inner_stats) else {}),
+        }
+
+    def _cached(self, key: str, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Вернуть ответ из кэша либо запросить (один раз на ключ) и сохранить."""
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        return self._single_flight.do(key, lambda: self._fetch(key, fetch))
+
+    def _fetch(self, key: str, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Запросить Nominatim и сохранить ответ с TTL по его виду."""
+        result = fetch()
+        raw = result.get("raw") or {}
+        if raw.get("deadline_exceeded"):
+            # Запрос не выполнялся — бюджет исчерпан у нас, а не у Nominatim
+            return result
+        try:
+            if result.get("display_name"):
+                self.cache.set(key, result)
+            elif self.negative_ttl_seconds and self.negative_ttl_seconds > 0:
+                self.cache.set(key, result, ttl_seconds=self.negative_ttl_seconds)
+        except Exception as e:
+            self._logger.warning(f"Не удалось записать в кэш геокодинга: {e}")
+        return result
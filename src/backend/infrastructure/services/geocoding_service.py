@@ -5,6 +5,17 @@ from typing import Any, Dict, Optional
 
 import requests
 
+from src.backend.infrastructure.client.http_session import (
+    BoundedRetry,
+    PooledHTTPSession,
+)
+from src.backend.infrastructure.client.rate_limiter import (
+    INTERACTIVE,
+    SharedRateLimiter,
+    current_priority,
+)
+from src.backend.utils.deadline import DeadlineExceeded, remaining_timeout
+
 
 class GeocodingService:
     """Сервис реверс‑геокодинга на базе OpenStreetMap Nominatim.
@@ -12,7 +23,16 @@ class GeocodingService:
     Возвращает нормализованный адрес по координатам.
     ВАЖНО: согласно политике Nominatim требуется корректный User-Agent и
     желательно email. Настраивается через конфиг: NOMINATIM_BASE_URL,
-    NOMINATIM_USER_AGENT, NOMINATIM_EMAIL.
+    NOMINATIM_USER_AGENT, NOMINATIM_EMAIL, NOMINATIM_TIMEOUT_SECONDS.
+    Запросы идут через долгоживущую сессию с пулом keep-alive соединений
+    и повторами на 429/5xx (см. ``PooledHTTPSession``). Частоту запросов
+    ограничивает общий для воркеров хоста ``SharedRateLimiter``:
+    интерактивные запросы обслуживаются раньше прогрева и ждут слота не
+    дольше ``queue_max_wait``. Повторы сессии тоже берут слот на каждую
+    попытку.
+    Таймаут запроса сокращается до остатка бюджета текущего запроса
+    (см. ``utils.deadline``); при исчерпанном бюджете Nominatim не
+    вызывается и возвращается пустой результат.
     """
 
     def __init__(
@@ -21,6 +41,10 @@ class GeocodingService:
         user_agent: Optional[str] = None,
         email: Optional[str] = None,
         logger: logging.Logger | None = None,
+        timeout: float = 10.0,
+        session: Optional[requests.Session] = None,
+        limiter: Optional[SharedRateLimiter] = None,
+        queue_max_wait: Optional[float] = 5.0,
     ) -> None:
         """Инициализировать сервис геокодинга.
 
@@ -29,11 +53,42 @@ class GeocodingService:
             user_agent: User-Agent для запросов
             email: Email для идентификации (рекомендуется)
             logger: Логгер для записи ошибок
+            timeout: Таймаут HTTP-запроса без дедлайна, секунды
+            session: HTTP-сессия (по умолчанию ``PooledHTTPSession``)
+            limiter: Ограничитель частоты запросов (None — без ограничения)
+            queue_max_wait: Предел ожидания слота для интерактивных запросов,
+                секунды (прогрев и пакетные задачи ждут без предела)
         """
         self.base_url = base_url or "https://nominatim.openstreetmap.org"
         self.user_agent = user_agent or "aitravel-app/1.0"
         self.email = email
         self._logger = logger or logging.getLogger(__name__)
+        self.timeout = timeout
+        self._session = session if session is not None else PooledHTTPSession()
+        self._limiter = limiter
+        self.queue_max_wait = queue_max_wait
+        retry = getattr(self._session, "retry", None)
+        if limiter is not None and isinstance(retry, BoundedRetry):
+            retry.throttle = self._throttle
+
+    def stats(self) -> Dict[str, Any]:
+        """Переиспользование соединений, повторы и очередь ограничителя."""
+        session_stats = getattr(self._session, "stats", None)
+        return {
+            "http": session_stats() if callable(session_stats) else None,
+            "rate_limit": self._limiter.stats() if self._limiter else None,
+        }
+
+    def _throttle(self) -> None:
+        """Дождаться слота ограничителя частоты.
+
+        Raises:
+            QueueTimeout: Если слот не освободится вовремя
+        """
+        if self._limiter is None:
+            return
+        interactive = current_priority() <= INTERACTIVE
+        self._limiter.acquire(max_wait=self.queue_max_wait if interactive else None)
 
     def reverse_geocode(
         self, latitude: float, longitude: float, lang: str = "ru"
@@ -61,7 +116,13 @@ class GeocodingService:
 
         url = f"{self.base_url}/reverse"
         try:
-            resp = requests.get(url, params=params, headers=headers, timeout=10)
+            self._throttle()
+            resp = self._session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=remaining_timeout(self.timeout),
+            )
             resp.raise_for_status()
             data = resp.json()
             return {
@@ -69,6 +130,13 @@ class GeocodingService:
                 "address": data.get("address"),
                 "raw": data,
             }
+        except DeadlineExceeded as e:
+            self._logger.warning(f"Nominatim reverse пропущен: {e}")
+            return {
+                "display_name": None,
+                "address": None,
+                "raw": {"error": str(e), "deadline_exceeded": True},
+            }
         except Exception as e:
             self._logger.error(f"Ошибка Nominatim reverse: {e}", exc_info=True)
             return {
@@ -85,6 +153,7 @@ class GeocodingService:
         - lat: float | None
         - lon: float | None
         - raw: dict | None
+        - results: list[dict] — все совпадения (display_name, lat, lon)
         """
         params = {
             "format": "jsonv2",
@@ -102,7 +171,13 @@ class GeocodingService:
 
         url = f"{self.base_url}/search"
         try:
-            resp = requests.get(url, params=params, headers=headers, timeout=10)
+            self._throttle()
+            resp = self._session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=remaining_timeout(self.timeout),
+            )
             resp.raise_for_status()
             arr = resp.json() or []
             first = arr[0] if arr else None
@@ -112,14 +187,22 @@ class GeocodingService:
                     "lat": None,
                     "lon": None,
                     "raw": {"results": []},
+                    "results": [],
                 }
-            lat = float(first.get("lat")) if first.get("lat") is not None else None
-            lon = float(first.get("lon")) if first.get("lon") is not None else None
+            results = [self._hit(item) for item in arr]
             return {
-                "display_name": first.get("display_name"),
-                "lat": lat,
-                "lon": lon,
+                **results[0],
                 "raw": first,
+                "results": results,
+            }
+        except DeadlineExceeded as e:
+            self._logger.warning(f"Nominatim search пропущен: {e}")
+            return {
+                "display_name": None,
+                "lat": None,
+                "lon": None,
+                "raw": {"error": str(e), "deadline_exceeded": True},
+                "results": [],
             }
         except Exception as e:
             self._logger.error(f"Ошибка Nominatim search: {e}", exc_info=True)
@@ -128,4 +211,15 @@ class GeocodingService:
                 "lat": None,
                 "lon": None,
                 "raw": {"error": str(e)},
+                "results": [],
             }
+
+    @staticmethod
+    def _hit(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Совпадение прямого геокодинга: название и координаты."""
+        lat, lon = item.get("lat"), item.get("lon")
+        return {
+            "display_name": item.get("display_name"),
+            "lat": float(lat) if lat is not None else None,
+            "lon": float(lon) if lon is not None else None,
+        }
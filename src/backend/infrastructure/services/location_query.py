@@ -0,0 +1,133 @@
+"""Быстрая нормализация поисковых запросов по локации без обращения к модели.
+
+Координаты и короткие названия мест («Казань», «Ростов-на-Дону»,
+«New York») уже пригодны для геокодинга — модель для них не нужна.
+Остальные запросы нормализует модель; её ответы кэшируются по ключу
+запроса со свёрнутыми регистром и пробелами.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional, Tuple
+
+MAX_QUERY_LENGTH = 50
+MAX_PLACE_WORDS = 3
+
+# Те же форматы, что разбирает chat.js: "56.12, 40.39" и "56.12 N, 40.39 E"
+_COORDS_RE = re.compile(
+    r"^([-+]?\d{1,2}(?:\.\d+)?)\s*[,;\s]\s*([-+]?\d{1,3}(?:\.\d+)?)$"
+)
+_COORDS_NSEW_RE = re.compile(
+    r"^(\d{1,2}(?:\.\d+)?)\s*°?\s*([NS])[\s,;]+(\d{1,3}(?:\.\d+)?)\s*°?\s*([EW])$",
+    re.IGNORECASE,
+)
+# Слово названия: буквы, внутри — дефис, апостроф или точка (Ростов-на-Дону, St.)
+# (запятая после слова допускается: «Казань, Россия»)
+_PLACE_WORD_RE = re.compile(r"^[^\W\d_]+(?:[-'’.][^\W\d_]+)*\.?$")
+# Слова запроса, а не названия: такой текст отдаётся модели
+_QUERY_WORDS = frozenset(
+    {
+        "где",
+        "что",
+        "как",
+        "куда",
+        "какой",
+        "какие",
+        "покажи",
+        "найди",
+        "найти",
+        "хочу",
+        "расскажи",
+        "посоветуй",
+        "мне",
+        "про",
+        "о",
+        "об",
+        "в",
+        "во",
+        "на",
+        "из",
+        "до",
+        "и",
+        "или",
+        "рядом",
+        "около",
+        "недалеко",
+        "отель",
+        "погода",
+        "where",
+        "what",
+        "how",
+        "show",
+        "find",
+        "me",
+        "in",
+        "near",
+        "to",
+        "the",
+        "and",
+        "or",
+        "hotel",
+        "weather",
+        "привет",
+        "hello",
+        "hi",
+    }
+)
+
+
+def fold_query(text: str) -> str:
+    """Ключ запроса: нижний регистр и схлопнутые пробелы."""
+    return " ".join((text or "").casefold().split())
+
+
+def parse_coordinates(text: str) -> Optional[Tuple[float, float]]:
+    """Разобрать координаты «широта, долгота» (в том числе с N/S/E/W).
+
+    Returns:
+        (широта, долгота) или None, если текст — не координаты
+    """
+    text = (text or "").strip()
+    match = _COORDS_RE.match(text)
+    if match:
+        lat, lon = float(match.group(1)), float(match.group(2))
+    else:
+        match = _COORDS_NSEW_RE.match(text)
+        if not match:
+            return None
+        lat, lon = float(match.group(1)), float(match.group(3))
+        if match.group(2).upper() == "S":
+            lat = -lat
+        if match.group(4).upper() == "W":
+            lon = -lon
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        return lat, lon
+    return None
+
+
+def quick_location_query(text: str) -> Optional[str]:
+    """Нормализовать запрос без модели, если он уже пригоден для геокодинга.
+
+    Args:
+        text: Исходный текст пользователя
+
+    Returns:
+        Координаты в виде «lat, lon», короткое название места как есть
+        (со схлопнутыми пробелами) или None, если нужна модель
+    """
+    collapsed = " ".join((text or "").split())
+    if not collapsed:
+        return None
+    coords = parse_coordinates(collapsed)
+    if coords is not None:
+        return f"{coords[0]}, {coords[1]}"
+    candidate = collapsed.rstrip("!?.,;")
+    words = candidate.split()
+    if len(candidate) > MAX_QUERY_LENGTH or len(words) > MAX_PLACE_WORDS:
+        return None
+    for word in words:
+        word = word.rstrip(",")
+        if word.casefold() in _QUERY_WORDS or not _PLACE_WORD_RE.match(word):
+            return None
+    return candidate or None
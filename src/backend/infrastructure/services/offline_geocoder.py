@@ -0,0 +1,378 @@
+"""Офлайн реверс-геокодер: ближайший населённый пункт по локальному справочнику.
+
+Справочник — выгрузка GeoNames (``cities500.txt``, ``cities15000.txt``,
+``allCountries.txt``: 19 колонок через табуляцию). Точки переводятся в
+единичные векторы на сфере (евклидово расстояние между ними монотонно
+по дуге большого круга, полюса и антимеридиан не требуют особой
+обработки) и раскладываются в сбалансированное k-d дерево с листьями
+фиксированного размера. Дерево хранится неявно — массивами NumPy —
+и целиком сохраняется в бинарный индекс ``.npz``: загрузка индекса не
+требует ни разбора справочника, ни перестройки дерева.
+
+Одиночный запрос обходит дерево с отсечением по расстоянию до
+разделяющей плоскости; пакетный (``nearest_many``) делает то же для всех
+точек сразу векторными операциями. Оба дают точный ближайший пункт.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+INDEX_FORMAT_VERSION = 1
+# Координаты-заглушки в неполных листьях: дальше любой точки единичной сферы
+_PAD = np.float32(10.0)
+
+
+@dataclass(frozen=True)
+class GazetteerEntry:
+    """Строка справочника населённых пунктов."""
+
+    geoname_id: int
+    name: str
+    latitude: float
+    longitude: float
+    country_code: str
+    population: int = 0
+
+
+@dataclass(frozen=True)
+class OfflinePlace:
+    """Ближайший населённый пункт."""
+
+    geoname_id: int
+    name: str
+    country_code: str
+    country: Optional[str]
+    latitude: float
+    longitude: float
+    population: int
+    distance_km: float
+
+    @property
+    def display_name(self) -> str:
+        """Подпись вида ``Город, Страна``."""
+        return ", ".join(p for p in (self.name, self.country or self.country_code) if p)
+
+
+def read_geonames(
+    path: str, min_population: int = 0, feature_classes: str = "P"
+) -> Iterator[GazetteerEntry]:
+    """Прочитать выгрузку GeoNames.
+
+    Args:
+        path: Файл в формате GeoNames (``geonameid<TAB>name<TAB>...``)
+        min_population: Пропускать пункты с меньшим населением
+        feature_classes: Классы объектов, которые оставить (P — населённые
+            пункты, A — административные единицы); пусто — все
+
+    Raises:
+        ValueError: Если строка не в формате GeoNames
+    """
+    with open(path, encoding="utf-8") as fh:
+        for number, line in enumerate(fh, start=1):
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 15:
+                raise ValueError(f"{path}:{number}: ожидается 19 колонок GeoNames")
+            if feature_classes and cols[6] not in feature_classes:
+                continue
+            population = int(cols[14] or 0)
+            if population < min_population:
+                continue
+            yield GazetteerEntry(
+                geoname_id=int(cols[0]),
+                name=cols[1],
+                latitude=float(cols[4]),
+                longitude=float(cols[5]),
+                country_code=cols[8],
+                population=population,
+            )
+
+
+def read_country_names(path: str) -> Dict[str, str]:
+    """Прочитать ``countryInfo.txt`` GeoNames: код ISO → название страны."""
+    names = {}
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.startswith("#") or not line.strip():
+                continue
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) > 4:
+                names[cols[0]] = cols[4]
+    return names
+
+
+def to_unit_vectors(latitudes: Any, longitudes: Any) -> np.ndarray:
+    """Широты и долготы (градусы) → единичные векторы, массив ``(n, 3)``."""
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack(
+        (cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=-1
+    ).astype(np.float32)
+
+
+def chord_to_km(squared_chord: Any) -> Any:
+    """Квадрат хорды единичной сферы → расстояние по поверхности, км."""
+    chord = np.sqrt(np.maximum(squared_chord, 0.0))
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2.0, 1.0))
+
+
+class OfflineReverseGeocoder:
+    """Индекс ближайшего населённого пункта (k-d дерево на NumPy).
+
+    Дерево полное: ``2**depth`` листьев по ``leaf_size`` точек (не больше),
+    внутренний узел ``i`` делит точки по оси ``split_dim[i]`` на значении
+    ``split_val[i]``, его потомки — ``2i+1`` и ``2i+2``.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]) -> None:
+        """Создать геокодер из массивов индекса (см. ``build`` и ``load``).
+
+        Raises:
+            ValueError: Если версия формата индекса не поддерживается
+        """
+        version = int(arrays["format_version"])
+        if version != INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f"Версия индекса {version} не поддерживается"
+                f" (ожидается {INDEX_FORMAT_VERSION})"
+            )
+        self._arrays = arrays
+        self.split_dim = arrays["split_dim"]
+        self.split_val = arrays["split_val"]
+        self.leaf_xyz = arrays["leaf_xyz"]
+        self.leaf_ids = arrays["leaf_ids"]
+        self.latitudes = arrays["latitudes"]
+        self.longitudes = arrays["longitudes"]
+        self.geoname_ids = arrays["geoname_ids"]
+        self.populations = arrays["populations"]
+        self.country_codes = arrays["country_codes"]
+        self._names = arrays["names"].tobytes()
+        self._name_offsets = arrays["name_offsets"]
+        self.country_names: Dict[str, str] = json.loads(
+            arrays["country_names"].tobytes().decode("utf-8") or "{}"
+        )
+        self.n_internal = len(self.split_dim)
+        self.depth = int(math.log2(self.n_internal + 1))
+        # Скалярный обход быстрее по спискам Python, чем по массивам
+        self._dims: List[int] = self.split_dim.tolist()
+        self._vals: List[float] = self.split_val.tolist()
+
+    def __len__(self) -> int:
+        return len(self.geoname_ids)
+
+    # ---- построение и загрузка -------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        entries: Iterable[GazetteerEntry],
+        country_names: Optional[Dict[str, str]] = None,
+        leaf_size: int = 16,
+    ) -> "OfflineReverseGeocoder":
+        """Построить индекс по справочнику.
+
+        Args:
+            entries: Населённые пункты
+            country_names: Код ISO → название страны (необязательно)
+            leaf_size: Максимум точек в листе (не меньше 2)
+
+        Raises:
+            ValueError: Если справочник пуст
+        """
+        items = list(entries)
+        if not items:
+            raise ValueError("Справочник населённых пунктов пуст")
+        n = len(items)
+        leaf_size = max(2, leaf_size)
+        latitudes = np.array([e.latitude for e in items], dtype=np.float32)
+        longitudes = np.array([e.longitude for e in items], dtype=np.float32)
+        xyz = to_unit_vectors(latitudes, longitudes)
+
+        depth = max(0, math.ceil(math.log2(n / leaf_size)))
+        n_leaves = 2**depth
+        split_dim = np.zeros(n_leaves - 1, dtype=np.int8)
+        split_val = np.zeros(n_leaves - 1, dtype=np.float32)
+        order = np.arange(n, dtype=np.int64)
+        segments = [(0, n)]
+        for level in range(depth):
+            first = 2**level - 1
+            children = []
+            for k, (start, end) in enumerate(segments):
+                ids = order[start:end]
+                points = xyz[ids]
+                dim = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+                mid = (start + end) // 2
+                part = np.argpartition(points[:, dim], mid - start)
+                order[start:end] = ids[part]
+                split_dim[first + k] = dim
+                split_val[first + k] = xyz[order[mid], dim]
+                children += [(start, mid), (mid, end)]
+            segments = children
+
+        width = max(end - start for start, end in segments)
+        leaf_xyz = np.full((n_leaves, width, 3), _PAD, dtype=np.float32)
+        leaf_ids = np.full((n_leaves, width), -1, dtype=np.int32)
+        for leaf, (start, end) in enumerate(segments):
+            leaf_xyz[leaf, : end - start] = xyz[order[start:end]]
+            leaf_ids[leaf, : end - start] = order[start:end]
+
+        encoded = [e.name.encode("utf-8") for e in items]
+        name_offsets = np.zeros(n + 1, dtype=np.int64)
+        name_offsets[1:] = np.cumsum([len(b) for b in encoded])
+        arrays = {
+            "format_version": np.array(INDEX_FORMAT_VERSION),
+            "split_dim": split_dim,
+            "split_val": split_val,
+            "leaf_xyz": leaf_xyz,
+            "leaf_ids": leaf_ids,
+            "latitudes": latitudes,
+            "longitudes": longitudes,
+            "geoname_ids": np.array([e.geoname_id for e in items], dtype=np.int64),
+            "populations": np.array([e.population for e in items], dtype=np.int64),
+            "country_codes": np.array([e.country_code for e in items], dtype="S2"),
+            "names": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            "name_offsets": name_offsets,
+            "country_names": np.frombuffer(
+                json.dumps(country_names or {}, ensure_ascii=False).encode("utf-8"),
+                dtype=np.uint8,
+            ),
+        }
+        return cls(arrays)
+
+    def save(self, path: str) -> None:
+        """Сохранить индекс в бинарный файл ``.npz`` (без сжатия)."""
+        with open(path, "wb") as fh:
+            np.savez(fh, **self._arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "OfflineReverseGeocoder":
+        """Загрузить индекс, сохранённый ``save``.
+
+        Raises:
+            OSError: Если файл недоступен
+            ValueError: Если файл не является индексом поддерживаемой версии
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    # ---- запросы ----------------------------------------------------------
+
+    def nearest(self, latitude: float, longitude: float) -> OfflinePlace:
+        """Ближайший населённый пункт к точке."""
+        lat, lon = math.radians(latitude), math.radians(longitude)
+        qx = [
+            math.cos(lat) * math.cos(lon),
+            math.cos(lat) * math.sin(lon),
+            math.sin(lat),
+        ]
+        q = np.array(qx, dtype=np.float32)
+        best_d2 = math.inf
+        best_id = -1
+        dims, vals, n_internal = self._dims, self._vals, self.n_internal
+        stack: List[Tuple[int, float]] = [(0, 0.0)]
+        while stack:
+            node, plane_d2 = stack.pop()
+            if plane_d2 >= best_d2:
+                continue
+            # Спуск к листу без стека: дальние ветви откладываются
+            while node < n_internal:
+                diff = qx[dims[node]] - vals[node]
+                if diff > 0:
+                    stack.append((2 * node + 1, diff * diff))
+                    node = 2 * node + 2
+                else:
+                    stack.append((2 * node + 2, diff * diff))
+                    node = 2 * node + 1
+            leaf = node - n_internal
+            d2 = np.square(self.leaf_xyz[leaf] - q).sum(axis=1)
+            j = int(d2.argmin())
+            if d2[j] < best_d2:
+                best_d2 = float(d2[j])
+                best_id = int(self.leaf_ids[leaf, j])
+        chord = math.sqrt(best_d2)
+        return self.place(best_id, 2.0 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1)))
+
+    def nearest_many(
+        self, latitudes: Any, longitudes: Any, chunk_size: int = 65536
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Ближайшие пункты для массива точек.
+
+        Args:
+            latitudes: Широты, градусы
+            longitudes: Долготы, градусы
+            chunk_size: Сколько точек обрабатывать за один проход
+
+        Returns:
+            ``(номера пунктов, расстояния в км)``; пункт по номеру — ``place``
+        """
+        q = to_unit_vectors(latitudes, longitudes).reshape(-1, 3)
+        ids = np.empty(len(q), dtype=np.int64)
+        dist = np.empty(len(q), dtype=np.float64)
+        for start in range(0, len(q), chunk_size):
+            chunk_ids, chunk_d2 = self._nearest_chunk(q[start : start + chunk_size])
+            ids[start : start + len(chunk_ids)] = chunk_ids
+            dist[start : start + len(chunk_ids)] = chord_to_km(chunk_d2)
+        return ids, dist
+
+    def place(self, index: int, distance_km: float = 0.0) -> OfflinePlace:
+        """Населённый пункт по номеру в справочнике."""
+        name = self._names[
+            self._name_offsets[index] : self._name_offsets[index + 1]
+        ].decode("utf-8")
+        code = self.country_codes[index].decode("ascii")
+        return OfflinePlace(
+            geoname_id=int(self.geoname_ids[index]),
+            name=name,
+            country_code=code,
+            country=self.country_names.get(code),
+            latitude=float(self.latitudes[index]),
+            longitude=float(self.longitudes[index]),
+            population=int(self.populations[index]),
+            distance_km=round(float(distance_km), 3),
+        )
+
+    def _nearest_chunk(self, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Точный ближайший сосед для пачки векторов ``(m, 3)``."""
+        rows = np.arange(len(q))
+        # 1. Спуск в «свой» лист даёт верхнюю оценку расстояния
+        node = np.zeros(len(q), dtype=np.int64)
+        for _ in range(self.depth):
+            right = q[rows, self.split_dim[node]] > self.split_val[node]
+            node = 2 * node + 1 + right
+        best_d2, _ = self._scan_leaves(q, rows, node - self.n_internal)
+        # 2. Все листья, чья сторона плоскости ближе найденного расстояния
+        qi = rows
+        node = np.zeros(len(q), dtype=np.int64)
+        for _ in range(self.depth):
+            diff = q[qi, self.split_dim[node]] - self.split_val[node]
+            right = diff > 0
+            near = 2 * node + 1 + right
+            far_mask = diff * diff < best_d2[qi]
+            far = 2 * node[far_mask] + 2 - right[far_mask]
+            qi = np.concatenate((qi, qi[far_mask]))
+            node = np.concatenate((near, far))
+        d2, ids = self._scan_leaves(q, qi, node - self.n_internal)
+        best = np.full(len(q), np.inf, dtype=np.float32)
+        np.minimum.at(best, qi, d2)
+        result = np.empty(len(q), dtype=np.int64)
+        winners = d2 == best[qi]
+        result[qi[winners]] = ids[winners]
+        return result, best
+
+    def _scan_leaves(
+        self, q: np.ndarray, qi: np.ndarray, leaves: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Ближайшая точка листа ``leaves[k]`` к запросу ``q[qi[k]]``."""
+        d2 = np.square(self.leaf_xyz[leaves] - q[qi, None, :]).sum(axis=2)
+        j = d2.argmin(axis=1)
+        pairs = np.arange(len(qi))
+        return d2[pairs, j], self.leaf_ids[leaves, j]
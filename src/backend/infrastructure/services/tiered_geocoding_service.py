@@ -0,0 +1,143 @@
+"""Реверс-геокодинг с офлайн-уровнем перед Nominatim или вместо него.
+
+Для подсказки модели по клику на карте чаще всего достаточно «ближайший
+город и страна» — это даёт ``OfflineReverseGeocoder`` за десятки
+микросекунд без сети. Режимы:
+
+* ``first`` — сначала офлайн-индекс; Nominatim вызывается, только если
+  ближайший пункт дальше ``max_distance_km`` (море, тайга);
+* ``fallback`` — сначала Nominatim (не дольше ``fallback_after`` секунд),
+  при ошибке, пустом ответе или исчерпанном бюджете — офлайн-индекс.
+
+Прямой геокодинг (``search``) всегда идёт в исходный сервис.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from src.backend.infrastructure.services.offline_geocoder import (
+    OfflineReverseGeocoder,
+)
+from src.backend.utils.deadline import deadline_scope
+
+MODES = ("first", "fallback")
+
+
+class TieredGeocodingService:
+    """Сервис геокодинга с офлайн-уровнем реверс-геокодинга.
+
+    Attributes:
+        inner: Исходный сервис геокодинга (обычно с кэшем)
+        offline: Офлайн-индекс населённых пунктов
+        mode: ``first`` или ``fallback``
+        max_distance_km: Дальше этого офлайн-ответ не используется
+        fallback_after: Бюджет Nominatim в режиме ``fallback``, секунды
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        offline: OfflineReverseGeocoder,
+        mode: str = "fallback",
+        max_distance_km: float = 50.0,
+        fallback_after: Optional[float] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Инициализировать сервис.
+
+        Args:
+            inner: Исходный сервис геокодинга
+            offline: Офлайн-индекс населённых пунктов
+            mode: ``first`` или ``fallback``
+            max_distance_km: Предел расстояния до ближайшего пункта, км
+            fallback_after: Сколько ждать Nominatim в режиме ``fallback``
+                (None — до дедлайна запроса)
+            logger: Логгер
+
+        Raises:
+            ValueError: При неизвестном режиме
+        """
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим офлайн-геокодинга: {mode!r}")
+        self.inner = inner
+        self.offline = offline
+        self.mode = mode
+        self.max_distance_km = max_distance_km
+        self.fallback_after = fallback_after
+        self._logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._counters = {"offline": 0, "upstream": 0, "fallbacks": 0}
+
+    def reverse_geocode(
+        self, latitude: float, longitude: float, lang: str = "ru"
+    ) -> Dict[str, Any]:
+        """Реверс-геокодинг с офлайн-уровнем.
+
+        Возвращает словарь того же вида, что ``GeocodingService.reverse_geocode``;
+        у офлайн-ответа ``raw["source"] == "offline"``.
+        """
+        if self.mode == "first":
+            result = self._offline(latitude, longitude)
+            if result is not None:
+                self._count("offline")
+                return result
+            self._count("upstream")
+            return self.inner.reverse_geocode(latitude, longitude, lang=lang)
+
+        self._count("upstream")
+        with deadline_scope(self.fallback_after):
+            result = self.inner.reverse_geocode(latitude, longitude, lang=lang)
+        if result.get("display_name"):
+            return result
+        reason = (result.get("raw") or {}).get("error")
+        fallback = self._offline(latitude, longitude, reason)
+        if fallback is None:
+            return result
+        self._count("fallbacks")
+        self._logger.info(f"Офлайн-геокодинг вместо Nominatim: {reason}")
+        return fallback
+
+    def search(self, query: str, lang: str = "ru", limit: int = 1) -> Dict[str, Any]:
+        """Прямой геокодинг — без изменений через исходный сервис."""
+        return self.inner.search(query, lang=lang, limit=limit)
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики офлайн-уровня вместе со статистикой исходного сервиса."""
+        inner_stats = getattr(self.inner, "stats", None)
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **(inner_stats() if callable(inner_stats) else {}),
+            "offline": {"mode": self.mode, "places": len(self.offline), **counters},
+        }
+
+    def _offline(
+        self, latitude: float, longitude: float, reason: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Ответ по офлайн-индексу или None, если пункт слишком далеко."""
+        place = self.offline.nearest(latitude, longitude)
+        if place.distance_km > self.max_distance_km:
+            return None
+        raw: Dict[str, Any] = {
+            "source": "offline",
+            "geonameid": place.geoname_id,
+            "distance_km": place.distance_km,
+        }
+        if reason:
+            raw["fallback_reason"] = reason
+        return {
+            "display_name": place.display_name,
+            "address": {
+                "city": place.name,
+                "country": place.country,
+                "country_code": place.country_code.lower(),
+            },
+            "raw": raw,
+        }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
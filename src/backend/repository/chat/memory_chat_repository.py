@@ -5,17 +5,28 @@ from typing import Deque, Dict, List, Tuple
 
 
 class ChatMemoryRepository:
-    """Хранит последние сообщения чата, ограничивая длину истории."""
+    """Хранит последние сообщения чата, ограничивая длину истории.
+
+    Помимо самих сообщений считает, сколько их всего добавлено в сессию:
+    по этому счётчику политика истории определяет абсолютный номер
+    сообщения после вытеснения старых.
+    """
 
     def __init__(self, max_messages: int = 20) -> None:
         """Создаёт репозиторий с ограничением количества сообщений на сессию."""
         self._storage: Dict[str, Deque[Tuple[str, str]]] = defaultdict(
             lambda: deque(maxlen=max_messages)
         )
+        self._totals: Dict[str, int] = defaultdict(int)
 
     def append(self, session_id: str, role: str, content: str) -> None:
         """Добавляет сообщение в историю по сессии."""
         self._storage[session_id].append((role, content))
+        self._totals[session_id] += 1
+
+    def total(self, session_id: str) -> int:
+        """Возвращает число сообщений, добавленных в сессию с начала диалога."""
+        return self._totals.get(session_id, 0)
 
     def get(self, session_id: str) -> List[Dict[str, str]]:
         """Возвращает историю сообщений для сессии в формате списка словарей."""
@@ -27,3 +38,4 @@ class ChatMemoryRepository:
     def clear(self, session_id: str) -> None:
         """Очищает историю сообщений для сессии."""
         self._storage.pop(session_id, None)
+        self._totals.pop(session_id, None)
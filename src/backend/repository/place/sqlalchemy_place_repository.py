@@ -1,15 +1,28 @@
 """SQLAlchemy-реализация репозитория мест."""
 
+import sqlite3
+
+from sqlalchemy import Numeric, cast, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from src.backend.domain.model.place.liked_place_model import (
     LikedPlace as DomainLikedPlace,
 )
+from src.backend.domain.model.place.popular_place_model import PopularPlace
 from src.backend.domain.repositories import PlaceRepository
+from src.backend.infrastructure.models.liked_place_model import (
+    COORDINATE_PRECISION,
+)
 from src.backend.infrastructure.models.liked_place_model import (
     LikedPlace as DbLikedPlace,
 )
 
+# INSERT ... ON CONFLICT ... RETURNING появился в SQLite 3.35
+_SQLITE_UPSERT = sqlite3.sqlite_version_info >= (3, 35)
+
 
 class SqlAlchemyPlaceRepository(PlaceRepository):
     """Репозиторий для работы с понравившимися местами через SQLAlchemy."""
@@ -32,16 +45,47 @@ class SqlAlchemyPlaceRepository(PlaceRepository):
         Returns:
             Сохранённая доменная модель с присвоенным ID
         """
-        db_place = DbLikedPlace(
-            user_id=place.user_id,
-            city_name=place.city_name,
-            latitude=place.latitude,
-            longitude=place.longitude,
-        )
+        db_place = DbLikedPlace(**self._values(place))
         self.session.add(db_place)
         place.id = db_place.id
         return place
 
+    def add_liked_place_if_absent(
+        self, place: DomainLikedPlace
+    ) -> tuple[DomainLikedPlace, bool]:
+        """Добавить место, если у пользователя его ещё нет.
+
+        На PostgreSQL и SQLite это один запрос ``INSERT ... ON CONFLICT DO
+        NOTHING RETURNING`` по уникальному ключу ``(user_id, latitude,
+        longitude)``; существующее место дочитывается только при конфликте.
+        На прочих СУБД — вставка в точке сохранения с перехватом нарушения
+        уникальности.
+
+        Args:
+            place: Доменная модель понравившегося места
+
+        Returns:
+            Сохранённое (новое или существовавшее) место и признак вставки
+        """
+        values = self._values(place)
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            insert = postgresql_insert
+        elif dialect == "sqlite" and _SQLITE_UPSERT:
+            insert = sqlite_insert
+        else:
+            return self._insert_or_get(values)
+        stmt = (
+            insert(DbLikedPlace)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=["user_id", "latitude", "longitude"])
+            .returning(DbLikedPlace.id)
+        )
+        inserted_id = self.session.execute(stmt).scalar()
+        if inserted_id is not None:
+            return DomainLikedPlace(id=inserted_id, **values), True
+        return self._find_by_coordinates(values), False
+
     def get_liked_places_by_user(self, user_id: int) -> list[DomainLikedPlace]:
         """Получить все понравившиеся места пользователя.
 
@@ -57,13 +101,84 @@ class SqlAlchemyPlaceRepository(PlaceRepository):
             .order_by(DbLikedPlace.id.desc())
             .all()
         )
+        return [self._to_domain(p) for p in db_places]
+
+    def get_popular_places(self, limit: int) -> list[PopularPlace]:
+        """Получить самые часто отмечаемые места.
+
+        Отметки группируются по координатам, округлённым до 4 знаков
+        (~10 м), чтобы одно место с разными кликами считалось одним.
+
+        Args:
+            limit: Максимальное число мест
+
+        Returns:
+            Список популярных мест по убыванию числа отметок
+        """
+        lat = func.round(cast(DbLikedPlace.latitude, Numeric), 4)
+        lon = func.round(cast(DbLikedPlace.longitude, Numeric), 4)
+        likes = func.count(DbLikedPlace.id)
+        rows = (
+            self.session.query(
+                func.min(DbLikedPlace.city_name),
+                lat.label("lat"),
+                lon.label("lon"),
+                likes,
+            )
+            .group_by(lat, lon)
+            .order_by(likes.desc())
+            .limit(limit)
+            .all()
+        )
         return [
-            DomainLikedPlace(
-                id=p.id,
-                user_id=p.user_id,
-                city_name=p.city_name,
-                latitude=p.latitude,
-                longitude=p.longitude,
+            PopularPlace(
+                city_name=name,
+                latitude=float(latitude),
+                longitude=float(longitude),
+                likes=count,
             )
-            for p in db_places
+            for name, latitude, longitude, count in rows
         ]
+
+    def _insert_or_get(self, values: dict) -> tuple[DomainLikedPlace, bool]:
+        """Вставка без ON CONFLICT: нарушение уникальности — место уже есть."""
+        db_place = DbLikedPlace(**values)
+        try:
+            with self.session.begin_nested():
+                self.session.add(db_place)
+        except IntegrityError:
+            return self._find_by_coordinates(values), False
+        return self._to_domain(db_place), True
+
+    def _find_by_coordinates(self, values: dict) -> DomainLikedPlace:
+        """Место пользователя с теми же (округлёнными) координатами."""
+        db_place = (
+            self.session.query(DbLikedPlace)
+            .filter_by(
+                user_id=values["user_id"],
+                latitude=values["latitude"],
+                longitude=values["longitude"],
+            )
+            .one()
+        )
+        return self._to_domain(db_place)
+
+    @staticmethod
+    def _values(place: DomainLikedPlace) -> dict:
+        """Значения столбцов с координатами в точности хранения."""
+        return {
+            "user_id": place.user_id,
+            "city_name": place.city_name,
+            "latitude": round(place.latitude, COORDINATE_PRECISION),
+            "longitude": round(place.longitude, COORDINATE_PRECISION),
+        }
+
+    @staticmethod
+    def _to_domain(db_place: DbLikedPlace) -> DomainLikedPlace:
+        return DomainLikedPlace(
+            id=db_place.id,
+            user_id=db_place.user_id,
+            city_name=db_place.city_name,
+            latitude=db_place.latitude,
+            longitude=db_place.longitude,
+        )
@@ -1,42 +1,68 @@
-"""Локальный сервис ИИ на базе Transformers для генерации ответов."""
+"""Локальный сервис ИИ на базе Transformers для генерации ответов.
 
-import logging
+torch и transformers импортируются при создании сервиса, а не при импорте
+модуля; в приложении сервис создаётся реестром бэкендов при первом вызове.
+"""
 
-import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+import logging
 
+from src.backend.domain.services.ai.ai_port import IAIService
+from src.backend.infrastructure.client.batching import (
+    MicroBatchScheduler,
+    batched_generate,
+)
 from src.backend.infrastructure.client.init_model.ai_config import MODEL_CONFIG
+from src.backend.infrastructure.services.ai_service import (
+    AI_CHAT_ERROR_MESSAGE,
+    AI_EMPTY_PLACE_MESSAGE,
+    AI_EMPTY_RECOMMENDATION_MESSAGE,
+    AI_ERROR_MESSAGE,
+)
+from src.backend.infrastructure.services.location_query import quick_location_query
 
 
-class AIService:
-    """Сервис, инкапсулирующий загрузку модели и генерацию текста."""
+class AIService(IAIService):
+    """Сервис, инкапсулирующий загрузку модели и генерацию текста.
+
+    При сбое или пустом ответе возвращает общие заглушки из ``ai_service``
+    (``AI_FAILURE_MESSAGES``, ``AI_CHAT_ERROR_MESSAGE``), которые кэши не
+    сохраняют; текст исключения пишется только в лог.
+    """
 
     def __init__(self, logger: logging.Logger | None = None) -> None:
         """Инициализировать сервис и загрузить модель/токенайзер."""
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+
         self._logger = logger or logging.getLogger(__name__)
         model_path = MODEL_CONFIG["model_path"]
-        self.device = "cuda" if torch.cuda.is_available() else "cuda"
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.tokenizer = AutoTokenizer.from_pretrained(model_path)
         self.model = AutoModelForCausalLM.from_pretrained(model_path).to(self.device)
         self.temperature = MODEL_CONFIG.get("temperature", 0.7)
         self.top_p = MODEL_CONFIG.get("top_p", 0.95)
         self.do_sample = MODEL_CONFIG.get("do_sample", True)
         self.max_new_tokens = MODEL_CONFIG.get("max_new_tokens", 100)
+        # Одновременные запросы объединяются в пакетные вызовы модели
+        self._scheduler = MicroBatchScheduler(
+            lambda prompts, params: batched_generate(
+                self.model, self.tokenizer, self.device, prompts, **params
+            ),
+            max_batch_size=int(MODEL_CONFIG.get("max_batch_size", 8)),
+            max_wait_ms=float(MODEL_CONFIG.get("max_batch_wait_ms", 10)),
+            logger=self._logger,
+        )
 
     def _generate(self, prompt: str) -> str:
         """Сгенерировать продолжение текста для указанного prompt."""
-        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
-        with torch.no_grad():
-            outputs = self.model.generate(
-                **inputs,
-                max_new_tokens=self.max_new_tokens,
-                temperature=self.temperature,
-                top_p=self.top_p,
-                do_sample=self.do_sample,
-                early_stopping=MODEL_CONFIG.get("early_stopping", True),
-            )
-        generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-        return generated_text[len(prompt) :].strip()  # убрать prompt из начала
+        return self._scheduler.generate(
+            prompt,
+            max_new_tokens=self.max_new_tokens,
+            temperature=self.temperature,
+            top_p=self.top_p,
+            do_sample=self.do_sample,
+            early_stopping=MODEL_CONFIG.get("early_stopping", True),
+        )
 
     def get_place_info(self, latitude: float, longitude: float) -> str:
         """Вернуть краткое описание места по координатам."""
@@ -49,11 +75,11 @@ class AIService:
             response_text = self._generate(prompt)
             if not response_text:
                 self._logger.warning("Пустой ответ от модели на get_place_info.")
-                return "Не удалось получить информацию: пустой ответ модели."
+                return AI_EMPTY_PLACE_MESSAGE
             return response_text
         except Exception as e:
             self._logger.error(f"Ошибка генерации get_place_info: {e}", exc_info=True)
-            return f"Ошибка сервиса ИИ: {str(e)}"
+            return AI_ERROR_MESSAGE
 
     def get_travel_recommendation(self, liked_places_str: str) -> str:
         """Вернуть рекомендацию на основе списка понравившихся мест."""
@@ -68,10 +94,75 @@ class AIService:
                 self._logger.warning(
                     "Пустой ответ от модели на get_travel_recommendation."
                 )
-                return "Не удалось получить рекомендации: пустой ответ модели."
+                return AI_EMPTY_RECOMMENDATION_MESSAGE
             return response_text
         except Exception as e:
             self._logger.error(
                 f"Ошибка генерации get_travel_recommendation: {e}", exc_info=True
             )
-            return f"Ошибка сервиса ИИ: {str(e)}"
+            return AI_ERROR_MESSAGE
+
+    def get_place_info_with_address(
+        self, address: str | None, latitude: float, longitude: float
+    ) -> str:
+        """Вернуть краткое описание места по адресу и координатам."""
+        if not address:
+            return self.get_place_info(latitude, longitude)
+        return self.get_place_info_with_address_and_prefs(address, latitude, longitude)
+
+    def get_place_info_with_address_and_prefs(
+        self,
+        address: str | None,
+        latitude: float,
+        longitude: float,
+        liked_places_str: str | None = None,
+    ) -> str:
+        """Вернуть описание места по адресу с учётом предпочтений."""
+        if not address:
+            return self.get_place_info(latitude, longitude)
+        prompt = (
+            f"Ты — полезный туристический ассистент. Кратко и интересно опиши место "
+            f"по адресу: {address} (широта {latitude}, долгота {longitude}). "
+        )
+        if liked_places_str:
+            prompt += f"Пользователю нравятся: {liked_places_str}. "
+        prompt += "Не больше 100 слов. Пиши на русском языке."
+        try:
+            response_text = self._generate(prompt)
+            if not response_text:
+                return AI_EMPTY_PLACE_MESSAGE
+            return response_text
+        except Exception as e:
+            self._logger.error(
+                f"Ошибка генерации описания по адресу: {e}", exc_info=True
+            )
+            return AI_ERROR_MESSAGE
+
+    def chat(self, messages: list[dict[str, str]]) -> str:
+        """Ответить на диалог, развернув сообщения в текстовый промпт."""
+        if not messages:
+            return "Пожалуйста, задайте вопрос."
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        try:
+            return self._generate(f"{transcript}\nassistant:") or AI_CHAT_ERROR_MESSAGE
+        except Exception as e:
+            self._logger.error(f"Ошибка чата ИИ: {e}", exc_info=True)
+            return AI_CHAT_ERROR_MESSAGE
+
+    def normalize_location_query(self, user_text: str) -> str:
+        """Выделить краткий поисковый запрос по локации (до 50 символов)."""
+        text = (user_text or "").strip()
+        if not text:
+            return ""
+        quick = quick_location_query(text)
+        if quick is not None:
+            return quick
+        prompt = (
+            "Выдели из текста только название места, города или адреса, "
+            f"без лишних слов.\nТекст: {text}\nМесто:"
+        )
+        try:
+            return self._generate(prompt).strip()[:50]
+        except Exception as e:
+            self._logger.error(f"Ошибка normalize_location_query: {e}", exc_info=True)
+            return ""
@@ -0,0 +1,178 @@
+"""Прогрев кэша описаний мест вне пиковой нагрузки."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.backend.domain.services.ai.ai_port import IAIService
+from src.backend.infrastructure.client.rate_limiter import (
+    BATCH,
+    RateLimiter,
+    priority_scope,
+)
+from src.backend.infrastructure.services.ai_service import AI_FAILURE_MESSAGES
+from src.backend.infrastructure.services.geocoding_service import GeocodingService
+
+
+@dataclass
+class WarmPoint:
+    """Точка для прогрева кэша."""
+
+    latitude: float
+    longitude: float
+    name: str = ""
+
+
+@dataclass
+class WarmStats:
+    """Итоги прогрева."""
+
+    total: int = 0
+    warmed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, outcome: str) -> None:
+        """Учесть исход обработки одной точки."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def as_dict(self) -> Dict[str, int]:
+        """Итоги в виде словаря."""
+        return {
+            "total": self.total,
+            "warmed": self.warmed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
+
+
+def read_seed_file(path: str) -> Iterator[WarmPoint]:
+    """Прочитать список точек: строки ``широта,долгота[,название]``.
+
+    Пустые строки и строки, начинающиеся с ``#``, пропускаются.
+
+    Raises:
+        ValueError: Если строка не содержит корректных координат
+    """
+    with open(path, encoding="utf-8") as fh:
+        for number, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = [p.strip() for p in line.split(",", 2)]
+            try:
+                latitude, longitude = float(parts[0]), float(parts[1])
+            except (IndexError, ValueError) as e:
+                raise ValueError(f"{path}:{number}: ожидается 'lat,lon[,name]'") from e
+            yield WarmPoint(latitude, longitude, parts[2] if len(parts) > 2 else "")
+
+
+class CacheWarmer:
+    """Заранее генерирует описания мест и складывает их в кэш.
+
+    Для каждой точки выполняет реверс-геокодинг и запрашивает оба варианта
+    описания, которые отдают пиковые маршруты: по координатам
+    (``/get_location_info``) и по адресу (``/reverse_geocode`` для
+    анонимного пользователя). Кэширующий декоратор сервиса ИИ сохраняет
+    ответы в кэш описаний. Вызовы Nominatim и модели ограничены по частоте,
+    число одновременно обрабатываемых точек — размером пула. Запросы к
+    Nominatim идут с приоритетом ``BATCH``: в общей очереди ограничителя
+    интерактивные запросы пользователей обслуживаются раньше.
+    """
+
+    def __init__(
+        self,
+        ai_service: IAIService,
+        geocoder: GeocodingService | None,
+        max_workers: int = 4,
+        ai_rate: float = 2.0,
+        geocode_rate: float = 1.0,
+        lang: str = "ru",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Инициализировать прогрев.
+
+        Args:
+            ai_service: Сервис ИИ (обычно CachedAIService)
+            geocoder: Сервис геокодинга; None — только описания по координатам
+            max_workers: Размер пула обработчиков
+            ai_rate: Не более стольких запросов к модели в секунду
+            geocode_rate: Не более стольких запросов к Nominatim в секунду
+            lang: Язык адресов
+            logger: Логгер
+        """
+        self.ai_service = ai_service
+        self.geocoder = geocoder
+        self.max_workers = max(1, max_workers)
+        self.lang = lang
+        self._ai_limiter = RateLimiter(ai_rate)
+        self._geo_limiter = RateLimiter(geocode_rate)
+        self._logger = logger or logging.getLogger(__name__)
+
+    def warm(self, points: Iterable[WarmPoint], force: bool = False) -> WarmStats:
+        """Прогреть кэш для набора точек.
+
+        Args:
+            points: Точки (дубликаты координат обрабатываются один раз)
+            force: Генерировать заново даже закэшированные точки
+
+        Returns:
+            Итоги прогрева
+        """
+        unique = list(self._dedupe(points))
+        stats = WarmStats(total=len(unique))
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="warm"
+        ) as pool:
+            for outcome in pool.map(lambda p: self._warm_one(p, force), unique):
+                stats.add(outcome)
+                done = stats.warmed + stats.skipped + stats.failed
+                if done % 50 == 0 or done == stats.total:
+                    self._logger.info(f"Прогрев кэша: {done}/{stats.total}")
+        return stats
+
+    def _warm_one(self, point: WarmPoint, force: bool) -> str:
+        """Обработать одну точку; вернуть имя счётчика исхода."""
+        lat, lon = point.latitude, point.longitude
+        if not force and self.ai_service.get_cached_place_info(lat, lon):
+            return "skipped"
+        try:
+            address = None
+            if self.geocoder is not None:
+                self._geo_limiter.acquire()
+                with priority_scope(BATCH):
+                    geo = self.geocoder.reverse_geocode(lat, lon, lang=self.lang)
+                address = geo.get("display_name")
+            texts: List[str] = []
+            if address:
+                self._ai_limiter.acquire()
+                texts.append(
+                    self.ai_service.get_place_info_with_address_and_prefs(
+                        address, lat, lon
+                    )
+                )
+            self._ai_limiter.acquire()
+            texts.append(self.ai_service.get_place_info(lat, lon))
+        except Exception as e:
+            self._logger.warning(f"Прогрев точки {lat},{lon} не удался: {e}")
+            return "failed"
+        if any(not t or t in AI_FAILURE_MESSAGES for t in texts):
+            return "failed"
+        return "warmed"
+
+    @staticmethod
+    def _dedupe(points: Iterable[WarmPoint]) -> Iterator[WarmPoint]:
+        """Убрать повторы координат (с точностью ~10 м)."""
+        seen: set[Tuple[float, float]] = set()
+        for point in points:
+            key = (round(point.latitude, 4), round(point.longitude, 4))
+            if key in seen:
+                continue
+            seen.add(key)
+            yield point
@@ -0,0 +1,191 @@
+"""Политика истории чата с бюджетом токенов и скользящим кратким содержанием."""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.backend.domain.services.ai.ai_port import IAIService
+from src.backend.infrastructure.cache import LRUCache, SingleFlight
+from src.backend.infrastructure.services.ai_service import AI_CHAT_ERROR_MESSAGE
+from src.backend.utils.deadline import current_deadline
+
+# Служебные токены на сообщение (роль, разделители шаблона чата)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str, chars_per_token: float = 3.0) -> int:
+    """Грубая оценка числа токенов текста по его длине.
+
+    Args:
+        text: Текст сообщения
+        chars_per_token: Среднее число символов на токен (для кириллицы ~3)
+
+    Returns:
+        Оценка числа токенов с учётом служебных токенов сообщения
+    """
+    return math.ceil(len(text or "") / chars_per_token) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class _Summary:
+    """Краткое содержание сообщений сессии с номерами до ``covered_upto``."""
+
+    text: str
+    covered_upto: int
+
+
+class TokenBudgetHistoryPolicy:
+    """Отбирает историю диалога для промпта в пределах бюджета токенов.
+
+    Новейшие сообщения попадают в промпт, пока укладываются в
+    ``budget_tokens``. Более старые сворачиваются в краткое содержание,
+    которое хранится в кэше по сессии и перегенерируется, только когда
+    несвёрнутых старых сообщений накопилось больше ``refresh_tokens``;
+    до этого они остаются в промпте как есть. Генерация идёт в бюджете
+    текущего запроса (см. ``utils.deadline``) и пропускается, если он
+    исчерпан: тогда в промпт идёт прежнее содержание и несвёрнутые
+    сообщения.
+
+    Attributes:
+        ai_service: Сервис ИИ для генерации краткого содержания
+        summaries: Кэш кратких содержаний по идентификатору сессии
+    """
+
+    def __init__(
+        self,
+        ai_service: IAIService,
+        budget_tokens: int = 1500,
+        refresh_tokens: int = 400,
+        chars_per_token: float = 3.0,
+        summaries: LRUCache | None = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Инициализировать политику.
+
+        Args:
+            ai_service: Сервис ИИ
+            budget_tokens: Бюджет токенов на недавние сообщения
+            refresh_tokens: Объём несвёрнутых старых сообщений, после которого
+                краткое содержание перегенерируется
+            chars_per_token: Параметр оценки токенов
+            summaries: Кэш кратких содержаний (по умолчанию in-memory LRU)
+            logger: Логгер
+        """
+        self.ai_service = ai_service
+        self.budget_tokens = budget_tokens
+        self.refresh_tokens = refresh_tokens
+        self.chars_per_token = chars_per_token
+        self.summaries = summaries or LRUCache(
+            max_size=1024, ttl_seconds=86400, name="chat_summary"
+        )
+        self._logger = logger or logging.getLogger(__name__)
+        self._single_flight = SingleFlight()
+
+    def build(
+        self, session_id: str, history: List[Dict[str, str]], total: int | None = None
+    ) -> List[Dict[str, str]]:
+        """Собрать сообщения для промпта.
+
+        Args:
+            session_id: Идентификатор сессии чата
+            history: Хранимая история сессии (от старых к новым)
+            total: Число сообщений, добавленных в сессию за всё время
+                (по умолчанию равно длине истории)
+
+        Returns:
+            Краткое содержание (системным сообщением, если есть) и
+            сообщения, укладывающиеся в бюджет
+        """
+        if not history:
+            return []
+        total = len(history) if total is None else total
+        offset = total - len(history)  # абсолютный номер history[0]
+
+        # Новейшие сообщения в пределах бюджета (последнее — всегда)
+        cut = len(history) - 1
+        used = self._tokens(history[cut])
+        while cut > 0:
+            cost = self._tokens(history[cut - 1])
+            if used + cost > self.budget_tokens:
+                break
+            used += cost
+            cut -= 1
+
+        summary = self._summary(session_id)
+        start = 0
+        if summary is not None:
+            start = min(max(summary.covered_upto - offset, 0), cut)
+        unsummarized = history[start:cut]
+        pending_tokens = sum(self._tokens(m) for m in unsummarized)
+
+        if unsummarized and (summary is None or pending_tokens > self.refresh_tokens):
+            refreshed = self._refresh(session_id, summary, unsummarized, offset + cut)
+            if refreshed is not None:
+                summary = refreshed
+                start = min(max(summary.covered_upto - offset, 0), cut)
+
+        messages = history[start:]
+        if summary is not None:
+            messages = [self._as_message(summary.text)] + messages
+        return messages
+
+    def forget(self, session_id: str) -> None:
+        """Удалить краткое содержание сессии (например, при очистке чата)."""
+        self.summaries.delete(session_id)
+
+    def _tokens(self, message: Dict[str, str]) -> int:
+        """Оценка токенов сообщения."""
+        return estimate_tokens(message.get("content", ""), self.chars_per_token)
+
+    def _summary(self, session_id: str) -> _Summary | None:
+        """Краткое содержание сессии из кэша."""
+        raw = self.summaries.get(session_id)
+        if not raw:
+            return None
+        return _Summary(text=raw["text"], covered_upto=raw["covered_upto"])
+
+    def _refresh(
+        self,
+        session_id: str,
+        summary: _Summary | None,
+        messages: List[Dict[str, str]],
+        covered_upto: int,
+    ) -> _Summary | None:
+        """Дополнить краткое содержание новыми свёрнутыми сообщениями.
+
+        Returns:
+            Новое краткое содержание либо None, если модель не ответила
+            или бюджет запроса исчерпан
+        """
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            self._logger.warning("Бюджет запроса исчерпан: история чата не сжата")
+            return None
+
+        def generate() -> _Summary | None:
+            try:
+                text = self.ai_service.summarize_dialog(
+                    messages, previous_summary=summary.text if summary else None
+                )
+            except Exception as e:
+                self._logger.warning(f"Не удалось сжать историю чата: {e}")
+                return None
+            text = (text or "").strip()
+            if not text or text == AI_CHAT_ERROR_MESSAGE:
+                return None
+            self.summaries.set(session_id, {"text": text, "covered_upto": covered_upto})
+            return _Summary(text=text, covered_upto=covered_upto)
+
+        # Одновременные запросы одной сессии ждут одну генерацию
+        return self._single_flight.do(session_id, generate)
+
+    @staticmethod
+    def _as_message(text: str) -> Dict[str, str]:
+        """Системное сообщение с кратким содержанием ранней части диалога."""
+        return {
+            "role": "system",
+            "content": f"Краткое содержание предыдущей части диалога: {text}",
+        }
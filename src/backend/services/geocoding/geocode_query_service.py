@@ -0,0 +1,178 @@
+"""Поиск мест по тексту для строки поиска карты."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from src.backend.infrastructure.cache import LRUCache, PrefixIndex, SingleFlight
+from src.backend.infrastructure.services.ai_service import AI_FAILURE_MESSAGES
+from src.backend.infrastructure.services.location_query import (
+    fold_query,
+    parse_coordinates,
+    quick_location_query,
+)
+
+
+class GeocodeQueryService:
+    """Прямой геокодинг пользовательского запроса с кэшем и подсказками.
+
+    Запрос нормализуется (``normalize_location_query``: без модели для
+    координат и коротких названий), затем геокодируется. Ответ кэшируется
+    по свёрнутому тексту запроса, поэтому повторный запрос не доходит ни
+    до модели, ни до Nominatim; описание первого совпадения, однажды
+    полученное, хранится в той же записи. Названия найденных мест
+    (``display_name`` первого совпадения, а не текст запроса — он
+    может содержать личные данные) попадают в общий префиксный индекс,
+    из которого строка поиска получает подсказки без внешних вызовов.
+
+    Attributes:
+        geocoder: Сервис геокодинга
+        ai_service: Сервис ИИ (нормализация запроса и описание места)
+        results: Кэш ответов по запросу
+        suggestions: Префиксный индекс названий найденных мест
+    """
+
+    def __init__(
+        self,
+        geocoder: Any,
+        ai_service: Any = None,
+        results: Optional[LRUCache] = None,
+        suggestions: Optional[PrefixIndex] = None,
+        negative_ttl_seconds: float = 300,
+        lang: str = "ru",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Инициализировать сервис.
+
+        Args:
+            geocoder: Сервис геокодинга (``search`` и ``reverse_geocode``)
+            ai_service: Сервис ИИ; None — нормализация только без модели
+            results: Кэш ответов (по умолчанию в памяти)
+            suggestions: Префиксный индекс (по умолчанию пустой)
+            negative_ttl_seconds: Время жизни ответа «ничего не найдено»
+            lang: Язык результатов
+            logger: Логгер
+        """
+        self.geocoder = geocoder
+        self.ai_service = ai_service
+        self.results = results if results is not None else LRUCache(max_size=5000)
+        self.suggestions = suggestions if suggestions is not None else PrefixIndex()
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.lang = lang
+        self._single_flight = SingleFlight()
+        self._logger = logger or logging.getLogger(__name__)
+
+    def search(
+        self, query: str, limit: int = 5, describe: bool = False
+    ) -> Dict[str, Any]:
+        """Найти места по тексту запроса.
+
+        Args:
+            query: Текст из строки поиска
+            limit: Сколько совпадений вернуть
+            describe: Добавить описание первого совпадения
+
+        Returns:
+            Словарь с полями query, normalized, results (display_name, lat,
+            lon), description, suggestions, cached и degraded
+
+        Raises:
+            DeadlineExceeded: Если бюджет запроса исчерпан при обращении к модели
+        """
+        folded = fold_query(query)
+        key = f"{self.lang}:{limit}:{folded}"
+        entry = self.results.get(key)
+        cached = entry is not None
+        if entry is None:
+            entry = self._single_flight.do(key, lambda: self._lookup(query, limit, key))
+        results: List[Dict[str, Any]] = entry["results"]
+        name = results[0].get("display_name") if results else None
+        if name:
+            # Индекс общий для всех пользователей: только ответ геокодера
+            self.suggestions.add(fold_query(name), {"query": name, **results[0]})
+        description = None
+        if describe and results:
+            description = entry.get("description") or self._describe(key, entry)
+        return {
+            "query": query,
+            "normalized": entry["normalized"],
+            "results": results,
+            "description": description,
+            "suggestions": self.suggest(folded),
+            "cached": cached,
+            "degraded": bool(entry.get("degraded")),
+        }
+
+    def suggest(self, prefix: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Подсказки по началу названия из ранее найденных мест (без внешних вызовов)."""
+        return self.suggestions.suggest(fold_query(prefix), limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Счётчики кэша ответов и префиксного индекса."""
+        return {
+            **self.results.stats(),
+            "single_flight": self._single_flight.stats(),
+            "suggestions": self.suggestions.stats(),
+        }
+
+    def _lookup(self, query: str, limit: int, key: str) -> Dict[str, Any]:
+        """Нормализовать и геокодировать запрос; сохранить удачный ответ."""
+        normalized = self._normalize(query)
+        if not normalized:
+            return {"normalized": "", "results": []}
+        coords = parse_coordinates(normalized)
+        if coords is not None:
+            geo = self.geocoder.reverse_geocode(coords[0], coords[1], lang=self.lang)
+            results = [
+                {
+                    "display_name": geo.get("display_name") or normalized,
+                    "lat": coords[0],
+                    "lon": coords[1],
+                }
+            ]
+        else:
+            geo = self.geocoder.search(normalized, lang=self.lang, limit=limit)
+            results = geo.get("results") or []
+            if not results and geo.get("display_name"):
+                results = [{k: geo.get(k) for k in ("display_name", "lat", "lon")}]
+        raw = geo.get("raw") or {}
+        entry = {
+            "normalized": normalized,
+            "results": results[:limit],
+            "degraded": bool(raw.get("deadline_exceeded")),
+        }
+        if entry["degraded"] or (raw.get("error") and not geo.get("display_name")):
+            # Сбой, а не ответ: его кэширует (или нет) слой геокодинга
+            return entry
+        try:
+            if results:
+                self.results.set(key, entry)
+            elif self.negative_ttl_seconds and self.negative_ttl_seconds > 0:
+                self.results.set(key, entry, ttl_seconds=self.negative_ttl_seconds)
+        except Exception as e:
+            self._logger.warning(f"Не удалось записать в кэш поиска мест: {e}")
+        return entry
+
+    def _normalize(self, query: str) -> str:
+        """Текст для геокодинга: через модель, если она есть, иначе как есть."""
+        normalize = getattr(self.ai_service, "normalize_location_query", None)
+        if callable(normalize):
+            return normalize(query)
+        return quick_location_query(query) or " ".join(query.split())
+
+    def _describe(self, key: str, entry: Dict[str, Any]) -> Optional[str]:
+        """Описание первого совпадения; удачное сохраняется в записи кэша."""
+        describe = getattr(self.ai_service, "get_place_info_with_address", None)
+        top = entry["results"][0]
+        if not callable(describe) or top.get("lat") is None:
+            return None
+        text = describe(top["display_name"], top["lat"], top["lon"])
+        if not text or text in AI_FAILURE_MESSAGES:
+            return None
+        if not entry.get("degraded"):
+            try:
+                self.results.set(key, {**entry, "description": text})
+            except Exception as e:
+                self._logger.warning(f"Не удалось записать в кэш поиска мест: {e}")
+        return text
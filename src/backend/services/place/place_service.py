@@ -1,7 +1,11 @@
 """Сервис для работы с местами (прикладной слой)."""
 
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
 from src.backend.domain.exceptions.place_exceptions import PlaceNotFoundError
+from src.backend.domain.model.place.popular_place_model import PopularPlace
 from src.backend.use_case.place.place_use_case import PlaceUseCase
+from src.backend.utils.deadline import DeadlineExceeded
 
 
 class PlaceService:
@@ -30,11 +34,61 @@ class PlaceService:
 
         Raises:
             PlaceNotFoundError: Место не найдено
+            DeadlineExceeded: Исчерпан бюджет времени запроса
             RuntimeError: Ошибка при получении информации
         """
         try:
             return self.place_use_case.get_info_for_point(latitude, longitude)
-        except PlaceNotFoundError as e:
+        except (PlaceNotFoundError, DeadlineExceeded) as e:
+            raise e
+        except Exception as e:
+            raise RuntimeError("Ошибка при получении информации о точке") from e
+
+    async def get_info_for_point_async(self, latitude: float, longitude: float) -> str:
+        """Асинхронно получить информацию о месте по координатам.
+
+        Args:
+            latitude: Широта
+            longitude: Долгота
+
+        Returns:
+            Описание места от ИИ-сервиса
+
+        Raises:
+            PlaceNotFoundError: Место не найдено
+            DeadlineExceeded: Исчерпан бюджет времени запроса
+            RuntimeError: Ошибка при получении информации
+        """
+        try:
+            return await self.place_use_case.get_info_for_point_async(
+                latitude, longitude
+            )
+        except (PlaceNotFoundError, DeadlineExceeded) as e:
             raise e
         except Exception as e:
             raise RuntimeError("Ошибка при получении информации о точке") from e
+
+    def describe_points(
+        self, points: Sequence[Tuple[float, float]], max_concurrency: int = 8
+    ) -> Iterator[Dict[str, Any]]:
+        """Получить описания набора точек в порядке входного списка.
+
+        Args:
+            points: Пары (широта, долгота)
+            max_concurrency: Максимум одновременных обращений к ИИ
+
+        Returns:
+            Итератор результатов по точкам (с ``info`` либо ``error``)
+        """
+        return self.place_use_case.describe_points(points, max_concurrency)
+
+    def get_popular_places(self, limit: int = 100) -> List[PopularPlace]:
+        """Получить самые часто отмечаемые места.
+
+        Args:
+            limit: Максимальное число мест
+
+        Returns:
+            Популярные места по убыванию числа отметок
+        """
+        return self.place_use_case.get_popular_places(limit)
@@ -0,0 +1,142 @@
+"""Фоновая генерация рекомендаций для отложенного фрагмента профиля."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from src.backend.domain.model.place.liked_place_model import LikedPlace
+from src.backend.infrastructure.services.ai_service import (
+    AI_EMPTY_RECOMMENDATION_MESSAGE,
+)
+from src.backend.use_case.user.profile_use_case import (
+    ProfileUseCase,
+    liked_places_hash,
+)
+
+
+class RecommendationJobs:
+    """Запускает генерацию рекомендаций в пуле и отдаёт готовый результат.
+
+    Страница профиля не ждёт модель: если рекомендации нет в хранилище,
+    генерация ставится в пул (не более одной на пользователя), а страница
+    опрашивает фрагмент, пока результат не будет готов. Через тот же пул
+    идёт и перегенерация после изменения понравившихся мест (``refresh``).
+    """
+
+    def __init__(
+        self,
+        profile_use_case: ProfileUseCase,
+        max_workers: int = 4,
+        max_jobs: int = 1000,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Инициализировать пул генерации.
+
+        Args:
+            profile_use_case: Сценарий профиля
+            max_workers: Число одновременных генераций
+            max_jobs: Сколько незабранных результатов держать в памяти
+            logger: Логгер
+        """
+        self.profile_use_case = profile_use_case
+        self.max_jobs = max(1, max_jobs)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="recommendation"
+        )
+        # user_id -> (хеш набора мест, для которого идёт генерация; задача)
+        self._jobs: Dict[int, Tuple[str, Future]] = {}
+        self._lock = threading.Lock()
+        self._logger = logger or logging.getLogger(__name__)
+
+    def get_or_start(
+        self, user_id: int, liked_places: Optional[List[LikedPlace]] = None
+    ) -> Optional[str]:
+        """Вернуть готовую рекомендацию или запустить её генерацию.
+
+        Готовый результат отдаётся, только если он сгенерирован для
+        текущего набора мест; иначе генерация запускается заново.
+
+        Args:
+            user_id: ID пользователя
+            liked_places: Уже загруженные понравившиеся места
+
+        Returns:
+            Текст рекомендации или None, если генерация ещё идёт
+        """
+        if liked_places is None:
+            liked_places = self.profile_use_case.get_liked_places(user_id)
+        stored = self.profile_use_case.get_stored_recommendations(user_id, liked_places)
+        places_hash = liked_places_hash(liked_places)
+        with self._lock:
+            job = self._jobs.get(user_id)
+            if stored is not None:
+                if job is not None and job[1].done():
+                    del self._jobs[user_id]
+                return stored
+            if job is None:
+                self._start(user_id, liked_places, places_hash)
+                return None
+            job_hash, future = job
+            if not future.done():
+                return None
+            if job_hash != places_hash:
+                # Набор мест изменился после запуска: результат устарел
+                self._start(user_id, liked_places, places_hash)
+                return None
+            del self._jobs[user_id]
+        try:
+            return future.result()
+        except Exception as e:
+            self._logger.error(
+                f"Ошибка фоновой генерации рекомендаций для {user_id}: {e}",
+                exc_info=True,
+            )
+            return AI_EMPTY_RECOMMENDATION_MESSAGE
+
+    def refresh(self, user_id: int) -> None:
+        """Перегенерировать рекомендацию в фоне после изменения набора мест.
+
+        Если генерация для пользователя уже идёт, вторая не запускается:
+        устаревший результат будет перезапущен в ``get_or_start``.
+
+        Args:
+            user_id: ID пользователя
+        """
+        liked_places = self.profile_use_case.get_liked_places(user_id)
+        with self._lock:
+            job = self._jobs.get(user_id)
+            if job is not None and not job[1].done():
+                return
+            self._start(user_id, liked_places, liked_places_hash(liked_places))
+
+    def pending(self) -> int:
+        """Число генераций в работе."""
+        with self._lock:
+            return sum(1 for _, f in self._jobs.values() if not f.done())
+
+    def shutdown(self) -> None:
+        """Остановить пул (дождавшись текущих генераций)."""
+        self._executor.shutdown(wait=True)
+
+    def _start(
+        self, user_id: int, liked_places: List[LikedPlace], places_hash: str
+    ) -> None:
+        """Запустить генерацию для набора мест (под блокировкой)."""
+        self._jobs.pop(user_id, None)
+        self._prune()
+        self._jobs[user_id] = (
+            places_hash,
+            self._executor.submit(
+                self.profile_use_case.get_recommendations, user_id, liked_places
+            ),
+        )
+
+    def _prune(self) -> None:
+        """Забыть незабранные готовые результаты сверх лимита (под блокировкой)."""
+        if len(self._jobs) < self.max_jobs:
+            return
+        for user_id in [u for u, (_, f) in self._jobs.items() if f.done()]:
+            del self._jobs[user_id]
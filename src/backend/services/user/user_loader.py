@@ -0,0 +1,137 @@
+"""Загрузка пользователя для flask-login с кэшем и данными подписанной сессии."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, MutableMapping, Optional
+
+from src.backend.domain.model.user.user_model import User
+from src.backend.infrastructure.cache import LRUCache
+
+# Ключ данных пользователя в сессии Flask
+SESSION_CLAIMS_KEY = "_user_claims"
+
+
+class CachedUserLoader:
+    """Загрузчик ``current_user``: сессия, затем кэш процесса, затем БД.
+
+    flask-login вызывает загрузчик на каждый запрос с авторизацией. Кэш
+    хранит доменных пользователей по id ``ttl_seconds`` секунд, поэтому
+    БД видит один запрос на пользователя за TTL в каждом процессе. Если
+    задан ``claims_ttl_seconds``, после проверки по кэшу или БД в
+    подписанную сессию записываются id и имя пользователя, и следующие
+    запросы в течение этого окна обходятся без кэша и БД (отзыв доступа
+    вступает в силу не позже чем через окно). У пользователя из сессии
+    нет хэша пароля — он нужен только при входе.
+
+    Attributes:
+        cache: Кэш пользователей (None — всегда БД)
+        claims_ttl_seconds: Окно доверия данным сессии (0 — выключено)
+    """
+
+    def __init__(
+        self,
+        load: Callable[[int], Optional[User]],
+        cache: Optional[LRUCache] = None,
+        claims_ttl_seconds: float = 0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Инициализировать загрузчик.
+
+        Args:
+            load: Загрузка пользователя из БД по id
+            cache: Кэш пользователей
+            claims_ttl_seconds: Окно доверия данным сессии, секунды
+            clock: Источник времени
+        """
+        self._load = load
+        self.cache = cache
+        self.claims_ttl_seconds = max(0.0, claims_ttl_seconds or 0.0)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "claims_hits": 0, "db_loads": 0}
+
+    def __call__(
+        self, user_id: Any, session: Optional[MutableMapping] = None
+    ) -> Optional[User]:
+        """Загрузить пользователя по id из flask-login.
+
+        Args:
+            user_id: Идентификатор из сессии (строка)
+            session: Сессия Flask для режима доверия её данным
+
+        Returns:
+            Доменный пользователь или None, если его нет
+        """
+        try:
+            uid = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        self._count("requests")
+        use_claims = session is not None and self.claims_ttl_seconds > 0
+        if use_claims:
+            user = self._from_claims(uid, session.get(SESSION_CLAIMS_KEY))
+            if user is not None:
+                self._count("claims_hits")
+                return user
+        user = self.cache.get(str(uid)) if self.cache is not None else None
+        if user is None:
+            self._count("db_loads")
+            user = self._load(uid)
+            if user is not None and self.cache is not None:
+                self.cache.set(str(uid), user)
+        if user is not None and use_claims:
+            session[SESSION_CLAIMS_KEY] = {
+                "id": uid,
+                "username": user.username,
+                "active": user.is_active,
+                "verified_at": self._clock(),
+            }
+        return user
+
+    def invalidate(
+        self, user_id: Any, session: Optional[MutableMapping] = None
+    ) -> None:
+        """Забыть пользователя после изменения или выхода.
+
+        Args:
+            user_id: ID пользователя
+            session: Сессия Flask, из которой удалить данные пользователя
+        """
+        if self.cache is not None:
+            self.cache.delete(str(user_id))
+        if session is not None:
+            session.pop(SESSION_CLAIMS_KEY, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Счётчики загрузчика и кэша; ``hit_rate`` — доля запросов без БД."""
+        with self._lock:
+            counters = dict(self._counters)
+        requests = counters["requests"]
+        return {
+            **counters,
+            "hit_rate": (
+                round(1 - counters["db_loads"] / requests, 4) if requests else 0.0
+            ),
+            "claims_ttl_seconds": self.claims_ttl_seconds,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    def _from_claims(self, uid: int, claims: Any) -> Optional[User]:
+        """Пользователь из данных сессии, если они его и ещё не устарели."""
+        if not isinstance(claims, dict) or claims.get("id") != uid:
+            return None
+        age = self._clock() - float(claims.get("verified_at") or 0)
+        if not 0 <= age <= self.claims_ttl_seconds:
+            return None
+        return User(
+            user_id=uid,
+            username=claims.get("username", ""),
+            password_hash="",
+            is_active=bool(claims.get("active", True)),
+        )
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
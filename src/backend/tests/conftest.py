@@ -52,9 +52,20 @@ def make_place_repo(initial_places: List[object] | None = None):
         places.append(place)
         return place
 
+    def add_liked_place_if_absent(place):
+        for existing in places:
+            if (existing.user_id, existing.latitude, existing.longitude) == (
+                place.user_id,
+                place.latitude,
+                place.longitude,
+            ):
+                return existing, False
+        return add_liked_place(place), True
+
     repo = SimpleNamespace(
         get_liked_places_by_user=get_liked_places_by_user,
         add_liked_place=add_liked_place,
+        add_liked_place_if_absent=add_liked_place_if_absent,
         _places=places,
     )
     return repo
@@ -63,14 +74,27 @@ def make_place_repo(initial_places: List[object] | None = None):
 class DummyAI:
     """Simple AI service double for unit tests."""
 
-    def __init__(self, info_response: str = "INFO", rec_prefix: str = "REC:"):
+    def __init__(
+        self,
+        info_response: str = "INFO",
+        rec_prefix: str = "REC:",
+        cached: dict | None = None,
+    ):
         self.info_response = info_response
         self.rec_prefix = rec_prefix
+        self.cached = cached or {}
+        self.info_calls = 0
+        self.rec_calls = 0
 
     def get_place_info(self, latitude: float, longitude: float) -> str:
+        self.info_calls += 1
         return f"{self.info_response} {latitude},{longitude}"
 
+    def get_cached_place_info(self, latitude: float, longitude: float):
+        return self.cached.get((latitude, longitude))
+
     def get_travel_recommendation(self, liked_places_str: str) -> str:
+        self.rec_calls += 1
         return f"{self.rec_prefix} {liked_places_str}"
 
 
@@ -105,3 +129,6 @@ class FakePlaceService:
 
     def get_info_for_point(self, latitude: float, longitude: float) -> str:
         return f"{self.response} {latitude},{longitude}"
+
+    async def get_info_for_point_async(self, latitude: float, longitude: float) -> str:
+        return self.get_info_for_point(latitude, longitude)
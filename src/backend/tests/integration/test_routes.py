@@ -22,8 +22,250 @@ def test_get_location_info_success(client, app):
     assert resp.get_json()["info"].startswith("OK")
 
 
+def test_get_location_info_async_success(client, app):
+    from src.backend.tests.conftest import FakePlaceService
+
+    app.extensions["services"]["place_service"] = FakePlaceService(response="OK")
+
+    resp = client.post(
+        "/get_location_info/async",
+        json={"latitude": 10.0, "longitude": 20.0},
+    )
+    assert resp.status_code == 200
+    assert resp.get_json()["info"] == "OK 10.0,20.0"
+
+
+def test_get_location_info_batch_streams_ndjson(client, app):
+    import json
+
+    from src.backend.services.place.place_service import PlaceService
+    from src.backend.tests.conftest import (
+        DummyAI,
+        DummyUoW,
+        make_place_repo,
+        make_user_repo,
+    )
+    from src.backend.use_case.place.place_use_case import PlaceUseCase
+
+    app.extensions["services"]["place_service"] = PlaceService(
+        PlaceUseCase(DummyUoW(make_user_repo(), make_place_repo()), DummyAI("OK"))
+    )
+
+    resp = client.post(
+        "/get_location_info/batch",
+        json={"points": [{"latitude": 1.0, "longitude": 2.0}] * 3},
+    )
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.data.decode().splitlines()]
+    assert [item["index"] for item in lines] == [0, 1, 2]
+    assert lines[0]["info"] == "OK 1.0,2.0"
+
+
 def test_get_location_info_validation_error(client):
     resp = client.post("/get_location_info", json={"latitude": 1000})
     assert resp.status_code == 400
     assert resp.is_json
     assert "error" in resp.get_json()
+
+
+def test_chat_stream_emits_tokens_and_saves_answer(client, app):
+    class StreamingAI:
+        def chat_stream(self, messages):
+            yield "При"
+            yield "вет"
+
+    app.extensions["services"]["ai_service"] = StreamingAI()
+
+    resp = client.post(
+        "/api/chat/stream",
+        json={"session_id": "s1", "messages": [{"role": "user", "content": "Hi"}]},
+    )
+    body = resp.get_data(as_text=True)
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    assert body.count("event: token") == 2
+    assert '"answer": "Привет"' in body
+    history = app.extensions["services"]["chat_repo"].get("s1")
+    assert history[-1] == {"role": "assistant", "content": "Привет"}
+
+
+def test_llm_metrics_endpoint(client, app):
+    app.config["SHOW_LOGS_LINK"] = True
+    app.extensions["services"]["llm_metrics"].record("chat", "p", "m", 0.2, "ok")
+
+    resp = client.get("/logs/api/metrics")
+
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["llm"][0]["method"] == "chat"
+    assert "remote" in data["backends"]
+
+
+def test_chat_semantic_cache_serves_repeated_first_question(client, app):
+    from src.backend.infrastructure.cache import SemanticCache
+
+    class CountingAI:
+        calls = 0
+
+        def chat(self, messages):
+            CountingAI.calls += 1
+            return "Лувр, Эйфелева башня"
+
+    app.extensions["services"]["ai_service"] = CountingAI()
+    app.extensions["services"]["chat_semantic_cache"] = SemanticCache()
+
+    for session_id, text in [
+        ("a", "Что посмотреть в Париже?"),
+        ("b", "что посмотреть в париже"),
+    ]:
+        resp = client.post(
+            "/api/chat",
+            json={
+                "session_id": session_id,
+                "messages": [{"role": "user", "content": text}],
+            },
+        )
+        assert resp.get_json()["answer"] == "Лувр, Эйфелева башня"
+
+    assert CountingAI.calls == 1
+    history = app.extensions["services"]["chat_repo"].get("b")
+    assert history[-1]["role"] == "assistant"
+
+
+def test_reverse_geocode_returns_address_when_ai_misses_deadline(client, app):
+    from types import SimpleNamespace
+
+    from src.backend.utils.deadline import DeadlineExceeded
+
+    def slow_description(*args, **kwargs):
+        raise DeadlineExceeded("budget spent")
+
+    app.extensions["services"]["geocoding_service"] = SimpleNamespace(
+        reverse_geocode=lambda lat, lon, lang: {
+            "display_name": "Москва",
+            "address": {"city": "Москва"},
+            "raw": {},
+        }
+    )
+    app.extensions["services"]["ai_service"] = SimpleNamespace(
+        get_place_info_with_address=slow_description
+    )
+
+    resp = client.post("/reverse_geocode", json={"latitude": 55.75, "longitude": 37.62})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["address"] == "Москва"
+    assert body["ai_description"] is None
+    assert body["degraded"] is True
+
+
+def test_geocode_query_returns_results_and_suggestions(client, app):
+    from types import SimpleNamespace
+
+    from src.backend.services.geocoding.geocode_query_service import (
+        GeocodeQueryService,
+    )
+
+    searches = []
+
+    def search(query, lang, limit):
+        searches.append(query)
+        hit = {"display_name": "Казань, Россия", "lat": 55.8, "lon": 49.1}
+        return {**hit, "raw": {}, "results": [hit]}
+
+    app.extensions["services"]["geocode_query_service"] = GeocodeQueryService(
+        SimpleNamespace(search=search),
+        SimpleNamespace(
+            normalize_location_query=lambda text: text.strip(),
+            get_place_info_with_address=lambda address, lat, lon: f"Про {address}",
+        ),
+    )
+
+    resp = client.post("/geocode_query", json={"query": "Казань", "describe": True})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["results"][0]["display_name"] == "Казань, Россия"
+    assert body["description"] == "Про Казань, Россия"
+
+    resp = client.get("/geocode_query/suggest?q=каз")
+    assert resp.get_json()["suggestions"][0]["query"] == "Казань, Россия"
+    assert client.post("/geocode_query", json={"query": " "}).status_code == 400
+    assert searches == ["Казань"]
+
+
+def test_authenticated_requests_load_user_from_db_once(client, app):
+    from src.backend.domain.model.user.user_model import User
+
+    loader = app.extensions["services"]["user_loader"]
+    calls = []
+    loader._load = lambda uid: calls.append(uid) or User(uid, "alice", "hash")
+    with client.session_transaction() as sess:
+        sess["_user_id"] = "7"
+
+    client.get("/")
+    resp = client.get("/")
+
+    assert resp.status_code == 200
+    assert b"alice" in resp.data
+    assert calls == [7]
+    assert loader.stats()["cache"]["hits"] == 1
+
+
+def test_metrics_report_ai_single_flight(client, app):
+    from src.backend.infrastructure.cache import LRUCache
+    from src.backend.infrastructure.services.cached_ai_service import (
+        CachedAIService,
+    )
+    from src.backend.tests.conftest import DummyAI
+
+    inner = DummyAI("OK")
+    inner.single_flight_stats = lambda: {"executed": 1, "coalesced": 4}
+    app.config["SHOW_LOGS_LINK"] = True
+    app.extensions["services"]["ai_service"] = CachedAIService(inner, LRUCache())
+
+    resp = client.get("/logs/api/metrics")
+
+    assert resp.status_code == 200
+    assert resp.get_json()["ai_single_flight"]["coalesced"] == 4
+
+
+def test_chat_history_summary_runs_within_chat_budget(client, app):
+    from src.backend.services.chat.history_policy import TokenBudgetHistoryPolicy
+    from src.backend.utils.deadline import current_deadline
+
+    class SummarizingAI:
+        deadlines = []
+
+        def summarize_dialog(self, messages, previous_summary=None):
+            SummarizingAI.deadlines.append(current_deadline())
+            return "краткое содержание"
+
+        def chat(self, messages):
+            SummarizingAI.deadlines.append(current_deadline())
+            return "ответ"
+
+    ai = SummarizingAI()
+    app.config["CHAT_BUDGET_SECONDS"] = 30
+    app.extensions["services"]["ai_service"] = ai
+    app.extensions["services"]["chat_history_policy"] = TokenBudgetHistoryPolicy(
+        ai, budget_tokens=1
+    )
+
+    resp = client.post(
+        "/api/chat",
+        json={
+            "session_id": "budget",
+            "messages": [
+                {"role": "user", "content": "Хочу в Италию"},
+                {"role": "assistant", "content": "Рим или Флоренция?"},
+                {"role": "user", "content": "Рим"},
+            ],
+        },
+    )
+
+    assert resp.get_json()["answer"] == "ответ"
+    summary_deadline, chat_deadline = SummarizingAI.deadlines
+    assert summary_deadline is not None
+    assert summary_deadline is chat_deadline  # один бюджет на весь ход
@@ -0,0 +1,86 @@
+import pytest
+
+from src.backend.infrastructure.services.ai_backends import AIBackendRegistry
+from src.backend.tests.conftest import DummyAI
+
+
+class CountingBuild:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        ai = DummyAI(info_response="LOCAL")
+        ai.stats = lambda: {"backend": "local"}
+        return ai
+
+
+def test_backend_is_built_on_first_call_only():
+    build = CountingBuild()
+    registry = AIBackendRegistry()
+    registry.register("local", build, import_modules=("json",))
+
+    service = registry.get("local")
+    assert build.calls == 0
+    assert registry.stats()["local"]["loaded"] is False
+
+    assert service.get_place_info(1.0, 2.0) == "LOCAL 1.0,2.0"
+    service.get_place_info(3.0, 4.0)
+
+    assert build.calls == 1
+    stats = registry.stats()["local"]
+    assert stats["loaded"] is True
+    assert stats["import_seconds"] >= 0
+    assert stats["load_seconds"] >= 0
+
+
+def test_extra_backend_methods_are_delegated():
+    registry = AIBackendRegistry()
+    registry.register("local", CountingBuild())
+
+    assert registry.get("local").stats() == {"backend": "local"}
+
+
+def test_unknown_backend_is_rejected():
+    registry = AIBackendRegistry()
+    registry.register("remote", CountingBuild())
+
+    with pytest.raises(ValueError):
+        registry.get("gpu")
+
+
+def test_failed_load_is_reported():
+    def broken():
+        raise RuntimeError("no weights")
+
+    registry = AIBackendRegistry()
+    registry.register("local", broken)
+
+    with pytest.raises(RuntimeError):
+        registry.get("local").chat([])
+    assert registry.stats()["local"]["error"] == "no weights"
+
+
+def test_single_flight_stats_do_not_load_backend():
+    build = CountingBuild()
+    registry = AIBackendRegistry()
+    registry.register("remote", build)
+    service = registry.get("remote")
+
+    assert service.single_flight_stats() is None
+    assert build.calls == 0
+
+    registry.load("remote").single_flight_stats = lambda: {"coalesced": 3}
+    assert service.single_flight_stats() == {"coalesced": 3}
+
+
+def test_capability_checks_do_not_load_backend():
+    build = CountingBuild()
+    registry = AIBackendRegistry()
+    registry.register("remote", build)
+    service = registry.get("remote")
+
+    assert hasattr(service, "normalize_location_query")
+    assert hasattr(service, "get_place_info_with_address")
+    assert hasattr(service, "get_place_info_with_address_and_prefs")
+    assert build.calls == 0
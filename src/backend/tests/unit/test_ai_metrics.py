@@ -0,0 +1,85 @@
+import logging
+from types import SimpleNamespace
+
+from src.backend.infrastructure.services.ai_metrics import LLMMetrics
+from src.backend.infrastructure.services.ai_service import (
+    AI_EMPTY_PLACE_MESSAGE,
+    AI_ERROR_MESSAGE,
+    AIService,
+)
+
+
+class ScriptedCompletions:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+
+    def create(self, model, messages, **kwargs):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def completion(text, usage=None):
+    message = {"content": text}
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def make_service(completions, metrics):
+    svc = AIService(config={"HF_TOKEN": "test", "HF_PROVIDER": "p1"}, metrics=metrics)
+    svc._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    svc._model = "m1"
+    return svc
+
+
+def series(metrics, method):
+    return next(s for s in metrics.snapshot() if s["method"] == method)
+
+
+def test_records_calls_tokens_errors_and_empty_by_method(caplog):
+    metrics = LLMMetrics(chars_per_token=3.0)
+    usage = SimpleNamespace(prompt_tokens=120, completion_tokens=40)
+    svc = make_service(
+        ScriptedCompletions(
+            completion("Описание", usage),
+            completion(""),
+            RuntimeError("boom"),
+            completion("Рим"),
+        ),
+        metrics,
+    )
+
+    with caplog.at_level(logging.INFO):
+        assert svc.get_place_info(1.0, 2.0) == "Описание"
+        assert svc.get_place_info(3.0, 4.0) == AI_EMPTY_PLACE_MESSAGE
+        assert svc.get_place_info(5.0, 6.0) == AI_ERROR_MESSAGE
+        assert svc.get_travel_recommendation("Париж") == "Рим"
+
+    place = series(metrics, "get_place_info")
+    assert (place["provider"], place["model"]) == ("p1", "m1")
+    assert (place["calls"], place["errors"], place["empty"]) == (3, 1, 1)
+    assert place["prompt_tokens"] > 120  # usage + оценка двух вызовов без usage
+    assert place["completion_tokens"] == 40
+    assert place["estimated_token_calls"] == 2
+    assert sum(place["latency_buckets"].values()) == 3
+
+    rec = series(metrics, "get_travel_recommendation")
+    assert rec["calls"] == 1 and rec["completion_tokens"] == 1  # "Рим" ~ 1 токен
+
+    logged = [r.llm for r in caplog.records if hasattr(r, "llm")]
+    assert [f["outcome"] for f in logged] == ["ok", "empty", "error", "ok"]
+    assert logged[2]["error"] == "RuntimeError"
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    metrics = LLMMetrics(buckets=(0.1, 1.0))
+    for latency in [0.05] * 90 + [0.5] * 9 + [3.0]:
+        metrics.record("chat", "p", "m", latency, "ok")
+
+    latency = metrics.snapshot()[0]["latency_ms"]
+
+    assert latency["p50"] == 100.0
+    assert latency["p95"] == 1000.0
+    assert latency["p99"] == 1000.0
+    assert latency["max"] == 3000.0
+    assert metrics.snapshot()[0]["latency_buckets"] == {"0.1": 90, "1.0": 9, "+Inf": 1}
@@ -0,0 +1,122 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.infrastructure.cache import SingleFlight
+from src.backend.infrastructure.services.ai_service import AIService
+
+
+class SlowCompletions:
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, model, messages):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        message = {"content": f"Описание: {messages[-1]['content'][:20]}"}
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_service(completions):
+    svc = AIService(config={"HF_TOKEN": "test"})
+    svc._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    svc._model = "test-model"
+    return svc
+
+
+def test_identical_concurrent_prompts_share_one_upstream_call():
+    completions = SlowCompletions()
+    svc = make_service(completions)
+    results = []
+
+    def worker():
+        results.append(
+            svc.get_place_info_with_address_and_prefs("Красная площадь", 55.75, 37.62)
+        )
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert completions.calls == 1
+    assert len(set(results)) == 1
+    stats = svc.single_flight_stats()
+    assert stats["executed"] == 1
+    assert stats["coalesced"] == 7
+    assert stats["in_flight"] == 0
+
+
+def test_whitespace_differences_are_coalesced():
+    completions = SlowCompletions()
+    svc = make_service(completions)
+    threads = [
+        threading.Thread(
+            target=svc.get_place_info_with_address_and_prefs,
+            args=(address, 1.0, 2.0),
+        )
+        for address in ("Невский  проспект", "Невский проспект ")
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert completions.calls == 1
+
+
+def test_single_flight_propagates_errors_to_waiters():
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    def leader():
+        with pytest.raises(ValueError):
+            flight.do("k", failing)
+
+    def follower():
+        started.wait()
+        try:
+            flight.do("k", lambda: "never")
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=leader), threading.Thread(target=follower)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 1
+    assert flight.stats()["coalesced"] == 1
+
+
+def test_stats_count_callers_waiting_on_in_flight_call():
+    group = SingleFlight()
+    release = threading.Event()
+    threads = [
+        threading.Thread(target=group.do, args=("key", lambda: release.wait(5)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    while group.stats()["coalesced"] < 3:
+        time.sleep(0.01)
+
+    assert group.stats()["waiting"] == 3
+
+    release.set()
+    for t in threads:
+        t.join()
+    assert group.stats()["waiting"] == 0
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import huggingface_hub
+import pytest
+
+from src.backend.infrastructure.client import hf_inference
+from src.backend.infrastructure.services.ai_service import AI_ERROR_MESSAGE
+from src.backend.infrastructure.services.async_ai_service import AsyncAIService
+from src.backend.utils.deadline import DeadlineExceeded, deadline_scope
+
+
+class AsyncCompletions:
+    def __init__(self, delay: float = 0.05, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.max_concurrent = 0
+        self._active = 0
+
+    async def create(self, model, messages, stream=False):
+        self.calls += 1
+        self._active += 1
+        self.max_concurrent = max(self.max_concurrent, self._active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self._active -= 1
+        if self.fail:
+            raise RuntimeError("provider down")
+        if stream:
+            return self._stream(["При", "вет"])
+        message = {"content": f"Ответ: {messages[-1]['content'][:30]}"}
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def _stream(self, parts):
+        for part in parts:
+            delta = SimpleNamespace(content=part)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+@pytest.fixture
+def make_service():
+    services = []
+
+    def factory(completions):
+        svc = AsyncAIService(config={"HF_TOKEN": "test"})
+        svc._client = SimpleNamespace(
+            chat=SimpleNamespace(completions=completions), close=_noop
+        )
+        svc._model = "test-model"
+        services.append(svc)
+        return svc
+
+    yield factory
+    for svc in services:
+        svc.close()
+
+
+async def _noop():
+    return None
+
+
+def test_sync_api_runs_on_background_loop(make_service):
+    completions = AsyncCompletions()
+    svc = make_service(completions)
+
+    assert svc.get_place_info(55.75, 37.62).startswith("Ответ:")
+    assert svc.chat([{"role": "user", "content": "Привет"}]) == "Ответ: Привет"
+    assert list(svc.chat_stream([{"role": "user", "content": "hi"}])) == [
+        "При",
+        "вет",
+    ]
+
+
+class EndlessStream(AsyncCompletions):
+    def __init__(self):
+        super().__init__(delay=0)
+        self.done = None
+
+    async def create(self, model, messages, stream=False):
+        return self._endless()
+
+    async def _endless(self):
+        try:
+            while True:
+                delta = SimpleNamespace(content="x")
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+                await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            self.done = "cancelled"
+            raise
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_closed_stream_cancels_background_task(make_service):
+    completions = EndlessStream()
+    svc = make_service(completions)
+
+    stream = svc.chat_stream([{"role": "user", "content": "hi"}])
+    assert next(stream) == "x"
+    stream.close()  # клиент отключился
+
+    assert wait_for(lambda: completions.done == "cancelled")
+
+
+def test_stream_wait_is_bounded_by_request_deadline(make_service):
+    completions = AsyncCompletions(delay=5)
+    svc = make_service(completions)
+
+    started = time.monotonic()
+    with deadline_scope(0.2):
+        with pytest.raises(DeadlineExceeded):
+            list(svc.chat_stream([{"role": "user", "content": "hi"}]))
+
+    assert time.monotonic() - started < 2
+
+
+def test_async_calls_overlap_and_identical_prompts_coalesce(make_service):
+    completions = AsyncCompletions(delay=0.1)
+    svc = make_service(completions)
+
+    async def run():
+        distinct = [svc.get_place_info_async(float(i), 0.0) for i in range(20)]
+        same = [svc.get_place_info_async(1.0, 1.0) for _ in range(5)]
+        return await asyncio.gather(*distinct, *same)
+
+    results = asyncio.run(run())
+
+    assert len(results) == 25
+    assert completions.calls == 21
+    assert completions.max_concurrent > 1
+    assert svc.single_flight_stats()["coalesced"] == 4
+
+
+def test_provider_errors_return_fallback_message(make_service):
+    svc = make_service(AsyncCompletions(fail=True))
+
+    assert svc.get_place_info(1.0, 2.0) == AI_ERROR_MESSAGE
+    assert asyncio.run(svc.get_place_info_async(1.0, 2.0)) == AI_ERROR_MESSAGE
+
+
+def test_shared_pool_matches_installed_huggingface_hub():
+    # Падает при обновлении huggingface_hub: переопределение
+    # _get_client_session нужно сверить с новой версией и обновить отпечаток
+    assert huggingface_hub.__version__ == hf_inference.UPSTREAM_HUGGINGFACE_HUB_VERSION
+    assert hf_inference.upstream_session_fingerprint() == (
+        hf_inference.UPSTREAM_SESSION_FINGERPRINT
+    )
+    assert hf_inference.shared_pool_supported()
+
+
+def test_requirements_pin_the_verified_huggingface_hub():
+    requirements = Path(__file__).parents[4] / "requirements.dev.txt"
+    pins = [
+        line.split("#")[0].strip()
+        for line in requirements.read_text().splitlines()
+        if line.startswith("huggingface-hub")
+    ]
+
+    assert pins == [f"huggingface-hub=={hf_inference.UPSTREAM_HUGGINGFACE_HUB_VERSION}"]
+
+
+def test_changed_upstream_falls_back_to_base_sessions(monkeypatch):
+    monkeypatch.setattr(hf_inference, "UPSTREAM_SESSION_FINGERPRINT", "changed")
+
+    async def scenario():
+        client = hf_inference.PooledAsyncInferenceClient(api_key="t", pool_size=5)
+        session = client._get_client_session()
+        try:
+            return client.shared_pool, client._connector, session.connector.limit
+        finally:
+            await client.close()
+
+    shared, connector, limit = asyncio.run(scenario())
+
+    assert shared is False
+    assert connector is None
+    assert limit != 5
+
+
+def test_metrics_label_the_provider_actually_called():
+    svc = AsyncAIService(
+        config={"HF_TOKEN": "t", "HF_PROVIDERS": "groq:m1,together:m2"}
+    )
+    try:
+        svc._ensure_client()
+        svc._client = SimpleNamespace(
+            chat=SimpleNamespace(completions=AsyncCompletions(delay=0)), close=_noop
+        )
+        svc.get_place_info(1.0, 2.0)
+        labels = {(s["provider"], s["model"]) for s in svc.metrics().snapshot()}
+    finally:
+        svc.close()
+
+    assert labels == {("groq", "m1")}
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from src.backend.infrastructure.services.ai_service import AI_ERROR_MESSAGE
+from src.backend.services.cache.cache_warmer import (
+    CacheWarmer,
+    WarmPoint,
+    read_seed_file,
+)
+
+
+class RecordingAI:
+    def __init__(self, cached=(), fail_at=()):
+        self.cached = set(cached)
+        self.fail_at = set(fail_at)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_cached_place_info(self, latitude, longitude):
+        return "CACHED" if (latitude, longitude) in self.cached else None
+
+    def get_place_info(self, latitude, longitude):
+        with self._lock:
+            self.calls.append(("coords", latitude, longitude))
+        if (latitude, longitude) in self.fail_at:
+            return AI_ERROR_MESSAGE
+        return "INFO"
+
+    def get_place_info_with_address_and_prefs(self, address, latitude, longitude):
+        with self._lock:
+            self.calls.append(("address", address))
+        return "ADDR"
+
+
+class FakeGeocoder:
+    def reverse_geocode(self, latitude, longitude, lang="ru"):
+        return {"display_name": f"addr {latitude},{longitude}"}
+
+
+def test_warm_generates_both_variants_and_skips_cached():
+    ai = RecordingAI(cached={(2.0, 2.0)}, fail_at={(3.0, 3.0)})
+    warmer = CacheWarmer(ai, FakeGeocoder(), max_workers=2, ai_rate=0, geocode_rate=0)
+    points = [
+        WarmPoint(1.0, 1.0),
+        WarmPoint(1.00001, 1.00001),  # тот же дом — дубликат
+        WarmPoint(2.0, 2.0),
+        WarmPoint(3.0, 3.0),
+    ]
+
+    stats = warmer.warm(points)
+
+    assert stats.as_dict() == {"total": 3, "warmed": 1, "skipped": 1, "failed": 1}
+    assert ("address", "addr 1.0,1.0") in ai.calls
+    assert ("coords", 1.0, 1.0) in ai.calls
+    assert all(call[1:] != (2.0, 2.0) for call in ai.calls)
+
+
+def test_warm_without_geocoder_uses_coordinates_only():
+    ai = RecordingAI()
+    warmer = CacheWarmer(ai, None, ai_rate=0)
+
+    warmer.warm([WarmPoint(5.0, 6.0)])
+
+    assert ai.calls == [("coords", 5.0, 6.0)]
+
+
+def test_read_seed_file(tmp_path):
+    seed = tmp_path / "seed.csv"
+    seed.write_text(
+        "# столицы\n55.7558, 37.6173, Москва\n\n48.8566,2.3522\n", encoding="utf-8"
+    )
+
+    points = list(read_seed_file(str(seed)))
+
+    assert [(p.latitude, p.longitude, p.name) for p in points] == [
+        (55.7558, 37.6173, "Москва"),
+        (48.8566, 2.3522, ""),
+    ]
+
+    seed.write_text("not,a point\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(read_seed_file(str(seed)))
@@ -0,0 +1,145 @@
+import logging
+import sqlite3
+
+from src.backend.infrastructure.cache import (
+    CoordinateQuantizer,
+    LRUCache,
+    SqliteCacheStore,
+    geohash_encode,
+)
+from src.backend.infrastructure.services.ai_service import AI_ERROR_MESSAGE
+from src.backend.infrastructure.services.cached_ai_service import CachedAIService
+from src.backend.services.ai.ai_services import AIService as LocalAIService
+
+
+class CountingAI:
+    def __init__(self, response: str = "INFO"):
+        self.response = response
+        self.calls = 0
+
+    def get_place_info(self, latitude: float, longitude: float) -> str:
+        self.calls += 1
+        return f"{self.response} {latitude},{longitude}"
+
+
+def test_geohash_known_value():
+    assert geohash_encode(42.6, -5.6, 5) == "ezs42"
+
+
+def test_same_cell_served_from_cache():
+    inner = CountingAI()
+    svc = CachedAIService(inner=inner, cache=LRUCache(max_size=10))
+
+    first = svc.get_place_info(55.75580, 37.61730)
+    second = svc.get_place_info(55.75585, 37.61735)
+
+    assert first == second
+    assert inner.calls == 1
+    assert svc.stats()["hits"] == 1
+    assert svc.stats()["misses"] == 1
+
+
+def test_different_cells_miss():
+    inner = CountingAI()
+    svc = CachedAIService(
+        inner=inner,
+        cache=LRUCache(max_size=10),
+        quantizer=CoordinateQuantizer(grid_size_deg=0.01),
+    )
+
+    svc.get_place_info(10.001, 20.001)
+    svc.get_place_info(10.051, 20.001)
+
+    assert inner.calls == 2
+
+
+def test_failures_are_not_cached():
+    inner = CountingAI()
+    inner.get_place_info = lambda lat, lon: AI_ERROR_MESSAGE
+    svc = CachedAIService(inner=inner, cache=LRUCache(max_size=10))
+
+    svc.get_place_info(1.0, 2.0)
+
+    assert len(svc.cache) == 0
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    cache = LRUCache(max_size=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+    import time
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("a") is None
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    inner = CountingAI()
+    svc = CachedAIService(
+        inner=inner, cache=LRUCache(store=SqliteCacheStore(path, namespace="ai"))
+    )
+    svc.get_place_info(48.8584, 2.2945)
+
+    restarted = CachedAIService(
+        inner=inner, cache=LRUCache(store=SqliteCacheStore(path, namespace="ai"))
+    )
+    restarted.get_place_info(48.8584, 2.2945)
+
+    assert inner.calls == 1
+    assert restarted.stats()["store_hits"] == 1
+
+
+def test_failed_local_backend_call_is_not_cached():
+    # Без загрузки модели: генерация подменяется падающей функцией
+    local = LocalAIService.__new__(LocalAIService)
+    local._logger = logging.getLogger("test")
+    calls = []
+
+    def broken(prompt):
+        calls.append(prompt)
+        raise RuntimeError("CUDA out of memory")
+
+    local._generate = broken
+    svc = CachedAIService(inner=local, cache=LRUCache(max_size=10))
+
+    assert svc.get_place_info(55.7558, 37.6173) == AI_ERROR_MESSAGE
+    assert svc.get_place_info(55.7558, 37.6173) == AI_ERROR_MESSAGE
+
+    assert len(calls) == 2
+    assert len(svc.cache) == 0
+
+
+def test_stats_include_inner_single_flight_counters():
+    inner = CountingAI()
+    inner.single_flight_stats = lambda: {"executed": 2, "coalesced": 5}
+    svc = CachedAIService(inner=inner, cache=LRUCache(max_size=10))
+
+    stats = svc.stats()
+
+    assert stats["single_flight"] == {"executed": 2, "coalesced": 5}
+    assert stats["hits"] == 0
+
+
+def test_broken_cache_store_falls_through_to_model():
+    class BrokenStore:
+        def get(self, key):
+            raise sqlite3.OperationalError("database is locked")
+
+        def set(self, key, value, expires_at):
+            raise sqlite3.DatabaseError("database disk image is malformed")
+
+    inner = CountingAI()
+    svc = CachedAIService(inner=inner, cache=LRUCache(store=BrokenStore()))
+
+    assert svc.get_place_info(48.8584, 2.2945) == "INFO 48.8584,2.2945"
+    assert svc.get_cached_place_info(10.0, 10.0) is None
+    assert inner.calls == 1
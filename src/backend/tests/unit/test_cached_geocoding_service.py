@@ -0,0 +1,122 @@
+import threading
+import time
+
+from src.backend.infrastructure.cache import LRUCache, SqliteCacheStore
+from src.backend.infrastructure.services.cached_geocoding_service import (
+    CachedGeocodingService,
+)
+
+
+class CountingGeocoder:
+    def __init__(self, display_name="Москва, Россия", delay: float = 0.0):
+        self.display_name = display_name
+        self.delay = delay
+        self.calls = []
+
+    def reverse_geocode(self, latitude, longitude, lang="ru"):
+        self.calls.append((latitude, longitude, lang))
+        time.sleep(self.delay)
+        if self.display_name is None:
+            return {"display_name": None, "address": None, "raw": {"error": "timeout"}}
+        return {
+            "display_name": f"{self.display_name} ({lang})",
+            "address": {"city": "Москва"},
+            "raw": {},
+        }
+
+    def search(self, query, lang="ru", limit=1):
+        self.calls.append((query, lang, limit))
+        return {"display_name": query, "lat": 1.0, "lon": 2.0, "raw": {}}
+
+
+def test_nearby_clicks_share_snapped_entry():
+    inner = CountingGeocoder()
+    svc = CachedGeocodingService(inner, LRUCache(max_size=10), precision=3)
+
+    first = svc.reverse_geocode(55.75581, 37.61729)
+    second = svc.reverse_geocode(55.75612, 37.61748)
+
+    assert first == second
+    assert inner.calls == [(55.756, 37.617, "ru")]
+    assert svc.stats()["hits"] == 1
+
+
+def test_language_is_part_of_the_key():
+    inner = CountingGeocoder()
+    svc = CachedGeocodingService(inner, LRUCache(max_size=10))
+
+    ru = svc.reverse_geocode(55.7558, 37.6173, lang="ru")
+    en = svc.reverse_geocode(55.7558, 37.6173, lang="en")
+
+    assert ru["display_name"] != en["display_name"]
+    assert len(inner.calls) == 2
+
+
+def test_failures_are_cached_with_negative_ttl(monkeypatch):
+    inner = CountingGeocoder(display_name=None)
+    svc = CachedGeocodingService(
+        inner, LRUCache(max_size=10, ttl_seconds=3600), negative_ttl_seconds=60
+    )
+    now = time.time()
+    monkeypatch.setattr(
+        "src.backend.infrastructure.cache.lru_cache.time.time", lambda: now
+    )
+
+    svc.reverse_geocode(10.0, 20.0)
+    svc.reverse_geocode(10.0, 20.0)
+    assert len(inner.calls) == 1
+
+    now += 61
+    svc.reverse_geocode(10.0, 20.0)
+    assert len(inner.calls) == 2
+
+
+def test_deadline_skips_are_not_cached():
+    class SkippingGeocoder(CountingGeocoder):
+        def reverse_geocode(self, latitude, longitude, lang="ru"):
+            self.calls.append((latitude, longitude, lang))
+            return {
+                "display_name": None,
+                "address": None,
+                "raw": {"error": "budget", "deadline_exceeded": True},
+            }
+
+    inner = SkippingGeocoder()
+    svc = CachedGeocodingService(inner, LRUCache(max_size=10))
+
+    svc.reverse_geocode(10.0, 20.0)
+    svc.reverse_geocode(10.0, 20.0)
+
+    assert len(inner.calls) == 2
+
+
+def test_concurrent_misses_call_nominatim_once():
+    inner = CountingGeocoder(delay=0.1)
+    svc = CachedGeocodingService(inner, LRUCache(max_size=10))
+    threads = [
+        threading.Thread(target=svc.reverse_geocode, args=(55.7558, 37.6173))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(inner.calls) == 1
+
+
+def test_search_key_ignores_case_and_spaces_and_survives_restart(tmp_path):
+    path = str(tmp_path / "geocode.sqlite3")
+    inner = CountingGeocoder()
+    svc = CachedGeocodingService(
+        inner, LRUCache(max_size=10, store=SqliteCacheStore(path, "geocode"))
+    )
+    svc.search("Нижний  Новгород")
+    svc.search("нижний новгород")
+    assert len(inner.calls) == 1
+
+    restarted = CachedGeocodingService(
+        inner, LRUCache(max_size=10, store=SqliteCacheStore(path, "geocode"))
+    )
+    assert restarted.search("Нижний Новгород")["display_name"] == "Нижний  Новгород"
+    assert len(inner.calls) == 1
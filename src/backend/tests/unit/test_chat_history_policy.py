@@ -0,0 +1,103 @@
+import time
+
+from src.backend.repository.chat.memory_chat_repository import ChatMemoryRepository
+from src.backend.services.chat.history_policy import (
+    TokenBudgetHistoryPolicy,
+    estimate_tokens,
+)
+from src.backend.utils.deadline import deadline_scope
+
+
+class SummarizingAI:
+    def __init__(self):
+        self.calls = []
+
+    def summarize_dialog(self, messages, previous_summary=None):
+        self.calls.append((list(messages), previous_summary))
+        return f"summary#{len(self.calls)}"
+
+
+def fill(repo, session_id, count, size=30):
+    for i in range(count):
+        role = "user" if i % 2 == 0 else "assistant"
+        repo.append(session_id, role, f"{i:03d}" + "x" * size)
+
+
+def test_estimate_tokens_grows_with_length():
+    assert estimate_tokens("") == 4
+    assert estimate_tokens("x" * 300) > estimate_tokens("x" * 30)
+
+
+def test_short_history_is_passed_through_without_summary():
+    ai = SummarizingAI()
+    policy = TokenBudgetHistoryPolicy(ai, budget_tokens=1000)
+    repo = ChatMemoryRepository(max_messages=50)
+    fill(repo, "s", 4)
+
+    messages = policy.build("s", repo.get("s"), total=repo.total("s"))
+
+    assert messages == repo.get("s")
+    assert ai.calls == []
+
+
+def test_old_turns_are_folded_into_summary_within_budget():
+    ai = SummarizingAI()
+    policy = TokenBudgetHistoryPolicy(ai, budget_tokens=60, refresh_tokens=1000)
+    repo = ChatMemoryRepository(max_messages=50)
+    fill(repo, "s", 10)
+
+    messages = policy.build("s", repo.get("s"), total=repo.total("s"))
+
+    assert messages[0]["role"] == "system"
+    assert "summary#1" in messages[0]["content"]
+    kept = messages[1:]
+    assert kept == repo.get("s")[-len(kept) :]
+    assert sum(estimate_tokens(m["content"]) for m in kept) <= 60
+    assert len(ai.calls[0][0]) == 10 - len(kept)
+
+
+def test_summary_is_reused_until_out_of_date():
+    ai = SummarizingAI()
+    policy = TokenBudgetHistoryPolicy(ai, budget_tokens=60, refresh_tokens=40)
+    repo = ChatMemoryRepository(max_messages=50)
+    fill(repo, "s", 10)
+    policy.build("s", repo.get("s"), total=repo.total("s"))
+
+    # Одно новое сообщение: старые несвёрнутые реплики остаются в промпте
+    fill(repo, "s", 1)
+    messages = policy.build("s", repo.get("s"), total=repo.total("s"))
+    assert len(ai.calls) == 1
+    assert "summary#1" in messages[0]["content"]
+
+    # Накопилось больше порога — содержание дополняется
+    fill(repo, "s", 4)
+    messages = policy.build("s", repo.get("s"), total=repo.total("s"))
+    assert len(ai.calls) == 2
+    assert ai.calls[1][1] == "summary#1"
+    assert "summary#2" in messages[0]["content"]
+
+
+def test_forget_drops_summary():
+    ai = SummarizingAI()
+    policy = TokenBudgetHistoryPolicy(ai, budget_tokens=60)
+    repo = ChatMemoryRepository(max_messages=50)
+    fill(repo, "s", 10)
+    policy.build("s", repo.get("s"), total=repo.total("s"))
+
+    policy.forget("s")
+
+    assert policy.summaries.get("s") is None
+
+
+def test_summary_is_skipped_when_request_budget_is_spent():
+    ai = SummarizingAI()
+    policy = TokenBudgetHistoryPolicy(ai, budget_tokens=60, refresh_tokens=1000)
+    repo = ChatMemoryRepository(max_messages=50)
+    fill(repo, "s", 10)
+
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        messages = policy.build("s", repo.get("s"), total=repo.total("s"))
+
+    assert ai.calls == []
+    assert messages == repo.get("s")
@@ -0,0 +1,117 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.infrastructure.services.ai_service import AIService
+from src.backend.infrastructure.services.geocoding_service import GeocodingService
+from src.backend.utils.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    deadline_scope,
+    remaining_timeout,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowCompletions:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def create(self, model, messages):
+        time.sleep(self.delay)
+        message = {"content": "Ответ"}
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_ai(delay: float) -> AIService:
+    svc = AIService(config={"HF_TOKEN": "test"})
+    svc._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SlowCompletions(delay))
+    )
+    svc._model = "test-model"
+    return svc
+
+
+def test_deadline_caps_call_timeout_by_remaining_budget():
+    clock = FakeClock()
+    deadline = Deadline(5, clock=clock)
+    assert deadline.timeout(10) == 5
+    clock.now += 4
+    assert deadline.timeout(10) == pytest.approx(1)
+    assert deadline.timeout(0.5) == 0.5
+    clock.now += 2
+    assert deadline.expired
+    with pytest.raises(DeadlineExceeded):
+        deadline.timeout(10)
+
+
+def test_nested_scope_keeps_the_earlier_deadline():
+    assert remaining_timeout(10) == 10
+    with deadline_scope(1) as outer:
+        with deadline_scope(60) as inner:
+            assert inner is outer
+            assert remaining_timeout(10) <= 1
+        with deadline_scope(0) as same:
+            assert same is outer
+    assert current_deadline() is None
+
+
+class RecordingSession:
+    def __init__(self):
+        self.timeouts = []
+
+    def get(self, url, params, headers, timeout):
+        self.timeouts.append(timeout)
+        return SimpleNamespace(
+            raise_for_status=lambda: None,
+            json=lambda: {"display_name": "Москва", "address": {}},
+        )
+
+
+def test_geocoding_timeout_follows_request_budget():
+    session = RecordingSession()
+    geocoder = GeocodingService(timeout=10, session=session)
+
+    assert geocoder.reverse_geocode(55.75, 37.62)["display_name"] == "Москва"
+    with deadline_scope(2):
+        geocoder.reverse_geocode(55.75, 37.62)
+    assert session.timeouts[0] == 10
+    assert session.timeouts[1] <= 2
+
+
+def test_geocoding_is_skipped_when_budget_is_spent():
+    session = RecordingSession()
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        geo = GeocodingService(session=session).reverse_geocode(55.75, 37.62)
+
+    assert geo["display_name"] is None
+    assert geo["raw"]["deadline_exceeded"] is True
+    assert session.timeouts == []
+
+
+def test_ai_call_stops_waiting_at_the_deadline():
+    svc = make_ai(delay=0.5)
+
+    started = time.perf_counter()
+    with deadline_scope(0.05):
+        with pytest.raises(DeadlineExceeded):
+            svc.get_place_info_with_address("Красная площадь", 55.75, 37.62)
+    assert time.perf_counter() - started < 0.4
+
+
+def test_ai_call_without_deadline_is_unchanged():
+    svc = make_ai(delay=0)
+
+    assert svc.chat([{"role": "user", "content": "Привет"}]) == "Ответ"
+    with deadline_scope(5):
+        assert svc.chat([{"role": "user", "content": "Привет"}]) == "Ответ"
@@ -0,0 +1,155 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.infrastructure.client.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+from src.backend.infrastructure.client.failover import (
+    FailoverInferenceClient,
+    ProviderEndpoint,
+    ProvidersUnavailableError,
+    parse_providers,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProvider:
+    def __init__(self, answer="ok", fail=False, delay=0.0):
+        self.answer = answer
+        self.fail = fail
+        self.delay = delay
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, model, messages, stream=False):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider down")
+        message = {"content": f"{self.answer}:{model}"}
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def endpoint(name, provider, **breaker_kwargs):
+    breaker_kwargs.setdefault("min_calls", 2)
+    return ProviderEndpoint(
+        name, f"{name}-model", provider, CircuitBreaker(**breaker_kwargs)
+    )
+
+
+def answer(completion):
+    return completion.choices[0].message["content"]
+
+
+def test_parse_providers_keeps_order_and_default_model():
+    assert parse_providers("a:m1, b ,", "def") == [("a", "m1"), ("b", "def")]
+    assert parse_providers(None, "def") == []
+
+
+def test_breaker_opens_then_probes_in_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_calls=2, error_rate=0.5, open_seconds=10, clock=clock)
+    breaker.record(False, 0.1)
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+
+    clock.now = 11
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # только один пробный вызов
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+
+
+def test_breaker_opens_on_slow_calls():
+    breaker = CircuitBreaker(min_calls=2, slow_call_seconds=1.0, slow_call_rate=0.5)
+    breaker.record(True, 2.0)
+    breaker.record(True, 2.0)
+    assert breaker.state == OPEN
+
+
+def test_fails_over_and_skips_open_provider():
+    broken, healthy = FakeProvider(fail=True), FakeProvider()
+    client = FailoverInferenceClient([endpoint("a", broken), endpoint("b", healthy)])
+
+    for _ in range(3):
+        completion = client.chat.completions.create(model="ignored", messages=[])
+        assert answer(completion) == "ok:b-model"
+
+    # После двух ошибок цепь первого провайдера разомкнута: он не вызывается
+    assert broken.calls == 2
+    assert client.stats()["providers"][0]["breaker"]["state"] == OPEN
+
+
+def test_all_providers_down_raises():
+    client = FailoverInferenceClient([endpoint("a", FakeProvider(fail=True))])
+
+    with pytest.raises(ProvidersUnavailableError):
+        client.complete([])
+
+
+def test_hedged_request_returns_faster_provider():
+    slow, fast = FakeProvider("slow", delay=0.5), FakeProvider("fast")
+    client = FailoverInferenceClient(
+        [endpoint("a", slow), endpoint("b", fast)],
+        hedge_enabled=True,
+        hedge_min_delay=0.05,
+    )
+
+    started = time.perf_counter()
+    completion = client.complete([])
+
+    assert answer(completion) == "fast:b-model"
+    assert time.perf_counter() - started < 0.4
+    assert client.stats()["hedges"] == 1
+    assert client.stats()["hedge_wins"] == 1
+
+
+class StreamingProvider(FakeProvider):
+    def create(self, model, messages, stream=False):
+        self.calls += 1
+        return iter(["a", "b", "c"])
+
+
+@pytest.mark.parametrize("read_chunks", [0, 1])
+def test_abandoned_stream_releases_half_open_probe(read_chunks):
+    clock = FakeClock()
+    ep = endpoint("a", StreamingProvider(), open_seconds=10, clock=clock)
+    ep.breaker.record(False, 0.1)
+    ep.breaker.record(False, 0.1)
+    clock.now = 11
+    client = FailoverInferenceClient([ep])
+
+    stream = client.stream([])  # пробный вызов в полуоткрытом состоянии
+    for _ in range(read_chunks):
+        next(stream)
+    stream.close()  # клиент закрыл SSE-соединение
+
+    assert ep.breaker.state == HALF_OPEN
+    assert ep.breaker.allow() is True  # следующий вызов снова пробный
+    assert ep.client.calls == 1 and ep.failures == 0
+
+
+def test_finished_stream_closes_half_open_circuit():
+    clock = FakeClock()
+    ep = endpoint("a", StreamingProvider(), open_seconds=10, clock=clock)
+    ep.breaker.record(False, 0.1)
+    ep.breaker.record(False, 0.1)
+    clock.now = 11
+    client = FailoverInferenceClient([ep])
+
+    assert list(client.stream([])) == ["a", "b", "c"]
+    assert ep.breaker.state == CLOSED
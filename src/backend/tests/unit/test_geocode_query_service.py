@@ -0,0 +1,118 @@
+from src.backend.infrastructure.cache import LRUCache, PrefixIndex
+from src.backend.services.geocoding.geocode_query_service import GeocodeQueryService
+
+
+class FakeGeocoder:
+    def __init__(self, results=None, raw=None):
+        self.results = results
+        self.raw = raw or {}
+        self.calls = []
+
+    def search(self, query, lang="ru", limit=1):
+        self.calls.append(("search", query, limit))
+        results = self.results
+        if results is None:
+            results = [{"display_name": f"{query}, Россия", "lat": 55.8, "lon": 49.1}]
+        return {**(results[0] if results else {}), "raw": self.raw, "results": results}
+
+    def reverse_geocode(self, latitude, longitude, lang="ru"):
+        self.calls.append(("reverse", latitude, longitude))
+        return {"display_name": "Казань", "address": {}, "raw": {}}
+
+
+class FakeAI:
+    def __init__(self):
+        self.calls = []
+
+    def normalize_location_query(self, text):
+        self.calls.append(("normalize", text))
+        return "Казань" if "казан" in text.lower() else text.strip()
+
+    def get_place_info_with_address(self, address, latitude, longitude):
+        self.calls.append(("describe", address))
+        return f"Про {address}"
+
+
+def test_repeated_query_is_served_without_upstream_calls():
+    geocoder, ai = FakeGeocoder(), FakeAI()
+    svc = GeocodeQueryService(geocoder, ai, LRUCache(max_size=10))
+
+    first = svc.search("Хочу в Казань", describe=True)
+    second = svc.search("  хочу в  КАЗАНЬ ", describe=True)
+
+    assert first["results"][0]["display_name"] == "Казань, Россия"
+    assert first["description"] == "Про Казань, Россия"
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["description"] == first["description"]
+    assert geocoder.calls == [("search", "Казань", 5)]
+    assert [c[0] for c in ai.calls] == ["normalize", "describe"]
+
+
+def test_description_is_a_single_hop_on_cache_hit():
+    geocoder, ai = FakeGeocoder(), FakeAI()
+    svc = GeocodeQueryService(geocoder, ai, LRUCache(max_size=10))
+    svc.search("Казань")
+    ai.calls.clear()
+
+    result = svc.search("казань", describe=True)
+
+    assert result["cached"] is True
+    assert ai.calls == [("describe", "Казань, Россия")]
+    assert len(geocoder.calls) == 1
+
+
+def test_coordinates_are_reverse_geocoded():
+    geocoder = FakeGeocoder()
+    svc = GeocodeQueryService(geocoder)
+
+    result = svc.search("55.79, 49.12")
+
+    assert result["results"] == [{"display_name": "Казань", "lat": 55.79, "lon": 49.12}]
+    assert geocoder.calls == [("reverse", 55.79, 49.12)]
+
+
+def test_upstream_failure_is_not_cached():
+    geocoder = FakeGeocoder(results=[], raw={"error": "503"})
+    svc = GeocodeQueryService(geocoder, results=LRUCache(max_size=10))
+
+    svc.search("Казань")
+    svc.search("Казань")
+
+    assert len(geocoder.calls) == 2
+
+
+def test_suggestions_come_from_successful_queries_by_popularity():
+    svc = GeocodeQueryService(FakeGeocoder())
+    svc.search("Казань")
+    svc.search("Калининград")
+    svc.search("Калининград")
+
+    suggestions = svc.suggest("КА")
+
+    assert [s["query"] for s in suggestions] == [
+        "Калининград, Россия",
+        "Казань, Россия",
+    ]
+    assert suggestions[0]["lat"] == 55.8
+    assert svc.suggest("мос") == []
+
+
+def test_suggestions_do_not_expose_raw_queries_of_other_users():
+    svc = GeocodeQueryService(FakeGeocoder(), FakeAI())
+    svc.search("хочу в казань к Ивану Петрову")
+
+    assert svc.suggest("хочу") == []
+    assert svc.suggest("ива") == []
+    assert [s["query"] for s in svc.suggest("каз")] == ["Казань, Россия"]
+
+
+def test_prefix_index_evicts_rarest_key():
+    index = PrefixIndex(max_entries=2)
+    index.add("москва", 1)
+    index.add("москва", 1)
+    index.add("мурманск", 2)
+    index.add("магадан", 3)
+
+    assert index.suggest("м") == [1, 3]
+    assert len(index) == 2
@@ -0,0 +1,125 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.backend.infrastructure.client.http_session import PooledHTTPSession
+from src.backend.infrastructure.services.geocoding_service import GeocodingService
+from src.backend.utils.deadline import DeadlineExceeded, deadline_scope
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    failures_left = 0
+    retry_after = "0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        if self.path.startswith("/busy") and cls.failures_left > 0:
+            cls.failures_left -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", cls.retry_after)
+        else:
+            self.send_response(200)
+        body = b"{}"
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def base_url():
+    handler = type("TestHandler", (Handler,), {})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", handler
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused(base_url):
+    url, _ = base_url
+    session = PooledHTTPSession()
+
+    for _ in range(5):
+        assert session.get(f"{url}/reverse").status_code == 200
+
+    host = next(iter(session.stats()["hosts"].values()))
+    assert host["requests"] == 5
+    assert host["connections_opened"] == 1
+    assert host["reused"] == 4
+
+
+def test_retry_after_is_honored_but_capped(base_url):
+    url, handler = base_url
+    handler.failures_left = 2
+    handler.retry_after = "30"
+    session = PooledHTTPSession(retries=2, max_retry_wait=0.05)
+
+    started = time.perf_counter()
+    resp = session.get(f"{url}/busy")
+
+    assert resp.status_code == 200
+    assert time.perf_counter() - started < 1
+    stats = session.stats()
+    assert stats["retries"] == 2
+    assert stats["retry_wait_seconds"] == pytest.approx(0.1)
+
+
+def test_exhausted_retries_return_last_response(base_url):
+    url, handler = base_url
+    handler.failures_left = 5
+    session = PooledHTTPSession(retries=1, backoff_factor=0)
+
+    assert session.get(f"{url}/busy").status_code == 429
+
+
+def test_retry_that_does_not_fit_the_budget_is_skipped(base_url):
+    url, handler = base_url
+    handler.failures_left = 1
+    handler.retry_after = "5"
+    session = PooledHTTPSession(retries=2, max_retry_wait=5)
+
+    with deadline_scope(0.5):
+        with pytest.raises(DeadlineExceeded):
+            session.get(f"{url}/busy")
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self, max_wait=None):
+        self.acquired += 1
+
+
+def test_each_retry_waits_for_throttle(base_url):
+    url, handler = base_url
+    handler.failures_left = 2
+    slots = []
+    session = PooledHTTPSession(
+        retries=2, backoff_factor=0, throttle=lambda: slots.append(1)
+    )
+
+    assert session.get(f"{url}/busy").status_code == 200
+    assert len(slots) == 2
+
+
+def test_geocoder_retries_go_through_rate_limiter(base_url):
+    url, handler = base_url
+    handler.failures_left = 2
+    limiter = CountingLimiter()
+    service = GeocodingService(
+        base_url=f"{url}/busy",
+        session=PooledHTTPSession(retries=2, backoff_factor=0),
+        limiter=limiter,
+    )
+
+    service.reverse_geocode(48.85, 2.35)
+
+    assert limiter.acquired == 3  # первая попытка и два повтора
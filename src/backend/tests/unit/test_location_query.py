@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.infrastructure.services.ai_service import AIService
+from src.backend.infrastructure.services.location_query import (
+    fold_query,
+    parse_coordinates,
+    quick_location_query,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Казань", "Казань"),
+        ("  нижний   новгород ", "нижний новгород"),
+        ("Ростов-на-Дону", "Ростов-на-Дону"),
+        ("Paris?", "Paris"),
+        ("Казань, Россия", "Казань, Россия"),
+        ("56.126917, 40.397011", "56.126917, 40.397011"),
+        ("33.86 S, 151.2 E", "-33.86, 151.2"),
+        ("где поесть в Казани", None),
+        ("улица Ленина 5", None),
+        ("покажи Рим", None),
+        ("Привет", None),
+    ],
+)
+def test_quick_location_query(text, expected):
+    assert quick_location_query(text) == expected
+
+
+def test_parse_coordinates_rejects_out_of_range():
+    assert parse_coordinates("91.0, 20.0") is None
+    assert parse_coordinates("55.75 37.62") == (55.75, 37.62)
+    assert fold_query("  Что  РЯДОМ ") == "что рядом"
+
+
+class CountingCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, model, messages, **kwargs):
+        self.calls += 1
+        message = {"content": "  Казань, Кремль  "}
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_normalize_skips_model_for_names_and_caches_model_answers():
+    completions = CountingCompletions()
+    svc = AIService(config={"HF_TOKEN": "test"})
+    svc._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    svc._model = "m"
+
+    assert svc.normalize_location_query("Казань") == "Казань"
+    assert completions.calls == 0
+
+    first = svc.normalize_location_query("Где находится кремль в Казани?")
+    again = svc.normalize_location_query("  где находится КРЕМЛЬ в казани? ")
+
+    assert first == again == "Казань, Кремль"
+    assert completions.calls == 1
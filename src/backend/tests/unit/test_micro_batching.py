@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from src.backend.infrastructure.client.batching import MicroBatchScheduler
+
+
+class FakeModel:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.batches = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def generate_batch(self, prompts, params):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.batches.append((list(prompts), params))
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return [f"{p}|{params.get('max_new_tokens')}" for p in prompts]
+
+
+def fire(scheduler, prompts, **params):
+    results = {}
+
+    def call(prompt):
+        results[prompt] = scheduler.generate(prompt, **params)
+
+    threads = [threading.Thread(target=call, args=(p,)) for p in prompts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_requests_are_batched_and_routed_back():
+    model = FakeModel()
+    scheduler = MicroBatchScheduler(
+        model.generate_batch, max_batch_size=4, max_wait_ms=50
+    )
+    prompts = [f"p{i}" for i in range(8)]
+
+    results = fire(scheduler, prompts, max_new_tokens=16)
+    scheduler.close()
+
+    assert results == {p: f"{p}|16" for p in prompts}
+    assert max(len(b[0]) for b in model.batches) == 4
+    assert len(model.batches) < len(prompts)
+    assert model.max_active == 1  # модель вызывается только из одного потока
+
+
+def test_different_params_are_not_mixed_in_one_batch():
+    model = FakeModel(delay=0.01)
+    scheduler = MicroBatchScheduler(
+        model.generate_batch, max_batch_size=8, max_wait_ms=50
+    )
+    futures = [
+        scheduler.submit("a", max_new_tokens=8),
+        scheduler.submit("b", max_new_tokens=32),
+    ]
+
+    assert [f.result() for f in futures] == ["a|8", "b|32"]
+    scheduler.close()
+    assert [len(prompts) for prompts, _ in model.batches] == [1, 1]
+
+
+def test_batch_errors_propagate_to_every_caller():
+    def broken(prompts, params):
+        raise RuntimeError("oom")
+
+    scheduler = MicroBatchScheduler(broken, max_batch_size=4, max_wait_ms=20)
+    futures = [scheduler.submit(p) for p in ("x", "y")]
+
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result()
+    scheduler.close()
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from src.backend.infrastructure.services.offline_geocoder import (
+    GazetteerEntry,
+    OfflineReverseGeocoder,
+    read_country_names,
+    read_geonames,
+    to_unit_vectors,
+)
+from src.backend.infrastructure.services.tiered_geocoding_service import (
+    TieredGeocodingService,
+)
+
+GEONAMES = [
+    (524901, "Москва", 55.75222, 37.61556, "P", "RU", 10381222),
+    (551487, "Казань", 55.78874, 49.12214, "P", "RU", 1104738),
+    (2988507, "Paris", 48.85341, 2.3488, "P", "FR", 2138551),
+    (2017370, "Russia", 60.0, 100.0, "A", "RU", 140702000),
+    (4030939, "Suva", -18.14161, 178.44149, "P", "FJ", 77366),
+    (2110425, "Funafuti", -8.52425, 179.19417, "P", "TV", 4492),
+]
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    path = tmp_path / "cities.txt"
+    lines = []
+    for gid, name, lat, lon, fclass, cc, pop in GEONAMES:
+        cols = [str(gid), name, name, "", str(lat), str(lon), fclass, "PPL", cc]
+        cols += ["", "", "", "", "", str(pop), "", "", "Europe/Moscow", "2024-01-01"]
+        lines.append("\t".join(cols))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    countries = tmp_path / "countryInfo.txt"
+    countries.write_text(
+        "#ISO\tISO3\tISO-Numeric\tfips\tCountry\n"
+        "RU\tRUS\t643\tRS\tRussia\nFR\tFRA\t250\tFR\tFrance\n",
+        encoding="utf-8",
+    )
+    return str(path), str(countries)
+
+
+def test_geonames_index_finds_nearest_city(gazetteer):
+    cities, countries = gazetteer
+    geocoder = OfflineReverseGeocoder.build(
+        read_geonames(cities), read_country_names(countries), leaf_size=2
+    )
+
+    place = geocoder.nearest(55.79, 49.10)
+
+    assert len(geocoder) == 5  # административная единица отброшена
+    assert place.name == "Казань"
+    assert place.display_name == "Казань, Russia"
+    assert place.distance_km < 2
+    # Через антимеридиан ближе Фунафути, чем по долготе «с той же стороны»
+    assert geocoder.nearest(-9.0, -179.9).name == "Funafuti"
+
+
+def test_index_round_trips_through_binary_file(gazetteer, tmp_path):
+    cities, _ = gazetteer
+    built = OfflineReverseGeocoder.build(read_geonames(cities))
+    path = str(tmp_path / "index.npz")
+    built.save(path)
+
+    loaded = OfflineReverseGeocoder.load(path)
+
+    assert loaded.nearest(48.9, 2.4) == built.nearest(48.9, 2.4)
+    assert loaded.nearest(48.9, 2.4).country is None
+
+
+def test_batch_and_single_queries_match_brute_force():
+    rng = np.random.default_rng(7)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, 3000)))
+    lon = rng.uniform(-180, 180, 3000)
+    entries = [
+        GazetteerEntry(i, f"p{i}", float(a), float(b), "RU")
+        for i, (a, b) in enumerate(zip(lat, lon))
+    ]
+    geocoder = OfflineReverseGeocoder.build(entries, leaf_size=8)
+    q_lat = np.degrees(np.arcsin(rng.uniform(-1, 1, 500)))
+    q_lon = rng.uniform(-180, 180, 500)
+
+    ids, distances = geocoder.nearest_many(q_lat, q_lon, chunk_size=128)
+
+    points = to_unit_vectors(lat, lon)
+    for k in range(len(q_lat)):
+        d2 = np.square(points - to_unit_vectors(q_lat[k], q_lon[k])).sum(axis=1)
+        assert d2[ids[k]] == pytest.approx(d2.min(), abs=1e-9)
+        single = geocoder.nearest(float(q_lat[k]), float(q_lon[k]))
+        assert d2[single.geoname_id] == pytest.approx(d2.min(), abs=1e-9)
+        assert single.distance_km == pytest.approx(distances[k], abs=1e-2)
+
+
+class FlakyGeocoder:
+    def __init__(self, display_name=None):
+        self.display_name = display_name
+        self.calls = 0
+
+    def reverse_geocode(self, latitude, longitude, lang="ru"):
+        self.calls += 1
+        if self.display_name is None:
+            return {"display_name": None, "address": None, "raw": {"error": "429"}}
+        return {"display_name": self.display_name, "address": {}, "raw": {}}
+
+
+def test_tiered_service_modes(gazetteer):
+    cities, _ = gazetteer
+    offline = OfflineReverseGeocoder.build(read_geonames(cities))
+
+    down = FlakyGeocoder()
+    fallback = TieredGeocodingService(down, offline, mode="fallback")
+    result = fallback.reverse_geocode(55.75, 37.62)
+    assert result["display_name"] == "Москва, RU"
+    assert result["raw"]["source"] == "offline"
+    assert result["raw"]["fallback_reason"] == "429"
+
+    up = FlakyGeocoder("Тверская улица, Москва")
+    first = TieredGeocodingService(up, offline, mode="first", max_distance_km=50)
+    assert first.reverse_geocode(55.75, 37.62)["address"]["city"] == "Москва"
+    assert up.calls == 0
+    # Посреди океана офлайн-ответ не годится — идём в Nominatim
+    assert first.reverse_geocode(0.0, -140.0)["display_name"] == up.display_name
+    assert first.stats()["offline"]["upstream"] == 1
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.domain.model.place.liked_place_model import LikedPlace
+from src.backend.infrastructure.db.Base import Base
+from src.backend.infrastructure.models import user_model  # noqa: F401
+from src.backend.repository.place import sqlalchemy_place_repository as module
+from src.backend.repository.place.sqlalchemy_place_repository import (
+    SqlAlchemyPlaceRepository,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def repo(engine):
+    session = sessionmaker(bind=engine)()
+    yield SqlAlchemyPlaceRepository(session)
+    session.close()
+
+
+def place(user_id=1, lat=48.8566, lon=2.3522, name="Paris"):
+    return LikedPlace(None, user_id, name, lat, lon)
+
+
+def test_upsert_inserts_with_single_statement(engine, repo):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    added, created = repo.add_liked_place_if_absent(place())
+
+    assert created is True
+    assert added.id is not None
+    assert len(statements) == 1
+    assert "ON CONFLICT" in statements[0] and "RETURNING" in statements[0]
+
+
+def test_upsert_returns_existing_place_at_storage_precision(repo):
+    first, _ = repo.add_liked_place_if_absent(place())
+
+    again, created = repo.add_liked_place_if_absent(
+        place(lat=48.85660004, name="Paris again")
+    )
+
+    assert created is False
+    assert again.id == first.id
+    assert again.city_name == "Paris"
+    assert len(repo.get_liked_places_by_user(1)) == 1
+
+
+def test_same_coordinates_of_another_user_are_inserted(repo):
+    repo.add_liked_place_if_absent(place(user_id=1))
+
+    _, created = repo.add_liked_place_if_absent(place(user_id=2))
+
+    assert created is True
+
+
+def test_fallback_without_on_conflict_support(monkeypatch, repo):
+    monkeypatch.setattr(module, "_SQLITE_UPSERT", False)
+    first, created = repo.add_liked_place_if_absent(place())
+
+    again, created_again = repo.add_liked_place_if_absent(place())
+
+    assert (created, created_again) == (True, False)
+    assert again.id == first.id
+    assert len(repo.get_liked_places_by_user(1)) == 1
@@ -1,6 +1,10 @@
 import pytest
 
 from src.backend.domain.model.place.liked_place_model import LikedPlace
+from src.backend.infrastructure.services.ai_service import (
+    AI_ERROR_MESSAGE,
+    AI_FAILURE_MESSAGES,
+)
 from src.backend.tests.conftest import (
     DummyAI,
     DummyUoW,
@@ -21,6 +25,59 @@ def test_get_info_for_point_uses_ai():
     assert "10.0,20.0" in res
 
 
+def test_describe_points_keeps_input_order_and_skips_cached():
+    uow = DummyUoW(make_user_repo(), make_place_repo())
+    ai = DummyAI(info_response="OK", cached={(2.0, 2.0): "CACHED"})
+    uc = PlaceUseCase(uow=uow, ai_service=ai)
+    points = [(1.0, 1.0), (2.0, 2.0), (3.0, 3.0), (4.0, 4.0)]
+
+    results = list(uc.describe_points(points, max_concurrency=2))
+
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[1] == {
+        "index": 1,
+        "latitude": 2.0,
+        "longitude": 2.0,
+        "cached": True,
+        "info": "CACHED",
+    }
+    assert results[3]["info"] == "OK 4.0,4.0"
+    assert ai.info_calls == 3
+
+
+def test_describe_points_reports_errors_per_point():
+    class FailingAI(DummyAI):
+        def get_place_info(self, latitude, longitude):
+            if latitude == 2.0:
+                raise RuntimeError("boom")
+            return super().get_place_info(latitude, longitude)
+
+    uc = PlaceUseCase(
+        uow=DummyUoW(make_user_repo(), make_place_repo()), ai_service=FailingAI()
+    )
+
+    results = list(uc.describe_points([(1.0, 1.0), (2.0, 2.0)]))
+
+    assert "info" in results[0]
+    assert "error" in results[1]
+
+
+def test_describe_points_reports_ai_fallback_message_as_error():
+    class StubAI(DummyAI):
+        def get_place_info(self, latitude, longitude):
+            return AI_ERROR_MESSAGE if latitude == 2.0 else ""
+
+    uc = PlaceUseCase(
+        uow=DummyUoW(make_user_repo(), make_place_repo()),
+        ai_service=StubAI(),
+        fallback_messages=AI_FAILURE_MESSAGES,
+    )
+
+    results = list(uc.describe_points([(1.0, 1.0), (2.0, 2.0)]))
+
+    assert all("error" in r and "info" not in r for r in results)
+
+
 def test_add_liked_place_happy_path_creates_new():
     user_repo = make_user_repo(existing_user=True)
     place_repo = make_place_repo([])
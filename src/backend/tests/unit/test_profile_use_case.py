@@ -1,6 +1,7 @@
 import pytest
 
 from src.backend.domain.model.place.liked_place_model import LikedPlace
+from src.backend.infrastructure.cache import LRUCache
 from src.backend.tests.conftest import (
     DummyAI,
     DummyUoW,
@@ -77,3 +78,49 @@ def test_add_liked_place_idempotent():
     result = uc.add_liked_place(1, "City", 1.1, 2.2)
 
     assert result is existing
+
+
+def test_recommendations_reused_until_liked_places_change():
+    places = [LikedPlace(1, 1, "Paris", 0, 0)]
+    uow = DummyUoW(make_user_repo(existing_user=True), make_place_repo(places))
+    ai = DummyAI(rec_prefix="REC:")
+    uc = ProfileUseCase(uow=uow, ai_service=ai, recommendation_cache=LRUCache())
+
+    first = uc.get_recommendations(1)
+    assert uc.get_recommendations(1) == first
+    assert ai.rec_calls == 1
+
+    uc.add_liked_place(1, "Berlin", 1.0, 1.0)
+    rec = uc.get_recommendations(1)
+
+    assert ai.rec_calls == 2
+    assert "Berlin" in rec
+
+
+def test_fallback_recommendation_is_not_stored():
+    places = [LikedPlace(1, 1, "Paris", 0, 0)]
+    uow = DummyUoW(make_user_repo(existing_user=True), make_place_repo(places))
+    ai = DummyAI()
+    ai.get_travel_recommendation = lambda s: "FAILED"
+    cache = LRUCache()
+    uc = ProfileUseCase(
+        uow=uow, ai_service=ai, recommendation_cache=cache, fallback_messages={"FAILED"}
+    )
+
+    assert uc.get_recommendations(1) == "FAILED"
+    assert len(cache) == 0
+
+
+def test_like_invalidates_stored_recommendation():
+    uow = DummyUoW(make_user_repo(existing_user=True), make_place_repo([]))
+    ai = DummyAI(rec_prefix="REC:")
+    uc = ProfileUseCase(uow=uow, ai_service=ai, recommendation_cache=LRUCache())
+    uc.add_liked_place(1, "Rome", 2.0, 2.0)
+    assert uc.get_recommendations(1) == "REC: Rome"
+
+    uc.add_liked_place(1, "Rome", 2.0, 2.0)  # повторный лайк ничего не меняет
+    assert uc.get_recommendations(1) == "REC: Rome"
+    uc.add_liked_place(1, "Oslo", 3.0, 3.0)
+
+    assert uc.get_recommendations(1) == "REC: Rome, Oslo"
+    assert ai.rec_calls == 2
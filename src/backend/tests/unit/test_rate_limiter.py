@@ -0,0 +1,87 @@
+import pytest
+
+from src.backend.infrastructure.client.rate_limiter import (
+    BATCH,
+    INTERACTIVE,
+    QueueTimeout,
+    SharedRateLimiter,
+    priority_scope,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(tmp_path, clock, **kwargs):
+    kwargs.setdefault("rate", 1.0)
+    return SharedRateLimiter(
+        str(tmp_path / "rate.sqlite3"),
+        name="nominatim",
+        clock=clock,
+        sleep=clock.sleep,
+        **kwargs,
+    )
+
+
+def test_bucket_is_shared_between_instances(tmp_path):
+    clock = FakeClock()
+    first = make_limiter(tmp_path, clock)
+    second = make_limiter(tmp_path, clock)
+
+    assert first.acquire() == 0.0
+    assert second.acquire() == pytest.approx(1.0)
+    assert first.acquire() == pytest.approx(1.0)
+    assert clock.now == pytest.approx(1002.0)
+    assert first.stats()["acquired"] == 2
+    assert first.stats()["queued"] == 0
+
+
+def test_interactive_request_goes_before_queued_batch(tmp_path):
+    clock = FakeClock()
+    limiter = make_limiter(tmp_path, clock)
+    limiter.acquire()
+    batch = limiter._enqueue(BATCH, clock())
+
+    assert limiter.acquire(priority=INTERACTIVE) == pytest.approx(1.0)
+    # Следующий маркер — через секунду, и теперь он достанется прогреву
+    assert limiter._try_take(batch, BATCH) == pytest.approx(1.0)
+    clock.now += 1.0
+    assert limiter._try_take(batch, BATCH) is None
+
+
+def test_wait_beyond_max_wait_fails_fast(tmp_path):
+    clock = FakeClock()
+    limiter = make_limiter(tmp_path, clock, rate=0.5)
+    limiter.acquire()
+
+    with pytest.raises(QueueTimeout):
+        limiter.acquire(max_wait=1.0)
+
+    assert clock.sleeps == []
+    stats = limiter.stats()
+    assert stats["timeouts"] == 1
+    assert stats["queued"] == 0
+
+
+def test_priority_scope_sets_default_priority(tmp_path):
+    clock = FakeClock()
+    limiter = make_limiter(tmp_path, clock)
+    limiter.acquire()
+    interactive = limiter._enqueue(INTERACTIVE, clock())
+
+    with priority_scope(BATCH):
+        with pytest.raises(QueueTimeout):
+            # Впереди интерактивный запрос: слот не раньше чем через 2 с
+            limiter.acquire(max_wait=1.5)
+
+    assert limiter._try_take(interactive, INTERACTIVE) == pytest.approx(1.0)
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from src.backend.domain.model.place.liked_place_model import LikedPlace
+from src.backend.infrastructure.cache import LRUCache
+from src.backend.services.profile.recommendation_jobs import RecommendationJobs
+from src.backend.tests.conftest import (
+    DummyAI,
+    DummyUoW,
+    make_place_repo,
+    make_user_repo,
+)
+from src.backend.use_case.user.profile_use_case import ProfileUseCase
+
+
+class GatedAI(DummyAI):
+    def __init__(self):
+        super().__init__(rec_prefix="REC:")
+        self.gate = threading.Event()
+
+    def get_travel_recommendation(self, liked_places_str):
+        self.gate.wait(5)
+        return super().get_travel_recommendation(liked_places_str)
+
+
+def make_jobs(ai):
+    places = [LikedPlace(1, 1, "Paris", 0, 0)]
+    uow = DummyUoW(make_user_repo(existing_user=True), make_place_repo(places))
+    use_case = ProfileUseCase(uow=uow, ai_service=ai, recommendation_cache=LRUCache())
+    return RecommendationJobs(use_case, max_workers=2)
+
+
+def test_generation_runs_in_background_once_per_user():
+    ai = GatedAI()
+    jobs = make_jobs(ai)
+
+    assert jobs.get_or_start(1) is None
+    assert jobs.get_or_start(1) is None  # та же генерация, не вторая
+    assert jobs.pending() == 1
+
+    ai.gate.set()
+    jobs.shutdown()
+
+    assert jobs.get_or_start(1) == "REC: Paris"
+    assert jobs.get_or_start(1) == "REC: Paris"  # теперь из хранилища
+    assert ai.rec_calls == 1
+
+
+def test_failed_generation_returns_fallback():
+    ai = DummyAI()
+
+    def boom(liked_places_str):
+        raise RuntimeError("boom")
+
+    ai.get_travel_recommendation = boom
+    jobs = make_jobs(ai)
+
+    assert jobs.get_or_start(1) is None
+    jobs.shutdown()
+
+    assert jobs.get_or_start(1) == "Не удалось получить рекомендации."
+
+
+def test_refresh_after_like_shares_the_per_user_job():
+    ai = GatedAI()
+    jobs = make_jobs(ai)
+
+    jobs.refresh(1)
+    assert jobs.get_or_start(1) is None  # страница ждёт ту же генерацию
+    jobs.refresh(1)
+    assert jobs.pending() == 1
+
+    ai.gate.set()
+    jobs.shutdown()
+
+    assert jobs.get_or_start(1) == "REC: Paris"
+    assert ai.rec_calls == 1
+
+
+def test_finished_job_for_old_liked_places_is_restarted():
+    ai = GatedAI()
+    ai.gate.set()
+    jobs = make_jobs(ai)
+    assert jobs.get_or_start(1) is None
+    while jobs.pending():
+        time.sleep(0.01)
+
+    # Лайк после завершения генерации: готовый текст — для старого набора
+    jobs.profile_use_case.add_liked_place(1, "Rome", 2.0, 2.0)
+
+    assert jobs.get_or_start(1) is None  # новая генерация, не "REC: Paris"
+    jobs.shutdown()
+    assert jobs.get_or_start(1) == "REC: Paris, Rome"
+    assert ai.rec_calls == 2
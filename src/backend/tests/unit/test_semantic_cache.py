@@ -0,0 +1,50 @@
+from src.backend.infrastructure.cache import SemanticCache, normalize_question
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_question():
+    assert (
+        normalize_question("  Что   посмотреть, в Орле?! ") == "что посмотреть в орле"
+    )
+    assert normalize_question("Ёлки") == "елки"
+
+
+def test_reuses_answer_for_similar_question_only():
+    cache = SemanticCache(threshold=0.85)
+    cache.set("Что посмотреть в Париже за 3 дня?", "PARIS")
+    cache.set("Что посмотреть в Риме за 3 дня?", "ROME")
+    cache.set("Лучшие музеи Лондона", "LONDON")
+
+    hit = cache.get("что посмотреть в париже за 3 дня")
+    assert hit.answer == "PARIS" and hit.score > 0.95
+    assert cache.get("Что посмотреть в Риме за 3 дня").answer == "ROME"
+    assert cache.get("Что посмотреть в Берлине за 3 дня") is None
+    assert cache.get("Что посмотреть в Париже за 5 дней") is None  # числа различаются
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+
+
+def test_bounded_index_evicts_least_recently_used_and_expires():
+    clock = FakeClock()
+    cache = SemanticCache(max_entries=2, ttl_seconds=100, clock=clock)
+    cache.set("погода в Сочи летом", "SOCHI")
+    clock.now = 1
+    cache.set("музеи Казани", "KAZAN")
+    clock.now = 2
+    assert cache.get("погода в Сочи летом").answer == "SOCHI"
+    clock.now = 3
+    cache.set("пляжи Анапы", "ANAPA")  # вытесняет Казань
+
+    assert len(cache) == 2
+    assert cache.get("музеи Казани") is None
+    assert cache.stats()["evictions"] == 1
+
+    clock.now = 200
+    assert cache.get("пляжи Анапы") is None
+    assert len(cache) == 1
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.domain.model.place.liked_place_model import LikedPlace
+from src.backend.infrastructure.db.Base import Base
+from src.backend.infrastructure.db.uow import SqlAlchemyUnitOfWork, request_scope
+from src.backend.infrastructure.models import liked_place_model, user_model  # noqa
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'uow.db'}", connect_args={"timeout": 30}
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+def count_places(session_factory, user_id=None):
+    uow = SqlAlchemyUnitOfWork(session_factory)
+    with uow:
+        if user_id is None:
+            return uow.session.query(liked_place_model.LikedPlace).count()
+        return len(uow.place_repo.get_liked_places_by_user(user_id))
+
+
+def test_shared_instance_gives_each_thread_its_own_session(session_factory):
+    uow = SqlAlchemyUnitOfWork(session_factory)  # один на всё, как в create_app
+    threads_count, iterations = 16, 25
+    active, errors = set(), []
+    lock = threading.Lock()
+    start = threading.Barrier(threads_count)
+
+    def worker(user_id):
+        start.wait()
+        for i in range(iterations):
+            try:
+                with uow as u:
+                    session = u.session
+                    with lock:
+                        assert id(session) not in active
+                        active.add(id(session))
+                    u.place_repo.add_liked_place(
+                        LikedPlace(None, user_id, f"City {i}", user_id, i)
+                    )
+                    assert u.session is session
+                    assert u.place_repo.session is session
+                    with lock:
+                        active.discard(id(session))
+            except Exception as e:  # pragma: no cover - попадёт в assert ниже
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert uow.session is None
+    assert count_places(session_factory) == threads_count * iterations
+    assert count_places(session_factory, user_id=3) == iterations
+
+
+def test_request_scope_shares_session_across_unit_of_work_instances(
+    session_factory,
+):
+    places_uow = SqlAlchemyUnitOfWork(session_factory)
+    profile_uow = SqlAlchemyUnitOfWork(session_factory)
+
+    with request_scope():
+        with places_uow as u:
+            first = u.session
+            u.place_repo.add_liked_place(LikedPlace(None, 1, "Paris", 48.8, 2.3))
+        with profile_uow as u:
+            assert u.session is first  # та же сессия в другом сценарии
+            assert len(u.place_repo.get_liked_places_by_user(1)) == 1
+
+    assert places_uow.session is None
+
+
+def test_only_outermost_block_commits_and_rollback_discards_all(session_factory):
+    uow = SqlAlchemyUnitOfWork(session_factory)
+
+    with pytest.raises(RuntimeError):
+        with uow:
+            uow.place_repo.add_liked_place(LikedPlace(None, 1, "Paris", 48.8, 2.3))
+            with uow:
+                uow.place_repo.add_liked_place(LikedPlace(None, 1, "Rome", 41.9, 12.5))
+            raise RuntimeError("сбой после вложенного блока")
+
+    assert count_places(session_factory) == 0
@@ -0,0 +1,73 @@
+from src.backend.domain.model.user.user_model import User
+from src.backend.infrastructure.cache import LRUCache
+from src.backend.services.user.user_loader import SESSION_CLAIMS_KEY, CachedUserLoader
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_loader(**kwargs):
+    calls = []
+
+    def load(user_id):
+        calls.append(user_id)
+        return User(user_id, f"user{user_id}", "hash") if user_id < 100 else None
+
+    return CachedUserLoader(load=load, **kwargs), calls
+
+
+def test_cached_user_is_loaded_from_db_once():
+    loader, calls = make_loader(cache=LRUCache(name="users"))
+
+    assert loader("1").username == "user1"
+    assert loader("1").username == "user1"
+    assert loader("404") is None
+    assert loader("404") is None  # отсутствие не кэшируется
+    assert loader("not-a-number") is None
+
+    assert calls == [1, 404, 404]
+    stats = loader.stats()
+    assert stats["requests"] == 4 and stats["db_loads"] == 3
+    assert stats["cache"]["hits"] == 1
+
+
+def test_invalidate_drops_cached_user_and_session_claims():
+    loader, calls = make_loader(cache=LRUCache(name="users"), claims_ttl_seconds=60)
+    session = {}
+    loader("1", session)
+
+    loader.invalidate(1, session)
+    loader("1")
+
+    assert SESSION_CLAIMS_KEY not in session
+    assert calls == [1, 1]
+
+
+def test_session_claims_are_trusted_only_within_window():
+    clock = FakeClock()
+    loader, calls = make_loader(claims_ttl_seconds=30, clock=clock)
+    session = {}
+
+    loader("1", session)  # проверка по БД записывает данные в сессию
+    clock.now += 10
+    user = loader("1", session)
+    clock.now += 30
+    loader("1", session)  # окно истекло: снова БД
+
+    assert user.username == "user1" and user.password_hash == ""
+    assert calls == [1, 1]
+    assert session[SESSION_CLAIMS_KEY]["verified_at"] == clock.now
+    assert loader.stats()["claims_hits"] == 1
+
+
+def test_claims_of_another_user_are_ignored():
+    loader, calls = make_loader(claims_ttl_seconds=30, clock=FakeClock())
+    session = {SESSION_CLAIMS_KEY: {"id": 2, "username": "x", "verified_at": 1000}}
+
+    assert loader("1", session).username == "user1"
+    assert calls == [1]
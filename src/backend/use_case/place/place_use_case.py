@@ -4,10 +4,12 @@ This module implements the core business logic for place-related operations
 following Domain-Driven Design principles.
 """
 
-from typing import List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Collection, Dict, Iterator, List, Sequence, Tuple
 
 from src.backend.domain.exceptions.user_exceptions import UserNotFoundError
 from src.backend.domain.model.place.liked_place_model import LikedPlace
+from src.backend.domain.model.place.popular_place_model import PopularPlace
 from src.backend.domain.services.ai.ai_port import IAIService
 from src.backend.domain.uow.uow_port import IUnitOfWork
 
@@ -22,17 +24,26 @@ class PlaceUseCase:
     Attributes:
         uow: Unit of Work for managing database transactions
         ai_service: AI service for generating place information and recommendations
+        fallback_messages: AI fallback answers reported as per-point errors
     """
 
-    def __init__(self, uow: IUnitOfWork, ai_service: IAIService) -> None:
+    def __init__(
+        self,
+        uow: IUnitOfWork,
+        ai_service: IAIService,
+        fallback_messages: Collection[str] = (),
+    ) -> None:
         """Initialize PlaceUseCase with required dependencies.
 
         Args:
             uow: Unit of Work implementation for data persistence
             ai_service: AI service implementation for place information
+            fallback_messages: Answers the AI service returns instead of
+                raising when it fails
         """
         self.uow = uow
         self.ai_service = ai_service
+        self.fallback_messages = frozenset(fallback_messages)
 
     def get_info_for_point(self, latitude: float, longitude: float) -> str:
         """Get AI-generated information about a specific location.
@@ -46,6 +57,72 @@ class PlaceUseCase:
         """
         return self.ai_service.get_place_info(latitude, longitude)
 
+    async def get_info_for_point_async(self, latitude: float, longitude: float) -> str:
+        """Asynchronously get AI-generated information about a location.
+
+        Args:
+            latitude: Geographic latitude coordinate
+            longitude: Geographic longitude coordinate
+
+        Returns:
+            AI-generated description of the location
+        """
+        return await self.ai_service.get_place_info_async(latitude, longitude)
+
+    def describe_points(
+        self, points: Sequence[Tuple[float, float]], max_concurrency: int = 8
+    ) -> Iterator[Dict[str, Any]]:
+        """Describe many points, serving cached ones first.
+
+        All points are checked against the AI cache up front; the misses are
+        generated concurrently by at most ``max_concurrency`` workers. Results
+        are yielded in input order, each as soon as it and every point before
+        it are ready.
+
+        Args:
+            points: Sequence of (latitude, longitude) pairs
+            max_concurrency: Maximum number of simultaneous AI calls
+
+        Yields:
+            Dicts with index, latitude, longitude, cached flag and either
+            ``info`` or ``error`` (an exception, an empty answer or an AI
+            fallback message)
+        """
+        cached: Dict[int, str] = {}
+        for index, (latitude, longitude) in enumerate(points):
+            text = self.ai_service.get_cached_place_info(latitude, longitude)
+            if text is not None:
+                cached[index] = text
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency), thread_name_prefix="describe"
+        )
+        try:
+            pending: Dict[int, Future] = {
+                index: executor.submit(self.ai_service.get_place_info, lat, lon)
+                for index, (lat, lon) in enumerate(points)
+                if index not in cached
+            }
+            for index, (latitude, longitude) in enumerate(points):
+                item: Dict[str, Any] = {
+                    "index": index,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "cached": index in cached,
+                }
+                try:
+                    text = cached[index] if index in cached else pending[index].result()
+                except Exception:
+                    text = None
+                if text and text not in self.fallback_messages:
+                    item["info"] = text
+                else:
+                    item["error"] = "Не удалось получить описание точки"
+                yield item
+        finally:
+            # Клиент мог отключиться: не генерируем оставшиеся описания
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def add_liked_place(
         self, user_id: int, city_name: str, latitude: float, longitude: float
     ) -> LikedPlace:
@@ -68,20 +145,17 @@ class PlaceUseCase:
             if not user:
                 raise UserNotFoundError("Пользователь не найден")
 
-            liked_places = uow.place_repo.get_liked_places_by_user(user_id)
-            for place in liked_places:
-                if place.latitude == latitude and place.longitude == longitude:
-                    return place
-
-            new_place = LikedPlace(
-                id=None,
-                user_id=user_id,
-                city_name=city_name,
-                latitude=latitude,
-                longitude=longitude,
+            # Дубликат отсекает уникальный ключ в БД, а не перебор мест
+            place, _ = uow.place_repo.add_liked_place_if_absent(
+                LikedPlace(
+                    id=None,
+                    user_id=user_id,
+                    city_name=city_name,
+                    latitude=latitude,
+                    longitude=longitude,
+                )
             )
-            added = uow.place_repo.add_liked_place(new_place)
-            return added
+            return place
 
     def get_liked_places_by_user(self, user_id: int) -> List[LikedPlace]:
         """Retrieve all places liked by a specific user.
@@ -95,6 +169,18 @@ class PlaceUseCase:
         with self.uow as uow:
             return uow.place_repo.get_liked_places_by_user(user_id)
 
+    def get_popular_places(self, limit: int = 100) -> List[PopularPlace]:
+        """Retrieve the places liked most often across all users.
+
+        Args:
+            limit: Maximum number of places to return
+
+        Returns:
+            Popular places ordered by number of likes
+        """
+        with self.uow as uow:
+            return uow.place_repo.get_popular_places(limit)
+
     def generate_recommendations_for_user(self, user_id: int) -> str:
         """Generate AI-powered travel recommendations based on user preferences.
 
@@ -4,13 +4,33 @@ This module implements the core business logic for user profile operations
 following Domain-Driven Design principles.
 """
 
-from typing import List
+import hashlib
+from typing import Collection, List, Optional, Sequence
 
 from src.backend.domain.exceptions.user_exceptions import UserNotFoundError
 from src.backend.domain.model.place.liked_place_model import LikedPlace
 from src.backend.domain.services.ai.ai_port import IAIService
+from src.backend.domain.services.cache.cache_port import ICache
 from src.backend.domain.uow.uow_port import IUnitOfWork
 
+NO_LIKED_PLACES_MESSAGE = "Сначала отметьте любимые места, чтобы получить рекомендации."
+
+
+def liked_places_hash(liked_places: Sequence[LikedPlace]) -> str:
+    """Content hash of a liked-places set (order-independent).
+
+    Args:
+        liked_places: Places liked by a user
+
+    Returns:
+        Hex digest identifying the set of (name, latitude, longitude)
+    """
+    items = sorted(
+        f"{p.city_name}|{round(p.latitude, 6)}|{round(p.longitude, 6)}"
+        for p in liked_places
+    )
+    return hashlib.sha256("\n".join(items).encode("utf-8")).hexdigest()
+
 
 class ProfileUseCase:
     """Use case for managing user profiles and travel preferences.
@@ -21,17 +41,29 @@ class ProfileUseCase:
     Attributes:
         uow: Unit of Work for managing database transactions
         ai_service: AI service for generating recommendations
+        recommendation_cache: Per-user store of generated recommendations
     """
 
-    def __init__(self, uow: IUnitOfWork, ai_service: IAIService) -> None:
+    def __init__(
+        self,
+        uow: IUnitOfWork,
+        ai_service: IAIService,
+        recommendation_cache: Optional[ICache] = None,
+        fallback_messages: Collection[str] = (),
+    ) -> None:
         """Initialize ProfileUseCase with required dependencies.
 
         Args:
             uow: Unit of Work implementation for data persistence
             ai_service: AI service implementation for recommendations
+            recommendation_cache: Store of recommendations keyed by user; an
+                entry is reused while the user's liked-places set is unchanged
+            fallback_messages: AI fallback answers that must not be stored
         """
         self.uow = uow
         self.ai_service = ai_service
+        self.recommendation_cache = recommendation_cache
+        self.fallback_messages = frozenset(fallback_messages)
 
     def get_liked_places(self, user_id: int) -> List[LikedPlace]:
         """Retrieve all places liked by a specific user.
@@ -51,21 +83,71 @@ class ProfileUseCase:
                 raise UserNotFoundError("Пользователь не найден")
             return uow.place_repo.get_liked_places_by_user(user_id)
 
-    def get_recommendations(self, user_id: int) -> str:
+    def get_recommendations(
+        self, user_id: int, liked_places: Optional[List[LikedPlace]] = None
+    ) -> str:
         """Generate AI-powered travel recommendations for a user.
 
+        A stored recommendation is returned while the user's liked-places set
+        hashes to the same value it was generated for.
+
         Args:
             user_id: ID of the user to generate recommendations for
+            liked_places: The user's liked places, if already loaded
 
         Returns:
             AI-generated travel recommendations as text
         """
-        liked_places = self.get_liked_places(user_id)
-        if not liked_places:
-            return "Сначала отметьте любимые места, чтобы получить рекомендации."
+        if liked_places is None:
+            liked_places = self.get_liked_places(user_id)
+        stored = self.get_stored_recommendations(user_id, liked_places)
+        if stored is not None:
+            return stored
+        places_hash = liked_places_hash(liked_places)
+        cache = self.recommendation_cache
+        key = self._recommendation_key(user_id)
         liked_places_names = [p.city_name for p in liked_places]
         liked_places_str = ", ".join(liked_places_names)
-        return self.ai_service.get_travel_recommendation(liked_places_str)
+        text = self.ai_service.get_travel_recommendation(liked_places_str)
+        if cache is not None and text and text not in self.fallback_messages:
+            cache.set(key, {"hash": places_hash, "text": text})
+        return text
+
+    def get_stored_recommendations(
+        self, user_id: int, liked_places: List[LikedPlace]
+    ) -> Optional[str]:
+        """Return a recommendation that needs no generation, if there is one.
+
+        Args:
+            user_id: ID of the user
+            liked_places: The user's current liked places
+
+        Returns:
+            The hint for an empty set, the stored recommendation for an
+            unchanged set, or None if the recommendation must be generated
+        """
+        if not liked_places:
+            return NO_LIKED_PLACES_MESSAGE
+        if self.recommendation_cache is None:
+            return None
+        entry = self.recommendation_cache.get(self._recommendation_key(user_id))
+        if entry and entry.get("hash") == liked_places_hash(liked_places):
+            return entry["text"]
+        return None
+
+    def invalidate_recommendations(self, user_id: int) -> None:
+        """Drop the stored recommendation of a user.
+
+        Args:
+            user_id: ID of the user whose recommendation is outdated
+        """
+        if self.recommendation_cache is not None:
+            self.recommendation_cache.delete(self._recommendation_key(user_id))
+
+    @staticmethod
+    def _recommendation_key(user_id: int) -> str:
+        """Cache key of a user's recommendation."""
+        return f"recommendation:{user_id}"
 
     def add_liked_place(
         self, user_id: int, city_name: str, latitude: float, longitude: float
@@ -89,16 +171,16 @@ class ProfileUseCase:
             if not user:
                 raise UserNotFoundError("Пользователь не найден")
 
-            liked_places = uow.place_repo.get_liked_places_by_user(user_id)
-            for place in liked_places:
-                if place.latitude == latitude and place.longitude == longitude:
-                    return place
-
-            new_place = LikedPlace(
-                id=None,
-                user_id=user_id,
-                city_name=city_name,
-                latitude=latitude,
-                longitude=longitude,
+            place, created = uow.place_repo.add_liked_place_if_absent(
+                LikedPlace(
+                    id=None,
+                    user_id=user_id,
+                    city_name=city_name,
+                    latitude=latitude,
+                    longitude=longitude,
+                )
             )
-            return uow.place_repo.add_liked_place(new_place)
+        if created:
+            # The liked-places set changed: the stored recommendation is stale
+            self.invalidate_recommendations(user_id)
+        return place
@@ -0,0 +1,120 @@
+"""Сквозные дедлайны запроса.
+
+Маршрут задаёт бюджет времени на весь запрос (``deadline_scope``), а
+вызовы внешних систем — Nominatim, LLM, база данных — берут свой таймаут
+из остатка бюджета (``remaining_timeout``) вместо фиксированного. Когда
+бюджет исчерпан, вызов не начинается, а ожидание прерывается
+``DeadlineExceeded``; маршрут отдаёт частичный ответ.
+
+Дедлайн хранится в ``ContextVar``: он виден во всех вызовах в пределах
+запроса и переносится в пулы потоков через ``contextvars.copy_context``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Бюджет времени запроса исчерпан."""
+
+
+class Deadline:
+    """Момент, к которому запрос должен быть обработан."""
+
+    def __init__(
+        self, seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Создать дедлайн через ``seconds`` секунд от текущего момента.
+
+        Args:
+            seconds: Бюджет времени
+            clock: Источник монотонного времени
+        """
+        self._clock = clock
+        self.budget = float(seconds)
+        self.expires_at = clock() + self.budget
+
+    def remaining(self) -> float:
+        """Оставшееся время, секунды (не меньше нуля)."""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        """Исчерпан ли бюджет."""
+        return self.remaining() <= 0.0
+
+    def timeout(self, default: Optional[float] = None) -> float:
+        """Таймаут очередного вызова: остаток бюджета, но не больше ``default``.
+
+        Args:
+            default: Собственный таймаут вызова (None — без ограничения)
+
+        Returns:
+            Таймаут в секундах
+
+        Raises:
+            DeadlineExceeded: Если бюджет уже исчерпан
+        """
+        remaining = self.remaining()
+        if remaining <= 0.0:
+            raise DeadlineExceeded(f"Бюджет запроса {self.budget} с исчерпан")
+        if default is None:
+            return remaining
+        return min(float(default), remaining)
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Дедлайн текущего запроса или None, если бюджет не задан."""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Установить дедлайн на время блока.
+
+    Вложенный блок не продлевает внешний бюджет: действует более ранний
+    из двух дедлайнов. ``seconds`` None или не больше нуля — бюджет не
+    задаётся, действует внешний дедлайн (если есть).
+
+    Args:
+        seconds: Бюджет времени блока
+    """
+    outer = _current.get()
+    if not seconds or seconds <= 0:
+        yield outer
+        return
+    deadline = Deadline(seconds)
+    if outer is not None and outer.expires_at <= deadline.expires_at:
+        deadline = outer
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def remaining_timeout(default: Optional[float] = None) -> Optional[float]:
+    """Таймаут вызова с учётом дедлайна текущего запроса.
+
+    Args:
+        default: Собственный таймаут вызова
+
+    Returns:
+        ``default`` без дедлайна, иначе меньшее из ``default`` и остатка
+
+    Raises:
+        DeadlineExceeded: Если бюджет запроса уже исчерпан
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    return deadline.timeout(default)
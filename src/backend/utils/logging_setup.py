@@ -35,6 +35,10 @@ class JsonFormatter(logging.Formatter):
             "request_id": getattr(record, "request_id", None),
             "user_id": getattr(record, "user_id", None),
         }
+        llm = getattr(record, "llm", None)
+        if llm is not None:
+            # Структурированные поля вызова LLM (см. ai_metrics)
+            data["llm"] = llm
         if self.pretty:
             return json.dumps(data, ensure_ascii=False, indent=2)
         return json.dumps(data, ensure_ascii=False)
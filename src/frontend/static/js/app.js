@@ -9,9 +9,10 @@
   };
 
   // Universal Markdown render: any element with [data-markdown] or .markdown
-  function renderMarkdownInDocument() {
+  function renderMarkdownInDocument(root) {
     try {
-      var nodes = Array.prototype.slice.call(document.querySelectorAll('[data-markdown], .markdown'));
+      var scope = root || document;
+      var nodes = Array.prototype.slice.call(scope.querySelectorAll('[data-markdown], .markdown'));
       nodes.forEach(function (node) {
         // Use textContent as source (escaping from templates stays safe)
         var src = node.textContent || '';
@@ -24,8 +25,13 @@
     }
   }
 
+  // Re-render Markdown inside a fragment inserted after page load
+  window.App.renderMarkdown = renderMarkdownInDocument;
+
   if (document.readyState === 'loading') {
-    document.addEventListener('DOMContentLoaded', renderMarkdownInDocument);
+    document.addEventListener('DOMContentLoaded', function () {
+      renderMarkdownInDocument();
+    });
   } else {
     renderMarkdownInDocument();
   }
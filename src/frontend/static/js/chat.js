@@ -10,20 +10,86 @@
     marked.setOptions({gfm:true, breaks:true});
   }
 
-  function addMsg(role, content){
-    const wrap=document.createElement('div');
-    wrap.className='chat-msg '+role;
-    const bubble=document.createElement('div');
-    bubble.className='chat-bubble';
+  function renderBubble(bubble, role, content){
     if(role==='assistant' && window.marked && window.DOMPurify){
       const html=marked.parse(content||'');
       bubble.innerHTML=DOMPurify.sanitize(html);
     } else {
       bubble.textContent=content;
     }
+  }
+
+  function addMsg(role, content){
+    const wrap=document.createElement('div');
+    wrap.className='chat-msg '+role;
+    const bubble=document.createElement('div');
+    bubble.className='chat-bubble';
+    renderBubble(bubble, role, content);
     wrap.appendChild(bubble);
     historyEl.appendChild(wrap);
     historyEl.scrollTop=historyEl.scrollHeight;
+    return bubble;
+  }
+
+  // Parse one SSE frame ("event: x\ndata: {...}") into {event, data}
+  function parseSseFrame(frame){
+    let event='message';
+    const dataLines=[];
+    frame.split('\n').forEach(line=>{
+      if(line.startsWith('event:')) event=line.slice(6).trim();
+      else if(line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+    });
+    if(!dataLines.length) return null;
+    try{ return {event, data:JSON.parse(dataLines.join('\n'))}; }
+    catch(e){ return null; }
+  }
+
+  // Stream the answer from /api/chat/stream and render tokens as they arrive.
+  // Resolves to false if streaming is unavailable, so the caller can fall back.
+  async function streamChat(text){
+    if(!window.ReadableStream || !window.TextDecoder) return false;
+    const res=await fetch('/api/chat/stream',{
+      method:'POST',headers:{'Content-Type':'application/json'},
+      body:JSON.stringify({session_id:sessionId,messages:[{role:'user',content:text}]})
+    });
+    if(!res.ok || !res.body){
+      const data=await res.json().catch(()=>({}));
+      addMsg('assistant', 'Ошибка: '+(data.error||'Неизвестно'));
+      return true;
+    }
+    const bubble=addMsg('assistant', '…');
+    const reader=res.body.getReader();
+    const decoder=new TextDecoder();
+    let buffer='';
+    let answer='';
+    let scheduled=false;
+    const render=()=>{
+      scheduled=false;
+      renderBubble(bubble, 'assistant', answer);
+      historyEl.scrollTop=historyEl.scrollHeight;
+    };
+    for(;;){
+      const {value, done}=await reader.read();
+      if(done) break;
+      buffer+=decoder.decode(value, {stream:true});
+      let idx;
+      while((idx=buffer.indexOf('\n\n'))!==-1){
+        const msg=parseSseFrame(buffer.slice(0, idx));
+        buffer=buffer.slice(idx+2);
+        if(!msg) continue;
+        if(msg.event==='token'){
+          answer+=msg.data.text||'';
+          // Re-render markdown at most once per animation frame
+          if(!scheduled){ scheduled=true; requestAnimationFrame(render); }
+        } else if(msg.event==='done'){
+          answer=msg.data.answer||answer;
+        } else if(msg.event==='error'){
+          answer+=(answer?'\n\n':'')+'Ошибка: '+(msg.data.error||'Неизвестно');
+        }
+      }
+    }
+    render();
+    return true;
   }
 
   // Try to parse coordinates from free text. Supports:
@@ -83,6 +149,8 @@
         return;
       }
 
+      if(await streamChat(text)) return;
+
       // Fallback to regular chat
       const res=await fetch('/api/chat',{
         method:'POST',headers:{'Content-Type':'application/json'},
@@ -2,6 +2,7 @@
   document.addEventListener('DOMContentLoaded', function () {
     var cfgEl = document.getElementById('page-config') || { dataset: {} };
     var reverseUrl = cfgEl.dataset.reverseUrl || '/map/reverse_geocode';
+    var geocodeQueryUrl = cfgEl.dataset.geocodeQueryUrl || '/geocode_query';
     var aiServiceConfigured = (cfgEl.dataset.aiConfigured === 'true');
     var isAuthenticated = (cfgEl.dataset.authenticated === 'true');
 
@@ -87,15 +88,62 @@
       });
     }
 
+    // Поиск идёт через сервер (кэш, лимит запросов к Nominatim); по мере ввода
+    // показываются только подсказки из ранее найденного — без запросов к OSM
+    var serverProvider = {
+      search: function (options) {
+        return fetch(geocodeQueryUrl, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ query: options.query, limit: 5 })
+        })
+        .then(function (response) { return response.ok ? response.json() : { results: [] }; })
+        .then(function (data) {
+          return (data.results || []).map(function (r) {
+            return { x: r.lon, y: r.lat, label: r.display_name, bounds: null, raw: r };
+          });
+        });
+      }
+    };
+
     var search = new GeoSearch.GeoSearchControl({
-      provider: new GeoSearch.OpenStreetMapProvider(),
+      provider: serverProvider,
       style: 'bar',
+      autoComplete: false,
       autoClose: true,
       keepResult: true,
       searchLabel: 'Поиск города или адреса...'
     });
     map.addControl(search);
 
+    var searchInput = document.querySelector('.leaflet-control-geosearch input');
+    if (searchInput) {
+      var suggestList = document.createElement('datalist');
+      suggestList.id = 'geocode-suggestions';
+      document.body.appendChild(suggestList);
+      searchInput.setAttribute('list', suggestList.id);
+      var suggestTimer = null;
+      searchInput.addEventListener('input', function () {
+        clearTimeout(suggestTimer);
+        var prefix = searchInput.value.trim();
+        if (prefix.length < 2) return;
+        suggestTimer = setTimeout(function () {
+          fetch(geocodeQueryUrl + '/suggest?q=' + encodeURIComponent(prefix))
+            .then(function (response) { return response.json(); })
+            .then(function (data) {
+              suggestList.innerHTML = '';
+              (data.suggestions || []).forEach(function (item) {
+                var option = document.createElement('option');
+                option.value = item.query;
+                option.label = item.display_name || '';
+                suggestList.appendChild(option);
+              });
+            })
+            .catch(function () {});
+        }, 150);
+      });
+    }
+
     map.on('geosearch/showlocation', function (result) {
       processLocation({ lat: result.location.y, lng: result.location.x }, result.location.label);
     });
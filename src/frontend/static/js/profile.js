@@ -0,0 +1,35 @@
+// Profile page: poll the deferred recommendation fragment until it is ready
+(function () {
+  var POLL_INTERVAL_MS = 1500;
+  var MAX_ATTEMPTS = 80;
+
+  function poll(container, attempt) {
+    fetch(container.dataset.url, { credentials: 'same-origin', cache: 'no-store' })
+      .then(function (resp) {
+        if (resp.status === 202) {
+          if (attempt + 1 < MAX_ATTEMPTS) {
+            setTimeout(function () { poll(container, attempt + 1); }, POLL_INTERVAL_MS);
+          } else {
+            container.innerHTML = '<div class="alert alert-info">Рекомендации готовятся дольше обычного. Обновите страницу позже.</div>';
+          }
+          return null;
+        }
+        if (!resp.ok) throw new Error('HTTP ' + resp.status);
+        return resp.text();
+      })
+      .then(function (html) {
+        if (html === null) return;
+        container.innerHTML = html;
+        container.removeAttribute('data-pending');
+        if (window.App && window.App.renderMarkdown) window.App.renderMarkdown(container);
+      })
+      .catch(function () {
+        container.innerHTML = '<div class="alert alert-info">Не удалось получить рекомендации.</div>';
+      });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    var container = document.getElementById('recommendation');
+    if (container && container.dataset.pending === 'true') poll(container, 0);
+  });
+})();